@@ -4,25 +4,65 @@ GHM SCRVNR Package
 AI detection + voice alignment gate for Website Studio.
 
 Primary entry point: SCRVNRGate
-Profile tools:       VoiceProfileExtractor, load_profile
+Profile tools:       VoiceProfileExtractor, load_profile, validate_profile, ProfileStore
+
+Attributes load lazily (PEP 562): `import scrvnr` touches no engine and
+no sys.path entry; the first access to e.g. scrvnr.AIDetector imports only
+the module that defines it. bench/run_bench.py times the import.
 """
 
 import sys
-from pathlib import Path
+import os
 
-# Make core importable from package root
-sys.path.insert(0, str(Path(__file__).parent / "core"))
+_core_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "core")
 
-from core.scrvnr_gate import SCRVNRGate, load_profile
-from core.pass1_ai_detection import AIDetector
-from core.pass2_voice_alignment import VoiceAligner
-from core.voice_profile_extractor import VoiceProfileExtractor
+# Public name -> core module that defines it (scrvnr.core reads this map too)
+_LAZY = {
+    "SCRVNRGate": "scrvnr_gate",
+    "load_profile": "scrvnr_gate",
+    "AIDetector": "pass1_ai_detection",
+    "VoiceAligner": "pass2_voice_alignment",
+    "VoiceProfileExtractor": "voice_profile_extractor",
+    "validate_profile": "profile_validator",
+    "ProfileValidationError": "profile_validator",
+    "ProfileStore": "profile_store",
+    "ProfileConflictError": "profile_store",
+    "AuditLog": "audit_log",
+    "AuditQuery": "audit_query",
+    "ReplayEngine": "replay",
+    "GateConfig": "replay",
+    "Pass1Policy": "scoring_policy",
+    "Pass2Policy": "scoring_policy",
+    "Calibrator": "calibration",
+    "CompiledProfileSet": "profile_set",
+    "ProfileIndex": "profile_index",
+    "NearDuplicateIndex": "near_duplicate",
+    "MetricsRegistry": "metrics",
+    "WarmSnapshot": "warm_snapshot",
+    "LexiconSet": "lexicons",
+    "load_lexicons": "lexicons",
+    "FramedClient": "framing",
+}
 
 __version__ = "1.0.0"
-__all__ = [
-    "SCRVNRGate",
-    "load_profile",
-    "AIDetector",
-    "VoiceAligner",
-    "VoiceProfileExtractor",
-]
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    _core_on_path()
+    value = getattr(__import__(module), name)
+    globals()[name] = value
+    return value
+
+
+def _core_on_path():
+    """Make core importable from package root (engines use flat sibling imports)."""
+    if _core_dir not in sys.path:
+        sys.path.insert(0, _core_dir)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,131 @@
+"""
+GHM SCRVNR — Synthetic Benchmark Corpus
+=========================================
+Deterministic section and page generator for benchmarks.
+
+Real client copy can't ship with the repo, and timing needs inputs whose
+size and shape are controlled. Every generator here is seeded, so the same
+arguments always produce the same text on every machine.
+
+Controls:
+    words       — section length (50 to 50,000 words)
+    ai_isms     — AI-ism phrases per 100 words (from AIDetector.AI_ISMS)
+    hedges      — hedge words per 100 words (from AIDetector.HEDGE_WORDS)
+    burstiness  — target coefficient of variation of sentence length
+    bullets     — fraction of sentences written as bullet items (Pass 1's
+                  sentence splitter joins a bullet to the sentence before
+                  it, so bullets raise measured burstiness)
+
+Usage:
+    from corpus import make_section, make_page, PRESETS
+
+    text = make_section(5000, **PRESETS["ai"], seed=3)
+    page = make_page(sections=5, words=300, preset="human", seed=1)
+
+CLI:
+    python corpus.py <words> [human|ai|mixed] [--seed 0]
+"""
+
+import math
+import os
+import random
+import sys
+from typing import Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "core"))
+
+from pass1_ai_detection import AIDetector
+
+
+VOCABULARY = (
+    "brake rotor caliper engine transmission clutch coolant radiator alternator battery "
+    "tire wheel alignment suspension shock strut axle bearing gasket seal pump belt hose "
+    "filter oil fluid sensor module inspection diagnostic estimate warranty appointment "
+    "vehicle car owner driver shop technician service repair replace check test drive "
+    "mile year month week hour price quote part labor cost dealer factory spec code "
+    "we you your our the a an and or but with for on in at to from by of it that this "
+    "is are was were has have had do does did can will should would keep fix run start "
+    "stop fit feel sound noise leak wear load heat cold fast slow right wrong same every"
+).split()
+
+SECTION_NAMES = ("hero", "services", "about", "process", "pricing", "faq", "reviews", "cta")
+
+PRESETS = {
+    "human": {"ai_isms": 0.0, "hedges": 0.3, "burstiness": 0.75, "bullets": 0.0},
+    "ai":    {"ai_isms": 1.5, "hedges": 2.5, "burstiness": 0.25, "bullets": 0.0},
+    "mixed": {"ai_isms": 0.4, "hedges": 1.0, "burstiness": 0.50, "bullets": 0.1},
+}
+
+MEAN_SENTENCE_WORDS = 15
+
+
+def make_section(
+    words: int,
+    ai_isms: float = 0.0,
+    hedges: float = 0.5,
+    burstiness: float = 0.6,
+    bullets: float = 0.0,
+    seed: int = 0,
+) -> str:
+    """One section of roughly `words` words with the requested profile."""
+    rng = random.Random(seed)
+    # Lognormal sentence lengths: CV = sqrt(exp(sigma^2) - 1)
+    sigma = math.sqrt(math.log(1 + burstiness ** 2))
+    mu = math.log(MEAN_SENTENCE_WORDS) - sigma ** 2 / 2
+
+    ai_left = round(words * ai_isms / 100)
+    hedge_left = round(words * hedges / 100)
+    lines, line, written = [], [], 0
+    while written < words:
+        length = max(3, min(80, round(rng.lognormvariate(mu, sigma))))
+        length = min(length, max(3, words - written))
+        sentence = [rng.choice(VOCABULARY) for _ in range(length)]
+        remaining = max(1, (words - written) // length)
+
+        if hedge_left and rng.random() < hedge_left / remaining:
+            sentence.insert(rng.randrange(len(sentence)), rng.choice(AIDetector.HEDGE_WORDS))
+            hedge_left -= 1
+        if ai_left and rng.random() < ai_left / remaining:
+            sentence.insert(0, rng.choice(AIDetector.AI_ISMS))
+            ai_left -= 1
+
+        text = " ".join(sentence)
+        written += len(text.split())
+        text = text[0].upper() + text[1:] + rng.choice(".....!?")
+        if rng.random() < bullets:
+            if line:
+                lines.append(" ".join(line))
+                line = []
+            lines.append("- " + text)
+        else:
+            line.append(text)
+            if len(line) >= 5:
+                lines.append(" ".join(line))
+                line = []
+    if line:
+        lines.append(" ".join(line))
+    return "\n".join(lines)
+
+
+def make_page(sections: int = 5, words: int = 300, preset: str = "mixed", seed: int = 0) -> Dict[str, str]:
+    """A page of named sections sharing one preset (each section seeded apart)."""
+    names = [SECTION_NAMES[i % len(SECTION_NAMES)] + ("" if i < len(SECTION_NAMES) else str(i))
+             for i in range(sections)]
+    return {
+        name: make_section(words, **PRESETS[preset], seed=seed * 1000 + i)
+        for i, name in enumerate(names)
+    }
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print a synthetic benchmark section.")
+    parser.add_argument("words", type=int)
+    parser.add_argument("preset", nargs="?", default="mixed", choices=sorted(PRESETS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(make_section(args.words, **PRESETS[args.preset], seed=args.seed))
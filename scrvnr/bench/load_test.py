@@ -0,0 +1,374 @@
+"""
+GHM SCRVNR — Composer Load Test
+=================================
+Replays Page Composer traffic against the gate and reports throughput,
+latency percentiles and memory growth over time.
+
+Traffic model (seeded, so every run replays the same requests):
+  - A session picks a property (a few hot properties take most traffic,
+    with a long tail) and a page of synthetic sections.
+  - The writer edits some of the page's sections. Each debounce fires a
+    check_section on the text typed so far, a few words longer each time.
+  - The session ends with a check_page submit of the whole page.
+
+Properties: --properties N writes N copies of the gad-main profile under
+distinct slugs to a temp directory, so every property gets its own cached
+gate. The harness adds --bare-properties slugs with no profile (Pass 1
+only). Caches that grow with property count show up as memory growth.
+
+Transports:
+    adapter  SCRVNRAdapter in this process, called from worker threads
+    spawn    one ws_gate_runner.py process per request (as the Next.js
+             route runs it today)
+    framed   one ws_gate_runner.py --framed process for the whole run,
+             requests multiplexed over its stdin/stdout
+
+Report:
+    {
+        "transport", "concurrency", "requests", "errors", "elapsed_s", "throughput_rps",
+        "latency_ms": {"check_section": {count, p50, p95, p99, max}, "check_page": {...}},
+        "memory": {"start_mb", "end_mb", "peak_mb", "growth_kb_per_request",
+                   "samples": [[seconds, rss_mb, requests], ...]},
+        "caches": {"gates": n, "profiles": n}          # adapter transport only
+    }
+
+Memory is this process's resident set (the adapter lives here). With the
+spawn transport each request is a fresh process, so memory reports the
+harness itself plus the largest child seen (child_peak_mb, Unix only).
+growth_kb_per_request is measured after the first 10% of requests
+(warm-up) and is the number to watch for cache leaks.
+
+Usage:
+    python bench/load_test.py --transport adapter --duration 30 --concurrency 4
+    python bench/load_test.py --transport spawn --requests 200 --json
+    python bench/load_test.py --transport framed --requests 200
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
+
+_bench_dir = os.path.dirname(os.path.abspath(__file__))
+_scrvnr_root = os.path.dirname(_bench_dir)
+sys.path.insert(0, os.path.join(_scrvnr_root, "core"))
+sys.path.insert(0, _scrvnr_root)
+sys.path.insert(0, _bench_dir)
+
+from corpus import make_page, PRESETS
+
+
+SAMPLE_INTERVAL = 1.0      # seconds between memory samples
+WARMUP_FRACTION = 0.10
+
+
+# ─── Properties ──────────────────────────────────────────────────────────────
+
+def make_properties(count: int, bare: int = 0, seed: int = 0) -> Tuple[str, List[str]]:
+    """
+    Write count profile copies to a temp directory.
+    Returns (profiles_dir, slugs); the caller removes the directory.
+    """
+    with open(os.path.join(_scrvnr_root, "profiles", "gad-main.json"), "r", encoding="utf-8") as f:
+        template = json.load(f)
+    rng = random.Random(seed)
+    profiles_dir = tempfile.mkdtemp(prefix="scrvnr-load-")
+    slugs = []
+    for i in range(count):
+        client = f"load{i:04d}"
+        profile = dict(template, profile_id=f"{client}-main", client_slug=client, brand_slug="main")
+        profile["reading_level"] = dict(template["reading_level"])
+        profile["reading_level"]["flesch_kincaid_grade"] = round(rng.uniform(6.0, 12.0), 1)
+        with open(os.path.join(profiles_dir, f"{client}-main.json"), "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        slugs.append(f"{client}-main")
+    slugs += [f"bare{i:04d}-main" for i in range(bare)]
+    return profiles_dir, slugs
+
+
+# ─── Traffic ─────────────────────────────────────────────────────────────────
+
+def composer_traffic(slugs: List[str], seed: int = 0, sections: int = 5, words: int = 300,
+                     debounce_words: int = 6) -> Iterator[Tuple]:
+    """
+    Endless composer request stream:
+        ("check_section", slug, section_name, text)
+        ("check_page", slug, {section_name: text})
+    """
+    rng = random.Random(seed)
+    presets = sorted(PRESETS)
+    session = 0
+    while True:
+        # Pareto-distributed index: a handful of hot properties, long tail
+        slug = slugs[min(int(rng.paretovariate(1.2)) - 1, len(slugs) - 1)]
+        page = make_page(sections, words, preset=rng.choice(presets), seed=seed * 100_000 + session)
+        for name in rng.sample(sorted(page), k=rng.randint(1, len(page))):
+            typed = page[name].split()
+            end = rng.randrange(0, max(1, len(typed) // 2))   # resuming a draft
+            while end < len(typed):
+                end = min(len(typed), end + rng.randint(1, 2 * debounce_words))
+                yield ("check_section", slug, name, " ".join(typed[:end]))
+        yield ("check_page", slug, page)
+        session += 1
+
+
+# ─── Transports ──────────────────────────────────────────────────────────────
+
+class AdapterTransport:
+    """Calls one shared SCRVNRAdapter in-process."""
+
+    name = "adapter"
+
+    def __init__(self, profiles_dir: str):
+        from website_studio_adapter import SCRVNRAdapter
+        self.adapter = SCRVNRAdapter(profiles_dir=profiles_dir)
+
+    def send(self, event: Tuple) -> Dict:
+        if event[0] == "check_section":
+            _, slug, name, text = event
+            return self.adapter.check_section(slug, name, text)
+        _, slug, sections = event
+        return self.adapter.check_page(slug, sections)
+
+    def caches(self) -> Dict:
+        return {"gates": len(self.adapter._gate_cache), "profiles": len(self.adapter._profile_cache)}
+
+    def close(self):
+        pass
+
+
+class SpawnTransport:
+    """One ws_gate_runner.py subprocess per request."""
+
+    name = "spawn"
+
+    def __init__(self, profiles_dir: str):
+        self.runner = os.path.join(_scrvnr_root, "ws_gate_runner.py")
+        self.env = dict(os.environ, SCRVNR_PROFILES_DIR=profiles_dir)
+
+    def send(self, event: Tuple) -> Dict:
+        if event[0] == "check_section":
+            _, slug, name, text = event
+            payload = {"property_slug": slug, "sections": {name: text}, "section_only": name}
+        else:
+            _, slug, sections = event
+            payload = {"property_slug": slug, "sections": sections}
+        out = subprocess.run([sys.executable, self.runner], input=json.dumps(payload).encode("utf-8"),
+                             capture_output=True, env=self.env, check=True)
+        return json.loads(out.stdout)
+
+    def caches(self) -> Dict:
+        return {}
+
+    def close(self):
+        pass
+
+
+class FramedTransport(SpawnTransport):
+    """One long-lived ws_gate_runner.py --framed process; requests share it concurrently."""
+
+    name = "framed"
+
+    def __init__(self, profiles_dir: str):
+        super().__init__(profiles_dir)
+        from framing import FramedClient
+        self.client = FramedClient([sys.executable, self.runner, "--framed"], env=self.env)
+
+    def send(self, event: Tuple) -> Dict:
+        if event[0] == "check_section":
+            _, slug, name, text = event
+            return self.client.request({"property_slug": slug, "sections": {name: text}, "section_only": name})
+        _, slug, sections = event
+        return self.client.request({"property_slug": slug, "sections": sections})
+
+    def close(self):
+        self.client.close()
+
+
+TRANSPORTS = {"adapter": AdapterTransport, "spawn": SpawnTransport, "framed": FramedTransport}
+
+
+# ─── Measurement ─────────────────────────────────────────────────────────────
+
+def rss_mb() -> float:
+    """Current resident set of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+def _child_peak_mb() -> float:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+def percentiles(samples: List[float]) -> Dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {"count": len(ordered), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99),
+            "max": round(ordered[-1], 3)}
+
+
+def run_load(transport, traffic: Iterator[Tuple], concurrency: int = 4, duration: float = None,
+             max_requests: int = None, sample_interval: float = SAMPLE_INTERVAL,
+             progress: bool = False) -> Dict:
+    """
+    Drive transport with traffic from concurrency worker threads until
+    duration seconds have passed or max_requests have been sent.
+    """
+    if duration is None and max_requests is None:
+        raise ValueError("run_load needs a duration or max_requests")
+
+    lock = threading.Lock()
+    latencies: Dict[str, List[float]] = {"check_section": [], "check_page": []}
+    state = {"sent": 0, "done": 0, "errors": 0}
+    started = time.perf_counter()
+    deadline = started + duration if duration is not None else None
+
+    def next_event():
+        with lock:
+            if max_requests is not None and state["sent"] >= max_requests:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            state["sent"] += 1
+            return next(traffic)
+
+    def worker():
+        while True:
+            event = next_event()
+            if event is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                result = transport.send(event)
+                failed = result.get("gate_status") == "ERROR"
+            except Exception:
+                failed = True
+            elapsed = (time.perf_counter() - t0) * 1000
+            with lock:
+                latencies[event[0]].append(elapsed)
+                state["done"] += 1
+                state["errors"] += failed
+
+    start_mb = rss_mb()
+    samples = [[0.0, round(start_mb, 2), 0]]
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        time.sleep(min(0.05, sample_interval))
+        now = time.perf_counter() - started
+        if now - samples[-1][0] >= sample_interval:
+            samples.append([round(now, 2), round(rss_mb(), 2), state["done"]])
+            if progress:
+                print(f"  {now:>7.1f}s  {state['done']:>7} requests  {samples[-1][1]:>8.1f} MB", flush=True)
+    elapsed = time.perf_counter() - started
+    end_mb = rss_mb()
+    samples.append([round(elapsed, 2), round(end_mb, 2), state["done"]])
+
+    # Growth after warm-up: first sample past WARMUP_FRACTION of requests -> end
+    warm = next((s for s in samples if s[2] >= state["done"] * WARMUP_FRACTION and s[2] > 0), samples[0])
+    grown_requests = state["done"] - warm[2]
+    growth = (end_mb - warm[1]) * 1024 / grown_requests if grown_requests > 0 else 0.0
+
+    memory = {
+        "start_mb": round(start_mb, 2),
+        "end_mb": round(end_mb, 2),
+        "peak_mb": round(max(s[1] for s in samples), 2),
+        "growth_kb_per_request": round(growth, 3),
+        "samples": samples,
+    }
+    if transport.name == "spawn":
+        memory["child_peak_mb"] = round(_child_peak_mb(), 2)
+
+    return {
+        "transport": transport.name,
+        "concurrency": concurrency,
+        "requests": state["done"],
+        "errors": state["errors"],
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(state["done"] / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {entry: percentiles(values) for entry, values in latencies.items()},
+        "memory": memory,
+        "caches": transport.caches(),
+    }
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay Page Composer traffic against the SCRVNR gate.")
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default="adapter")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, help="Seconds to run (default 10 unless --requests)")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--properties", type=int, default=50, help="Properties with a voice profile")
+    parser.add_argument("--bare-properties", type=int, default=10, help="Properties with no profile")
+    parser.add_argument("--words", type=int, default=300, help="Words per section")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-interval", type=float, default=SAMPLE_INTERVAL)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.duration is None and args.requests is None:
+        args.duration = 10.0
+
+    profiles_dir, slugs = make_properties(args.properties, args.bare_properties, args.seed)
+    try:
+        transport = TRANSPORTS[args.transport](profiles_dir)
+        if not args.json:
+            print(f"\n SCRVNR LOAD TEST — {args.transport}, {args.concurrency} workers, {len(slugs)} properties")
+            print("=" * 60)
+        report = run_load(
+            transport,
+            composer_traffic(slugs, seed=args.seed, words=args.words),
+            concurrency=args.concurrency,
+            duration=args.duration,
+            max_requests=args.requests,
+            sample_interval=args.sample_interval,
+            progress=not args.json,
+        )
+        transport.close()
+    finally:
+        shutil.rmtree(profiles_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n  {report['requests']} requests in {report['elapsed_s']:.1f}s "
+              f"= {report['throughput_rps']:.1f} req/s  ({report['errors']} errors)")
+        for entry, stats in report["latency_ms"].items():
+            if stats["count"]:
+                print(f"  {entry:<14} n={stats['count']:<6} p50 {stats['p50']:>8.2f}  p95 {stats['p95']:>8.2f}  "
+                      f"p99 {stats['p99']:>8.2f}  max {stats['max']:>8.2f} ms")
+        mem = report["memory"]
+        print(f"  memory {mem['start_mb']:.1f} -> {mem['end_mb']:.1f} MB (peak {mem['peak_mb']:.1f}), "
+              f"{mem['growth_kb_per_request']:+.2f} KB/request after warm-up")
+        if report["caches"]:
+            print(f"  caches {report['caches']}")
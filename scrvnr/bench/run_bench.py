@@ -0,0 +1,268 @@
+"""
+GHM SCRVNR — Benchmark Suite
+==============================
+Times every scorer and entry point on the synthetic corpus, stores
+baselines as JSON and flags regressions.
+
+Benchmarks (sizes 50 / 500 / 5,000 / 50,000 words; --quick drops 50,000):
+    pass1.<dimension>/<n>w       AIDetector measure + score, per dimension
+    pass1.analyze_section/<n>w
+    pass2.<dimension>/<n>w       VoiceAligner measure + score, per dimension
+    pass2.analyze_section/<n>w
+    extractor.extract/<n>w       VoiceProfileExtractor.extract
+    pass1.analyze_document/page  5 sections x 300 words
+    gate.run/page                SCRVNRGate.run with the gad-main profile
+    gate.run_no_profile/page     Pass 1 only
+    ws_gate_runner/page          subprocess end to end (JSON in, JSON out)
+    cli.cold_start               `python cli.py --help` in a fresh interpreter
+    cli.module_help              `python -m scrvnr --help` (package import + CLI)
+    python.startup               `python -c pass`, the floor for the rows below
+    import.scrvnr                `import scrvnr` in a fresh interpreter (lazy, no engines)
+    import.adapter               `import scrvnr.website_studio_adapter` (engines, no default_adapter)
+
+Each benchmark runs once untimed, then repeats until min_time has elapsed
+(at least once, at most max_runs) and records median and min milliseconds per call. Comparisons
+use the min (best-of-N, as timeit recommends: noise only ever adds time).
+A result is a regression when it exceeds the baseline by more than the
+tolerance (default 25%). Benchmarks listed in BUDGETS also fail when their
+best time exceeds a fixed budget, baseline or not. Baselines are machine-specific — record one per
+machine (or CI runner) and compare on that machine only.
+
+Usage:
+    python bench/run_bench.py --save bench/baseline.json       # record
+    python bench/run_bench.py --baseline bench/baseline.json   # compare; exit 1 on regression
+    python bench/run_bench.py --quick --filter pass1.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+_bench_dir = os.path.dirname(os.path.abspath(__file__))
+_scrvnr_root = os.path.dirname(_bench_dir)
+sys.path.insert(0, os.path.join(_scrvnr_root, "core"))
+sys.path.insert(0, _bench_dir)
+sys.path.insert(0, _scrvnr_root)
+
+from pass1_ai_detection import AIDetector
+from pass2_voice_alignment import VoiceAligner
+from scrvnr_gate import SCRVNRGate, resolve_profile
+from voice_profile_extractor import VoiceProfileExtractor
+from corpus import make_section, make_page, PRESETS
+from cli import COLD_START_BUDGET_MS
+
+
+SIZES = (50, 500, 5000, 50000)
+QUICK_SIZES = (50, 500, 5000)
+TOLERANCE = 0.25
+BASELINE_VERSION = 1
+
+# name -> maximum best-of-N milliseconds
+# import.scrvnr includes interpreter startup (python.startup, ~20 ms)
+IMPORT_BUDGET_MS = 50
+BUDGETS = {
+    "cli.cold_start": COLD_START_BUDGET_MS,
+    "cli.module_help": COLD_START_BUDGET_MS,
+    "import.scrvnr": IMPORT_BUDGET_MS,
+}
+
+
+def time_call(fn: Callable, min_time: float = 0.2, max_runs: int = 50) -> Dict:
+    """Run fn until min_time has elapsed (1..max_runs calls). Returns ms stats."""
+    fn()  # warm-up: regex compilation, caches, first-touch allocation
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_runs:
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+        if time.perf_counter() - started >= min_time:
+            break
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "runs": len(samples),
+    }
+
+
+def build_benchmarks(sizes=SIZES) -> List[Tuple[str, Callable]]:
+    """(name, zero-argument callable) for every benchmark, in run order."""
+    detector = AIDetector()
+    profile = resolve_profile("gad-main", profiles_dir=os.path.join(_scrvnr_root, "profiles"))
+    aligner = VoiceAligner(profile)
+    extractor = VoiceProfileExtractor()
+    benches = []
+
+    for words in sizes:
+        text = make_section(words, **PRESETS["mixed"], seed=words)
+        suffix = f"/{words}w"
+        for dim in AIDetector.DIMENSIONS:
+            benches.append((f"pass1.{dim}{suffix}",
+                            lambda d=dim, t=text: detector.score_dimension(d, t)))
+        benches.append((f"pass1.analyze_section{suffix}", lambda t=text: detector.analyze_section(t)))
+        for dim in aligner._dimensions:
+            benches.append((f"pass2.{dim}{suffix}",
+                            lambda d=dim, t=text: aligner.policy.score({d: aligner.measure_dimension(d, t)},
+                                                                      aligner.profile)))
+        benches.append((f"pass2.analyze_section{suffix}", lambda t=text: aligner.analyze_section(t)))
+        benches.append((f"extractor.extract{suffix}",
+                        lambda t=text: extractor.extract(t, client_slug="bench", brand_slug="main")))
+
+    page = make_page(sections=5, words=300, preset="mixed", seed=1)
+    gate = SCRVNRGate(profile_dict=profile)
+    bare_gate = SCRVNRGate()
+    payload = json.dumps({"property_slug": "gad-main", "sections": page}).encode("utf-8")
+    runner = os.path.join(_scrvnr_root, "ws_gate_runner.py")
+
+    def run_subprocess():
+        out = subprocess.run([sys.executable, runner], input=payload, capture_output=True, check=True)
+        json.loads(out.stdout)
+
+    cli = os.path.join(_scrvnr_root, "cli.py")
+
+    def cold_start():
+        subprocess.run([sys.executable, cli, "--help"], capture_output=True, check=True)
+
+    def fresh(*args):
+        package_parent = os.path.dirname(_scrvnr_root)
+        return lambda: subprocess.run([sys.executable, *args], cwd=package_parent, capture_output=True, check=True)
+
+    benches += [
+        ("pass1.analyze_document/page", lambda: detector.analyze_document(page)),
+        ("gate.run/page", lambda: gate.run(page)),
+        ("gate.run_no_profile/page", lambda: bare_gate.run(page)),
+        ("ws_gate_runner/page", run_subprocess),
+        ("cli.cold_start", cold_start),
+        ("cli.module_help", fresh("-m", "scrvnr", "--help")),
+        ("python.startup", fresh("-c", "pass")),
+        ("import.scrvnr", fresh("-c", "import scrvnr")),
+        ("import.adapter", fresh("-c", "import scrvnr.website_studio_adapter")),
+    ]
+    return benches
+
+
+def run(sizes=SIZES, name_filter: str = None, min_time: float = 0.2, max_runs: int = 50,
+        progress: bool = False) -> Dict[str, Dict]:
+    """Run the suite. Returns {benchmark_name: {median_ms, min_ms, runs}}."""
+    results = {}
+    for name, fn in build_benchmarks(sizes):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_call(fn, min_time=min_time, max_runs=max_runs)
+        if progress:
+            print(f"  {name:<44} {results[name]['median_ms']:>11.3f} ms  ({results[name]['runs']} runs)",
+                  flush=True)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = TOLERANCE) -> Dict:
+    """
+    Compare best-of-N times (min_ms) against a baseline.
+
+    Returns:
+        {
+            regressions:  [{name, baseline_ms, current_ms, change}],   # slower than tolerance
+            improvements: [{name, baseline_ms, current_ms, change}],   # faster than tolerance
+            new:          [name],   # not in the baseline
+            missing:      [name],   # in the baseline, not run now
+        }
+    """
+    report = {"regressions": [], "improvements": [], "new": [], "missing": []}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            report["new"].append(name)
+            continue
+        before, after = base["min_ms"], result["min_ms"]
+        change = (after - before) / before if before > 0 else 0.0
+        entry = {"name": name, "baseline_ms": before, "current_ms": after, "change": round(change, 3)}
+        if change > tolerance:
+            report["regressions"].append(entry)
+        elif change < -tolerance:
+            report["improvements"].append(entry)
+    report["missing"] = sorted(set(baseline) - set(results))
+    return report
+
+
+def check_budgets(results: Dict[str, Dict], budgets: Dict[str, float] = None) -> List[Dict]:
+    """Benchmarks whose best time exceeds their fixed budget: [{name, budget_ms, current_ms}]."""
+    budgets = BUDGETS if budgets is None else budgets
+    return [
+        {"name": name, "budget_ms": budget, "current_ms": results[name]["min_ms"]}
+        for name, budget in budgets.items()
+        if name in results and results[name]["min_ms"] > budget
+    ]
+
+
+def save_baseline(path: str, results: Dict[str, Dict]) -> None:
+    data = {
+        "version": BASELINE_VERSION,
+        "created": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version in {path}: {data.get('version')}")
+    return data["results"]
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the SCRVNR benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help="Skip the 50,000-word sizes")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save", help="Write results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per benchmark")
+    parser.add_argument("--json", action="store_true", help="Print results and comparison as JSON")
+    args = parser.parse_args()
+
+    if not args.json:
+        print("\n SCRVNR BENCHMARKS")
+        print("=" * 60)
+    results = run(QUICK_SIZES if args.quick else SIZES, args.filter, args.min_time, progress=not args.json)
+
+    report = None
+    if args.baseline:
+        report = compare(results, load_baseline(args.baseline), args.tolerance)
+    if args.save:
+        save_baseline(args.save, results)
+    over_budget = check_budgets(results)
+
+    if args.json:
+        print(json.dumps({"results": results, "comparison": report, "over_budget": over_budget}, indent=2))
+    else:
+        for entry in over_budget:
+            print(f"  OVER BUDGET {entry['name']:<40} {entry['current_ms']:.3f} ms > {entry['budget_ms']} ms")
+        if report is not None:
+            print(f"\n  vs {args.baseline} (tolerance {args.tolerance:.0%})")
+            for entry in report["regressions"]:
+                print(f"  REGRESSION  {entry['name']:<40} {entry['baseline_ms']:.3f} -> "
+                      f"{entry['current_ms']:.3f} ms ({entry['change']:+.0%})")
+            for entry in report["improvements"]:
+                print(f"  faster      {entry['name']:<40} {entry['baseline_ms']:.3f} -> "
+                      f"{entry['current_ms']:.3f} ms ({entry['change']:+.0%})")
+            if not report["regressions"]:
+                print("  No regressions.")
+        if args.save:
+            print(f"\n  Baseline written: {args.save}")
+
+    sys.exit(1 if (report and report["regressions"]) or over_budget else 0)
@@ -0,0 +1,307 @@
+"""
+GHM SCRVNR — Command Line
+===========================
+One entry point for every SCRVNR tool.
+
+Each subcommand imports only the modules it needs (detect never loads
+Pass 2, the extractor or the adapter), so `--help` and light commands
+start fast. bench/run_bench.py times the cold start against
+COLD_START_BUDGET_MS.
+
+Commands:
+    detect  <file>...                          Pass 1 — AI detection
+    align   <file>... --profile P              Pass 2 — voice alignment
+    gate    <file>... [--profile P] [--override NOTE] [--timings]
+    gate    <dir | glob>... [--profile P] [--workers N] [--out PATH]   # batch, JSONL
+    watch   <dir | file>... [--profile P] [--interval S]           # re-gate on change
+    extract <source> --client C --brand B [--name N] [--out PATH]
+    bench   [run_bench.py options]
+    serve   [--host H] [--port N] [--metrics-port N] [--snapshot PATH]
+
+--profile takes a profile JSON path or a property slug ("gad-main")
+resolved against --profiles-dir. detect, align and gate accept --json and
+exit 1 when any file fails.
+
+Usage:
+    python -m scrvnr gate page.txt --profile gad-main
+    python scrvnr/cli.py detect draft.txt --json
+    python -m scrvnr bench --quick
+"""
+
+import argparse
+import os
+import sys
+
+_scrvnr_root = os.path.dirname(os.path.abspath(__file__))
+_core_dir = os.path.join(_scrvnr_root, "core")
+
+COLD_START_BUDGET_MS = 150
+
+
+def _use_core():
+    """Put core/ on sys.path (engines use flat sibling imports)."""
+    if _core_dir not in sys.path:
+        sys.path.insert(0, _core_dir)
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _load_profile_arg(value: str, profiles_dir: str):
+    """A profile JSON path, or a property slug resolved against profiles_dir."""
+    _use_core()
+    if value.endswith(".json") or os.path.sep in value:
+        import json
+        from profile_validator import validate_profile
+        with open(value, "r", encoding="utf-8") as f:
+            return validate_profile(json.load(f))
+    from scrvnr_gate import resolve_profile
+    profile = resolve_profile(value, profiles_dir=profiles_dir)
+    if profile is None:
+        raise SystemExit(f"scrvnr: no profile found for '{value}' in {profiles_dir}")
+    return profile
+
+
+def _print_json(results):
+    import json
+    print(json.dumps(results[0] if len(results) == 1 else results, indent=2))
+
+
+def _print_pass(title: str, path: str, result: dict):
+    print(f"\n {title} — {os.path.basename(path)}")
+    print("=" * 60)
+    print(f"Result: {'PASS' if result['pass'] else 'FAIL'}")
+    print(f"Score:  {result['overall_score']:.0%} (threshold: {result['threshold']:.0%})")
+    print()
+    for dim, data in result.get("dimensions", {}).items():
+        print(f"  {dim}: {data['score']:.0%}")
+    for heading, key in (("Failures", "failures"), ("Suggestions", "suggestions")):
+        if result.get(key):
+            print(f"\n{heading}:")
+            for line in result[key]:
+                print(f"  - {line}")
+
+
+# ─── Commands ────────────────────────────────────────────────────────────────
+
+def cmd_detect(args) -> int:
+    _use_core()
+    from pass1_ai_detection import AIDetector
+
+    detector = AIDetector()
+    results = [detector.analyze_section(_read(path), section_name="document") for path in args.files]
+    if args.json:
+        _print_json(results)
+    else:
+        for path, result in zip(args.files, results):
+            _print_pass("PASS 1 — AI DETECTION", path, result)
+    return 0 if all(r["pass"] for r in results) else 1
+
+
+def cmd_align(args) -> int:
+    _use_core()
+    from pass2_voice_alignment import VoiceAligner
+
+    aligner = VoiceAligner(_load_profile_arg(args.profile, args.profiles_dir))
+    results = [aligner.analyze_section(_read(path), section_name="document") for path in args.files]
+    if args.json:
+        _print_json(results)
+    else:
+        brand = aligner.profile.get("brand_display_name") or aligner.profile.get("profile_id", "unknown")
+        for path, result in zip(args.files, results):
+            _print_pass(f"PASS 2 — VOICE ALIGNMENT ({brand})", path, result)
+    return 0 if all(r["pass"] for r in results) else 1
+
+
+def cmd_gate(args) -> int:
+    _use_core()
+    from batch_gate import is_batch_target, split_sections
+
+    profile = _load_profile_arg(args.profile, args.profiles_dir) if args.profile else None
+    if any(is_batch_target(target) for target in args.files):
+        return _gate_batch(args, profile)
+
+    from scrvnr_gate import SCRVNRGate
+    gate = SCRVNRGate(profile_dict=profile)
+    # Split like a batch run (headings, <h1>-<h3>) so a file scores the same either way
+    results = []
+    for path in args.files:
+        text = _read(path)
+        results.append(gate.run(split_sections(path, text) or {"document": text},
+                                override=args.override is not None,
+                                override_note=args.override or "", timings=args.timings))
+    if args.json:
+        _print_json(results)
+    else:
+        for path, result in zip(args.files, results):
+            override_tag = " [OVERRIDE]" if result["override_applied"] else ""
+            print(f"\n SCRVNR GATE — {result['gate_status']}{override_tag} — {os.path.basename(path)}")
+            print("=" * 60)
+            print(f"\n{result['summary']}")
+            p1, p2 = result["pass1"], result["pass2"]
+            print(f"\n Pass 1 (AI Detection):  {'PASS' if p1['pass'] else 'FAIL'}  {p1['score']:.0%}")
+            if p2["active"]:
+                print(f" Pass 2 (Voice Align):  {'PASS' if p2['pass'] else 'FAIL'}  {p2['score']:.0%}  "
+                      f"[{p2.get('brand') or p2.get('profile_used', '')}]")
+            else:
+                print(" Pass 2 (Voice Align):  SKIPPED  (no profile loaded)")
+            print(f"\n Action: {result['action_required']}")
+            if args.timings:
+                stages = result["timings"]["stages"]
+                print(f"\n Timings ({result['timings']['total_ms']:.1f} ms):")
+                for name in ("pass1", "pass2", "summary"):
+                    if name in stages:
+                        print(f"  {name:<10} {stages[name]:>8.2f} ms")
+    return 0 if all(r["gate_open"] for r in results) else 1
+
+
+def _gate_batch(args, profile) -> int:
+    from batch_gate import run_batch
+
+    stream = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        summary = run_batch(args.files, stream, profile=profile, workers=args.workers)
+    finally:
+        if args.out:
+            stream.close()
+    if args.out:
+        print(f"\n  {summary['files']} files -> {args.out}  {summary['gate_status']}  "
+              f"({summary['errors']} errors, {summary['files_per_s']} files/s)")
+    return 0 if summary["files"] and summary["gate_status"].get("FAIL", 0) + summary["errors"] == 0 else 1
+
+
+def cmd_watch(args) -> int:
+    _use_core()
+    from watch import GateWatcher
+
+    profile = _load_profile_arg(args.profile, args.profiles_dir) if args.profile else None
+    watcher = GateWatcher(args.targets, profile=profile)
+    baseline = watcher.scan()
+    print(f" Watching {baseline['files']} files ({baseline['passing']} PASS, {baseline['failing']} FAIL). "
+          f"Ctrl+C to stop.", flush=True)
+    try:
+        watcher.run(args.interval, emit=lambda text: print(text, flush=True))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_extract(args) -> int:
+    _use_core()
+    from voice_profile_extractor import VoiceProfileExtractor
+
+    extractor = VoiceProfileExtractor()
+    profile = extractor.extract(
+        text=_read(args.source),
+        client_slug=args.client,
+        brand_slug=args.brand,
+        brand_display_name=args.name or args.brand.replace("-", " ").title(),
+    )
+    out = args.out or os.path.join(args.profiles_dir, f"{args.client}-{args.brand}.json")
+    saved = extractor.save(profile, out)
+    confidence = profile["capture_confidence"]
+    print(f"\n Voice profile extracted: {saved}")
+    print(f"  Words sampled:    {confidence['source_word_count']}")
+    print(f"  Confidence:       {confidence['overall']}")
+    print(f"  Reading level:    FK Grade {profile['reading_level']['flesch_kincaid_grade']}")
+    print(f"  Burstiness:       {profile['sentence_rhythm']['burstiness_score']}")
+    print(f"  Contraction rate: {profile['contraction_rate']['measured']:.0%}")
+    if confidence["low_confidence_flags"]:
+        print(f"\n  Low confidence fields: {', '.join(confidence['low_confidence_flags'])}")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    import runpy
+
+    script = os.path.join(_scrvnr_root, "bench", "run_bench.py")
+    sys.argv = [script] + args.bench_args
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+
+def cmd_serve(args) -> int:
+    sys.path.insert(0, _scrvnr_root)
+    _use_core()
+    from gate_server import serve
+
+    serve(host=args.host, port=args.port, profiles_dir=args.profiles_dir, metrics_port=args.metrics_port,
+          audit_dir=args.audit_dir, duplicate_index=args.duplicate_index, snapshot=args.snapshot,
+          max_gates=args.max_gates, lexicons_path=args.lexicons)
+    return 0
+
+
+# ─── Parser ──────────────────────────────────────────────────────────────────
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="scrvnr", description="SCRVNR — AI detection + voice alignment gate.")
+    parser.add_argument("--profiles-dir", default=os.path.join(_scrvnr_root, "profiles"),
+                        help="Profile directory for slug lookups and extract output")
+    sub = parser.add_subparsers(dest="command", metavar="command")
+    sub.required = True
+
+    p = sub.add_parser("detect", help="Pass 1 — AI detection")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_detect)
+
+    p = sub.add_parser("align", help="Pass 2 — voice alignment against a profile")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--profile", required=True, help="Profile JSON path or property slug")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_align)
+
+    p = sub.add_parser("gate", help="Full gate (Pass 1, plus Pass 2 with --profile)")
+    p.add_argument("files", nargs="+", help="Files, or directories / globs for a JSONL batch")
+    p.add_argument("--profile", help="Profile JSON path or property slug")
+    p.add_argument("--override", metavar="NOTE", help="Human override with a note")
+    p.add_argument("--timings", action="store_true", help="Report per-stage timings")
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--workers", type=int, help="Batch: processes (default: CPU count)")
+    p.add_argument("--out", help="Batch: write JSONL here instead of stdout")
+    p.set_defaults(func=cmd_gate)
+
+    p = sub.add_parser("watch", help="Re-gate content files as they change, printing score deltas")
+    p.add_argument("targets", nargs="+", help="Directories (recursive) or files")
+    p.add_argument("--profile", help="Profile JSON path or property slug")
+    p.add_argument("--interval", type=float, default=1.0, help="Seconds between polls")
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("extract", help="Extract a voice profile from source copy")
+    p.add_argument("source")
+    p.add_argument("--client", required=True, help="Client slug")
+    p.add_argument("--brand", default="main", help="Brand slug")
+    p.add_argument("--name", help="Brand display name")
+    p.add_argument("--out", help="Output path (default: <profiles-dir>/<client>-<brand>.json)")
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser("bench", help="Run the benchmark suite (options as bench/run_bench.py)")
+    p.add_argument("bench_args", nargs=argparse.REMAINDER)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("serve", help="Run the gate as a long-lived local HTTP service")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--metrics-port", type=int, help="Also serve Prometheus /metrics on this port")
+    p.add_argument("--audit-dir", help="Append every page decision to an audit log here")
+    p.add_argument("--duplicate-index", help="Near-duplicate index file")
+    p.add_argument("--snapshot", help="Warm-start snapshot: read at start, rewritten on shutdown")
+    p.add_argument("--max-gates", type=int, help="Keep at most N compiled gates (LRU); pair with --snapshot")
+    p.add_argument("--lexicons", help="Versioned Pass 1 lexicon file (POST /reload or SIGHUP re-reads it)")
+    p.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,27 @@
 """
 GHM SCRVNR Core Package
+
+Attributes load lazily through the top-level scrvnr package, which owns
+the name -> module map: scrvnr.core.SCRVNRGate is scrvnr.SCRVNRGate.
+Importing scrvnr.core puts core/ on sys.path, so its submodules
+(scrvnr.core.scrvnr_gate, ...) can resolve their flat sibling imports.
 """
 
-from .pass1_ai_detection import AIDetector
-from .pass2_voice_alignment import VoiceAligner
-from .scrvnr_gate import SCRVNRGate, load_profile
-from .voice_profile_extractor import VoiceProfileExtractor
+from .. import _LAZY, __version__, _core_on_path
+from .. import __getattr__ as _root_getattr
+
+_core_on_path()
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _root_getattr(name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    "AIDetector",
-    "VoiceAligner",
-    "SCRVNRGate",
-    "load_profile",
-    "VoiceProfileExtractor",
-]
 
-__version__ = "1.0.0"
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
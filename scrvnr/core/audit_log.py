@@ -0,0 +1,585 @@
+"""
+GHM SCRVNR — Gate Decision Audit Log
+======================================
+Append-only, write-behind log of every page-level gate decision.
+
+The gate path only builds a compact record and drops it on an in-memory
+queue. A background writer thread drains the queue in batches, appends
+one JSON line per record to the active segment file, and fsyncs once per
+batch. Segments rotate at a size limit and are never rewritten.
+
+Layout:
+    {log_dir}/
+        audit-000001.jsonl
+        audit-000001.idx.json  <- sidecar index, written when the segment seals
+        audit-000002.jsonl     <- active segment
+
+Durability:
+  - A record is durable once its batch is fsynced (at most flush_interval
+    after append, or immediately on flush()/close()).
+  - A crash can only lose the unsynced tail. A torn final line is
+    truncated (on reopen, or by the next batch) so every segment stays
+    valid JSONL.
+
+Several processes may share one directory (e.g. one ws_gate_runner per
+request). Each batch is written under {log_dir}/audit.lock: the writer
+first moves to the newest segment, indexes what other processes appended
+since its last batch, then appends at the file's real end, so sidecar
+offsets stay correct whoever wrote the bytes.
+
+Write failures (lock timeout, disk full) never reach the gate path. A
+failed batch is retried up to WRITE_ATTEMPTS times with backoff, resuming
+after the records that did reach the segment. Every failure is reported on
+stderr; records still unwritten after the last attempt are counted in
+records_dropped (scrvnr_audit_records_dropped with a metrics registry).
+
+Record shape (compact — the full result stays with the caller):
+    {
+        "ts": "2026-02-18T10:00:00Z",
+        "job_id": "412",
+        "property_slug": "gad-main",
+        "profile_id": "gad-main",
+        "gate_status": "PASS" | "FAIL" | "OVERRIDE",
+        "pass1_score": 0.81,
+        "pass2_score": 0.74,
+        "sections": {"hero": [p1_score, p2_score, pass], ...},
+        "failures": {"hero": ["..."]},          # failing sections only
+        "override_note": str | null,
+        "content_hash": "sha256 of the gated sections",
+        "content": {...}                       # only with retain_content=True
+    }
+
+Usage:
+    audit = AuditLog("scrvnr/audit")
+    adapter = SCRVNRAdapter(audit_log=audit)
+    ...
+    audit.close()   # also runs automatically at interpreter exit
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from file_utils import FileLock
+
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx.json"
+LOCK_NAME = "audit.lock"
+LOCK_TIMEOUT = 10.0
+
+# Record fields with sidecar posting lists (value -> record positions)
+INDEXED_FIELDS = ("job_id", "property_slug", "gate_status")
+
+
+def segment_name(seq: int) -> str:
+    return f"{SEGMENT_PREFIX}{seq:06d}{SEGMENT_SUFFIX}"
+
+
+def index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX)
+
+
+def list_segments(log_dir) -> List[Path]:
+    """Return segment paths in write order."""
+    return sorted(Path(log_dir).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+
+def content_hash(sections: Dict[str, str]) -> str:
+    """Stable sha256 over section names and text."""
+    h = hashlib.sha256()
+    for name in sorted(sections):
+        h.update(name.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(sections[name].encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def build_record(
+    ws_result: Dict,
+    property_slug: str,
+    job_id: Optional[str] = None,
+) -> Dict:
+    """Compact audit record from a SCRVNRAdapter.check_page result."""
+    sections = {}
+    failures = {}
+    for name, sec in ws_result.get("sections", {}).items():
+        sections[name] = [sec.get("pass1_score"), sec.get("pass2_score"), sec.get("pass")]
+        sec_failures = sec.get("pass1_failures", []) + sec.get("pass2_failures", [])
+        if sec_failures:
+            failures[name] = sec_failures
+
+    return {
+        "ts": ws_result.get("timestamp"),
+        "job_id": job_id,
+        "property_slug": property_slug,
+        "profile_id": ws_result.get("profile_id"),
+        "gate_status": ws_result.get("gate_status"),
+        "pass1_score": ws_result.get("pass1_score"),
+        "pass2_score": ws_result.get("pass2_score"),
+        "sections": sections,
+        "failures": failures,
+        "override_note": ws_result.get("override_note"),
+        "versions": ws_result.get("versions"),
+    }
+
+
+class AuditLog:
+    """
+    Write-behind append-only audit log.
+    One instance per process; processes may share a directory (batches are
+    written under a directory lock). append() never blocks on disk I/O.
+    """
+
+    SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+    FLUSH_INTERVAL = 0.25   # seconds — max time a record waits for fsync
+    BATCH_SIZE = 512        # records per write/fsync batch
+    WRITE_ATTEMPTS = 5      # tries per batch before its unwritten records are dropped
+    RETRY_BACKOFF = 0.1     # seconds before the first retry, doubling per attempt
+
+    def __init__(
+        self,
+        log_dir: str,
+        segment_max_bytes: int = None,
+        flush_interval: float = None,
+        batch_size: int = None,
+        retain_content: bool = False,
+    ):
+        """
+        Args:
+            log_dir:           Directory for segment files (created if missing)
+            segment_max_bytes: Rotate the active segment past this size
+            flush_interval:    Max seconds between fsyncs while records are pending
+            batch_size:        Max records written per fsync
+            retain_content:    Store section text in each record (needed for replay)
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes or self.SEGMENT_MAX_BYTES
+        self.flush_interval = flush_interval or self.FLUSH_INTERVAL
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.retain_content = retain_content
+
+        self.records_written = 0
+        self.write_errors = 0       # failed write attempts
+        self.records_dropped = 0    # records given up on after WRITE_ATTEMPTS
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._closed = False
+
+        self._lock = FileLock(self.log_dir / LOCK_NAME, LOCK_TIMEOUT)
+        with self._lock:
+            self._seq, self._file = self._open_active_segment()
+        self._writer = threading.Thread(target=self._run, name="scrvnr-audit-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # ─── Public API ───────────────────────────────────────────────────────────
+
+    def append(self, record: Dict, sections: Dict[str, str] = None) -> None:
+        """
+        Queue a record for writing. Returns immediately.
+        If sections are given, content_hash (and content, if retained) are
+        computed on the writer thread, off the gate path.
+        """
+        if self._closed:
+            raise RuntimeError("AuditLog is closed")
+        with self._pending_lock:
+            self._pending += 1
+        self._queue.put((record, sections))
+
+    def append_decision(
+        self,
+        ws_result: Dict,
+        sections: Dict[str, str],
+        property_slug: str,
+        job_id: Optional[str] = None,
+    ) -> None:
+        """Queue the compact record for a check_page result."""
+        self.append(build_record(ws_result, property_slug, job_id), sections)
+
+    @property
+    def queue_depth(self) -> int:
+        """Records appended but not yet fsynced."""
+        return self._pending
+
+    @property
+    def active_segment(self) -> Path:
+        return self.log_dir / segment_name(self._seq)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything appended so far is fsynced. Returns False on timeout."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush, stop the writer and close the active segment. Idempotent."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put((None, None))
+        self._writer.join(timeout)
+        self._file.close()
+        with self._lock:
+            self._index.catch_up()
+            self._index.save()
+        atexit.unregister(self.close)
+
+    # ─── Writer thread ────────────────────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            batch = []
+            waiters = []
+            stop = False
+
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while True:
+                record, extra = item
+                if record is None:
+                    if extra is None:
+                        stop = True
+                        break
+                    waiters.append(extra)
+                else:
+                    batch.append((record, extra))
+                    if len(batch) >= self.batch_size:
+                        break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+            for event in waiters:
+                event.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        # The audit trail must never take down the gate: failures are retried,
+        # reported on stderr and counted, never raised.
+        try:
+            lines = []
+            for record, sections in batch:
+                try:
+                    if sections is not None:
+                        record["content_hash"] = content_hash(sections)
+                        if self.retain_content:
+                            record["content"] = sections
+                    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                except (TypeError, ValueError) as e:
+                    self.records_dropped += 1
+                    _report(f"dropped a record that cannot be serialized ({e}): job_id={record.get('job_id')!r}")
+                    continue
+                lines.append((record, line.encode("utf-8")))
+
+            for attempt in range(1, self.WRITE_ATTEMPTS + 1):
+                written, error = self._write_lines(lines)
+                self.records_written += written
+                lines = lines[written:]
+                if error is None:
+                    return
+                self.write_errors += 1
+                if attempt < self.WRITE_ATTEMPTS:
+                    _report(f"batch write failed ({error!r}); retrying {len(lines)} record(s) "
+                            f"[attempt {attempt}/{self.WRITE_ATTEMPTS}]")
+                    time.sleep(self.RETRY_BACKOFF * 2 ** (attempt - 1))
+            self.records_dropped += len(lines)
+            _report(f"dropped {len(lines)} record(s) after {self.WRITE_ATTEMPTS} failed attempts "
+                    f"({error!r}): job_ids={[record.get('job_id') for record, _ in lines]}")
+        finally:
+            with self._pending_lock:
+                self._pending -= len(batch)
+
+    def _write_lines(self, lines) -> Tuple[int, Optional[Exception]]:
+        """
+        Append and fsync encoded lines under the directory lock.
+        Returns (records now in the log, the error or None). After a failure
+        the segment is re-read, so the count covers lines that reached the
+        file before the error and a retry does not write them twice.
+        """
+        try:
+            with self._lock:
+                self._sync_segment()
+                start = (self._seq, self._index.count)
+                try:
+                    for record, data in lines:
+                        self._write_line(record, data)
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except Exception as e:
+                    return self._recover(*start), e
+        except Exception as e:   # lock timeout, or the segment could not be read
+            return 0, e
+        return len(lines), None
+
+    def _recover(self, seq: int, count: int) -> int:
+        """
+        Under the lock, after a failed write: drop the unflushed buffer,
+        reopen the newest segment (truncating a torn line) and return how
+        many records were appended since position count of segment seq.
+        """
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._seq = int(list_segments(self.log_dir)[-1].name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+        _truncate_torn_tail(self.active_segment)
+        self._file = open(self.active_segment, "ab")
+        self._index = SegmentIndex.load(self.active_segment)
+        written = self._index.count - count if self._seq == seq else self._index.count
+        for sealed in range(seq, self._seq):
+            records = SegmentIndex.load(self.log_dir / segment_name(sealed)).count
+            written += records - count if sealed == seq else records
+        return written
+
+    def _write_line(self, record: Dict, data: bytes):
+        offset = self._index.size
+        if offset + len(data) > self.segment_max_bytes and offset > 0:
+            self._rotate()
+            offset = 0
+        self._file.write(data)
+        self._index.add(record, offset, offset + len(data))
+
+    def _sync_segment(self):
+        """
+        Under the lock: switch to the newest segment if another process
+        rotated, index records other processes appended, and drop a torn
+        tail left by a writer that crashed (no live writer is mid-line
+        while the lock is held). Afterwards self._index.size is the end of
+        the file, where the next line goes.
+        """
+        segments = list_segments(self.log_dir)
+        if segments and (segments[-1].name != segment_name(self._seq) or self._file.closed):
+            latest = segments[-1]
+            self._file.close()
+            self._seq = int(latest.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            self._file = open(latest, "ab")
+            self._index = SegmentIndex.load(latest)
+        else:
+            self._index.catch_up()
+        if os.fstat(self._file.fileno()).st_size > self._index.size:
+            self._file.truncate(self._index.size)
+
+    def _rotate(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._index.save()
+        self._seq += 1
+        self._file = open(self.log_dir / segment_name(self._seq), "ab")
+        self._index = SegmentIndex(self.active_segment)
+
+    # ─── Recovery ─────────────────────────────────────────────────────────────
+
+    def _open_active_segment(self):
+        """Open the newest segment for appending (called under the lock)."""
+        segments = list_segments(self.log_dir)
+        if not segments:
+            seq = 1
+        else:
+            last = segments[-1]
+            seq = int(last.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            _truncate_torn_tail(last)
+        segment = self.log_dir / segment_name(seq)
+        f = open(segment, "ab")
+        self._index = SegmentIndex.load(segment)
+        return seq, f
+
+
+def _report(message: str) -> None:
+    print(f"SCRVNR audit log: {message}", file=sys.stderr, flush=True)
+
+
+class SegmentIndex:
+    """
+    Sidecar index for one segment.
+
+    Holds the byte offset and timestamp of every record plus posting lists
+    for INDEXED_FIELDS. `size` is the number of segment bytes covered; a
+    stale sidecar (segment grew after it was saved) is caught up by scanning
+    only the uncovered tail.
+    """
+
+    def __init__(self, segment: Path):
+        self.segment = Path(segment)
+        self.size = 0
+        self.offsets: List[int] = []
+        self.ts: List[str] = []
+        self.postings: Dict[str, Dict[str, List[int]]] = {f: {} for f in INDEXED_FIELDS}
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets)
+
+    def add(self, record: Dict, offset: int, end: int) -> None:
+        position = len(self.offsets)
+        self.offsets.append(offset)
+        self.ts.append(record.get("ts") or "")
+        for field in INDEXED_FIELDS:
+            value = record.get(field)
+            if value is not None:
+                self.postings[field].setdefault(str(value), []).append(position)
+        self.size = end
+
+    def catch_up(self) -> bool:
+        """Index records past self.size. Returns True if anything was added."""
+        if not self.segment.exists():
+            return False
+        if self.segment.stat().st_size <= self.size:
+            return False
+        with open(self.segment, "rb") as f:
+            f.seek(self.size)
+            offset = self.size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn tail — not a record yet
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = {}
+                self.add(record, offset, offset + len(line))
+                offset += len(line)
+        return True
+
+    def save(self) -> None:
+        """Write the sidecar atomically."""
+        data = {
+            "segment": self.segment.name,
+            "size": self.size,
+            "offsets": self.offsets,
+            "ts": self.ts,
+            "postings": self.postings,
+        }
+        path = index_path(self.segment)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, segment: Path) -> "SegmentIndex":
+        """Load the sidecar (if any) and catch up with the segment file."""
+        index = cls(segment)
+        path = index_path(Path(segment))
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                index.size = data["size"]
+                index.offsets = data["offsets"]
+                index.ts = data["ts"]
+                index.postings = {f: data["postings"].get(f, {}) for f in INDEXED_FIELDS}
+            except (ValueError, KeyError, OSError):
+                index = cls(segment)
+        if not index.consistent():
+            index = cls(segment)  # sidecar does not describe this segment: rebuild by scanning
+        index.catch_up()
+        return index
+
+    def consistent(self) -> bool:
+        """
+        Cheap check that the offsets describe the segment: the file is at
+        least self.size long, the last indexed record starts on a line
+        boundary and ends exactly at self.size.
+        """
+        if not self.offsets:
+            return self.size == 0
+        try:
+            if self.segment.stat().st_size < self.size or self.offsets[0] != 0:
+                return False
+            with open(self.segment, "rb") as f:
+                last = self.offsets[-1]
+                if last > 0:
+                    f.seek(last - 1)
+                    if f.read(1) != b"\n":
+                        return False
+                f.seek(last)
+                line = f.readline()
+        except OSError:
+            return False
+        return line.endswith(b"\n") and last + len(line) == self.size
+
+    def positions(self, filters: Dict[str, str], since: str = None, until: str = None) -> List[int]:
+        """
+        Record positions matching all equality filters and since <= ts < until.
+        Posting lists are intersected smallest-first; timestamps are read from
+        the index, not the segment.
+        """
+        if since is not None or until is not None:
+            known = [t for t in self.ts if t]
+            if known and ((since is not None and max(known) < since) or
+                          (until is not None and min(known) >= until)):
+                return []
+
+        result = None
+        lists = []
+        for field, value in filters.items():
+            if value is None:
+                continue
+            posting = self.postings.get(field, {}).get(str(value))
+            if not posting:
+                return []
+            lists.append(posting)
+        if lists:
+            lists.sort(key=len)
+            result = lists[0]
+            for other in lists[1:]:
+                other_set = set(other)
+                result = [p for p in result if p in other_set]
+                if not result:
+                    return []
+        else:
+            result = range(self.count)
+
+        if since is None and until is None:
+            return list(result)
+        ts = self.ts
+        return [
+            p for p in result
+            if (since is None or ts[p] >= since) and (until is None or ts[p] < until)
+        ]
+
+
+def _truncate_torn_tail(path: Path) -> None:
+    """Drop a partial final line left behind by a crash mid-write."""
+    size = path.stat().st_size
+    if size == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Scan backwards for the last complete line
+        block = 4096
+        pos = size
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            idx = chunk.rfind(b"\n")
+            if idx != -1:
+                f.truncate(start + idx + 1)
+                return
+            pos = start
+        f.truncate(0)
@@ -0,0 +1,188 @@
+"""
+GHM SCRVNR — Audit Log Queries
+================================
+Answers compliance and override questions over the gate decision audit
+log without scanning every record.
+
+Each segment has a sidecar index (see audit_log.SegmentIndex) holding
+posting lists for job_id, property_slug and gate_status plus every
+record's timestamp and byte offset. A query:
+  1. skips whole segments whose timestamp range misses the window,
+  2. intersects posting lists (smallest first) for the equality filters,
+  3. filters timestamps from the index,
+  4. seeks straight to the matching records.
+
+Only the tail of the active segment (written since its sidecar was last
+saved) is ever scanned, unless a sidecar's offsets do not match its
+segment (last record not ending at the recorded size); then that segment
+is indexed again by scanning it.
+
+Usage:
+    q = AuditQuery("scrvnr/audit")
+
+    # Every override for a property last quarter (since inclusive, until exclusive)
+    q.find(property_slug="gad-main", gate_status="OVERRIDE",
+           since="2026-01-01", until="2026-04-01")
+
+    # Full history of one job
+    q.find(job_id="412")
+
+CLI:
+    python audit_query.py <log_dir> --property gad-main --status OVERRIDE \\
+        --since 2026-01-01 --until 2026-04-01 --out overrides.jsonl
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from audit_log import SegmentIndex, list_segments
+
+
+class AuditQuery:
+    """
+    Read-only query layer over an audit log directory.
+    Safe to use while an AuditLog is writing to the same directory.
+    """
+
+    def __init__(self, log_dir: str):
+        self.log_dir = Path(log_dir)
+        self._indexes: Dict[str, SegmentIndex] = {}
+
+    def find(
+        self,
+        job_id: str = None,
+        property_slug: str = None,
+        gate_status: str = None,
+        since: str = None,
+        until: str = None,
+        limit: int = None,
+    ) -> List[Dict]:
+        """Return matching records in write order. See iter_records()."""
+        return list(self.iter_records(job_id, property_slug, gate_status, since, until, limit))
+
+    def count(
+        self,
+        job_id: str = None,
+        property_slug: str = None,
+        gate_status: str = None,
+        since: str = None,
+        until: str = None,
+    ) -> int:
+        """Count matches from the indexes alone — no records are read."""
+        filters = {"job_id": job_id, "property_slug": property_slug, "gate_status": gate_status}
+        return sum(
+            len(index.positions(filters, since, until))
+            for index in self._segment_indexes()
+        )
+
+    def iter_records(
+        self,
+        job_id: str = None,
+        property_slug: str = None,
+        gate_status: str = None,
+        since: str = None,
+        until: str = None,
+        limit: int = None,
+    ) -> Iterator[Dict]:
+        """
+        Yield matching records in write order.
+
+        Args:
+            job_id / property_slug / gate_status: exact-match filters (None = any)
+            since: ISO timestamp or date, inclusive
+            until: ISO timestamp or date, exclusive
+            limit: stop after this many records
+        """
+        filters = {"job_id": job_id, "property_slug": property_slug, "gate_status": gate_status}
+        remaining = limit
+        for index in self._segment_indexes():
+            positions = index.positions(filters, since, until)
+            if not positions:
+                continue
+            with open(index.segment, "rb") as f:
+                for position in positions:
+                    f.seek(index.offsets[position])
+                    yield json.loads(f.readline())
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+
+    def export_jsonl(self, out, **filters) -> int:
+        """Write matching records to a file object as JSONL. Returns the count."""
+        written = 0
+        for record in self.iter_records(**filters):
+            out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            written += 1
+        return written
+
+    def reindex(self) -> int:
+        """Rebuild and save every sidecar from its segment. Returns segments indexed."""
+        self._indexes.clear()
+        segments = list_segments(self.log_dir)
+        for segment in segments:
+            index = SegmentIndex(segment)
+            index.catch_up()
+            index.save()
+            self._indexes[segment.name] = index
+        return len(segments)
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _segment_indexes(self) -> List[SegmentIndex]:
+        indexes = []
+        for segment in list_segments(self.log_dir):
+            index = self._indexes.get(segment.name)
+            if index is None:
+                index = SegmentIndex.load(segment)
+                self._indexes[segment.name] = index
+            else:
+                index.catch_up()
+            indexes.append(index)
+        return indexes
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the SCRVNR gate decision audit log.")
+    parser.add_argument("log_dir", help="Audit log directory")
+    parser.add_argument("--job", dest="job_id", help="Filter by job_id")
+    parser.add_argument("--property", dest="property_slug", help="Filter by property slug")
+    parser.add_argument("--status", dest="gate_status", choices=["PASS", "FAIL", "OVERRIDE"],
+                        help="Filter by gate status")
+    parser.add_argument("--since", help="ISO timestamp or date (inclusive)")
+    parser.add_argument("--until", help="ISO timestamp or date (exclusive)")
+    parser.add_argument("--limit", type=int, help="Max records to export")
+    parser.add_argument("--out", help="Write JSONL here instead of stdout")
+    parser.add_argument("--count", action="store_true", help="Print the match count only")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild sidecar indexes first")
+    args = parser.parse_args()
+
+    query = AuditQuery(args.log_dir)
+    if args.reindex:
+        print(f"Reindexed {query.reindex()} segment(s)", file=sys.stderr)
+
+    filters = {
+        "job_id": args.job_id,
+        "property_slug": args.property_slug,
+        "gate_status": args.gate_status,
+        "since": args.since,
+        "until": args.until,
+    }
+
+    if args.count:
+        print(query.count(**filters))
+        sys.exit(0)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            n = query.export_jsonl(f, limit=args.limit, **filters)
+        print(f"Exported {n} record(s) to {args.out}", file=sys.stderr)
+    else:
+        n = query.export_jsonl(sys.stdout, limit=args.limit, **filters)
+        print(f"{n} record(s)", file=sys.stderr)
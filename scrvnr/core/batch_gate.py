@@ -0,0 +1,277 @@
+"""
+GHM SCRVNR — Batch Gate
+=========================
+Gates a directory or glob of Markdown / HTML / text files in parallel
+and streams one JSONL record per file, then a summary record.
+
+Content audits run over tens of thousands of pages, so nothing here holds
+more than a bounded window of work: files are discovered lazily, at most
+workers x WINDOW_PER_WORKER files are in flight, and each record is
+written as soon as it is ready (completion order, not input order). The
+summary is built from running totals.
+
+Sections:
+    .md / .markdown   split on ATX headings (# ... ######); text before
+                      the first heading is "intro"
+    .html / .htm      split on <h1>-<h3>; scripts, styles and tags are
+                      stripped and entities unescaped
+    .txt (other)      one section, "document"
+
+Record:
+    {"file", "sections", "words", "gate_open", "gate_status", "pass1_score",
+     "pass2_score", "failed_sections": [...], "failed_dimensions": [...]}
+    {"file", "error"}                                   # unreadable / failed file
+Summary (last line):
+    {"summary": {"files", "errors", "gate_status": {...}, "mean_pass1",
+                 "mean_pass2", "top_failed_dimensions": [[dim, n], ...],
+                 "elapsed_s", "files_per_s"}}
+
+Usage:
+    summary = run_batch(["content/"], out=sys.stdout, profile=profile, workers=8)
+
+CLI:
+    python batch_gate.py <dir | glob | file>... [--profile p.json] [--workers N] [--out results.jsonl]
+    python -m scrvnr gate content/ --profile gad-main        # same, via the unified CLI
+"""
+
+import glob
+import html
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+EXTENSIONS = (".md", ".markdown", ".html", ".htm", ".txt")
+WINDOW_PER_WORKER = 4
+GLOB_CHARS = set("*?[")
+
+_MD_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_HTML_DROP = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_HEADING = re.compile(r"<h([1-3])\b[^>]*>(.*?)</h\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_BLOCK = re.compile(r"</?(p|div|li|br|section|article|tr|ul|ol)\b[^>]*>", re.IGNORECASE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+# ─── Discovery ───────────────────────────────────────────────────────────────
+
+def is_batch_target(target: str) -> bool:
+    """True for a directory or a glob pattern (as opposed to one file)."""
+    return os.path.isdir(target) or bool(GLOB_CHARS & set(target))
+
+
+def iter_files(targets: Iterable[str], extensions=EXTENSIONS) -> Iterator[str]:
+    """Files under the targets (directories recursively, globs expanded), lazily."""
+    for target in targets:
+        if os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for name in sorted(files):
+                    if name.lower().endswith(extensions):
+                        yield os.path.join(root, name)
+        elif GLOB_CHARS & set(target):
+            for path in glob.iglob(target, recursive=True):
+                if os.path.isfile(path):
+                    yield path
+        else:
+            yield target
+
+
+# ─── Sectioning ──────────────────────────────────────────────────────────────
+
+def _slug(title: str, seen: Dict[str, int]) -> str:
+    name = _SLUG.sub("-", title.lower()).strip("-")[:60] or "section"
+    seen[name] = seen.get(name, 0) + 1
+    return name if seen[name] == 1 else f"{name}-{seen[name]}"
+
+
+def _split_on(headings, text: str, clean=lambda s: s) -> Dict[str, str]:
+    sections, seen = {}, {}
+    position, title = 0, None      # None: text before the first heading
+    for match in headings + [None]:
+        end = match.start() if match is not None else len(text)
+        body = clean(text[position:end]).strip()
+        if body:
+            sections["intro" if title is None else _slug(title, seen)] = body
+        if match is not None:
+            title = clean(match.group(match.lastindex)).strip() or "section"
+            position = match.end()
+    return sections
+
+
+def _html_text(fragment: str) -> str:
+    fragment = _HTML_BLOCK.sub("\n", fragment)
+    return re.sub(r"[ \t]+", " ", html.unescape(_HTML_TAG.sub("", fragment)))
+
+
+def split_sections(path: str, text: str) -> Dict[str, str]:
+    """Named sections of a file according to its type (see module docstring)."""
+    lower = path.lower()
+    if lower.endswith((".md", ".markdown")):
+        return _split_on(list(_MD_HEADING.finditer(text)), text)
+    if lower.endswith((".html", ".htm")):
+        text = _HTML_DROP.sub(" ", text)
+        return _split_on(list(_HTML_HEADING.finditer(text)), text, clean=_html_text)
+    text = text.strip()
+    return {"document": text} if text else {}
+
+
+# ─── Workers ─────────────────────────────────────────────────────────────────
+
+_gate = None
+
+
+def _init_worker(profile: Optional[Dict], core_dir: str):
+    global _gate
+    if core_dir not in sys.path:
+        sys.path.insert(0, core_dir)
+    from scrvnr_gate import SCRVNRGate
+    _gate = SCRVNRGate(profile_dict=profile)
+
+
+def gate_file(path: str) -> Dict:
+    """Gate one file in this worker. Returns its compact record."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            sections = split_sections(path, f.read())
+        if not sections:
+            return {"file": path, "error": "No content"}
+        result = _gate.run(sections)
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+    failed_dimensions = set()
+    engines = (("pass1", _gate.detector), ("pass2", _gate.aligner))
+    for key, engine in engines:
+        detail = result[key]["detail"]
+        if not detail:
+            continue
+        floor = engine.policy.dimension_fail_threshold
+        for section in detail["section_results"].values():
+            failed_dimensions.update(
+                f"{key}.{dim}" for dim, v in section.get("dimensions", {}).items() if v["score"] < floor
+            )
+    return {
+        "file": path,
+        "sections": len(sections),
+        "words": sum(len(t.split()) for t in sections.values()),
+        "gate_open": result["gate_open"],
+        "gate_status": result["gate_status"],
+        "pass1_score": result["pass1"]["score"],
+        "pass2_score": result["pass2"]["score"],
+        "failed_sections": [name for name, s in result["sections"].items() if not s["pass"]],
+        "failed_dimensions": sorted(failed_dimensions),
+    }
+
+
+# ─── Driver ──────────────────────────────────────────────────────────────────
+
+class _Summary:
+    """Running totals — constant memory however many files stream past."""
+
+    def __init__(self):
+        self.files = self.errors = 0
+        self.status = Counter()
+        self.dimensions = Counter()
+        self.pass1 = [0.0, 0]
+        self.pass2 = [0.0, 0]
+        self.started = time.perf_counter()
+
+    def add(self, record: Dict):
+        self.files += 1
+        if "error" in record:
+            self.errors += 1
+            return
+        self.status[record["gate_status"]] += 1
+        self.dimensions.update(record["failed_dimensions"])
+        for total, score in ((self.pass1, record["pass1_score"]), (self.pass2, record["pass2_score"])):
+            if score is not None:
+                total[0] += score
+                total[1] += 1
+
+    def to_dict(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "files": self.files,
+            "errors": self.errors,
+            "gate_status": dict(self.status),
+            "mean_pass1": round(self.pass1[0] / self.pass1[1], 3) if self.pass1[1] else None,
+            "mean_pass2": round(self.pass2[0] / self.pass2[1], 3) if self.pass2[1] else None,
+            "top_failed_dimensions": [list(item) for item in self.dimensions.most_common(10)],
+            "elapsed_s": round(elapsed, 3),
+            "files_per_s": round(self.files / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+def run_batch(targets: List[str], out: TextIO, profile: Dict = None, workers: int = None,
+              extensions=EXTENSIONS) -> Dict:
+    """
+    Gate every file under targets, writing one JSONL record per file to out,
+    then the summary record. Returns the summary.
+
+    Args:
+        workers: Processes (default: CPU count). 1 runs in this process.
+    """
+    core_dir = os.path.dirname(os.path.abspath(__file__))
+    workers = workers or os.cpu_count() or 1
+    summary = _Summary()
+    files = iter_files(targets, extensions)
+
+    def emit(record):
+        summary.add(record)
+        out.write(json.dumps(record) + "\n")
+
+    if workers == 1:
+        _init_worker(profile, core_dir)
+        for path in files:
+            emit(gate_file(path))
+    else:
+        window = workers * WINDOW_PER_WORKER
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(profile, core_dir)) as pool:
+            pending = set()
+            for path in files:
+                pending.add(pool.submit(gate_file, path))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        emit(future.result())
+            for future in pending:
+                emit(future.result())
+
+    result = summary.to_dict()
+    out.write(json.dumps({"summary": result}) + "\n")
+    out.flush()
+    return result
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gate a directory or glob of content files to JSONL.")
+    parser.add_argument("targets", nargs="+", help="Directories, globs (quote them) or files")
+    parser.add_argument("--profile", help="Voice profile JSON (Pass 2)")
+    parser.add_argument("--workers", type=int, help="Processes (default: CPU count)")
+    parser.add_argument("--out", help="Write JSONL here instead of stdout")
+    args = parser.parse_args()
+
+    profile = None
+    if args.profile:
+        from profile_validator import validate_profile
+        with open(args.profile, "r", encoding="utf-8") as f:
+            profile = validate_profile(json.load(f))
+
+    stream = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        summary = run_batch(args.targets, stream, profile=profile, workers=args.workers)
+    finally:
+        if args.out:
+            stream.close()
+    if args.out:
+        print(f"\n  {summary['files']} files -> {args.out}  {summary['gate_status']}  "
+              f"({summary['errors']} errors, {summary['files_per_s']} files/s)")
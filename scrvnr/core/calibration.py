@@ -0,0 +1,486 @@
+"""
+GHM SCRVNR — Threshold & Weight Calibration
+=============================================
+Calibrates pass thresholds and dimension weights against a labeled corpus
+of human-written and AI-generated sections, instead of hand-picking them.
+
+Features are extracted once per section (the expensive, text-reading
+stage). Each dimension is scored once under the base policy's curves into
+an N x D score matrix. Every weight configuration after that is a
+matrix product; every threshold is a sorted search. With NumPy installed
+thousands of weight configurations are evaluated per second. Without it,
+a pure-Python fallback produces the same numbers more slowly.
+
+Conventions:
+  - Positive class = AI-generated. A section is flagged when its composite
+    score is below the threshold (i.e. the gate would fail it).
+  - AUC = probability a random human section scores above a random AI
+    section (ties count half). 0.5 = no signal.
+
+Labeled corpus (JSONL), one per line:
+    {"text": "...", "label": "ai"}          # or "human"; 1/0 and true/false work too
+    {"sections": {"hero": "...", ...}, "label": "human"}
+
+Usage:
+    cal = Calibrator()                          # Pass 1
+    cal.extract(load_labeled_corpus("labeled.jsonl"))
+    report = cal.report(configs=5000)
+    report["suggested_policy"]                  # Pass1Policy overrides
+
+    cal = Calibrator(profile=profile)           # Pass 2 against one profile
+
+CLI:
+    python calibration.py labeled.jsonl --configs 5000 --features-cache feats.jsonl \\
+        --out report.json --write-policy tenant_policy.json
+"""
+
+import json
+import random
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional — pure-Python fallback below
+    np = None
+
+from pass1_ai_detection import AIDetector
+from pass2_voice_alignment import VoiceAligner
+from scoring_policy import Pass1Policy, Pass2Policy
+from profile_store import content_hash_of
+
+
+AI_LABELS = {"ai", "llm", "generated", "machine", "1", "true"}
+HUMAN_LABELS = {"human", "0", "false"}
+
+
+def parse_label(value) -> bool:
+    """Return True for AI-generated, False for human. Raises ValueError otherwise."""
+    key = str(value).strip().lower()
+    if key in AI_LABELS:
+        return True
+    if key in HUMAN_LABELS:
+        return False
+    raise ValueError(f"Unrecognized label: {value!r} (expected 'ai' or 'human')")
+
+
+def load_labeled_corpus(path: str) -> List[Tuple[str, bool]]:
+    """Read a labeled JSONL corpus into [(text, is_ai)]. Empty sections are skipped."""
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            try:
+                is_ai = parse_label(record.get("label"))
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: {e}") from None
+            texts = list((record.get("sections") or {}).values()) or [record.get("text") or ""]
+            samples.extend((t, is_ai) for t in texts if t and t.strip())
+    return samples
+
+
+class Calibrator:
+    """
+    Extract once, sweep many. Holds the feature records and the per-dimension
+    score matrix for one pass (and, for Pass 2, one profile).
+    """
+
+    THRESHOLD_GRID = [round(0.30 + i * 0.01, 2) for i in range(66)]  # 0.30 .. 0.95
+    ROC_STEP = 5  # report every 5th grid point in ROC tables
+
+    def __init__(
+        self,
+        profile: Dict = None,
+        policy=None,
+        lexicons: Dict[str, List[str]] = None,
+        use_numpy: bool = None,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            profile:   Calibrate Pass 2 against this profile (Pass 1 if None)
+            policy:    Base policy whose curves produce dimension scores
+                       (and whose weights/threshold are "current")
+            lexicons:  Pass 1 lexicon overrides (see AIDetector)
+            use_numpy: Force the NumPy (True) or pure-Python (False) path.
+                       Default: NumPy when installed.
+            seed:      Seed for the random weight search
+        """
+        self.profile = profile
+        if profile is not None:
+            self.pass_number = 2
+            self.policy = policy or Pass2Policy()
+            self.scorer = VoiceAligner(profile, policy=self.policy)
+        else:
+            self.pass_number = 1
+            self.policy = policy or Pass1Policy()
+            self.scorer = AIDetector(lexicons=lexicons, policy=self.policy)
+
+        if use_numpy and np is None:
+            raise RuntimeError("NumPy is not installed")
+        self.use_numpy = (np is not None) if use_numpy is None else use_numpy
+        self.seed = seed
+        self.features: List[Dict] = []
+        self.labels: List[bool] = []
+        self.dimensions: List[str] = []
+        self.matrix: List[List[float]] = []
+
+    # ─── Stage 1: features (once) ─────────────────────────────────────────────
+
+    def extract(self, samples: Iterable[Tuple[str, bool]]) -> "Calibrator":
+        """Extract feature records for (text, is_ai) samples."""
+        for text, is_ai in samples:
+            features = self.scorer.extract_features(text)
+            if features:
+                self.features.append(features)
+                self.labels.append(bool(is_ai))
+        self._build_matrix()
+        return self
+
+    def cache_key(self) -> Dict:
+        """Identifies what a feature cache file was extracted with."""
+        if self.pass_number == 1:
+            return {"pass": 1, "fingerprints": self.scorer.dimension_fingerprints()}
+        return {"pass": 2, "feature_version": self.scorer.FEATURE_VERSION,
+                "profile_hash": content_hash_of(self.profile)}
+
+    def save_features(self, path: str) -> None:
+        """Write the extracted features as JSONL (header line = cache key)."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.cache_key()) + "\n")
+            for features, is_ai in zip(self.features, self.labels):
+                f.write(json.dumps({"ai": is_ai, "features": features}, separators=(",", ":")) + "\n")
+
+    def load_features(self, path: str) -> bool:
+        """
+        Load features saved by save_features(). Returns False (and loads
+        nothing) if the file was extracted with different lexicons/profile.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if json.loads(f.readline() or "null") != self.cache_key():
+                return False
+            for line in f:
+                record = json.loads(line)
+                self.features.append(record["features"])
+                self.labels.append(record["ai"])
+        self._build_matrix()
+        return True
+
+    # ─── Stage 2: sweeps (many) ───────────────────────────────────────────────
+
+    def current_weights(self) -> List[float]:
+        weights = [self.policy.weights[d] for d in self.dimensions]
+        if self.pass_number == 2:
+            total = sum(weights) or 1.0
+            weights = [w / total for w in weights]
+        return weights
+
+    def evaluate(self, weight_rows: Sequence[Sequence[float]], thresholds: Sequence[float] = None,
+                 curves: bool = True) -> List[Dict]:
+        """
+        Evaluate weight configurations. Each row holds one weight per
+        dimension (self.dimensions order). Returns per-config AUC and the
+        threshold with the best F1, plus (curves=True) the per-threshold curve.
+        """
+        thresholds = list(thresholds or self.THRESHOLD_GRID)
+        if self.use_numpy:
+            return _evaluate_numpy(self.matrix, self.labels, weight_rows, thresholds, curves)
+        return _evaluate_python(self.matrix, self.labels, weight_rows, thresholds, curves)
+
+    def sample_weights(self, n: int) -> List[List[float]]:
+        """n random weight vectors, uniform over the simplex (Dirichlet(1))."""
+        d = len(self.dimensions)
+        if self.use_numpy:
+            return np.random.default_rng(self.seed).dirichlet(np.ones(d), n)
+        rng = random.Random(self.seed)
+        rows = []
+        for _ in range(n):
+            draws = [rng.gammavariate(1.0, 1.0) for _ in range(d)]
+            total = sum(draws)
+            rows.append([x / total for x in draws])
+        return rows
+
+    def report(self, configs: int = 2000, objective: str = "f1", top: int = 5) -> Dict:
+        """
+        Full calibration report: per-dimension and current-config
+        precision/recall/ROC, plus a random weight search.
+
+        objective: "f1" (best F1 at its best threshold) or "auc"
+        """
+        if objective not in ("f1", "auc"):
+            raise ValueError("objective must be 'f1' or 'auc'")
+        n_ai = sum(self.labels)
+        n_human = len(self.labels) - n_ai
+        if n_ai == 0 or n_human == 0:
+            raise ValueError("Calibration needs both AI and human labeled sections")
+
+        identity = [[1.0 if i == j else 0.0 for j in range(len(self.dimensions))]
+                    for i in range(len(self.dimensions))]
+        per_dimension = self.evaluate(identity)
+        current = self.evaluate([self.current_weights()])[0]
+
+        started = time.perf_counter()
+        rows = self.sample_weights(configs)
+        results = self.evaluate(rows, curves=False)
+        elapsed = time.perf_counter() - started
+
+        key = (lambda r: (r["best"]["f1"], r["auc"])) if objective == "f1" else (lambda r: (r["auc"], r["best"]["f1"]))
+        order = sorted(range(len(results)), key=lambda i: key(results[i]), reverse=True)[:top]
+        top_configs = [
+            {"weights": self._weights_dict(rows[i]), "auc": results[i]["auc"], **results[i]["best"]}
+            for i in order
+        ]
+
+        report = {
+            "pass": self.pass_number,
+            "backend": "numpy" if self.use_numpy else "python",
+            "samples": len(self.labels),
+            "ai_samples": n_ai,
+            "human_samples": n_human,
+            "dimensions": {
+                dim: self._summary(result, threshold=self.policy.dimension_fail_threshold)
+                for dim, result in zip(self.dimensions, per_dimension)
+            },
+            "current": {
+                "weights": self._weights_dict(self.current_weights()),
+                **self._summary(current, threshold=self.policy.pass_threshold),
+            },
+            "weight_search": {
+                "configs": configs,
+                "objective": objective,
+                "seconds": round(elapsed, 3),
+                "configs_per_second": round(configs / elapsed) if elapsed > 0 else None,
+                "top": top_configs,
+            },
+        }
+        if top_configs:
+            best = top_configs[0]
+            report["suggested_policy"] = {
+                "weights": best["weights"],
+                "pass_threshold": best["threshold"],
+            }
+        return report
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _build_matrix(self):
+        """Score every dimension once under the base policy's curves."""
+        if self.pass_number == 1:
+            self.dimensions = [d for d in self.policy.weights if d in AIDetector.DIMENSIONS]
+            scored = [self.policy.score(f) for f in self.features]
+        else:
+            self.dimensions = [d for d in self.policy.weights if d in self.scorer._dimensions]
+            if not self.dimensions:
+                raise ValueError("Profile has no scoreable Pass 2 dimensions")
+            scored = [self.policy.score(f, self.profile) for f in self.features]
+        self.matrix = [[s[d]["score"] for d in self.dimensions] for s in scored]
+
+    def _weights_dict(self, row) -> Dict[str, float]:
+        return {d: round(float(w), 4) for d, w in zip(self.dimensions, row)}
+
+    def _summary(self, result: Dict, threshold: float) -> Dict:
+        """AUC, metrics at the given and best threshold, and a coarse ROC table."""
+        curve = result["curve"]
+        at = min(curve, key=lambda p: abs(p["threshold"] - threshold))
+        return {
+            "auc": result["auc"],
+            "at_threshold": at,
+            "best": result["best"],
+            "roc": [
+                [p["threshold"], p["fpr"], p["tpr"]]
+                for i, p in enumerate(curve) if i % self.ROC_STEP == 0
+            ],
+        }
+
+
+# ─── Metric kernels ───────────────────────────────────────────────────────────
+# Both return, per weight row: {"auc", "best": {threshold, precision, recall, f1}}
+# plus, with curves=True, "curve": [{threshold, precision, recall, f1, fpr, tpr}].
+# The best threshold maximizes F1; ties go to the lower false positive rate.
+
+def _point(threshold, tp, fp, n_ai, n_human) -> Dict:
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / n_ai
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "threshold": threshold,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+        "fpr": round(fp / n_human, 4),
+        "tpr": round(recall, 4),
+    }
+
+
+def _best(curve: List[Dict]) -> Dict:
+    best = max(curve, key=lambda p: (p["f1"], -p["fpr"]))
+    return {k: best[k] for k in ("threshold", "precision", "recall", "f1")}
+
+
+def _evaluate_python(matrix, labels, weight_rows, thresholds, curves=True) -> List[Dict]:
+    n_ai = sum(labels)
+    n_human = len(labels) - n_ai
+    results = []
+    for weights in weight_rows:
+        ai, human = [], []
+        for row, is_ai in zip(matrix, labels):
+            score = sum(s * w for s, w in zip(row, weights))
+            (ai if is_ai else human).append(score)
+        ai.sort()
+        human.sort()
+
+        wins = ties = 0
+        for h in human:
+            below = bisect_left(ai, h)
+            wins += below
+            ties += bisect_right(ai, h) - below
+        auc = (wins + 0.5 * ties) / (n_ai * n_human)
+
+        curve = [
+            _point(t, bisect_left(ai, t), bisect_left(human, t), n_ai, n_human)
+            for t in thresholds
+        ]
+        result = {"auc": round(auc, 4), "best": _best(curve)}
+        if curves:
+            result["curve"] = curve
+        results.append(result)
+    return results
+
+
+def _evaluate_numpy(matrix, labels, weight_rows, thresholds, curves=True) -> List[Dict]:
+    S = np.asarray(matrix, dtype=float)
+    W = np.asarray(weight_rows, dtype=float)
+    is_ai = np.asarray(labels, dtype=bool)
+    n_ai = int(is_ai.sum())
+    n_human = len(labels) - n_ai
+    k = W.shape[0]
+
+    # Composite scores for every config at once: N x K
+    C = S @ W.T
+    t = np.asarray(thresholds, dtype=float)
+    # Shifting config j by j * span keeps each config's block of scores (and
+    # its thresholds) disjoint, so one flat sort + searchsorted answers all
+    # configs together. The span comes from the data: weights are not
+    # required to sum to 1, so composites can fall outside [0, 1].
+    lo = min(C.min(), t.min())
+    hi = max(C.max(), t.max())
+    shift = (hi - lo + 1.0) * np.arange(k)
+    ai_flat = np.sort((C[is_ai] + shift).T.ravel())
+    human_flat = np.sort((C[~is_ai] + shift).T.ravel())
+    ai_base = (np.arange(k) * n_ai)[:, None]
+    human_base = (np.arange(k) * n_human)[:, None]
+
+    human_q = (C[~is_ai] + shift).T  # K x n_human
+    below = np.searchsorted(ai_flat, human_q.ravel(), "left").reshape(k, n_human) - ai_base
+    at_or_below = np.searchsorted(ai_flat, human_q.ravel(), "right").reshape(k, n_human) - ai_base
+    auc = (below.sum(axis=1) + 0.5 * (at_or_below - below).sum(axis=1)) / (n_ai * n_human)
+
+    t_q = (t[None, :] + shift[:, None]).ravel()
+    tp = np.searchsorted(ai_flat, t_q, "left").reshape(k, len(t)) - ai_base
+    fp = np.searchsorted(human_flat, t_q, "left").reshape(k, len(t)) - human_base
+
+    # Metrics for every (config, threshold) pair, rounded like _point()
+    flagged = tp + fp
+    p = np.where(flagged > 0, tp / np.maximum(flagged, 1), 0.0)
+    r = tp / n_ai
+    f1 = np.round(np.where(p + r > 0, 2 * p * r / np.maximum(p + r, 1e-12), 0.0), 4)
+    precision = np.round(p, 4)
+    recall = np.round(r, 4)
+    fpr = np.round(fp / n_human, 4)
+
+    # Best = max F1, then min FPR, then first threshold
+    tied = f1 == f1.max(axis=1, keepdims=True)
+    best_idx = np.argmin(np.where(tied, fpr, np.inf), axis=1)
+
+    results = []
+    for j in range(k):
+        i = int(best_idx[j])
+        result = {
+            "auc": round(float(auc[j]), 4),
+            "best": {
+                "threshold": thresholds[i],
+                "precision": float(precision[j, i]),
+                "recall": float(recall[j, i]),
+                "f1": float(f1[j, i]),
+            },
+        }
+        if curves:
+            result["curve"] = [
+                _point(thresholds[t], int(tp[j, t]), int(fp[j, t]), n_ai, n_human)
+                for t in range(len(thresholds))
+            ]
+        results.append(result)
+    return results
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import sys
+
+    parser = argparse.ArgumentParser(description="Calibrate SCRVNR thresholds and weights on a labeled corpus.")
+    parser.add_argument("corpus", help="Labeled JSONL corpus ({text|sections, label})")
+    parser.add_argument("--profile", help="Calibrate Pass 2 against this profile JSON (default: Pass 1)")
+    parser.add_argument("--policy", help="JSON file of base policy overrides")
+    parser.add_argument("--configs", type=int, default=2000, help="Random weight configurations to evaluate")
+    parser.add_argument("--objective", choices=["f1", "auc"], default="f1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--features-cache", help="JSONL feature cache (reused when lexicons/profile match)")
+    parser.add_argument("--no-numpy", action="store_true", help="Force the pure-Python path")
+    parser.add_argument("--out", help="Write the full JSON report here")
+    parser.add_argument("--write-policy", help="Write the suggested policy overrides here")
+    args = parser.parse_args()
+
+    profile = None
+    if args.profile:
+        with open(args.profile, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    policy_cls = Pass2Policy if profile else Pass1Policy
+    policy = policy_cls.load(args.policy) if args.policy else None
+
+    cal = Calibrator(profile=profile, policy=policy, use_numpy=False if args.no_numpy else None, seed=args.seed)
+    started = time.perf_counter()
+    if args.features_cache and os.path.exists(args.features_cache) and cal.load_features(args.features_cache):
+        source = f"cache {args.features_cache}"
+    else:
+        cal.extract(load_labeled_corpus(args.corpus))
+        source = "extracted"
+        if args.features_cache:
+            cal.save_features(args.features_cache)
+    print(f"Features: {len(cal.labels)} sections ({source}, {time.perf_counter() - started:.2f}s)", file=sys.stderr)
+
+    report = cal.report(configs=args.configs, objective=args.objective)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.write_policy and "suggested_policy" in report:
+        with open(args.write_policy, "w", encoding="utf-8") as f:
+            json.dump(report["suggested_policy"], f, indent=2)
+
+    cur = report["current"]
+    search = report["weight_search"]
+    print(f"\n SCRVNR CALIBRATION — Pass {report['pass']} "
+          f"({report['ai_samples']} AI / {report['human_samples']} human, {report['backend']})")
+    print("=" * 60)
+    print(f"  {'dimension':<22} {'AUC':>6} {'best t':>7} {'prec':>6} {'recall':>7} {'F1':>6}")
+    for dim, d in report["dimensions"].items():
+        b = d["best"]
+        print(f"  {dim:<22} {d['auc']:>6.3f} {b['threshold']:>7.2f} {b['precision']:>6.2f} {b['recall']:>7.2f} {b['f1']:>6.2f}")
+    at = cur["at_threshold"]
+    print(f"\nCurrent policy: AUC {cur['auc']:.3f}; at threshold {at['threshold']:.2f}: "
+          f"precision {at['precision']:.2f}, recall {at['recall']:.2f}, F1 {at['f1']:.2f}")
+    print(f"Weight search: {search['configs']} configs in {search['seconds']}s "
+          f"({search['configs_per_second']}/s)")
+    if search["top"]:
+        best = search["top"][0]
+        print(f"Best: AUC {best['auc']:.3f}, threshold {best['threshold']:.2f}, F1 {best['f1']:.2f}")
+        print("  " + ", ".join(f"{d}={w:.2f}" for d, w in best["weights"].items()))
+    if args.write_policy:
+        print(f"\nSuggested policy: {args.write_policy}")
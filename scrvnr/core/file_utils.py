@@ -0,0 +1,91 @@
+"""
+GHM SCRVNR — File Utilities
+=============================
+Small cross-process file helpers shared by the core modules.
+
+    FileLock      — exclusive lock file (O_EXCL create), broken when stale.
+                    Used by the metrics accumulator and the audit log writer.
+    atomic_write  — write a file through a uniquely named temp file and
+                    rename it into place, so concurrent writers never share
+                    a temp file and readers never see a torn one.
+
+Usage:
+    with FileLock(Path("scrvnr/audit/audit.lock"), timeout=10.0):
+        ...   # one process at a time
+
+    with atomic_write(Path("scrvnr/profiles/gad-main.json"), "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: os.umask() can only be read by setting it
+_FILE_MODE = 0o666 & ~_umask()
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "w", encoding: str = None, fsync: bool = False):
+    """
+    Open a temp file next to path for writing; on a clean exit, rename it
+    over path. The file gets the mode open() would have given it (0666 less
+    the umask) instead of mkstemp's owner-only 0600. On error the temp file
+    is removed and path is untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, _FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class FileLock:
+    """Cross-process lock via O_EXCL file creation. Locks older than stale seconds are broken."""
+
+    def __init__(self, path: Path, timeout: float, stale: float = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.stale = stale
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - self.path.stat().st_mtime > self.stale:
+                        self.path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Could not lock {self.path}")
+                time.sleep(0.005)
+
+    def __exit__(self, *exc):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,234 @@
+"""
+GHM SCRVNR — Framed Runner Protocol
+=====================================
+Length-prefixed messages between a long-lived ws_gate_runner.py process
+(started with --framed) and its caller (the Next.js route, load tests).
+
+The one-shot runner reads stdin to EOF and parses it as one JSON document,
+so every request pays for a process and the caller has to buffer stdout
+until the process exits. A framed runner stays up and exchanges frames
+over stdin/stdout instead:
+
+    u32 body length | u32 request id | u8 codec | u8 kind | body
+
+All integers are big-endian. The length is checked against the runner's
+limit before the body is read, so an oversized request is skipped without
+being buffered or parsed and answered with an ERROR frame for its id.
+
+Codecs:
+    "j"  JSON, compact (no spaces, UTF-8). Always available.
+    "m"  MessagePack. Only when the msgpack package is installed; a runner
+         without it answers "m" requests with a JSON ERROR frame.
+A response uses the codec of its request.
+
+Kinds:
+    REQUEST  caller → runner   ws_gate_runner payload (see its docstring)
+    SECTION  runner → caller   one section's result, as soon as it is scored
+                               (payload "stream": true only)
+    RESULT   runner → caller   the final result; ends the request
+    ERROR    runner → caller   runner error result; ends the request
+
+Requests are independent: a caller may send many before reading, and
+responses arrive in completion order, matched up by request id.
+
+Usage:
+    client = FramedClient([sys.executable, "ws_gate_runner.py", "--framed"])
+    result = client.request({"property_slug": "gad-main", "sections": {...}})
+    for kind, body in client.stream({"property_slug": "gad-main", "sections": {...}, "stream": True}):
+        ...
+    client.close()
+"""
+
+import json
+import struct
+import subprocess
+import threading
+from queue import Queue
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON is always available
+    msgpack = None
+
+HEADER = struct.Struct(">IIBB")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+CODEC_JSON = ord("j")
+CODEC_MSGPACK = ord("m")
+
+KIND_REQUEST = 1
+KIND_SECTION = 2
+KIND_RESULT = 3
+KIND_ERROR = 4
+
+_SKIP_CHUNK = 64 * 1024
+
+
+class FrameError(ValueError):
+    """A frame could not be read or decoded."""
+
+    def __init__(self, message: str, request_id: int = None):
+        super().__init__(message)
+        self.request_id = request_id
+
+
+def codecs() -> Tuple[int, ...]:
+    """Codecs this process can encode and decode."""
+    return (CODEC_JSON, CODEC_MSGPACK) if msgpack is not None else (CODEC_JSON,)
+
+
+def encode(obj, codec: int = CODEC_JSON) -> bytes:
+    if codec == CODEC_JSON:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if codec == CODEC_MSGPACK and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    raise FrameError(f"Unsupported codec {codec!r}")
+
+
+def decode(body: bytes, codec: int = CODEC_JSON):
+    try:
+        if codec == CODEC_JSON:
+            return json.loads(body)
+        if codec == CODEC_MSGPACK and msgpack is not None:
+            return msgpack.unpackb(body, raw=False)
+    except ValueError as e:
+        raise FrameError(f"Invalid frame body: {e}")
+    raise FrameError(f"Unsupported codec {codec!r}")
+
+
+def pack_frame(request_id: int, kind: int, obj, codec: int = CODEC_JSON) -> bytes:
+    body = encode(obj, codec)
+    return HEADER.pack(len(body), request_id, codec, kind) + body
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    while len(data) < size:
+        more = stream.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+
+def read_frame(stream: BinaryIO, max_bytes: int = MAX_FRAME_BYTES) -> Optional[Tuple[int, int, int, bytes]]:
+    """
+    Read one frame: (request_id, codec, kind, body), or None at a clean EOF.
+    The body is returned undecoded.
+
+    Raises:
+        FrameError: truncated stream, or a body over max_bytes. An oversized
+                    body is read past in chunks (never held in memory), so
+                    the stream stays aligned and .request_id says whose it was.
+    """
+    header = _read_exact(stream, HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise FrameError("Truncated frame header")
+    length, request_id, codec, kind = HEADER.unpack(header)
+    if length > max_bytes:
+        remaining = length
+        while remaining:
+            skipped = len(stream.read(min(remaining, _SKIP_CHUNK)))
+            if not skipped:
+                raise FrameError("Truncated frame body")
+            remaining -= skipped
+        raise FrameError(f"Frame of {length} bytes exceeds the {max_bytes}-byte limit", request_id)
+    body = _read_exact(stream, length)
+    if len(body) < length:
+        raise FrameError("Truncated frame body")
+    return request_id, codec, kind, body
+
+
+class FrameWriter:
+    """Writes whole frames to a binary stream from any thread."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, request_id: int, kind: int, obj, codec: int = CODEC_JSON):
+        frame = pack_frame(request_id, kind, obj, codec)
+        with self._lock:
+            self.stream.write(frame)
+            self.stream.flush()
+
+
+class FramedClient:
+    """
+    Caller side: one framed runner process, many concurrent requests.
+    A reader thread routes response frames to the waiting request by id.
+    """
+
+    def __init__(self, command: List[str], env: Dict = None, codec: int = CODEC_JSON):
+        self.codec = codec
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+        self._writer = FrameWriter(self.process.stdin)
+        self._pending: Dict[int, Queue] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._reader_done = False
+        self._reader = threading.Thread(target=self._read_loop, name="scrvnr-framed-reader", daemon=True)
+        self._reader.start()
+
+    def stream(self, payload: Dict) -> Iterator[Tuple[int, Dict]]:
+        """Send one request; yield (kind, body) for each response frame until RESULT or ERROR."""
+        responses = Queue()
+        with self._lock:
+            # Checked under the lock the reader takes to fail pending
+            # requests on exit, so a request is either failed or refused
+            if self._reader_done:
+                raise FrameError("Runner exited")
+            self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+            request_id = self._next_id
+            self._pending[request_id] = responses
+        self._writer.write(request_id, KIND_REQUEST, payload, self.codec)
+        while True:
+            kind, body = responses.get()
+            yield kind, body
+            if kind != KIND_SECTION:
+                return
+
+    def request(self, payload: Dict) -> Dict:
+        """Send one request and return its final RESULT or ERROR body."""
+        for kind, body in self.stream(payload):
+            if kind != KIND_SECTION:
+                return body
+
+    def close(self):
+        """Close stdin (the runner drains in-flight requests and exits) and wait for it."""
+        self.process.stdin.close()
+        self.process.wait()
+        self._reader.join()
+        self.process.stdout.close()
+
+    def _read_loop(self):
+        try:
+            while True:
+                frame = read_frame(self.process.stdout, max_bytes=0xFFFFFFFF)
+                if frame is None:
+                    break
+                request_id, codec, kind, body = frame
+                try:
+                    response = (kind, decode(body, codec))
+                except FrameError as e:
+                    # Only this request is affected: fail it, keep reading
+                    kind = KIND_ERROR
+                    response = (KIND_ERROR, {"gate_status": "ERROR", "error": str(e)})
+                with self._lock:
+                    responses = self._pending.get(request_id)
+                    if kind != KIND_SECTION:
+                        self._pending.pop(request_id, None)
+                if responses is not None:
+                    responses.put(response)
+        except FrameError:
+            pass
+        finally:
+            # Runner gone: fail whatever is still waiting
+            with self._lock:
+                self._reader_done = True
+                orphans, self._pending = list(self._pending.values()), {}
+            for responses in orphans:
+                responses.put((KIND_ERROR, {"gate_status": "ERROR", "error": "Runner exited"}))
@@ -0,0 +1,125 @@
+"""
+GHM SCRVNR — Versioned Lexicons
+=================================
+Pass 1 phrase lists loaded from files instead of fixed at import time.
+
+AIDetector ships built-in AI_ISMS, HEDGE_WORDS and FORMAL_TRANSITIONS
+lists. A lexicon file replaces any of them and carries a version label
+that is recorded in every result scored with it, so a decision can always
+be traced to the lexicon that produced it. Long-running services swap
+lexicon files without a restart via SCRVNRAdapter.reload().
+
+File format (JSON):
+    {
+      "version": "2026-10-19.1",
+      "AI_ISMS": ["in the realm of", ...],       # any subset of the lists;
+      "HEDGE_WORDS": [...],                       # missing lists keep the
+      "FORMAL_TRANSITIONS": [...]                 # built-in phrases
+    }
+
+Usage:
+    lexicons = load_lexicons("scrvnr/lexicons/2026-10.json")
+    detector = AIDetector(lexicons=lexicons.tables, lexicon_version=lexicons.version)
+    adapter = SCRVNRAdapter(lexicons_path="scrvnr/lexicons/2026-10.json")
+
+CLI:
+    python lexicons.py export <out.json> --version 2026-10-19.1   # built-ins as a starting file
+    python lexicons.py check <file.json>
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from pass1_ai_detection import AIDetector
+
+BUILTIN_VERSION = "builtin"
+LEXICON_NAMES = tuple(sorted({attr for attrs in AIDetector.DIMENSION_LEXICONS.values() for attr in attrs}))
+
+
+class LexiconError(ValueError):
+    """A lexicon file is missing, unreadable or malformed."""
+
+
+class LexiconSet:
+    """An immutable, versioned set of Pass 1 phrase lists."""
+
+    def __init__(self, version: str, tables: Dict[str, List[str]] = None, path: str = None):
+        self.version = version
+        self.tables = {name: tuple(phrases) for name, phrases in (tables or {}).items()}
+        self.path = path
+        digest = hashlib.sha1(version.encode("utf-8"))
+        for name in sorted(self.tables):
+            digest.update(b"\x01" + name.encode("utf-8"))
+            for phrase in self.tables[name]:
+                digest.update(b"\x00" + phrase.encode("utf-8"))
+        self.digest = digest.hexdigest()[:16]
+
+    def __repr__(self) -> str:
+        return f"LexiconSet({self.version!r}, {sorted(self.tables)})"
+
+
+def builtin_lexicons() -> LexiconSet:
+    """The phrase lists compiled into AIDetector."""
+    return LexiconSet(BUILTIN_VERSION)
+
+
+def load_lexicons(path: Optional[str]) -> LexiconSet:
+    """
+    Load a lexicon file (None gives the built-ins).
+
+    Raises:
+        LexiconError: unreadable file, missing version, unknown list name or
+                      a list that is not all strings
+    """
+    if path is None:
+        return builtin_lexicons()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise LexiconError(f"Cannot read lexicon file {path}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("version"), str) or not data["version"].strip():
+        raise LexiconError(f"{path}: a non-empty string 'version' is required")
+    tables = {}
+    for name, phrases in data.items():
+        if name == "version":
+            continue
+        if name not in LEXICON_NAMES:
+            raise LexiconError(f"{path}: unknown lexicon '{name}'. Expected one of: {', '.join(LEXICON_NAMES)}")
+        if not isinstance(phrases, list) or not all(isinstance(p, str) and p.strip() for p in phrases):
+            raise LexiconError(f"{path}: '{name}' must be a list of non-empty strings")
+        tables[name] = [p.strip() for p in phrases]
+    return LexiconSet(data["version"].strip(), tables, path=str(path))
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Export or check versioned Pass 1 lexicon files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("export", help="Write the built-in lists as a lexicon file")
+    p.add_argument("out")
+    p.add_argument("--version", required=True)
+    p = sub.add_parser("check", help="Validate a lexicon file")
+    p.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        data = {"version": args.version}
+        data.update({name: list(getattr(AIDetector, name)) for name in LEXICON_NAMES})
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        print(f" Lexicons {args.version} -> {args.out}")
+    else:
+        try:
+            lexicons = load_lexicons(args.path)
+        except LexiconError as e:
+            print(f" INVALID: {e}")
+            sys.exit(1)
+        sizes = ", ".join(f"{name} {len(lexicons.tables[name])}" for name in sorted(lexicons.tables))
+        print(f" OK  version {lexicons.version}  digest {lexicons.digest}  ({sizes or 'built-ins only'})")
@@ -0,0 +1,394 @@
+"""
+GHM SCRVNR — Metrics Registry
+===============================
+In-process counters, gauges and fixed-bucket histograms for a long-running
+SCRVNR service, exported in the Prometheus text format.
+
+Design:
+  - Every series update is one dict lookup and one add inside a per-metric
+    lock held for nanoseconds. No allocation after a series' first update.
+  - Histograms use fixed bucket bounds (bisect into a short tuple), so
+    observe() costs the same at request one and request ten million.
+    p50/p95/p99 are estimated from the buckets, as Prometheus'
+    histogram_quantile() does.
+  - Instrumented classes take metrics=None by default and skip all
+    recording when no registry is given.
+
+Export:
+  - serve(port)     — /metrics over HTTP on a local socket (daemon thread)
+  - write(path)     — atomic text file (node_exporter textfile collector)
+  - accumulate(path) — for spawn-per-request runners: fold this process's
+                      values into a state file under a lock file, then
+                      rewrite the text file. Counters and histograms sum
+                      across processes; gauges keep the latest value.
+
+Metrics recorded by SCRVNRAdapter / SCRVNRGate (see their metrics= args):
+    scrvnr_requests_total{entry, status}          counter
+    scrvnr_request_seconds{entry}                 histogram
+    scrvnr_requests_in_flight                     gauge
+    scrvnr_gate_decisions_total{property, status} counter  (PASS/FAIL/OVERRIDE/ERROR)
+    scrvnr_profile_loads_total{result}            counter  (found/missing)
+    scrvnr_gate_cache_total{result}               counter  (hit/miss)
+    scrvnr_audit_queue_depth                      gauge
+    scrvnr_audit_records_dropped                  gauge    (after WRITE_ATTEMPTS failures)
+    scrvnr_near_duplicates_total                  counter  (sections flagged)
+    scrvnr_gate_run_seconds{profile}              histogram
+    scrvnr_gate_sections_total                    counter
+    scrvnr_pass_results_total{pass, result}       counter
+
+Usage:
+    registry = MetricsRegistry()
+    adapter = SCRVNRAdapter(metrics=registry)
+    registry.serve(9464)                      # http://127.0.0.1:9464/metrics
+
+    requests = registry.counter("my_total", "Things done", ("kind",))
+    requests.inc("a")
+    latency = registry.histogram("my_seconds", "Latency", ("kind",))
+    latency.observe(0.012, "a")
+    latency.quantile(0.95, "a")
+
+CLI:
+    python metrics.py <state.json>      # print a state file as Prometheus text
+"""
+
+import json
+import math
+import os
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from file_utils import FileLock
+
+
+# Seconds — spans a 1ms cached section check to a 10s cold 50k-word page
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STATE_VERSION = 1
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Tuple) -> Tuple:
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {labels}")
+        return labels
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_label_str(self.labels, k)} {_format(v)}" for k, v in items]
+        return lines
+
+
+class Gauge(_Metric):
+    """Current value per label set, or a callback sampled at export time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), fn: Callable[[], float] = None):
+        super().__init__(name, help, labels)
+        self.fn = fn
+
+    def set(self, value: float, *labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labels, amount: float = 1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels) -> float:
+        if self.fn is not None and not labels:
+            return self.fn()
+        return self._values.get(labels, 0)
+
+    def _sample(self):
+        if self.fn is not None:
+            self.set(self.fn())
+
+    def render(self):
+        self._sample()
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_label_str(self.labels, k)} {_format(v)}" for k, v in items]
+        return lines
+
+
+class Histogram(_Metric):
+    """Fixed-bucket distribution per label set: bucket counts, sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [count per bucket..., +Inf count, sum]
+        self._width = len(self.buckets) + 1
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * self._width + [0.0]
+            series[slot] += 1
+            series[-1] += value
+
+    def count(self, *labels) -> int:
+        series = self._values.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def quantile(self, q: float, *labels) -> Optional[float]:
+        """
+        Estimated q-quantile (0-1), interpolating linearly inside the bucket
+        that holds it. Values past the last bound report that bound.
+        None when nothing has been observed.
+        """
+        series = self._values.get(labels)
+        if not series:
+            return None
+        with self._lock:
+            counts = series[:-1]
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if seen + n >= rank and n:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                low = self.buckets[i - 1] if i else 0.0
+                return low + (self.buckets[i] - low) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += n
+                le = 'le="' + _format(bound) + '"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labels, key, le)} {cumulative}")
+            labels = _label_str(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named metrics for one process. counter()/gauge()/histogram() return the
+    existing metric when the name is already registered, so instrumented
+    classes can share a registry without coordinating.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._metrics
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def counter(self, name: str, help: str = "", labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", labels: Tuple[str, ...] = (), fn: Callable = None) -> Gauge:
+        gauge = self._register(Gauge, name, help, labels)
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name: str, help: str = "", labels: Tuple[str, ...] = (),
+                  buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labels, buckets=buckets)
+
+    # ─── Export ───────────────────────────────────────────────────────────────
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for name in sorted(self._metrics):
+            lines += self._metrics[name].render()
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write render() atomically to path."""
+        _atomic_write(Path(path), self.render())
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1"):
+        """
+        Serve /metrics over HTTP from a daemon thread. Binds to localhost by
+        default. Returns the server; call .shutdown() to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="scrvnr-metrics").start()
+        return server
+
+    def state(self) -> Dict:
+        """JSON-serializable snapshot of every metric (for accumulate())."""
+        metrics = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, Gauge):
+                metric._sample()
+            with metric._lock:
+                values = [[list(k), v] for k, v in metric._values.items()]
+            entry = {"kind": metric.kind, "help": metric.help, "labels": list(metric.labels), "values": values}
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            metrics[name] = entry
+        return {"version": STATE_VERSION, "metrics": metrics}
+
+    def merge_state(self, state: Dict) -> None:
+        """Add a state() snapshot into this registry."""
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported metrics state version: {state.get('version')}")
+        for name, entry in state["metrics"].items():
+            labels = tuple(entry["labels"])
+            if entry["kind"] == "histogram":
+                metric = self.histogram(name, entry["help"], labels, buckets=entry["buckets"])
+            elif entry["kind"] == "gauge":
+                metric = self.gauge(name, entry["help"], labels)
+            else:
+                metric = self.counter(name, entry["help"], labels)
+            with metric._lock:
+                for key, value in entry["values"]:
+                    key = tuple(key)
+                    current = metric._values.get(key)
+                    if current is None or isinstance(metric, Gauge):
+                        metric._values[key] = list(value) if isinstance(value, list) else value
+                    elif isinstance(metric, Histogram):
+                        metric._values[key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        metric._values[key] = current + value
+
+    def accumulate(self, path: str, timeout: float = 5.0) -> None:
+        """
+        Fold this registry into a shared file pair and rewrite it:
+        <path>.state.json (running totals) and <path> (Prometheus text).
+        Safe across concurrent processes via an exclusive <path>.lock file.
+        """
+        path = Path(path)
+        state_path = path.with_name(path.name + ".state.json")
+        with FileLock(path.with_name(path.name + ".lock"), timeout):
+            combined = MetricsRegistry()
+            if state_path.exists():
+                with open(state_path, "r", encoding="utf-8") as f:
+                    combined.merge_state(json.load(f))
+            combined.merge_state(self.state())
+            _atomic_write(state_path, json.dumps(combined.state(), separators=(",", ":")))
+            combined.write(str(path))
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _register(self, cls, name, help, labels, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, tuple(labels), **kwargs)
+        if not isinstance(metric, cls) or metric.labels != tuple(labels):
+            raise ValueError(f"Metric {name} already registered as {metric.kind} with labels {metric.labels}")
+        return metric
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python metrics.py <state.json>")
+        sys.exit(1)
+    registry = MetricsRegistry()
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        registry.merge_state(json.load(f))
+    sys.stdout.write(registry.render())
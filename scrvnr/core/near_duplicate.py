@@ -0,0 +1,486 @@
+"""
+GHM SCRVNR — Near-Duplicate Index
+===================================
+Flags gated sections that are near-copies of previously gated content.
+
+Generated pages reuse boilerplate across a client's pages and across
+clients. The gate scores each section in isolation, so a paragraph pasted
+onto forty location pages passes forty times. This index remembers every
+gated section and answers "have we seen (almost) this before?".
+
+How it works:
+  1. Shingling — a section becomes the set of its overlapping k-word
+     windows (lowercased, punctuation stripped).
+  2. MinHash — NUM_PERM universal hash functions; the signature keeps
+     the minimum hash of the shingle set under each. The fraction of equal
+     signature slots estimates Jaccard similarity between two sections.
+  3. LSH — the signature is cut into BANDS bands; sections sharing any
+     whole band land in the same bucket. A query only compares against
+     its bucket-mates, so lookup cost does not grow with the index.
+     Candidates are confirmed against the similarity threshold.
+
+The index is bounded: past max_entries the oldest sections are evicted.
+
+Storage:
+    NearDuplicateIndex        in memory; save() writes one JSON file
+                              (signatures packed as bytes) that the next
+                              process loads whole. For one long-lived
+                              process (serve, the framed runner).
+    SqliteDuplicateIndex      one SQLite file, band buckets in a B-tree
+                              index. Each add() commits its own rows and a
+                              query reads only its bucket-mates, so a
+                              process per request costs O(log n), and
+                              concurrent processes share it (WAL locking).
+    open_duplicate_index()    picks by extension: .db / .sqlite / .sqlite3
+                              -> SQLite, anything else -> JSON.
+
+Usage:
+    index = NearDuplicateIndex("scrvnr/dupes.json")
+    matches = index.query(text)            # [{"key": [...], "similarity": 0.91}]
+    index.add(("gad-main", "job-412", "hero"), text)
+    index.save()
+
+    index = open_duplicate_index("scrvnr/dupes.db")   # shared by many processes
+
+    adapter = SCRVNRAdapter(duplicate_index=index)   # check_page flags + records
+
+CLI:
+    python near_duplicate.py file1.txt file2.txt ... [--threshold 0.8] [--index path.json | path.db]
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from file_utils import atomic_write
+
+try:
+    import numpy as np
+except ImportError:  # optional — pure-Python fallback below
+    np = None
+
+
+_PRIME = (1 << 31) - 1   # Mersenne prime; a * x + b stays inside int64
+_WORD = re.compile(r"[a-z0-9']+")
+
+FORMAT_VERSION = 1
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+def shingles(text: str, size: int) -> List[int]:
+    """Hashed k-word shingles of a text (fewer words than size -> one shingle)."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return []
+    count = max(1, len(words) - size + 1)
+    return list({
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) % _PRIME
+        for i in range(count)
+    })
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index over gated sections.
+    Thread-safe; one instance per process.
+    """
+
+    NUM_PERM = 64
+    BANDS = 16
+    SHINGLE_SIZE = 5
+    THRESHOLD = 0.80       # estimated Jaccard similarity to flag
+    MIN_WORDS = 20         # shorter sections (CTAs, headings) are not indexed
+    MAX_ENTRIES = 100_000
+
+    def __init__(
+        self,
+        path: str = None,
+        threshold: float = None,
+        max_entries: int = None,
+        num_perm: int = None,
+        bands: int = None,
+        shingle_size: int = None,
+        min_words: int = None,
+        seed: int = 1,
+        use_numpy: bool = None,
+    ):
+        """
+        Args:
+            path:         JSON file to load from (if present) and save() to
+            threshold:    Minimum estimated similarity reported as a duplicate
+            max_entries:  Size bound; oldest sections are evicted first
+            num_perm:     MinHash signature length
+            bands:        LSH bands (must divide num_perm)
+            shingle_size: Words per shingle
+            min_words:    Sections shorter than this are neither indexed nor queried
+            seed:         Hash-function seed (persisted; signatures depend on it)
+            use_numpy:    Force the vectorized (True) or pure-Python (False) MinHash.
+                          Default: vectorized when NumPy is installed.
+
+        Raises:
+            ValueError: bad parameters, or the file at path was built with
+                        different MinHash parameters
+        """
+        if use_numpy and np is None:
+            raise RuntimeError("NumPy is not installed")
+        self.path = Path(path) if path else None
+        self.threshold = self.THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.num_perm = num_perm or self.NUM_PERM
+        self.bands = bands or self.BANDS
+        self.shingle_size = shingle_size or self.SHINGLE_SIZE
+        self.min_words = self.MIN_WORDS if min_words is None else min_words
+        self.seed = seed
+        self.use_numpy = (np is not None) if use_numpy is None else use_numpy
+        if self.num_perm % self.bands:
+            raise ValueError(f"bands ({self.bands}) must divide num_perm ({self.num_perm})")
+        self.rows = self.num_perm // self.bands
+
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(self.num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(self.num_perm)]
+        if self.use_numpy:
+            self._a_np = np.array(self._a, dtype=np.int64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.int64)[:, None]
+
+        self._entries: "OrderedDict[Tuple, Tuple[int, ...]]" = OrderedDict()
+        self._buckets: List[Dict[Tuple, set]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return tuple(key) in self._entries
+
+    # ─── Public API ───────────────────────────────────────────────────────────
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of a text, or None if it is below min_words."""
+        if len(_WORD.findall(text.lower())) < self.min_words:
+            return None
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+        if self.use_numpy:
+            x = np.array(hashes, dtype=np.int64)[None, :]
+            return tuple(((self._a_np * x + self._b_np) % _PRIME).min(axis=1).tolist())
+        return tuple(
+            min((a * x + b) % _PRIME for x in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+    def query(self, text: str, exclude=None, limit: int = 5) -> List[Dict]:
+        """
+        Previously indexed sections similar to text, most similar first.
+
+        Args:
+            exclude: Key to ignore (the section's own earlier version)
+
+        Returns:
+            [{"key": [...], "similarity": 0.91}]
+        """
+        sig = self.signature(text)
+        if sig is None:
+            return []
+        return self.query_signature(sig, exclude=exclude, limit=limit)
+
+    def query_signature(self, sig: Tuple[int, ...], exclude=None, limit: int = 5) -> List[Dict]:
+        exclude = tuple(exclude) if exclude is not None else None
+        with self._lock:
+            candidates = set()
+            for band, band_key in enumerate(self._band_keys(sig)):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            candidates.discard(exclude)
+            matches = []
+            for key in candidates:
+                other = self._entries[key]
+                similarity = sum(1 for x, y in zip(sig, other) if x == y) / self.num_perm
+                if similarity >= self.threshold:
+                    matches.append((-similarity, key))
+        matches.sort()
+        return [{"key": list(key), "similarity": round(-s, 3)} for s, key in matches[:limit]]
+
+    def add(self, key, text: str) -> bool:
+        """Index a section under key (replacing any earlier version). False if too short."""
+        sig = self.signature(text)
+        if sig is None:
+            return False
+        self.add_signature(key, sig)
+        return True
+
+    def add_signature(self, key, sig: Tuple[int, ...]):
+        key = tuple(key)
+        with self._lock:
+            if key in self._entries:
+                self._unlink(key)
+            self._entries[key] = sig
+            for band, band_key in enumerate(self._band_keys(sig)):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._unlink(next(iter(self._entries)))
+                self.evicted += 1
+
+    def remove(self, key) -> bool:
+        key = tuple(key)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._unlink(key)
+            return True
+
+    def save(self, path: str = None) -> None:
+        """Write the index atomically (to path, or the path it was opened with)."""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("save() needs a path")
+        with self._lock:
+            keys = [list(k) for k in self._entries]
+            packed = array("I", (v for sig in self._entries.values() for v in sig))
+        data = {
+            "version": FORMAT_VERSION,
+            "params": self._params(),
+            "keys": keys,
+            "signatures": base64.b64encode(packed.tobytes()).decode("ascii"),
+        }
+        with atomic_write(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _band_keys(self, sig: Tuple[int, ...]):
+        rows = self.rows
+        return [sig[i * rows:(i + 1) * rows] for i in range(self.bands)]
+
+    def _unlink(self, key: Tuple):
+        sig = self._entries.pop(key)
+        for band, band_key in enumerate(self._band_keys(sig)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def _params(self) -> Dict:
+        return {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "min_words": self.min_words,
+            "seed": self.seed,
+        }
+
+    def _open(self):
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION or data.get("params") != self._params():
+            raise ValueError(
+                f"{self.path} was built with different MinHash parameters: "
+                f"{data.get('params')} != {self._params()}"
+            )
+        packed = array("I")
+        packed.frombytes(base64.b64decode(data["signatures"]))
+        n = self.num_perm
+        for i, key in enumerate(data["keys"]):
+            self.add_signature(key, tuple(packed[i * n:(i + 1) * n]))
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sections (
+    id  INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    sig BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS bands (
+    bucket     INTEGER NOT NULL,
+    section_id INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands (bucket);
+CREATE INDEX IF NOT EXISTS idx_bands_section ON bands (section_id);
+"""
+
+
+class SqliteDuplicateIndex(NearDuplicateIndex):
+    """
+    NearDuplicateIndex kept in a SQLite file instead of memory.
+    Safe to share across threads (one connection per thread) and processes
+    (SQLite WAL locking). Nothing is loaded up front; save() is a no-op
+    because every add is committed as it happens.
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+
+    def __len__(self) -> int:
+        return int(self._meta("count") or 0)
+
+    def __contains__(self, key) -> bool:
+        return self._conn().execute(
+            "SELECT 1 FROM sections WHERE key = ?", (self._key_text(key),)
+        ).fetchone() is not None
+
+    def query_signature(self, sig: Tuple[int, ...], exclude=None, limit: int = 5) -> List[Dict]:
+        exclude = self._key_text(exclude) if exclude is not None else None
+        buckets = self._buckets_of(sig)
+        rows = self._conn().execute(
+            "SELECT DISTINCT s.key, s.sig FROM bands b JOIN sections s ON s.id = b.section_id "
+            f"WHERE b.bucket IN ({','.join('?' * len(buckets))})",
+            buckets,
+        ).fetchall()
+        matches = []
+        for key, blob in rows:
+            if key == exclude:
+                continue
+            other = array("I")
+            other.frombytes(blob)
+            similarity = sum(1 for x, y in zip(sig, other) if x == y) / self.num_perm
+            if similarity >= self.threshold:
+                matches.append((-similarity, key))
+        matches.sort()
+        return [{"key": json.loads(key), "similarity": round(-s, 3)} for s, key in matches[:limit]]
+
+    def add_signature(self, key, sig: Tuple[int, ...]):
+        key = self._key_text(key)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            count = int(self._meta("count") or 0) - self._delete(conn, key)
+            section_id = conn.execute(
+                "INSERT INTO sections (key, sig) VALUES (?, ?)", (key, array("I", sig).tobytes())
+            ).lastrowid
+            conn.executemany("INSERT INTO bands (bucket, section_id) VALUES (?, ?)",
+                             [(bucket, section_id) for bucket in self._buckets_of(sig)])
+            count += 1
+            while count > self.max_entries:
+                oldest = conn.execute("SELECT key FROM sections ORDER BY id LIMIT 1").fetchone()[0]
+                count -= self._delete(conn, oldest)
+                self.evicted += 1
+            conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('count', ?)", (str(count),))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def remove(self, key) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = self._delete(conn, self._key_text(key))
+            if removed:
+                conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) - 1 WHERE name = 'count'")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return bool(removed)
+
+    def save(self, path: str = None) -> None:
+        """No-op: adds are committed as they happen."""
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _open(self):
+        if self.path is None:
+            raise ValueError("SqliteDuplicateIndex needs a path")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA_SQL)
+        params = json.dumps(self._params(), sort_keys=True)
+        conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('params', ?)", (params,))
+        stored = self._meta("params")
+        if stored != params:
+            raise ValueError(f"{self.path} was built with different MinHash parameters: {stored} != {params}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transactions are managed explicitly
+            conn = sqlite3.connect(str(self.path), isolation_level=None, timeout=self.BUSY_TIMEOUT_MS / 1000)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, name: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _buckets_of(self, sig: Tuple[int, ...]) -> List[int]:
+        """One signed 64-bit bucket id per band (collisions only add candidates)."""
+        buckets = []
+        for band, band_key in enumerate(self._band_keys(sig)):
+            digest = hashlib.blake2b(array("I", (band,) + tuple(band_key)).tobytes(), digest_size=8).digest()
+            buckets.append(int.from_bytes(digest, "big", signed=True))
+        return buckets
+
+    @staticmethod
+    def _key_text(key) -> str:
+        return json.dumps(list(key), separators=(",", ":"))
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, key: str) -> int:
+        row = conn.execute("SELECT id FROM sections WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return 0
+        conn.execute("DELETE FROM bands WHERE section_id = ?", row)
+        conn.execute("DELETE FROM sections WHERE id = ?", row)
+        return 1
+
+
+def open_duplicate_index(path: str, **kwargs) -> NearDuplicateIndex:
+    """SqliteDuplicateIndex for .db / .sqlite / .sqlite3 paths, the JSON-backed index otherwise."""
+    if str(path).lower().endswith(SQLITE_SUFFIXES):
+        return SqliteDuplicateIndex(path, **kwargs)
+    return NearDuplicateIndex(path, **kwargs)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate texts.")
+    parser.add_argument("files", nargs="+", help="Text files to compare (each file is one section)")
+    parser.add_argument("--threshold", type=float, default=NearDuplicateIndex.THRESHOLD)
+    parser.add_argument("--index", help="Persistent index (.json, or .db for SQLite): check against it, "
+                                        "then add these files")
+    args = parser.parse_args()
+
+    index = (open_duplicate_index(args.index, threshold=args.threshold) if args.index
+             else NearDuplicateIndex(threshold=args.threshold))
+    found = 0
+    for name in args.files:
+        with open(name, "r", encoding="utf-8") as f:
+            text = f.read()
+        key = ("cli", "", name)
+        for match in index.query(text, exclude=key):
+            found += 1
+            print(f"  {match['similarity']:.0%}  {name}  ~  {'/'.join(k for k in match['key'] if k)}")
+        index.add(key, text)
+    if args.index:
+        index.save()
+    print(f"\n  {found} near-duplicate pair(s) across {len(args.files)} file(s)")
@@ -4,8 +4,10 @@ GHM SCRVNR — Pass 1: AI Detection Defense
 Analyzes copy for statistical markers associated with LLM-generated text.
 No LLM required — all scoring is statistical and pattern-based.
 
-Operates on individual sections (not full documents).
-Returns per-section results with specific failure reasons.
+Operates on individual sections. analyze_document() adds one page-level
+dimension — repetition across sections (shared sentence openers, repeated
+n-grams, identically shaped sections) — built from the per-section feature
+records. Returns per-section results with specific failure reasons.
 
 Scoring dimensions:
   1. Burstiness         — sentence length variance (humans are bursty; LLMs are flat)
@@ -19,17 +21,41 @@ Each dimension scores 0.0–1.0.
 Overall Pass 1 score = weighted composite.
 Threshold for pass: configurable, default 0.65.
 
+Scoring runs in two stages: extract_features() measures the text once into
+a compact raw record; a Pass1Policy (scoring_policy.py) maps the record to
+scores. Re-weighting stored records never touches the text again.
+
 Usage:
     detector = AIDetector()
     result = detector.analyze_section(text, section_name="hero")
     result = detector.analyze_document(sections_dict)
+
+    features = detector.extract_features(text)
+    result = detector.score_features(features, "hero", policy=Pass1Policy({...}))
 """
 
 import re
 import math
+import time
+import heapq
+import hashlib
 import statistics
+from collections import Counter
 from typing import Dict, List, Tuple, Optional
 
+from scoring_policy import Pass1Policy
+
+# Stripped from word edges when building page tokens
+_TOKEN_PUNCT = ".,;:!?\"'()[]{}*•·—–-"
+
+
+_HASH_SPACE = 1 << 64
+
+
+def _ngram_hash(phrase: str) -> int:
+    """Stable 64-bit hash of a page n-gram (hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(phrase.encode("utf-8"), digest_size=8).digest(), "big")
+
 
 class AIDetector:
     """
@@ -37,7 +63,7 @@ class AIDetector:
     No external dependencies. Pure Python stdlib.
     """
 
-    PASS_THRESHOLD = 0.65  # Overall score required to pass
+    PASS_THRESHOLD = Pass1Policy.DEFAULTS["pass_threshold"]  # Overall score required to pass
 
     # Known AI-ism phrases — phrases statistically overrepresented in LLM output.
     # Sourced from academic detection literature + empirical observation.
@@ -102,8 +128,66 @@ class AIDetector:
         "first and foremost", "last but not least", "in addition",
     ]
 
-    def __init__(self, pass_threshold: float = None):
-        self.pass_threshold = pass_threshold or self.PASS_THRESHOLD
+    # Dimensions in scoring order. Each has a matching _measure_<name> method
+    # here and a score_<name> curve in Pass1Policy.
+    DIMENSIONS = (
+        "burstiness",
+        "ai_isms",
+        "parallel_structure",
+        "hedge_density",
+        "specificity",
+        "transition_tells",
+    )
+
+    # Default policy weights — burstiness and ai_isms carry the most signal
+    WEIGHTS = Pass1Policy.DEFAULTS["weights"]
+
+    # A dimension below this score is reported as a failure (default policy)
+    DIMENSION_FAIL_THRESHOLD = Pass1Policy.DEFAULTS["dimension_fail_threshold"]
+
+    # Lexicon attributes each dimension reads. Used to fingerprint dimensions
+    # so cached feature records are only reused while the lexicon is unchanged.
+    DIMENSION_LEXICONS = {
+        "ai_isms": ("AI_ISMS",),
+        "hedge_density": ("HEDGE_WORDS",),
+        "transition_tells": ("FORMAL_TRANSITIONS",),
+    }
+
+    # Bump when feature measurement changes so fingerprinted caches are invalidated.
+    # Policy changes never need a bump — they do not touch stored features.
+    FEATURE_VERSION = 5
+
+    # Word n-gram length compared across sections for page repetition
+    PAGE_NGRAM = 4
+    # Page tokens kept per section: the n-grams with the smallest hashes
+    # (a bottom-k sketch) and the most frequent sentence openers
+    PAGE_SKETCH = 64
+
+    def __init__(
+        self,
+        pass_threshold: float = None,
+        lexicons: Dict[str, List[str]] = None,
+        policy: Pass1Policy = None,
+        lexicon_version: str = None,
+    ):
+        """
+        Args:
+            pass_threshold: Override the policy's pass threshold
+            lexicons:       Per-instance replacements for AI_ISMS, HEDGE_WORDS
+                            or FORMAL_TRANSITIONS, e.g. {"AI_ISMS": [...]}
+            policy:         Scoring policy (curves, weights, thresholds).
+                            Defaults to Pass1Policy().
+            lexicon_version: Label for the lexicons in use (see lexicons.py).
+                            Default: "builtin", or "custom" with lexicons.
+        """
+        self.policy = policy or Pass1Policy()
+        self.pass_threshold = pass_threshold or self.policy.pass_threshold
+        known = {attr for attrs in self.DIMENSION_LEXICONS.values() for attr in attrs}
+        for name, phrases in (lexicons or {}).items():
+            if name not in known:
+                raise ValueError(f"Unknown lexicon '{name}'. Expected one of: {', '.join(sorted(known))}")
+            setattr(self, name, list(phrases))
+        self.lexicon_version = lexicon_version or ("custom" if lexicons else "builtin")
 
     def analyze_section(self, text: str, section_name: str = "section") -> Dict:
         """
@@ -126,29 +210,59 @@ class AIDetector:
                 suggestions: [str]
             }
         """
+        return self.score_features(self.extract_features(text), section_name)
+
+    def extract_features(self, text: str, timer=None) -> Dict[str, Dict]:
+        """
+        Stage one: measure every dimension's raw features.
+        Returns a compact JSON-serializable record {dimension: {...}}, or {}
+        for empty text. Store it and rescore later with score_features().
+        With a StageTimer, each dimension's time is added as "pass1.<dim>".
+        """
         text = text.strip()
         if not text:
+            return {}
+        if timer is None:
+            return {dim: self.measure_dimension(dim, text) for dim in self.DIMENSIONS}
+        features = {}
+        for dim in self.DIMENSIONS:
+            t0 = time.perf_counter()
+            features[dim] = self.measure_dimension(dim, text)
+            timer.add("pass1." + dim, time.perf_counter() - t0)
+        return features
+
+    def score_features(self, features: Dict[str, Dict], section_name: str = "section",
+                       policy: Pass1Policy = None) -> Dict:
+        """
+        Stage two: score a feature record under a policy (this detector's by
+        default). Never reads text, so rescoring stored records is cheap.
+        """
+        if not features:
             return self._empty_result(section_name)
+        policy = policy or self.policy
+        return self.compose_result(section_name, policy.score(features), policy)
 
-        dimensions = {
-            "burstiness": self._score_burstiness(text),
-            "ai_isms": self._score_ai_isms(text),
-            "parallel_structure": self._score_parallel_structure(text),
-            "hedge_density": self._score_hedge_density(text),
-            "specificity": self._score_specificity(text),
-            "transition_tells": self._score_transition_tells(text),
-        }
+    def measure_dimension(self, dimension: str, text: str) -> Dict:
+        """Measure one dimension's raw features on already-stripped text."""
+        return getattr(self, "_measure_" + dimension)(text)
 
-        # Weights — burstiness and ai_isms carry the most signal
-        weights = {
-            "burstiness": 0.25,
-            "ai_isms": 0.25,
-            "parallel_structure": 0.15,
-            "hedge_density": 0.15,
-            "specificity": 0.10,
-            "transition_tells": 0.10,
-        }
+    def score_dimension(self, dimension: str, text: str) -> Dict:
+        """Measure and score one dimension on already-stripped text."""
+        return self.policy.score_dimension(dimension, self.measure_dimension(dimension, text))
+
+    def compose_result(self, section_name: str, dimensions: Dict[str, Dict],
+                       policy: Pass1Policy = None) -> Dict:
+        """
+        Combine per-dimension results into the section result.
+        A policy passed explicitly brings its own pass threshold; otherwise
+        this detector's policy and pass threshold apply.
+        """
+        if policy is None or policy is self.policy:
+            policy, threshold = self.policy, self.pass_threshold
+        else:
+            threshold = policy.pass_threshold
 
+        weights = policy.weights
         overall_score = sum(
             dimensions[dim]["score"] * weights[dim]
             for dim in dimensions
@@ -157,26 +271,28 @@ class AIDetector:
         failures = []
         suggestions = []
         for dim, result in dimensions.items():
-            if result["score"] < 0.60:
+            if result["score"] < policy.dimension_fail_threshold:
                 failures.append(result.get("failure_reason", f"{dim} below threshold"))
                 suggestions.append(result.get("suggestion", f"Improve {dim}"))
 
         return {
             "section": section_name,
-            "pass": overall_score >= self.pass_threshold,
+            "pass": overall_score >= threshold,
             "overall_score": round(overall_score, 3),
-            "threshold": self.pass_threshold,
+            "threshold": threshold,
             "dimensions": dimensions,
             "failures": failures,
             "suggestions": suggestions,
         }
 
-    def analyze_document(self, sections: Dict[str, str]) -> Dict:
+    def analyze_document(self, sections: Dict[str, str], timer=None) -> Dict:
         """
         Analyze multiple named sections.
 
         Args:
             sections: dict of {section_name: text}
+            timer:    Optional StageTimer — records per-dimension measurement,
+                      scoring and page-repetition time
 
         Returns:
             {
@@ -185,19 +301,39 @@ class AIDetector:
                 sections_passed: int,
                 sections_failed: int,
                 section_results: {section_name: result},
-                failed_sections: [section_name]
+                failed_sections: [section_name],
+                page_repetition: {...}   # page-level dimension, informational
             }
         """
         section_results = {}
+        section_features = {}
         for name, text in sections.items():
-            section_results[name] = self.analyze_section(text, name)
-
+            section_features[name] = self.extract_features(text, timer)
+            if timer is None:
+                section_results[name] = self.score_features(section_features[name], name)
+            else:
+                with timer.stage("pass1.score"):
+                    section_results[name] = self.score_features(section_features[name], name)
+        return self.summarize_document(section_results, section_features, timer)
+
+    def summarize_document(self, section_results: Dict[str, Dict], section_features: Dict[str, Dict],
+                           timer=None) -> Dict:
+        """
+        The document record from already-scored sections (analyze_document's
+        return value). Lets a caller score sections one at a time and still
+        get the same aggregate, page repetition included.
+        """
         passed = [k for k, v in section_results.items() if v["pass"]]
         failed = [k for k, v in section_results.items() if not v["pass"]]
 
         scores = [v["overall_score"] for v in section_results.values()]
         overall = statistics.mean(scores) if scores else 0.0
 
+        t0 = time.perf_counter()
+        page_repetition = self.policy.score_page_repetition(self.measure_page_repetition(section_features))
+        if timer is not None:
+            timer.add("pass1.page_repetition", time.perf_counter() - t0)
+
         return {
             "pass": len(failed) == 0,
             "overall_score": round(overall, 3),
@@ -205,241 +341,204 @@ class AIDetector:
             "sections_failed": len(failed),
             "section_results": section_results,
             "failed_sections": failed,
+            "page_repetition": page_repetition,
         }
 
-    # ─── Dimension Scorers ───────────────────────────────────────────────────
+    def measure_page_repetition(self, section_features: Dict[str, Dict]) -> Dict:
+        """
+        Cross-section repetition from per-section feature records.
+        Merges each section's page sketch (collected during extraction) and
+        never reads the texts. A section keeps at most PAGE_SKETCH n-grams —
+        those with the smallest hashes — so a repeated n-gram is seen when
+        its hash falls inside every sharing section's sketch. Sections that
+        fit in the sketch are compared exactly; for longer ones the number of
+        shared n-grams is estimated from the sampled fraction of hash space.
 
-    def _score_burstiness(self, text: str) -> Dict:
+        Returns:
+            {
+                sections: int,
+                openers:    [[opener, [section, ...]]],   # in 2+ sections
+                ngrams:     [[ngram, [section, ...]]],    # in 2+ sections, as sampled
+                shared_ngrams: int,                       # estimated count of repeated n-grams
+                structures: [[section, ...]],             # identical line shapes
+            }
         """
-        Score sentence length variance.
+        opener_sections: Dict[str, List[str]] = {}
+        ngram_sections: Dict[int, List[str]] = {}
+        shape_sections: Dict[str, List[str]] = {}
+        phrases: Dict[int, str] = {}
+        cutoffs: Dict[str, int] = {}
+        counted = 0
+        for name, features in section_features.items():
+            page = (features or {}).get("parallel_structure", {}).get("page")
+            if page is None or "ngram_count" not in page:
+                continue
+            counted += 1
+            for opener in page["openers"]:
+                opener_sections.setdefault(opener, []).append(name)
+            hashes = [_ngram_hash(phrase) for phrase in page["ngrams"]]
+            for h, phrase in zip(hashes, page["ngrams"]):
+                ngram_sections.setdefault(h, []).append(name)
+                phrases.setdefault(h, phrase)
+            # A full sketch samples hash space up to its largest hash
+            cutoffs[name] = max(hashes) + 1 if page["ngram_count"] > len(hashes) else _HASH_SPACE
+            if page["shape"]:
+                shape_sections.setdefault(page["shape"], []).append(name)
+
+        def shared(index):
+            return sorted(
+                ([key, names] for key, names in index.items() if len(names) >= 2),
+                key=lambda item: (-len(item[1]), item[0]),
+            )
+
+        repeated = {h: names for h, names in ngram_sections.items() if len(names) >= 2}
+        estimate = sum(_HASH_SPACE / min(cutoffs[name] for name in names) for names in repeated.values())
+
+        return {
+            "sections": counted,
+            "openers": shared(opener_sections),
+            "ngrams": shared({phrases[h]: names for h, names in repeated.items()}),
+            "shared_ngrams": round(estimate),
+            "structures": [names for _, names in shared(shape_sections)],
+        }
+
+    def dimension_fingerprints(self) -> Dict[str, str]:
+        """
+        Return {dimension: fingerprint}. A fingerprint changes when the
+        lexicon (or feature version) behind that dimension changes, so two
+        detectors with equal fingerprints extract identical features for it.
+        """
+        fingerprints = {}
+        for dim in self.DIMENSIONS:
+            h = hashlib.sha1(f"{dim}:{self.FEATURE_VERSION}".encode("utf-8"))
+            for attr in self.DIMENSION_LEXICONS.get(dim, ()):
+                for phrase in getattr(self, attr):
+                    h.update(b"\x00")
+                    h.update(phrase.encode("utf-8"))
+            fingerprints[dim] = h.hexdigest()[:16]
+        return fingerprints
+
+    # ─── Feature Extraction ──────────────────────────────────────────────────
+    # Each _measure_* returns raw measurements only. Score curves, weights and
+    # failure wording live in Pass1Policy (scoring_policy.py).
+
+    def _measure_burstiness(self, text: str) -> Dict:
+        """
+        Sentence length variance.
         Humans write with natural rhythm — short punchy sentences followed by
         longer explanatory ones. LLMs tend toward uniform medium-length sentences.
 
-        Burstiness = std_dev(lengths) / mean(lengths)
-        Target: > 0.60 (higher = more human-natural)
+        Burstiness = std_dev(lengths) / mean(lengths); None under 3 sentences.
         """
         sentences = self._split_sentences(text)
         if len(sentences) < 3:
-            return {
-                "score": 0.70,
-                "burstiness": None,
-                "note": "Too few sentences to score meaningfully",
-                "sentence_count": len(sentences),
-            }
-
-        lengths = [len(s.split()) for s in sentences if s.strip()]
-        if len(lengths) < 2:
-            return {"score": 0.70, "burstiness": None, "note": "Insufficient sentences"}
+            return {"sentence_count": len(sentences), "burstiness": None}
 
+        lengths = [len(s.split()) for s in sentences]
         mean_len = statistics.mean(lengths)
         std_dev = statistics.stdev(lengths)
-        burstiness = std_dev / mean_len if mean_len > 0 else 0
-
-        # Scoring: >0.80 = excellent, 0.60-0.80 = good, 0.40-0.60 = borderline, <0.40 = flat
-        if burstiness >= 0.80:
-            score = 1.0
-        elif burstiness >= 0.60:
-            score = 0.75 + (burstiness - 0.60) * 1.25
-        elif burstiness >= 0.40:
-            score = 0.40 + (burstiness - 0.40) * 1.75
-        else:
-            score = burstiness * 1.0  # 0-0.40 maps to 0-0.40
-
-        result = {
-            "score": round(min(1.0, score), 3),
-            "burstiness": round(burstiness, 3),
-            "mean_sentence_length": round(mean_len, 1),
-            "std_dev": round(std_dev, 1),
+        return {
             "sentence_count": len(lengths),
+            "burstiness": std_dev / mean_len if mean_len > 0 else 0,
+            "mean_length": mean_len,
+            "std_dev": std_dev,
         }
 
-        if burstiness < 0.60:
-            result["failure_reason"] = f"Sentence rhythm too uniform (burstiness: {burstiness:.2f}, target: >0.60)"
-            result["suggestion"] = (
-                "Vary sentence length more aggressively. Mix very short declaratives "
-                "(4-8 words) with longer explanatory sentences (20-30 words). "
-                "Flat, medium-length sentences signal AI generation."
-            )
-
-        return result
-
-    def _score_ai_isms(self, text: str) -> Dict:
-        """
-        Score absence of known AI-ism phrases.
-        More violations = lower score.
-        """
+    def _measure_ai_isms(self, text: str) -> Dict:
+        """Known AI-ism phrases present in the text."""
         text_lower = text.lower()
-        found = []
-
-        for phrase in self.AI_ISMS:
-            if phrase.lower() in text_lower:
-                found.append(phrase)
-
-        word_count = len(text.split())
-        # Normalize by document length (per 100 words)
-        density = (len(found) / max(1, word_count)) * 100
-
-        # 0 found = 1.0, each violation drops score
-        if len(found) == 0:
-            score = 1.0
-        elif len(found) == 1:
-            score = 0.75
-        elif len(found) == 2:
-            score = 0.55
-        elif len(found) == 3:
-            score = 0.40
-        else:
-            score = max(0.0, 0.40 - (len(found) - 3) * 0.10)
-
-        result = {
-            "score": round(score, 3),
-            "violations_found": len(found),
-            "flagged_phrases": found,
-            "density_per_100_words": round(density, 2),
+        return {
+            "found": [phrase for phrase in self.AI_ISMS if phrase.lower() in text_lower],
+            "word_count": len(text.split()),
         }
 
-        if found:
-            result["failure_reason"] = f"AI-ism phrases detected: {', '.join(found[:3])}"
-            result["suggestion"] = (
-                f"Remove or rewrite sections containing: {', '.join(found[:5])}. "
-                "These phrases appear at statistically elevated rates in LLM-generated text."
-            )
-
-        return result
-
-    def _score_parallel_structure(self, text: str) -> Dict:
+    def _measure_parallel_structure(self, text: str) -> Dict:
         """
-        Score for over-use of parallel list structures.
+        Parallel list structure.
         LLMs default to parallel bullet points with similar-length items.
         Humans use lists too, but with more structural variety.
 
-        Looks for: bulleted lists where all items have similar length,
-        sentences that start with the same word across multiple consecutive lines,
-        triple+ repetitions of the same sentence-opening pattern.
+        Measures bullet length uniformity (coefficient of variation) and the
+        most repeated sentence opener across lines. The same pass over the
+        words collects the section's page sketch — its most frequent sentence
+        openers, a bottom-k sample of its word n-grams and a digest of its
+        line shapes — which measure_page_repetition() compares across sections
+        without re-reading any text. The sketch is bounded by PAGE_SKETCH,
+        however long the section.
         """
         lines = [l.strip() for l in text.split("\n") if l.strip()]
 
-        # Check bullet list uniformity
         bullet_lines = [l for l in lines if l.startswith(("-", "*", "•", "·"))]
-        bullet_score = 1.0
-        uniformity_note = None
-
-        if len(bullet_lines) >= 3:
+        bullet_cv = None
+        if len(bullet_lines) >= 2:
             lengths = [len(l.split()) for l in bullet_lines]
-            if lengths:
-                mean_len = statistics.mean(lengths)
-                std_dev = statistics.stdev(lengths) if len(lengths) > 1 else 0
-                coefficient = std_dev / mean_len if mean_len > 0 else 0
-
-                if coefficient < 0.15 and len(bullet_lines) >= 4:
-                    bullet_score = 0.40
-                    uniformity_note = (
-                        f"{len(bullet_lines)} bullet items with very uniform length "
-                        f"(CV: {coefficient:.2f}). LLMs produce highly uniform lists."
-                    )
-                elif coefficient < 0.25:
-                    bullet_score = 0.65
-
-        # Check repeated sentence openers
+            mean_len = statistics.mean(lengths)
+            bullet_cv = statistics.stdev(lengths) / mean_len if mean_len > 0 else 0
+
         openers = []
+        sentence_openers = Counter()
+        ngrams = {}
+        shape = []
         for line in lines:
             words = line.split()
             if len(words) >= 3:
                 openers.append(words[0].lower())
 
-        opener_score = 1.0
-        opener_note = None
-        if len(openers) >= 3:
-            from collections import Counter
-            counts = Counter(openers)
-            most_common_word, most_common_count = counts.most_common(1)[0]
-            if most_common_count >= 4 and most_common_count / len(openers) > 0.40:
-                opener_score = 0.50
-                opener_note = (
-                    f"'{most_common_word}' starts {most_common_count} of {len(openers)} "
-                    "sentences. Repetitive sentence structure signals AI generation."
-                )
-
-        overall_score = min(bullet_score, opener_score)
-
-        result = {
-            "score": round(overall_score, 3),
-            "bullet_uniformity_score": round(bullet_score, 3),
-            "opener_repetition_score": round(opener_score, 3),
+            tokens = [w.strip(_TOKEN_PUNCT).lower() for w in words]
+            for i, word in enumerate(words):
+                if (i == 0 or words[i - 1].endswith((".", "!", "?"))) and i + 1 < len(words) \
+                        and tokens[i] and tokens[i + 1]:
+                    sentence_openers[f"{tokens[i]} {tokens[i + 1]}"] += 1
+            for phrase in self._line_ngrams(words, tokens):
+                ngrams[_ngram_hash(phrase)] = phrase
+            kind = "b" if line.startswith(("-", "*", "•", "·")) else "p"
+            shape.append(kind + ("s" if len(words) < 8 else "m" if len(words) < 20 else "l"))
+
+        features = {
             "bullet_count": len(bullet_lines),
+            "bullet_cv": bullet_cv,
+            "opener_count": len(openers),
+            "page": {
+                "openers": sorted(opener for opener, _ in sorted(
+                    sentence_openers.items(), key=lambda item: (-item[1], item[0]))[:self.PAGE_SKETCH]),
+                "ngrams": [ngrams[h] for h in heapq.nsmallest(self.PAGE_SKETCH, ngrams)],
+                "ngram_count": len(ngrams),
+                # One-line sections share the trivial shape; only multi-line ones count
+                "shape": (hashlib.blake2b(" ".join(shape).encode("ascii"), digest_size=8).hexdigest()
+                          if len(shape) >= 3 else None),
+            },
         }
+        if openers:
+            top_opener, top_count = Counter(openers).most_common(1)[0]
+            features["top_opener"] = top_opener
+            features["top_opener_count"] = top_count
+        return features
 
-        if uniformity_note:
-            result["failure_reason"] = uniformity_note
-        if opener_note:
-            result["failure_reason"] = (result.get("failure_reason", "") + " " + opener_note).strip()
-        if overall_score < 0.60:
-            result["suggestion"] = (
-                "Break parallel structure. Vary bullet item length substantially. "
-                "Mix sentence openers. Add structural variety: short declarative, "
-                "then longer explanatory, then specific example."
-            )
-
-        return result
-
-    def _score_hedge_density(self, text: str) -> Dict:
+    def _measure_hedge_density(self, text: str) -> Dict:
         """
-        Score the absence of hedging qualifiers.
+        Hedging qualifiers.
         LLMs hedge more than humans writing in a confident professional voice.
-        High hedge density = AI signal.
         """
         text_lower = text.lower()
-        word_count = len(text.split())
         found = []
-
         for hedge in self.HEDGE_WORDS:
             pattern = r'\b' + re.escape(hedge) + r'\b'
-            matches = re.findall(pattern, text_lower)
-            found.extend(matches)
-
-        density = (len(found) / max(1, word_count)) * 100
-
-        # Per 100 words: 0-1 = excellent, 1-2 = acceptable, 2-3 = borderline, >3 = fail
-        if density <= 1.0:
-            score = 1.0
-        elif density <= 2.0:
-            score = 0.80
-        elif density <= 3.0:
-            score = 0.55
-        elif density <= 4.0:
-            score = 0.35
-        else:
-            score = 0.20
+            found.extend(re.findall(pattern, text_lower))
 
-        result = {
-            "score": round(score, 3),
+        return {
             "hedge_count": len(found),
-            "density_per_100_words": round(density, 2),
-            "examples": list(set(found))[:5],
+            "word_count": len(text.split()),
+            "examples": list(dict.fromkeys(found))[:5],
         }
 
-        if score < 0.60:
-            result["failure_reason"] = (
-                f"High hedge density: {density:.1f} qualifiers per 100 words "
-                f"(examples: {', '.join(list(set(found))[:3])})"
-            )
-            result["suggestion"] = (
-                "Remove qualifying language. State claims directly. Replace "
-                "'it may be worth considering X' with 'consider X'. "
-                "Hedges soften copy into AI-flavored mush."
-            )
-
-        return result
-
-    def _score_specificity(self, text: str) -> Dict:
+    def _measure_specificity(self, text: str) -> Dict:
         """
-        Score for concrete specificity.
+        Concrete specificity.
         LLMs make vague general claims; humans (and good copy) commit to specifics.
 
         Positive signals: numbers, model names, proper nouns, years, measurements
         Negative signals: vague quantity words without backing detail
         """
-        # Positive specificity markers
         number_pattern = r'\b\d+(?:,\d{3})*(?:\.\d+)?(?:\s*(?:mph|rpm|miles|km|years?|months?|hours?|%|lbs?|kg|sq\s*ft|PSI))?\b'
         numbers = re.findall(number_pattern, text, re.IGNORECASE)
 
@@ -456,99 +555,35 @@ class AIDetector:
             text, re.IGNORECASE
         )
 
-        word_count = max(1, len(text.split()))
-        specificity_density = (len(numbers) + len(proper_nouns)) / (word_count / 100)
-        vague_density = len(vague_quantities) / (word_count / 100)
-
-        # Score: high specificity + low vagueness = high score
-        if specificity_density >= 5 and vague_density <= 1:
-            score = 1.0
-        elif specificity_density >= 3 and vague_density <= 2:
-            score = 0.80
-        elif specificity_density >= 2 or (specificity_density >= 1 and vague_density <= 1):
-            score = 0.65
-        elif specificity_density >= 1:
-            score = 0.50
-        else:
-            score = 0.30
-
-        # Penalize for vague density regardless
-        if vague_density > 3:
-            score = max(0.20, score - 0.30)
-        elif vague_density > 2:
-            score = max(0.30, score - 0.15)
-
-        result = {
-            "score": round(score, 3),
-            "numbers_found": len(numbers),
-            "proper_nouns_found": len(proper_nouns),
-            "vague_quantity_words": len(vague_quantities),
-            "specificity_density": round(specificity_density, 2),
+        return {
+            "numbers": len(numbers),
+            "proper_nouns": len(proper_nouns),
+            "vague": len(vague_quantities),
+            "word_count": len(text.split()),
         }
 
-        if score < 0.60:
-            result["failure_reason"] = (
-                f"Copy lacks specificity (specificity density: {specificity_density:.1f}/100 words, "
-                f"vague terms: {len(vague_quantities)})"
-            )
-            result["suggestion"] = (
-                "Add concrete details: specific numbers, model names, years, measurements. "
-                "Replace 'many years of experience' with '18 years'. "
-                "Replace 'a wide range of services' with the actual service names."
-            )
-
-        return result
-
-    def _score_transition_tells(self, text: str) -> Dict:
-        """
-        Score for overuse of formal transition words that LLMs favor.
-        """
+    def _measure_transition_tells(self, text: str) -> Dict:
+        """Formal transition words that LLMs favor, as [phrase, count] pairs."""
         text_lower = text.lower()
-        word_count = max(1, len(text.split()))
         found = []
-
         for transition in self.FORMAL_TRANSITIONS:
             pattern = r'\b' + re.escape(transition) + r'\b'
             matches = re.findall(pattern, text_lower)
             if matches:
-                found.append((transition, len(matches)))
-
-        total_transitions = sum(count for _, count in found)
-        density = (total_transitions / word_count) * 100
-
-        if density <= 0.5:
-            score = 1.0
-        elif density <= 1.0:
-            score = 0.80
-        elif density <= 2.0:
-            score = 0.60
-        elif density <= 3.0:
-            score = 0.40
-        else:
-            score = 0.20
-
-        result = {
-            "score": round(score, 3),
-            "transition_count": total_transitions,
-            "density_per_100_words": round(density, 2),
-            "examples": [phrase for phrase, _ in found[:4]],
-        }
+                found.append([transition, len(matches)])
 
-        if score < 0.60:
-            result["failure_reason"] = (
-                f"Overuse of formal transitions: {', '.join([p for p, _ in found[:3]])} "
-                f"({density:.1f} per 100 words)"
-            )
-            result["suggestion"] = (
-                "Remove formal transitions. Let ideas connect naturally without 'Furthermore,' "
-                "'Moreover,' 'In conclusion.' These words are AI tells. "
-                "Use em-free direct connection or start a new sentence."
-            )
-
-        return result
+        return {"found": found, "word_count": len(text.split())}
 
     # ─── Utilities ───────────────────────────────────────────────────────────
 
+    def _line_ngrams(self, words: List[str], tokens: List[str] = None) -> List[str]:
+        """Word n-grams (PAGE_NGRAM long, lowercased, punctuation stripped) of one line."""
+        if tokens is None:
+            tokens = [w.strip(_TOKEN_PUNCT).lower() for w in words]
+        tokens = [t for t in tokens if t]
+        n = self.PAGE_NGRAM
+        return [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences. Handles abbreviations reasonably."""
         # Split on . ! ? followed by space and uppercase (rough but effective)
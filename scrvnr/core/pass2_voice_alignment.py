@@ -21,19 +21,31 @@ Each dimension scores 0.0–1.0.
 Overall Pass 2 score = weighted composite.
 Threshold for pass: configurable, default 0.60.
 
+Scoring runs in two stages: extract_features() measures the text once;
+a Pass2Policy (scoring_policy.py) scores the record against the profile
+targets. Tolerances, curves and weights live in the policy.
+
 Usage:
     profile = json.load(open("profiles/gad-main.json"))
     aligner = VoiceAligner(profile)
     result = aligner.analyze_section(text, section_name="hero")
+
+    # Which of many profiles does a draft fit best?
+    profile_set = VoiceAligner.compile_profiles(profiles)
+    ranked = profile_set.rank(text, top=5)
 """
 
 import re
 import math
+import time
 import json
 import statistics
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from profile_validator import validate_profile
+from scoring_policy import Pass2Policy
+
 
 class VoiceAligner:
     """
@@ -41,16 +53,32 @@ class VoiceAligner:
     Profile-driven — different clients, different baselines.
     """
 
-    PASS_THRESHOLD = 0.60
+    PASS_THRESHOLD = Pass2Policy.DEFAULTS["pass_threshold"]
+
+    # Bump when feature measurement changes so cached feature records are invalidated.
+    # Policy changes never need a bump — they do not touch stored features.
+    FEATURE_VERSION = 1
 
-    def __init__(self, profile: Dict, pass_threshold: float = None):
+    # Register markers (substring matches, counted once each)
+    FORMAL_MARKERS = ["however", "therefore", "furthermore", "regarding", "pursuant"]
+    CASUAL_MARKERS = ["it's", "you'll", "gonna", "don't", "won't", "can't", "here's"]
+    WARM_MARKERS = ["you", "your", "we", "our", "together", "help", "care"]
+    COLD_MARKERS = ["the client", "the customer", "users", "end users", "personnel"]
+
+    def __init__(self, profile: Dict, pass_threshold: float = None, policy: Pass2Policy = None):
         """
         Args:
             profile: Loaded voice profile dict (from voice_profile_schema.json)
-            pass_threshold: Override default pass threshold
+            pass_threshold: Override the policy's pass threshold
+            policy: Scoring policy (tolerances, curves, weights).
+                    Defaults to Pass2Policy().
+
+        Raises:
+            ProfileValidationError: if the profile does not match the schema
         """
-        self.profile = profile
-        self.pass_threshold = pass_threshold or self.PASS_THRESHOLD
+        self.profile = validate_profile(profile)
+        self.policy = policy or Pass2Policy()
+        self.pass_threshold = pass_threshold or self.policy.pass_threshold
 
         # Pre-compile native construction patterns
         self._native_patterns = self._compile_patterns(
@@ -60,6 +88,7 @@ class VoiceAligner:
         self._negative_patterns = self._compile_patterns(
             profile.get("negative_space", {}).get("items", [])
         )
+        self._dimensions = self._active_dimensions()
 
     def analyze_section(self, text: str, section_name: str = "section") -> Dict:
         """
@@ -67,77 +96,58 @@ class VoiceAligner:
 
         Returns per-section scoring with specific alignment failures.
         """
+        return self.score_features(self.extract_features(text), section_name)
+
+    def extract_features(self, text: str, timer=None) -> Optional[Dict[str, Dict]]:
+        """
+        Stage one: measure the raw features for every dimension this profile
+        defines. Returns {dimension: {...}}, or None for empty text.
+        With a StageTimer, each dimension's time is added as "pass2.<dim>".
+
+        Phrase hits (native constructions, negative space) are matched against
+        this profile's patterns, so a record is only valid for the profile
+        content it was extracted with.
+        """
         text = text.strip()
         if not text:
+            return None
+        if timer is None:
+            return {dim: self.measure_dimension(dim, text) for dim in self._dimensions}
+        features = {}
+        for dim in self._dimensions:
+            t0 = time.perf_counter()
+            features[dim] = self.measure_dimension(dim, text)
+            timer.add("pass2." + dim, time.perf_counter() - t0)
+        return features
+
+    def measure_dimension(self, dimension: str, text: str) -> Dict:
+        """Measure one dimension's raw features on already-stripped text."""
+        return getattr(self, "_measure_" + dimension)(text)
+
+    def score_features(self, features: Optional[Dict[str, Dict]], section_name: str = "section",
+                       policy: Pass2Policy = None) -> Dict:
+        """
+        Stage two: score a feature record against the profile targets under a
+        policy (this aligner's by default). Never reads text.
+        """
+        if features is None:
             return self._empty_result(section_name)
-
-        dimensions = {}
-
-        # Reading level (if profile has target)
-        rl = self.profile.get("reading_level", {})
-        if rl.get("target_min") is not None or rl.get("target_max") is not None:
-            dimensions["reading_level"] = self._score_reading_level(text, rl)
-
-        # Sentence rhythm (burstiness)
-        sr = self.profile.get("sentence_rhythm", {})
-        if sr.get("burstiness_score") is not None:
-            dimensions["sentence_rhythm"] = self._score_rhythm(text, sr)
-
-        # Contraction rate
-        cr = self.profile.get("contraction_rate", {})
-        if cr.get("target_min") is not None or cr.get("measured") is not None:
-            dimensions["contraction_rate"] = self._score_contractions(text, cr)
-
-        # Specificity
-        ts = self.profile.get("technical_specificity", {})
-        if ts.get("target"):
-            dimensions["specificity"] = self._score_specificity(text, ts)
-
-        # Register (formality / warmth)
-        reg = self.profile.get("register", {})
-        if reg.get("formality_score") is not None:
-            dimensions["register"] = self._score_register(text, reg)
-
-        # Native constructions
-        nc = self.profile.get("native_constructions", {})
-        if nc.get("items"):
-            dimensions["native_constructions"] = self._score_native_constructions(text, nc)
-
-        # Negative space violations
-        ns = self.profile.get("negative_space", {})
-        if ns.get("items"):
-            dimensions["negative_space"] = self._score_negative_space(text, ns)
-
         # If profile is sparse (new/incomplete), score leniently
-        if not dimensions:
+        if not features:
             return self._sparse_profile_result(section_name)
 
-        # Weights — native constructions and contraction rate are highest signal
-        weights = {
-            "reading_level": 0.15,
-            "sentence_rhythm": 0.15,
-            "contraction_rate": 0.20,
-            "specificity": 0.10,
-            "register": 0.10,
-            "native_constructions": 0.20,
-            "negative_space": 0.10,
-        }
-
-        # Normalize weights to what's actually scored
-        active_weights = {k: v for k, v in weights.items() if k in dimensions}
-        total_weight = sum(active_weights.values())
-        if total_weight == 0:
-            total_weight = 1.0
+        if policy is None or policy is self.policy:
+            policy, threshold = self.policy, self.pass_threshold
+        else:
+            threshold = policy.pass_threshold
 
-        overall_score = sum(
-            dimensions[dim]["score"] * (active_weights[dim] / total_weight)
-            for dim in dimensions
-        )
+        dimensions = policy.score(features, self.profile)
+        overall_score = policy.composite(dimensions)
 
         failures = []
         suggestions = []
         for dim, result in dimensions.items():
-            if result["score"] < 0.60:
+            if result["score"] < policy.dimension_fail_threshold:
                 if result.get("failure_reason"):
                     failures.append(result["failure_reason"])
                 if result.get("suggestion"):
@@ -150,22 +160,40 @@ class VoiceAligner:
             "section": section_name,
             "profile_used": profile_id,
             "brand": brand,
-            "pass": overall_score >= self.pass_threshold,
+            "pass": overall_score >= threshold,
             "overall_score": round(overall_score, 3),
-            "threshold": self.pass_threshold,
+            "threshold": threshold,
             "dimensions": dimensions,
             "failures": failures,
             "suggestions": suggestions,
         }
 
-    def analyze_document(self, sections: Dict[str, str]) -> Dict:
+    @staticmethod
+    def compile_profiles(profiles: List[Dict], policy: Pass2Policy = None) -> "CompiledProfileSet":
+        """
+        Compile many profiles for one-text-against-N scoring.
+        See profile_set.CompiledProfileSet.rank().
+        """
+        from profile_set import CompiledProfileSet
+        return CompiledProfileSet(profiles, policy=policy)
+
+    def analyze_document(self, sections: Dict[str, str], timer=None) -> Dict:
         """
         Analyze multiple sections. Returns aggregate with per-section breakdown.
+        An optional StageTimer records per-dimension measurement and scoring time.
         """
         section_results = {}
         for name, text in sections.items():
-            section_results[name] = self.analyze_section(text, name)
+            if timer is None:
+                section_results[name] = self.analyze_section(text, name)
+            else:
+                features = self.extract_features(text, timer)
+                with timer.stage("pass2.score"):
+                    section_results[name] = self.score_features(features, name)
+        return self.summarize_document(section_results)
 
+    def summarize_document(self, section_results: Dict[str, Dict]) -> Dict:
+        """The document record from already-scored sections (analyze_document's return value)."""
         passed = [k for k, v in section_results.items() if v["pass"]]
         failed = [k for k, v in section_results.items() if not v["pass"]]
         scores = [v["overall_score"] for v in section_results.values()]
@@ -181,271 +209,84 @@ class VoiceAligner:
             "failed_sections": failed,
         }
 
-    # ─── Dimension Scorers ───────────────────────────────────────────────────
-
-    def _score_reading_level(self, text: str, profile_rl: Dict) -> Dict:
-        """
-        Score reading level alignment using Flesch-Kincaid approximation.
-        """
-        fk = self._estimate_fk_grade(text)
-        target_min = profile_rl.get("target_min")
-        target_max = profile_rl.get("target_max")
-        tolerance = profile_rl.get("tolerance", 1.5)
-
-        # If only measured (no explicit target range), derive range from measured
-        if target_min is None and target_max is None:
-            measured_profile = profile_rl.get("flesch_kincaid_grade")
-            if measured_profile:
-                target_min = measured_profile - tolerance
-                target_max = measured_profile + tolerance
-            else:
-                return {"score": 0.80, "note": "No reading level target in profile"}
-
-        # Score by distance from acceptable range
-        if target_min <= fk <= target_max:
-            score = 1.0
-        elif fk < target_min:
-            distance = target_min - fk
-            score = max(0.0, 1.0 - (distance / tolerance))
-        else:
-            distance = fk - target_max
-            score = max(0.0, 1.0 - (distance / tolerance))
-
-        result = {
-            "score": round(score, 3),
-            "measured_grade": round(fk, 1),
-            "target_min": target_min,
-            "target_max": target_max,
+    def _active_dimensions(self) -> List[str]:
+        """Dimensions the profile has targets for, in scoring order."""
+        p = self.profile
+        rl = p.get("reading_level", {})
+        sr = p.get("sentence_rhythm", {})
+        cr = p.get("contraction_rate", {})
+        active = {
+            "reading_level": rl.get("target_min") is not None or rl.get("target_max") is not None,
+            "sentence_rhythm": sr.get("burstiness_score") is not None,
+            "contraction_rate": cr.get("target_min") is not None or cr.get("measured") is not None,
+            "specificity": bool(p.get("technical_specificity", {}).get("target")),
+            "register": p.get("register", {}).get("formality_score") is not None,
+            "native_constructions": bool(p.get("native_constructions", {}).get("items")),
+            "negative_space": bool(p.get("negative_space", {}).get("items")),
         }
+        return [dim for dim in Pass2Policy.DEFAULTS["weights"] if active[dim]]
 
-        if score < 0.60:
-            direction = "too complex" if fk > target_max else "too simple"
-            result["failure_reason"] = (
-                f"Reading level {direction} (grade {fk:.1f}, target: {target_min}-{target_max})"
-            )
-            result["suggestion"] = (
-                f"{'Simplify sentence structure and vocabulary' if fk > target_max else 'Add more technical detail and complexity'} "
-                f"to reach target reading level {target_min:.0f}-{target_max:.0f}."
-            )
-
-        return result
+    # ─── Feature Extraction ──────────────────────────────────────────────────
+    # Each _measure_* returns raw measurements only. Tolerances, curves and
+    # failure wording live in Pass2Policy (scoring_policy.py).
 
-    def _score_rhythm(self, text: str, profile_sr: Dict) -> Dict:
-        """
-        Score sentence rhythm (burstiness) alignment against profile.
-        """
-        target_burstiness = profile_sr.get("burstiness_score")
-        tolerance = 0.15  # Allow ±0.15 variance from profile
+    def _measure_reading_level(self, text: str) -> Dict:
+        """Flesch-Kincaid grade approximation."""
+        return {"fk_grade": self._estimate_fk_grade(text)}
 
+    def _measure_sentence_rhythm(self, text: str) -> Dict:
+        """Burstiness (std_dev / mean sentence length); None under 3 sentences."""
         sentences = self._split_sentences(text)
         if len(sentences) < 3:
-            return {"score": 0.75, "note": "Too few sentences to score rhythm"}
-
-        lengths = [len(s.split()) for s in sentences if s.strip()]
-        if len(lengths) < 2:
-            return {"score": 0.75, "note": "Insufficient sentence data"}
+            return {"sentence_count": len(sentences), "burstiness": None}
 
+        lengths = [len(s.split()) for s in sentences]
         mean_len = statistics.mean(lengths)
         std_dev = statistics.stdev(lengths)
-        measured_burstiness = std_dev / mean_len if mean_len > 0 else 0
-
-        distance = abs(measured_burstiness - target_burstiness)
-        score = max(0.0, 1.0 - (distance / (tolerance * 2)))
-
-        result = {
-            "score": round(score, 3),
-            "measured_burstiness": round(measured_burstiness, 3),
-            "target_burstiness": target_burstiness,
-            "distance": round(distance, 3),
-        }
-
-        if score < 0.60:
-            direction = "too varied" if measured_burstiness > target_burstiness else "too uniform"
-            result["failure_reason"] = (
-                f"Sentence rhythm {direction} (measured: {measured_burstiness:.2f}, "
-                f"profile target: {target_burstiness:.2f})"
-            )
-            result["suggestion"] = (
-                f"This brand voice has burstiness {target_burstiness:.2f}. "
-                f"{'Reduce extreme sentence length variation' if measured_burstiness > target_burstiness else 'Add more variety in sentence length'}."
-            )
-
-        return result
-
-    def _score_contractions(self, text: str, profile_cr: Dict) -> Dict:
-        """
-        Score contraction rate alignment against profile target.
-        """
-        target = profile_cr.get("target_min") or profile_cr.get("measured")
-        target_max = profile_cr.get("target_max")
-        tolerance = profile_cr.get("tolerance", 0.10)
-
-        if target is None:
-            return {"score": 0.80, "note": "No contraction target in profile"}
-
-        measured = self._measure_contraction_rate(text)
-
-        if target_max and measured <= target_max and measured >= target:
-            score = 1.0
-        else:
-            distance = abs(measured - target)
-            score = max(0.0, 1.0 - (distance / (tolerance * 2)))
-
-        result = {
-            "score": round(score, 3),
-            "measured": round(measured, 3),
-            "target": target,
-            "tolerance": tolerance,
+        return {
+            "sentence_count": len(lengths),
+            "burstiness": std_dev / mean_len if mean_len > 0 else 0,
         }
 
-        if score < 0.60:
-            direction = "too formal" if measured < target else "too casual"
-            result["failure_reason"] = (
-                f"Contraction rate {direction} ({measured:.0%} vs. profile target {target:.0%})"
-            )
-            result["suggestion"] = (
-                f"{'Add contractions' if measured < target else 'Reduce contractions'} "
-                f"to match brand voice (target: {target:.0%})."
-            )
+    def _measure_contraction_rate(self, text: str) -> Dict:
+        return {"measured": self._contraction_rate(text)}
 
-        return result
-
-    def _score_specificity(self, text: str, profile_ts: Dict) -> Dict:
-        """
-        Score specificity level alignment.
-        Levels: low | moderate | high | very-high
-        """
-        target_level = profile_ts.get("target", "moderate")
-        level_map = {"low": 1, "moderate": 2, "high": 3, "very-high": 4}
-        target_numeric = level_map.get(target_level, 2)
-
-        # Measure specificity from text
+    def _measure_specificity(self, text: str) -> Dict:
+        """Numbers, proper nouns and model names (e.g. E46, 335i -> M3)."""
         numbers = re.findall(r'\b\d+(?:\.\d+)?\b', text)
         proper_nouns = re.findall(
             r'(?<![.!?]\s)\b[A-Z][a-z]{2,}\b', text
         )
         model_names = re.findall(r'\b[A-Z][0-9]+\b|\b[A-Z]{2,}[0-9]+\b', text)
-        word_count = max(1, len(text.split()))
-
-        specificity_density = (len(numbers) + len(proper_nouns) + len(model_names) * 2) / (word_count / 100)
-
-        if specificity_density >= 8:
-            measured_numeric = 4
-            measured_level = "very-high"
-        elif specificity_density >= 5:
-            measured_numeric = 3
-            measured_level = "high"
-        elif specificity_density >= 2:
-            measured_numeric = 2
-            measured_level = "moderate"
-        else:
-            measured_numeric = 1
-            measured_level = "low"
-
-        distance = abs(measured_numeric - target_numeric)
-        score = max(0.0, 1.0 - distance * 0.33)
-
-        result = {
-            "score": round(score, 3),
-            "measured_level": measured_level,
-            "target_level": target_level,
-            "specificity_density": round(specificity_density, 2),
+        return {
+            "numbers": len(numbers),
+            "proper_nouns": len(proper_nouns),
+            "model_names": len(model_names),
+            "word_count": len(text.split()),
         }
 
-        if score < 0.60:
-            direction = "too vague" if measured_numeric < target_numeric else "too technical"
-            result["failure_reason"] = (
-                f"Specificity {direction} (measured: {measured_level}, profile target: {target_level})"
-            )
-            result["suggestion"] = (
-                f"This brand voice commits to {target_level} specificity. "
-                f"{'Add specific numbers, model names, and technical details' if measured_numeric < target_numeric else 'Reduce technical jargon for broader accessibility'}."
-            )
-
-        return result
-
-    def _score_register(self, text: str, profile_reg: Dict) -> Dict:
-        """
-        Score formality and warmth register alignment.
-        """
-        target_formality = profile_reg.get("formality_score")
-        target_warmth = profile_reg.get("warmth_score")
-
-        if target_formality is None and target_warmth is None:
-            return {"score": 0.80, "note": "No register targets in profile"}
-
-        scores = []
-
-        # Formality estimation
-        if target_formality is not None:
-            formal_markers = ["however", "therefore", "furthermore", "regarding", "pursuant"]
-            casual_markers = ["it's", "you'll", "gonna", "don't", "won't", "can't", "here's"]
-            text_lower = text.lower()
-            formal_count = sum(1 for w in formal_markers if w in text_lower)
-            casual_count = sum(1 for w in casual_markers if w in text_lower)
-
-            if casual_count > formal_count:
-                estimated_formality = max(1, 5 - (casual_count - formal_count))
-            else:
-                estimated_formality = min(10, 5 + (formal_count - casual_count))
-
-            formality_distance = abs(estimated_formality - target_formality)
-            formality_score = max(0.0, 1.0 - formality_distance / 5.0)
-            scores.append(formality_score)
-
-        # Warmth estimation (second-person usage, direct address, inclusive language)
-        if target_warmth is not None:
-            warm_markers = ["you", "your", "we", "our", "together", "help", "care"]
-            cold_markers = ["the client", "the customer", "users", "end users", "personnel"]
-            text_lower = text.lower()
-            warm_count = sum(1 for w in warm_markers if w in text_lower)
-            cold_count = sum(1 for w in cold_markers if w in text_lower)
-
-            if warm_count > cold_count:
-                estimated_warmth = min(10, 5 + (warm_count - cold_count))
-            else:
-                estimated_warmth = max(1, 5 - (cold_count - warm_count))
-
-            warmth_distance = abs(estimated_warmth - target_warmth)
-            warmth_score = max(0.0, 1.0 - warmth_distance / 5.0)
-            scores.append(warmth_score)
-
-        overall_score = statistics.mean(scores) if scores else 0.80
-
-        result = {
-            "score": round(overall_score, 3),
+    def _measure_register(self, text: str) -> Dict:
+        """Formality and warmth marker counts."""
+        text_lower = text.lower()
+        return {
+            "formal": sum(1 for w in self.FORMAL_MARKERS if w in text_lower),
+            "casual": sum(1 for w in self.CASUAL_MARKERS if w in text_lower),
+            "warm": sum(1 for w in self.WARM_MARKERS if w in text_lower),
+            "cold": sum(1 for w in self.COLD_MARKERS if w in text_lower),
         }
-        if target_formality is not None:
-            result["formality_estimated"] = estimated_formality
-            result["formality_target"] = target_formality
-        if target_warmth is not None:
-            result["warmth_estimated"] = estimated_warmth
-            result["warmth_target"] = target_warmth
-
-        if overall_score < 0.60:
-            result["failure_reason"] = "Register (formality/warmth) doesn't match brand voice"
-            result["suggestion"] = (
-                f"Adjust tone toward profile targets: "
-                f"formality {target_formality}/10, warmth {target_warmth}/10."
-            )
 
-        return result
-
-    def _score_native_constructions(self, text: str, profile_nc: Dict) -> Dict:
+    def _measure_native_constructions(self, text: str) -> Dict:
         """
-        Score presence of native voice constructions from profile.
+        Which of the profile's high-confidence native constructions appear.
         These are phrases and structures characteristic of this specific brand.
         """
-        items = profile_nc.get("items", [])
-        if not items:
-            return {"score": 0.80, "note": "No native constructions defined in profile"}
-
+        profile_nc = self.profile.get("native_constructions", {})
         confidence_threshold = profile_nc.get("confidence_threshold", 0.70)
         text_lower = text.lower()
 
         found = []
         missed = []
-        for item in items:
+        for item in profile_nc.get("items", []):
             pattern_text = item if isinstance(item, str) else item.get("pattern", "")
             confidence = 1.0 if isinstance(item, str) else item.get("confidence", 1.0)
 
@@ -454,86 +295,17 @@ class VoiceAligner:
                     found.append(pattern_text)
                 else:
                     missed.append(pattern_text)
+        return {"found": found, "missed": missed}
 
-        total_high_confidence = len(found) + len(missed)
-        if total_high_confidence == 0:
-            return {"score": 0.80, "note": "No high-confidence constructions to match"}
-
-        hit_rate = len(found) / total_high_confidence
-
-        # Scoring: not every section will use every pattern.
-        # Expect 15-30% hit rate as baseline good performance.
-        if hit_rate >= 0.30:
-            score = 1.0
-        elif hit_rate >= 0.20:
-            score = 0.85
-        elif hit_rate >= 0.10:
-            score = 0.70
-        elif hit_rate >= 0.05:
-            score = 0.55
-        else:
-            score = 0.40
-
-        result = {
-            "score": round(score, 3),
-            "patterns_found": len(found),
-            "patterns_checked": total_high_confidence,
-            "hit_rate": round(hit_rate, 3),
-            "found_examples": found[:3],
-            "missed_examples": missed[:3],
-        }
-
-        if score < 0.60 and len(found) == 0:
-            result["failure_reason"] = (
-                f"No native brand constructions detected (0/{total_high_confidence} patterns matched)"
-            )
-            result["suggestion"] = (
-                f"This brand voice uses characteristic patterns. Consider: "
-                f"{', '.join(missed[:3])}"
-            )
-
-        return result
-
-    def _score_negative_space(self, text: str, profile_ns: Dict) -> Dict:
-        """
-        Score absence of patterns this brand voice never uses.
-        Finding a negative space pattern is a hard fail signal.
-        """
-        items = profile_ns.get("items", [])
-        if not items:
-            return {"score": 1.0, "note": "No negative space defined — skipped"}
-
+    def _measure_negative_space(self, text: str) -> Dict:
+        """Which patterns this brand voice never uses appear in the text."""
         text_lower = text.lower()
         violations = []
-
-        for item in items:
+        for item in self.profile.get("negative_space", {}).get("items", []):
             pattern_text = item if isinstance(item, str) else item.get("pattern", "")
             if pattern_text.lower() in text_lower:
                 violations.append(pattern_text)
-
-        if len(violations) == 0:
-            score = 1.0
-        elif len(violations) == 1:
-            score = 0.50
-        else:
-            score = 0.20
-
-        result = {
-            "score": round(score, 3),
-            "violations": violations,
-            "violation_count": len(violations),
-        }
-
-        if violations:
-            result["failure_reason"] = (
-                f"Negative space violations — brand would never say: {', '.join(violations[:3])}"
-            )
-            result["suggestion"] = (
-                f"Remove or rewrite sections containing: {', '.join(violations)}. "
-                "These patterns are explicitly out of character for this brand voice."
-            )
-
-        return result
+        return {"violations": violations}
 
     # ─── Utilities ───────────────────────────────────────────────────────────
 
@@ -579,7 +351,7 @@ class VoiceAligner:
             count = max(1, count - 1)
         return max(1, count)
 
-    def _measure_contraction_rate(self, text: str) -> float:
+    def _contraction_rate(self, text: str) -> float:
         """Measure fraction of eligible positions where contractions appear."""
         contractions = [
             "it's", "you'll", "here's", "that's", "don't", "won't", "can't",
@@ -0,0 +1,359 @@
+"""
+GHM SCRVNR — Multi-Profile Scoring
+====================================
+Scores one text against many voice profiles at once and ranks them.
+
+Agencies reuse drafts across sister brands; the question is which of N
+profiles a draft fits best. Building N VoiceAligners and re-analyzing the
+text N times repeats the same text measurements N times. Instead:
+
+  1. The text is measured once: FK grade, burstiness, contraction rate,
+     specificity density, register markers (profile-independent).
+  2. Every profile's native-construction and negative-space patterns are
+     merged into one union phrase table at compile time. The text is
+     checked against each distinct phrase once.
+  3. Profile targets are compiled into column arrays. With NumPy, all N
+     profiles are scored in one vectorized step (phrase counts are an
+     incidence-matrix product). Without NumPy, each profile is scored by
+     its Pass2Policy from the shared measurements — still no re-reading.
+
+Both paths score through Pass2Policy's own target resolution and curves
+(the vectorized path passes target columns where VoiceAligner passes one
+profile's numbers), so scores match VoiceAligner.analyze_section for each
+profile.
+
+Usage:
+    profile_set = CompiledProfileSet.from_directory("scrvnr/profiles")
+    ranked = profile_set.rank(draft_text, top=5)
+    # [{"profile_id": "gad-main", "score": 0.84, "pass": True, "dimensions": {...}}, ...]
+
+CLI:
+    python profile_set.py <draft.txt> [profiles_dir] [--top 10]
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional — per-profile fallback below
+    np = None
+
+from pass2_voice_alignment import VoiceAligner
+from profile_validator import validate_profile
+from scoring_policy import Pass2Policy
+
+
+# Dimensions measured from the text alone (shared across every profile)
+TEXT_DIMENSIONS = ("reading_level", "sentence_rhythm", "contraction_rate", "specificity", "register")
+
+
+class CompiledProfileSet:
+    """
+    N voice profiles compiled for one-text-against-N scoring.
+    Build once (profiles change rarely), rank many drafts.
+    """
+
+    def __init__(self, profiles: List[Dict], policy: Pass2Policy = None, use_numpy: bool = None):
+        """
+        Args:
+            profiles:  Profile dicts (validated here)
+            policy:    Pass 2 scoring policy shared by every profile
+            use_numpy: Force the vectorized (True) or per-profile (False) path.
+                       Default: vectorized when NumPy is installed.
+
+        Raises:
+            ProfileValidationError: a profile does not match the schema
+        """
+        if use_numpy and np is None:
+            raise RuntimeError("NumPy is not installed")
+        self.policy = policy or Pass2Policy()
+        self.use_numpy = (np is not None) if use_numpy is None else use_numpy
+        self.aligners = [VoiceAligner(p, policy=self.policy) for p in profiles]
+        self.profile_ids = [p.get("profile_id", "unknown") for p in profiles]
+        self.dimensions = list(self.policy.weights)
+        self._measurer = VoiceAligner({})
+
+        # Union phrase table: distinct lowercased pattern -> column
+        self._phrases: Dict[str, int] = {}
+        self._native: List[List[tuple]] = []    # per profile: [(column, pattern)] passing confidence
+        self._negative: List[List[tuple]] = []  # per profile: [(column, pattern)]
+        for profile in profiles:
+            nc = profile.get("native_constructions", {})
+            threshold = nc.get("confidence_threshold", 0.70)
+            native = []
+            for item in nc.get("items", []):
+                pattern = item if isinstance(item, str) else item.get("pattern", "")
+                confidence = 1.0 if isinstance(item, str) else item.get("confidence", 1.0)
+                if confidence >= threshold:
+                    native.append((self._column(pattern), pattern))
+            self._native.append(native)
+            self._negative.append([
+                (self._column(pattern), pattern)
+                for pattern in (
+                    item if isinstance(item, str) else item.get("pattern", "")
+                    for item in profile.get("negative_space", {}).get("items", [])
+                )
+            ])
+        self._phrase_list = list(self._phrases)
+
+        if self.use_numpy:
+            self._compile_arrays()
+
+    def __len__(self) -> int:
+        return len(self.aligners)
+
+    @classmethod
+    def from_directory(cls, profiles_dir: str, policy: Pass2Policy = None, **kwargs) -> "CompiledProfileSet":
+        """Compile every *.json profile in a directory (files starting with "_" are skipped)."""
+        profiles = []
+        for path in sorted(Path(profiles_dir).glob("*.json")):
+            if path.name.startswith("_"):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                profiles.append(validate_profile(json.load(f)))
+        return cls(profiles, policy=policy, **kwargs)
+
+    @classmethod
+    def from_store(cls, store, policy: Pass2Policy = None, **kwargs) -> "CompiledProfileSet":
+        """Compile the current version of every profile in a ProfileStore."""
+        profiles = [store.get_by_id(pid) for pid in store.list_profiles()]
+        return cls(profiles, policy=policy, **kwargs)
+
+    # ─── Scoring ──────────────────────────────────────────────────────────────
+
+    def measure(self, text: str) -> Optional[Dict]:
+        """
+        Measure a text once for the whole set: text-only features plus one
+        hit flag per distinct phrase. None for empty text.
+        """
+        text = text.strip()
+        if not text:
+            return None
+        text_lower = text.lower()
+        return {
+            "text": {dim: self._measurer.measure_dimension(dim, text) for dim in TEXT_DIMENSIONS},
+            "hits": [phrase in text_lower for phrase in self._phrase_list],
+        }
+
+    def score_all(self, text: str) -> List[Dict]:
+        """Score the text against every profile, in compile order."""
+        measured = self.measure(text)
+        if measured is None or not self.aligners:
+            return []
+        if self.use_numpy:
+            return self._score_numpy(measured)
+        return self._score_python(measured)
+
+    def rank(self, text: str, top: int = None, min_score: float = None) -> List[Dict]:
+        """
+        Rank profiles by Pass 2 score for this text, best first.
+
+        Returns:
+            [{profile_id, brand, score, pass, sparse, dimensions: {dim: score}}]
+            Sparse profiles (no scoreable dimensions) get the lenient 0.80 and
+            sparse=True, mirroring VoiceAligner.
+        """
+        results = self.score_all(text)
+        if min_score is not None:
+            results = [r for r in results if r["score"] >= min_score]
+        results.sort(key=lambda r: (-r["score"], r["profile_id"]))
+        return results[:top] if top else results
+
+    # ─── Per-profile path ─────────────────────────────────────────────────────
+
+    def _score_python(self, measured: Dict) -> List[Dict]:
+        hits = measured["hits"]
+        results = []
+        for i, aligner in enumerate(self.aligners):
+            features = {}
+            for dim in aligner._dimensions:
+                if dim == "native_constructions":
+                    features[dim] = {
+                        "found": [p for col, p in self._native[i] if hits[col]],
+                        "missed": [p for col, p in self._native[i] if not hits[col]],
+                    }
+                elif dim == "negative_space":
+                    features[dim] = {"violations": [p for col, p in self._negative[i] if hits[col]]}
+                else:
+                    features[dim] = measured["text"][dim]
+            result = aligner.score_features(features, "rank")
+            results.append(self._entry(
+                i,
+                result["overall_score"],
+                result["pass"],
+                {dim: d["score"] for dim, d in result["dimensions"].items()},
+            ))
+        return results
+
+    # ─── Vectorized path ──────────────────────────────────────────────────────
+
+    def _compile_arrays(self):
+        """Profile targets as column arrays; NaN = not set."""
+        n = len(self.aligners)
+        nan = float("nan")
+        policy = self.policy
+        col = {dim: i for i, dim in enumerate(self.dimensions)}
+
+        active = np.zeros((n, len(self.dimensions)), dtype=bool)
+        rl_lo, rl_hi, rl_tol = np.full(n, -np.inf), np.full(n, np.inf), np.ones(n)
+        sr_target = np.full(n, nan)
+        cr_target, cr_max, cr_tol = np.full(n, nan), np.full(n, nan), np.ones(n)
+        ts_target = np.zeros(n)
+        reg_f, reg_w = np.full(n, nan), np.full(n, nan)
+
+        for i, aligner in enumerate(self.aligners):
+            p = aligner.profile
+            for dim in aligner._dimensions:
+                active[i, col[dim]] = True
+
+            # Targets resolve exactly as Pass2Policy.score_* resolves them
+            rl_range = policy.reading_level_range(p.get("reading_level", {}))
+            if rl_range is not None:
+                rl_lo[i], rl_hi[i], rl_tol[i] = rl_range
+
+            sr = p.get("sentence_rhythm", {})
+            if sr.get("burstiness_score") is not None:
+                sr_target[i] = sr["burstiness_score"]
+
+            target, cr_max[i], cr_tol[i] = policy.contraction_target(p.get("contraction_rate", {}))
+            if target is not None:
+                cr_target[i] = target
+
+            ts_target[i] = policy.specificity_target(p.get("technical_specificity", {}))
+
+            reg = p.get("register", {})
+            if reg.get("formality_score") is not None:
+                reg_f[i] = reg["formality_score"]
+            if reg.get("warmth_score") is not None:
+                reg_w[i] = reg["warmth_score"]
+
+        u = max(1, len(self._phrase_list))
+        native = np.zeros((n, u))
+        negative = np.zeros((n, u))
+        for i in range(n):
+            for column, _ in self._native[i]:
+                native[i, column] += 1
+            for column, _ in self._negative[i]:
+                negative[i, column] += 1
+
+        weights = np.array([policy.weights[d] for d in self.dimensions]) * active
+        totals = weights.sum(axis=1)
+
+        self._arrays = {
+            "active": active, "col": col,
+            "rl_lo": rl_lo, "rl_hi": rl_hi, "rl_tol": rl_tol,
+            "sr_target": sr_target,
+            "cr_target": cr_target, "cr_max": cr_max, "cr_tol": cr_tol,
+            "ts_target": ts_target,
+            "reg_f": reg_f, "reg_w": reg_w,
+            "native": native, "native_total": native.sum(axis=1), "negative": negative,
+            "weights": weights / np.where(totals > 0, totals, 1.0)[:, None],
+            "sparse": totals == 0,
+        }
+
+    def _score_numpy(self, measured: Dict) -> List[Dict]:
+        a = self._arrays
+        policy = self.policy
+        neutral = policy.config["neutral_score"]
+        t = measured["text"]
+        n = len(self.aligners)
+        scores = np.zeros((n, len(self.dimensions)))
+
+        # Every curve is Pass2Policy's own, applied to the target columns
+        scores[:, a["col"]["reading_level"]] = policy.reading_level_curve(
+            t["reading_level"]["fk_grade"], a["rl_lo"], a["rl_hi"], a["rl_tol"])
+
+        burstiness = t["sentence_rhythm"]["burstiness"]
+        if burstiness is None:
+            scores[:, a["col"]["sentence_rhythm"]] = policy.curve("sentence_rhythm")["few_sentences_score"]
+        else:
+            scores[:, a["col"]["sentence_rhythm"]] = policy.rhythm_curve(burstiness, a["sr_target"])
+
+        with np.errstate(invalid="ignore"):
+            contraction = policy.contraction_curve(
+                t["contraction_rate"]["measured"], a["cr_target"], a["cr_max"], a["cr_tol"])
+        scores[:, a["col"]["contraction_rate"]] = np.where(np.isnan(a["cr_target"]), neutral, contraction)
+
+        measured_level = Pass2Policy.LEVELS[policy.specificity_level(t["specificity"])[1]]
+        scores[:, a["col"]["specificity"]] = policy.specificity_curve(measured_level, a["ts_target"])
+
+        # Register: formality (and warmth when set) vs estimates from the text
+        est_formality, est_warmth = policy.register_estimates(t["register"])
+        formality = policy.register_curve(est_formality, a["reg_f"])
+        warmth = policy.register_curve(est_warmth, a["reg_w"])
+        scores[:, a["col"]["register"]] = np.where(np.isnan(a["reg_w"]), formality, (formality + warmth) / 2)
+
+        # Phrase dimensions: one incidence-matrix product each
+        hits = np.zeros(a["native"].shape[1])
+        hits[:len(measured["hits"])] = measured["hits"]
+        found = a["native"] @ hits
+        total = a["native_total"]
+        native_score = policy.native_curve(found / np.where(total > 0, total, 1.0))
+        scores[:, a["col"]["native_constructions"]] = np.where(total > 0, native_score, neutral)
+
+        violations = (a["negative"] @ hits).astype(int)
+        scores[:, a["col"]["negative_space"]] = policy.negative_space_curve(violations)
+
+        # Rounding and the composite stay in Python so scores match
+        # VoiceAligner.analyze_section exactly (NumPy rounds and sums differently).
+        results = []
+        for i, row in enumerate(scores.tolist()):
+            if a["sparse"][i]:
+                results.append(self._entry(i, 0.80, True, {}))
+                continue
+            dims = {
+                dim: round(row[j], 3)
+                for j, dim in enumerate(self.dimensions) if a["active"][i, j]
+            }
+            overall = self.policy.composite({dim: {"score": s} for dim, s in dims.items()})
+            results.append(self._entry(i, round(overall, 3), overall >= self.policy.pass_threshold, dims))
+        return results
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _column(self, pattern: str) -> int:
+        key = pattern.lower()
+        if key not in self._phrases:
+            self._phrases[key] = len(self._phrases)
+        return self._phrases[key]
+
+    def _entry(self, i: int, score: float, passed: bool, dimensions: Dict[str, float]) -> Dict:
+        aligner = self.aligners[i]
+        return {
+            "profile_id": self.profile_ids[i],
+            "brand": aligner.profile.get("brand_display_name", ""),
+            "score": score,
+            "pass": passed,
+            "sparse": not aligner._dimensions,
+            "dimensions": dimensions,
+        }
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rank voice profiles by how well a draft fits them.")
+    parser.add_argument("draft", help="Draft text file")
+    parser.add_argument("profiles_dir", nargs="?", default=str(Path(__file__).parent.parent / "profiles"))
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.draft, "r", encoding="utf-8") as f:
+        draft = f.read()
+
+    ranked = CompiledProfileSet.from_directory(args.profiles_dir).rank(draft, top=args.top)
+
+    if args.json:
+        print(json.dumps(ranked, indent=2))
+    else:
+        print(f"\n SCRVNR PROFILE FIT — {Path(args.draft).name}")
+        print("=" * 60)
+        for rank, r in enumerate(ranked, 1):
+            label = r["brand"] or r["profile_id"]
+            note = "  (sparse profile)" if r["sparse"] else ""
+            print(f"  {rank:>2}. {r['score']:.0%}  {'PASS' if r['pass'] else 'FAIL'}  {label}{note}")
@@ -0,0 +1,303 @@
+"""
+GHM SCRVNR — SQLite Profile Store
+===================================
+Optional versioned backend for voice profiles. One SQLite file replaces
+the loose JSON files in profiles/ for deployments with many tenants.
+
+Every write creates a new immutable version row. The current version per
+profile is tracked in a small head table, indexed by profile_id and by
+(client_slug, brand_slug), so lookups are B-tree O(log n) regardless of
+tenant count.
+
+Guarantees:
+  - Atomic updates: each put() runs in a single BEGIN IMMEDIATE transaction.
+  - Optimistic concurrency: put(expected_version=N) fails with
+    ProfileConflictError if someone else wrote version N+1 first.
+  - Idempotent writes: re-saving identical content does not add a version.
+  - Profiles are schema-validated before they are stored.
+
+Usage:
+    store = ProfileStore("scrvnr/profiles.db")
+    store.import_directory("scrvnr/profiles")
+
+    version = store.put(profile, note="DNA Lab re-capture")
+    profile = store.get("german-auto-doctor", "main")
+    profile = store.get_by_id("gad-main", version=1)
+    store.history("gad-main")
+
+    # In place of the profiles directory:
+    adapter = SCRVNRAdapter(profile_store=store)
+    profile = load_profile(None, "german-auto-doctor", "main", store=store)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from profile_validator import validate_profile
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS profiles (
+    profile_id      TEXT PRIMARY KEY,
+    client_slug     TEXT NOT NULL,
+    brand_slug      TEXT NOT NULL,
+    current_version INTEGER NOT NULL,
+    content_hash    TEXT NOT NULL,
+    updated_at      TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_profiles_client_brand
+    ON profiles (client_slug, brand_slug);
+
+CREATE TABLE IF NOT EXISTS profile_versions (
+    profile_id    TEXT NOT NULL,
+    version       INTEGER NOT NULL,
+    content_hash  TEXT NOT NULL,
+    locked_fields TEXT NOT NULL,
+    body          TEXT NOT NULL,
+    created_at    TEXT NOT NULL,
+    note          TEXT,
+    PRIMARY KEY (profile_id, version)
+);
+"""
+
+
+class ProfileConflictError(RuntimeError):
+    """Raised when put(expected_version=...) loses a concurrent update race."""
+
+
+class ProfileStore:
+    """
+    SQLite-backed, versioned voice profile store.
+    Safe to share across threads (one connection per thread) and processes
+    (SQLite WAL locking).
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA_SQL)
+
+    # ─── Reads ────────────────────────────────────────────────────────────────
+
+    def get(self, client_slug: str, brand_slug: str, version: int = None) -> Optional[Dict]:
+        """Return the profile for client/brand (current version by default), or None."""
+        row = self._conn().execute(
+            "SELECT profile_id FROM profiles WHERE client_slug = ? AND brand_slug = ?",
+            (client_slug, brand_slug),
+        ).fetchone()
+        if row is None:
+            return None
+        return self.get_by_id(row[0], version)
+
+    def get_by_id(self, profile_id: str, version: int = None) -> Optional[Dict]:
+        """Return the profile by profile_id (current version by default), or None."""
+        conn = self._conn()
+        if version is None:
+            row = conn.execute(
+                "SELECT v.body FROM profiles p JOIN profile_versions v "
+                "ON v.profile_id = p.profile_id AND v.version = p.current_version "
+                "WHERE p.profile_id = ?",
+                (profile_id,),
+            ).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT body FROM profile_versions WHERE profile_id = ? AND version = ?",
+                (profile_id, version),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def head(self, profile_id: str) -> Optional[Dict]:
+        """Return {version, content_hash, updated_at} for the current version, or None."""
+        row = self._conn().execute(
+            "SELECT current_version, content_hash, updated_at FROM profiles WHERE profile_id = ?",
+            (profile_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"version": row[0], "content_hash": row[1], "updated_at": row[2]}
+
+    def history(self, profile_id: str) -> List[Dict]:
+        """Return version metadata (newest first). Bodies are not included."""
+        rows = self._conn().execute(
+            "SELECT version, content_hash, locked_fields, created_at, note "
+            "FROM profile_versions WHERE profile_id = ? ORDER BY version DESC",
+            (profile_id,),
+        ).fetchall()
+        return [
+            {
+                "version": version,
+                "content_hash": content_hash,
+                "locked_fields": json.loads(locked_fields),
+                "created_at": created_at,
+                "note": note,
+            }
+            for version, content_hash, locked_fields, created_at, note in rows
+        ]
+
+    def list_profiles(self) -> List[str]:
+        """Return all profile_ids in the store."""
+        rows = self._conn().execute("SELECT profile_id FROM profiles ORDER BY profile_id").fetchall()
+        return [r[0] for r in rows]
+
+    # ─── Writes ───────────────────────────────────────────────────────────────
+
+    def put(self, profile: Dict, expected_version: int = None, note: str = None) -> int:
+        """
+        Store a profile as a new version. Returns the current version number.
+
+        Args:
+            profile:          Profile dict (must have profile_id, client_slug, brand_slug)
+            expected_version: If set, the write only succeeds when the stored
+                              current version still equals this value
+                              (0 = profile must not exist yet).
+            note:             Optional change note recorded with the version
+
+        Raises:
+            ProfileValidationError: profile does not match the schema
+            ProfileConflictError:   expected_version no longer current
+            ValueError:             identity fields missing
+        """
+        validate_profile(profile)
+        profile_id = profile.get("profile_id")
+        client_slug = profile.get("client_slug")
+        brand_slug = profile.get("brand_slug")
+        if not (profile_id and client_slug and brand_slug):
+            raise ValueError("Profile needs profile_id, client_slug and brand_slug to be stored")
+
+        body = json.dumps(profile, ensure_ascii=False, sort_keys=True)
+        content_hash = content_hash_of(profile)
+        locked_fields = json.dumps(profile.get("locked_fields", []))
+        now = datetime.utcnow().isoformat() + "Z"
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT current_version, content_hash FROM profiles WHERE profile_id = ?",
+                (profile_id,),
+            ).fetchone()
+            current_version, current_hash = row if row else (0, None)
+
+            if expected_version is not None and expected_version != current_version:
+                raise ProfileConflictError(
+                    f"Profile '{profile_id}' is at version {current_version}, "
+                    f"expected {expected_version}"
+                )
+            if current_hash == content_hash:
+                conn.execute("COMMIT")
+                return current_version
+
+            version = current_version + 1
+            conn.execute(
+                "INSERT INTO profile_versions "
+                "(profile_id, version, content_hash, locked_fields, body, created_at, note) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (profile_id, version, content_hash, locked_fields, body, now, note),
+            )
+            conn.execute(
+                "INSERT INTO profiles "
+                "(profile_id, client_slug, brand_slug, current_version, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(profile_id) DO UPDATE SET "
+                "client_slug = excluded.client_slug, brand_slug = excluded.brand_slug, "
+                "current_version = excluded.current_version, "
+                "content_hash = excluded.content_hash, updated_at = excluded.updated_at",
+                (profile_id, client_slug, brand_slug, version, content_hash, now),
+            )
+            conn.execute("COMMIT")
+            return version
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def import_directory(self, profiles_dir: str) -> List[str]:
+        """
+        Import every *.json profile in a directory (files starting with "_" are skipped).
+        Returns the imported profile_ids.
+        """
+        imported = []
+        for path in sorted(Path(profiles_dir).glob("*.json")):
+            if path.name.startswith("_"):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                profile = json.load(f)
+            self.put(profile, note=f"imported from {path.name}")
+            imported.append(profile["profile_id"])
+        return imported
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transactions are managed explicitly in put()
+            conn = sqlite3.connect(self.db_path, isolation_level=None,
+                                   timeout=self.BUSY_TIMEOUT_MS / 1000)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+
+def content_hash_of(profile: Dict) -> str:
+    """Stable sha256 of a profile's canonical JSON form."""
+    canonical = json.dumps(profile, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import sys
+
+    def _usage():
+        print("Usage:")
+        print("  python profile_store.py <store.db> import <profiles_dir>")
+        print("  python profile_store.py <store.db> list")
+        print("  python profile_store.py <store.db> history <profile_id>")
+        print("  python profile_store.py <store.db> export <profile_id> [version]")
+        sys.exit(1)
+
+    if len(sys.argv) < 3:
+        _usage()
+
+    store = ProfileStore(sys.argv[1])
+    command = sys.argv[2]
+
+    if command == "import" and len(sys.argv) > 3:
+        for profile_id in store.import_directory(sys.argv[3]):
+            head = store.head(profile_id)
+            print(f"  {profile_id}  v{head['version']}  {head['content_hash'][:12]}")
+    elif command == "list":
+        for profile_id in store.list_profiles():
+            head = store.head(profile_id)
+            print(f"  {profile_id}  v{head['version']}  updated {head['updated_at']}")
+    elif command == "history" and len(sys.argv) > 3:
+        for entry in store.history(sys.argv[3]):
+            print(f"  v{entry['version']}  {entry['created_at']}  {entry['content_hash'][:12]}  {entry['note'] or ''}")
+    elif command == "export" and len(sys.argv) > 3:
+        version = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        profile = store.get_by_id(sys.argv[3], version)
+        if profile is None:
+            print(f"Profile not found: {sys.argv[3]}")
+            sys.exit(1)
+        print(json.dumps(profile, indent=2, ensure_ascii=False))
+    else:
+        _usage()
@@ -0,0 +1,309 @@
+"""
+GHM SCRVNR — Voice Profile Validator
+======================================
+Validates voice profile dicts against voice_profile_schema.json before
+they reach the scorers.
+
+The schema file is a populated template rather than a formal JSON Schema,
+so the validator reads it once and compiles every field into a small check
+function: the template value decides the expected type, and FIELD_RULES
+fills in what a null placeholder cannot express (numeric targets, enums,
+ranges, list item shapes).
+
+Validation is cheap — one isinstance check per present field — so it runs
+every time a profile is loaded, compiled into a VoiceAligner, or indexed.
+
+Rules:
+  - Every field is optional. Sparse and in-progress profiles stay valid.
+  - Fields that are present must have the expected type.
+  - Unknown fields are allowed (extractor metadata, future additions).
+
+Usage:
+    from profile_validator import validate_profile, ProfileValidationError
+
+    try:
+        validate_profile(profile)
+    except ProfileValidationError as e:
+        print(e.errors)   # ["reading_level.tolerance: expected number, got str"]
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+SCHEMA_PATH = Path(__file__).parent.parent / "schemas" / "voice_profile_schema.json"
+
+# Template keys that describe the schema itself, not a profile field
+SCHEMA_META_KEYS = {"$schema", "title", "description", "version"}
+
+SPECIFICITY_LEVELS = ("low", "moderate", "high", "very-high")
+GRAMMATICAL_PERSONS = ("first", "second", "third")
+
+# Rules the template cannot express on its own.
+# Keys are dotted field paths. Supported rule keys:
+#   type      — "number" | "string" | "bool" | "list" | "object"
+#   nullable  — value may be null
+#   enum      — allowed values (strings)
+#   min / max — inclusive numeric range
+#   positive  — number must be > 0 (used as a divisor by the scorers)
+#   items     — "pattern" (str or {"pattern": str, "confidence": number})
+FIELD_RULES: Dict[str, Dict] = {
+    "reading_level.flesch_kincaid_grade": {"type": "number", "nullable": True, "min": 0, "max": 30},
+    "reading_level.target_min": {"type": "number", "nullable": True, "min": 0, "max": 30},
+    "reading_level.target_max": {"type": "number", "nullable": True, "min": 0, "max": 30},
+    "reading_level.tolerance": {"type": "number", "positive": True},
+
+    "sentence_rhythm.avg_length_words": {"type": "number", "nullable": True, "min": 0},
+    "sentence_rhythm.std_dev_words": {"type": "number", "nullable": True, "min": 0},
+    "sentence_rhythm.burstiness_score": {"type": "number", "nullable": True, "min": 0},
+    "sentence_rhythm.target_burstiness_min": {"type": "number", "nullable": True, "min": 0},
+    "sentence_rhythm.tolerance": {"type": "number", "positive": True},
+
+    "contraction_rate.measured": {"type": "number", "nullable": True, "min": 0, "max": 1},
+    "contraction_rate.target_min": {"type": "number", "nullable": True, "min": 0, "max": 1},
+    "contraction_rate.target_max": {"type": "number", "nullable": True, "min": 0, "max": 1},
+    "contraction_rate.tolerance": {"type": "number", "positive": True},
+
+    "technical_specificity.level": {"type": "string", "nullable": True, "enum": SPECIFICITY_LEVELS},
+    "technical_specificity.target": {"type": "string", "nullable": True, "enum": SPECIFICITY_LEVELS},
+
+    "register.primary_person": {"type": "string", "nullable": True, "enum": GRAMMATICAL_PERSONS},
+    "register.formality_score": {"type": "number", "nullable": True, "min": 1, "max": 10},
+    "register.warmth_score": {"type": "number", "nullable": True, "min": 1, "max": 10},
+
+    "trust_signal_pattern.type": {"type": "string", "nullable": True},
+
+    "native_constructions.items": {"type": "list", "items": "pattern"},
+    "native_constructions.confidence_threshold": {"type": "number", "min": 0, "max": 1},
+    "negative_space.items": {"type": "list", "items": "pattern"},
+
+    "vocabulary.density_score": {"type": "number", "nullable": True, "min": 0, "max": 1},
+
+    "capture_confidence.overall": {"type": "string", "nullable": True},
+}
+
+# Section-level fields that are null in the template but always strings when set
+NULLABLE_STRING_KEYS = {"override_note"}
+
+_TYPE_NAMES = {
+    "number": "number",
+    "string": "str",
+    "bool": "bool",
+    "list": "list",
+    "object": "object",
+}
+
+
+class ProfileValidationError(ValueError):
+    """Raised when a voice profile does not match the schema."""
+
+    def __init__(self, errors: List[str], profile_id: str = None):
+        self.errors = errors
+        self.profile_id = profile_id
+        label = f"'{profile_id}'" if profile_id else "(no profile_id)"
+        super().__init__(
+            f"Invalid voice profile {label}: " + "; ".join(errors)
+        )
+
+
+Check = Callable[[object, str, List[str]], None]
+
+
+class ProfileValidator:
+    """
+    Schema-compiled profile validator.
+    Compile once (get_validator() caches a module-level instance), call many times.
+    """
+
+    def __init__(self, schema_path: Optional[str] = None):
+        path = Path(schema_path) if schema_path else SCHEMA_PATH
+        with open(path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+        self.schema_version = schema.get("version")
+        self._checks: List[Tuple[str, Check]] = [
+            (key, self._compile_field(key, value))
+            for key, value in schema.items()
+            if key not in SCHEMA_META_KEYS
+        ]
+
+    def errors(self, profile: Dict) -> List[str]:
+        """Return a list of field-level error strings. Empty list = valid."""
+        if not isinstance(profile, dict):
+            return [f"profile: expected object, got {_type_name(profile)}"]
+        errors: List[str] = []
+        for key, check in self._checks:
+            if key in profile:
+                check(profile[key], key, errors)
+        return errors
+
+    def validate(self, profile: Dict) -> Dict:
+        """Raise ProfileValidationError if invalid. Returns the profile unchanged."""
+        errors = self.errors(profile)
+        if errors:
+            profile_id = profile.get("profile_id") if isinstance(profile, dict) else None
+            raise ProfileValidationError(errors, profile_id)
+        return profile
+
+    # ─── Compilation ──────────────────────────────────────────────────────────
+
+    def _compile_field(self, path: str, template) -> Check:
+        rule = FIELD_RULES.get(path)
+        if rule is not None:
+            return self._compile_rule(rule)
+
+        leaf = path.rsplit(".", 1)[-1]
+        if template is None:
+            if leaf in NULLABLE_STRING_KEYS:
+                return self._compile_rule({"type": "string", "nullable": True})
+            return _accept_any
+        if isinstance(template, bool):
+            return self._compile_rule({"type": "bool"})
+        if isinstance(template, (int, float)):
+            return self._compile_rule({"type": "number"})
+        if isinstance(template, str):
+            return self._compile_rule({"type": "string"})
+        if isinstance(template, list):
+            return self._compile_rule({"type": "list"})
+        if isinstance(template, dict):
+            return self._compile_object(path, template)
+        return _accept_any
+
+    def _compile_object(self, path: str, template: Dict) -> Check:
+        children = [
+            (key, self._compile_field(f"{path}.{key}", value))
+            for key, value in template.items()
+        ]
+
+        def check(value, where, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{where}: expected object, got {_type_name(value)}")
+                return
+            for key, child in children:
+                if key in value:
+                    child(value[key], f"{where}.{key}", errors)
+
+        return check
+
+    def _compile_rule(self, rule: Dict) -> Check:
+        kind = rule["type"]
+        nullable = rule.get("nullable", False)
+        enum = rule.get("enum")
+        lo = rule.get("min")
+        hi = rule.get("max")
+        positive = rule.get("positive", False)
+        item_check = _check_pattern_item if rule.get("items") == "pattern" else None
+        expected = _TYPE_NAMES[kind] + (" or null" if nullable else "")
+
+        if kind == "number":
+            def type_ok(v):
+                return isinstance(v, (int, float)) and not isinstance(v, bool)
+        elif kind == "string":
+            def type_ok(v):
+                return isinstance(v, str)
+        elif kind == "bool":
+            def type_ok(v):
+                return isinstance(v, bool)
+        elif kind == "list":
+            def type_ok(v):
+                return isinstance(v, list)
+        else:
+            def type_ok(v):
+                return isinstance(v, dict)
+
+        def check(value, where, errors):
+            if value is None:
+                if not nullable:
+                    errors.append(f"{where}: expected {expected}, got null")
+                return
+            if not type_ok(value):
+                errors.append(f"{where}: expected {expected}, got {_type_name(value)}")
+                return
+            if enum is not None and value not in enum:
+                errors.append(f"{where}: must be one of {', '.join(enum)} (got '{value}')")
+            if lo is not None and value < lo:
+                errors.append(f"{where}: must be >= {lo} (got {value})")
+            if hi is not None and value > hi:
+                errors.append(f"{where}: must be <= {hi} (got {value})")
+            if positive and value <= 0:
+                errors.append(f"{where}: must be > 0 (got {value})")
+            if item_check is not None:
+                for i, item in enumerate(value):
+                    item_check(item, f"{where}[{i}]", errors)
+
+        return check
+
+
+# ─── Item / helper checks ─────────────────────────────────────────────────────
+
+def _accept_any(value, where, errors):
+    return None
+
+
+def _check_pattern_item(item, where, errors):
+    """Pattern items are plain strings or {"pattern": str, "confidence": number}."""
+    if isinstance(item, str):
+        return
+    if not isinstance(item, dict):
+        errors.append(f"{where}: expected str or object, got {_type_name(item)}")
+        return
+    pattern = item.get("pattern")
+    if not isinstance(pattern, str):
+        errors.append(f"{where}.pattern: expected str, got {_type_name(pattern)}")
+    confidence = item.get("confidence", 1.0)
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)):
+        errors.append(f"{where}.confidence: expected number, got {_type_name(confidence)}")
+
+
+def _type_name(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+# ─── Module-level compiled instance ──────────────────────────────────────────
+
+_default_validator: Optional[ProfileValidator] = None
+
+
+def get_validator() -> ProfileValidator:
+    """Return the shared validator, compiling the schema on first use."""
+    global _default_validator
+    if _default_validator is None:
+        _default_validator = ProfileValidator()
+    return _default_validator
+
+
+def validate_profile(profile: Dict) -> Dict:
+    """Validate against the default schema. Raises ProfileValidationError."""
+    return get_validator().validate(profile)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python profile_validator.py <profile.json> [<profile.json> ...]")
+        sys.exit(1)
+
+    validator = get_validator()
+    failed = 0
+    for path in sys.argv[1:]:
+        with open(path, "r", encoding="utf-8") as f:
+            errors = validator.errors(json.load(f))
+        if errors:
+            failed += 1
+            print(f"INVALID  {path}")
+            for err in errors:
+                print(f"  - {err}")
+        else:
+            print(f"OK       {path}")
+    sys.exit(1 if failed else 0)
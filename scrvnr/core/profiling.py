@@ -0,0 +1,187 @@
+"""
+GHM SCRVNR — On-Demand Profiling
+==================================
+Runs one request under cProfile ("cpu") or tracemalloc ("alloc") and
+reports the hottest functions or allocation sites.
+
+This exists to capture real slow production inputs where they happen.
+It is off unless the process environment turns it on, so a payload can
+never switch it on by itself:
+
+  SCRVNR_PROFILING=1         allow profiling requests
+  SCRVNR_PROFILING_DIR=path  also write each capture to this directory
+                             (cpu: .prof for pstats/snakeviz,
+                              alloc: .tracemalloc for tracemalloc.Snapshot.load)
+  SCRVNR_PROFILING_TOP=25    default number of entries reported
+
+Report shape:
+    cpu:   {"mode": "cpu", "total_ms": 48.1, "top": [
+               {"function", "file", "line", "calls", "self_ms", "cumulative_ms"}], "file": str|None}
+    alloc: {"mode": "alloc", "peak_kb": 912.4, "top": [
+               {"file", "line", "size_kb", "count"}], "file": str|None}
+
+Usage:
+    result, report = run_profiled("cpu", adapter.check_page, "gad-main", sections)
+
+CLI:
+    python profiling.py <capture.prof | capture.tracemalloc> [--top 25]
+"""
+
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+MODES = ("cpu", "alloc")
+DEFAULT_TOP = 25
+MAX_TOP = 200
+ALLOC_FRAMES = 10
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get("SCRVNR_PROFILING", "").lower() in ("1", "true", "yes", "on")
+
+
+def profile_dir() -> Optional[Path]:
+    path = os.environ.get("SCRVNR_PROFILING_DIR")
+    return Path(path) if path else None
+
+
+def default_top() -> int:
+    try:
+        return int(os.environ.get("SCRVNR_PROFILING_TOP", DEFAULT_TOP))
+    except ValueError:
+        return DEFAULT_TOP
+
+
+def run_profiled(mode: str, fn: Callable, *args, top: int = None, out_dir: Path = None,
+                 label: str = None, **kwargs) -> Tuple[object, Dict]:
+    """
+    Call fn(*args, **kwargs) under the given profiler.
+
+    Args:
+        mode:    "cpu" or "alloc"
+        top:     Entries to report (capped at MAX_TOP)
+        out_dir: Write the raw capture here as well
+        label:   Filename stem for the capture (e.g. the job id)
+
+    Returns:
+        (fn's return value, report dict)
+
+    Raises:
+        ValueError: unknown mode
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown profiling mode {mode!r}; expected one of {MODES}")
+    top = max(1, min(MAX_TOP, int(top or default_top())))
+    if mode == "cpu":
+        return _run_cpu(fn, args, kwargs, top, out_dir, label)
+    return _run_alloc(fn, args, kwargs, top, out_dir, label)
+
+
+# ─── Profilers ────────────────────────────────────────────────────────────────
+
+def _run_cpu(fn, args, kwargs, top, out_dir, label):
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+    total_ms = (time.perf_counter() - started) * 1000
+
+    report = {"mode": "cpu", "total_ms": round(total_ms, 3), "top": _cpu_top(pstats.Stats(profiler), top),
+              "file": None}
+    if out_dir is not None:
+        path = _capture_path(out_dir, label, ".prof")
+        profiler.dump_stats(str(path))
+        report["file"] = str(path)
+    return result, report
+
+
+def _cpu_top(stats, top: int):
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return [
+        {
+            "function": func,
+            "file": filename,
+            "line": line,
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, line, func), (_, calls, self_time, cumulative, _) in rows
+    ]
+
+
+def _run_alloc(fn, args, kwargs, top, out_dir, label):
+    import tracemalloc
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(ALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    try:
+        result = fn(*args, **kwargs)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    report = {
+        "mode": "alloc",
+        "peak_kb": round(peak / 1024, 1),
+        "top": [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:top]
+        ],
+        "file": None,
+    }
+    if out_dir is not None:
+        path = _capture_path(out_dir, label, ".tracemalloc")
+        snapshot.dump(str(path))
+        report["file"] = str(path)
+    return result, report
+
+
+def _capture_path(out_dir: Path, label: Optional[str], suffix: str) -> Path:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", label)[:64] if label else "request"
+    return out_dir / f"scrvnr-{stem}-{stamp}-{os.getpid()}{suffix}"
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize a SCRVNR profiling capture.")
+    parser.add_argument("capture", help=".prof (cpu) or .tracemalloc (alloc) file")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    args = parser.parse_args()
+
+    if args.capture.endswith(".tracemalloc"):
+        import tracemalloc
+        for stat in tracemalloc.Snapshot.load(args.capture).statistics("lineno")[:args.top]:
+            print(f"  {stat.size / 1024:>10.1f} KiB  {stat.count:>7}  {stat.traceback[0]}")
+    else:
+        import pstats
+        pstats.Stats(args.capture).sort_stats("cumulative").print_stats(args.top)
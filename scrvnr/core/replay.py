@@ -0,0 +1,596 @@
+"""
+GHM SCRVNR — Historical Re-scoring Replay
+===========================================
+Answers "how many past pages would flip?" before a rule change ships.
+
+Replays stored historical content through a baseline gate configuration
+(what production runs today) and a candidate configuration (new AI-isms,
+different lexicons, different thresholds), then reports every section and
+page whose decision changes, grouped by property.
+
+Only changed features are re-extracted:
+  - Each Pass 1 dimension has a fingerprint (AIDetector.dimension_fingerprints)
+    covering its lexicon. Dimensions whose fingerprint is the same in both
+    configs are measured once and shared.
+  - Raw feature records (not scores) are cached by (dimension, fingerprint,
+    text hash) in an optional SQLite cache. Scoring policies, weights and
+    thresholds are applied on top, so policy- or threshold-only changes
+    re-read no text at all.
+  - Pass 2 features do not depend on the Pass 1 lexicons; they are extracted
+    once per (profile, text) and both configs' Pass 2 policies score them.
+    Their cache key carries VoiceAligner.FEATURE_VERSION.
+
+Work is split into batches of pages and fanned out over worker processes.
+
+Content sources:
+  - Audit log segments written with AuditLog(retain_content=True)
+  - JSONL corpus: one {"property_slug", "job_id", "sections": {...}} per line
+Identical content (same content hash) is replayed once.
+
+Usage:
+    baseline = GateConfig()
+    candidate = GateConfig(lexicons={"AI_ISMS": AIDetector.AI_ISMS + ["elevate your"]},
+                           pass1_policy={"weights": {"burstiness": 0.30, "ai_isms": 0.20}})
+    engine = ReplayEngine(baseline, candidate, profiles_dir="scrvnr/profiles")
+    report = engine.run(iter_audit_pages("scrvnr/audit"))
+
+CLI:
+    python replay.py --audit-dir scrvnr/audit --add-ai-ism "elevate your" \\
+        --pass1-threshold 0.70 --pass1-policy tenant_policy.json --workers 8 --out flips.json
+
+    The baseline defaults to the built-in lexicons and policies; pass
+    --baseline-lexicons / --baseline-pass1-policy / --baseline-pass2-policy
+    when production runs something else. Candidate flags apply on top of it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pass1_ai_detection import AIDetector
+from pass2_voice_alignment import VoiceAligner
+from scrvnr_gate import resolve_profile
+from profile_store import content_hash_of
+from scoring_policy import Pass1Policy, Pass2Policy
+
+
+class GateConfig:
+    """
+    Picklable description of one gate configuration.
+    Policies are override dicts (see scoring_policy.py); explicit thresholds
+    take precedence over the policies' own.
+    """
+
+    def __init__(
+        self,
+        pass1_threshold: float = None,
+        pass2_threshold: float = None,
+        lexicons: Dict[str, List[str]] = None,
+        label: str = "",
+        pass1_policy: Dict = None,
+        pass2_policy: Dict = None,
+    ):
+        self.lexicons = lexicons or {}
+        self.label = label
+        self.pass1_policy = Pass1Policy(pass1_policy)
+        self.pass2_policy = Pass2Policy(pass2_policy)
+        self.pass1_threshold = pass1_threshold or self.pass1_policy.pass_threshold
+        self.pass2_threshold = pass2_threshold or self.pass2_policy.pass_threshold
+
+    def detector(self) -> AIDetector:
+        return AIDetector(pass_threshold=self.pass1_threshold, lexicons=self.lexicons,
+                          policy=self.pass1_policy)
+
+    def describe(self) -> Dict:
+        return {
+            "label": self.label,
+            "pass1_threshold": self.pass1_threshold,
+            "pass2_threshold": self.pass2_threshold,
+            "pass1_policy": self.pass1_policy.fingerprint(),
+            "pass2_policy": self.pass2_policy.fingerprint(),
+            "lexicon_sizes": {name: len(items) for name, items in self.lexicons.items()},
+        }
+
+
+class FeatureCache:
+    """
+    Persistent cache of raw feature records.
+    Keys encode everything the result depends on, so entries never go stale.
+    path=None keeps the cache in memory for the life of the engine.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._mem: Dict[str, Dict] = {}
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS feature_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        keys = list(set(keys))
+        if self._conn is None:
+            return {k: self._mem[k] for k in keys if k in self._mem}
+        found = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._conn.execute(
+                f"SELECT key, value FROM feature_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            found.update((k, json.loads(v)) for k, v in rows)
+        return found
+
+    def put_many(self, entries: Dict[str, Dict]) -> None:
+        if not entries:
+            return
+        if self._conn is None:
+            self._mem.update(entries)
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO feature_cache (key, value) VALUES (?, ?)",
+                [(k, json.dumps(v, separators=(",", ":"))) for k, v in entries.items()],
+            )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def pass1_key(dimension: str, fingerprint: str, digest: str) -> str:
+    return f"p1:{dimension}:{fingerprint}:{digest}"
+
+
+def pass2_key(profile_hash: str, digest: str) -> str:
+    return f"p2:{VoiceAligner.FEATURE_VERSION}:{profile_hash}:{digest}"
+
+
+# ─── Content sources ──────────────────────────────────────────────────────────
+
+def iter_audit_pages(log_dir: str, **filters) -> Iterator[Dict]:
+    """
+    Yield replayable pages from audit segments (records with retained content).
+    filters are passed to AuditQuery.iter_records (property_slug, since, ...).
+    """
+    from audit_query import AuditQuery
+
+    for record in AuditQuery(log_dir).iter_records(**filters):
+        if record.get("content"):
+            yield {
+                "property_slug": record.get("property_slug"),
+                "job_id": record.get("job_id"),
+                "sections": record["content"],
+            }
+
+
+def iter_jsonl_pages(path: str) -> Iterator[Dict]:
+    """Yield pages from a JSONL corpus file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+# ─── Worker ───────────────────────────────────────────────────────────────────
+
+_worker_state: Dict = {}
+
+
+def _init_worker(baseline: GateConfig, candidate: GateConfig):
+    base = baseline.detector()
+    cand = candidate.detector()
+    _worker_state.update(
+        baseline=baseline,
+        candidate=candidate,
+        base_detector=base,
+        cand_detector=cand,
+        base_fps=base.dimension_fingerprints(),
+        cand_fps=cand.dimension_fingerprints(),
+        aligners={},
+    )
+
+
+def _replay_batch(batch: List[Dict], profiles: Dict[str, Dict], cached: Dict[str, Dict]) -> Tuple[List[Dict], Dict[str, Dict], int]:
+    """
+    Score one batch of pages under both configs.
+    Returns (page_results, new_cache_entries, dimensions_measured).
+    """
+    st = _worker_state
+    base, cand = st["base_detector"], st["cand_detector"]
+    base_fps, cand_fps = st["base_fps"], st["cand_fps"]
+    baseline, candidate = st["baseline"], st["candidate"]
+    new_entries: Dict[str, Dict] = {}
+    measured = 0
+
+    def lookup(key):
+        if key in cached:
+            return cached[key]
+        return new_entries.get(key)
+
+    def dimension(detector, dim, fingerprint, digest, text):
+        nonlocal measured
+        key = pass1_key(dim, fingerprint, digest)
+        features = lookup(key)
+        if features is None:
+            features = detector.measure_dimension(dim, text)
+            new_entries[key] = features
+            measured += 1
+        return features
+
+    page_results = []
+    for page in batch:
+        slug = page.get("property_slug") or "no-profile"
+        profile_entry = profiles.get(slug)
+        aligner = None
+        if profile_entry is not None:
+            profile_hash, profile = profile_entry
+            aligner = st["aligners"].get(profile_hash)
+            if aligner is None:
+                aligner = VoiceAligner(profile)
+                st["aligners"][profile_hash] = aligner
+
+        sections = []
+        for name, raw_text in (page.get("sections") or {}).items():
+            text = (raw_text or "").strip()
+            if not text:
+                continue
+            digest = text_hash(text)
+
+            base_dims = {d: dimension(base, d, base_fps[d], digest, text) for d in base.DIMENSIONS}
+            cand_dims = {d: dimension(cand, d, cand_fps[d], digest, text) for d in cand.DIMENSIONS}
+            base_p1 = base.score_features(base_dims, name)
+            cand_p1 = cand.score_features(cand_dims, name)
+
+            base_p2 = cand_p2 = None
+            if aligner is not None:
+                key = pass2_key(profile_hash, digest)
+                features = lookup(key)
+                if features is None:
+                    features = aligner.extract_features(text)
+                    new_entries[key] = features
+                base_p2 = aligner.score_features(features, name, baseline.pass2_policy)["overall_score"]
+                cand_p2 = aligner.score_features(features, name, candidate.pass2_policy)["overall_score"]
+
+            base_p2_pass = base_p2 is None or base_p2 >= baseline.pass2_threshold
+            cand_p2_pass = cand_p2 is None or cand_p2 >= candidate.pass2_threshold
+            sections.append({
+                "section": name,
+                "baseline_pass": base_p1["pass"] and base_p2_pass,
+                "candidate_pass": cand_p1["pass"] and cand_p2_pass,
+                "baseline_pass1": base_p1["overall_score"],
+                "candidate_pass1": cand_p1["overall_score"],
+                "baseline_pass2": base_p2,
+                "candidate_pass2": cand_p2,
+                "candidate_failures": cand_p1["failures"],
+            })
+
+        page_results.append({
+            "property_slug": slug,
+            "job_id": page.get("job_id"),
+            "sections": sections,
+        })
+    return page_results, new_entries, measured
+
+
+# ─── Engine ───────────────────────────────────────────────────────────────────
+
+class ReplayEngine:
+    """
+    Replays historical pages under a baseline and a candidate GateConfig
+    and builds a flip report.
+    """
+
+    BATCH_SIZE = 200
+
+    def __init__(
+        self,
+        baseline: GateConfig,
+        candidate: GateConfig,
+        profiles_dir: str = None,
+        profile_store=None,
+        cache_path: str = None,
+        workers: int = None,
+        batch_size: int = None,
+    ):
+        self.baseline = baseline
+        self.candidate = candidate
+        self.profiles_dir = profiles_dir or str(Path(__file__).parent.parent / "profiles")
+        self.profile_store = profile_store
+        self.cache = FeatureCache(cache_path)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self._profiles: Dict[str, Optional[Tuple[str, Dict]]] = {}
+
+    def changed_dimensions(self) -> List[str]:
+        """Pass 1 dimensions whose features must be re-extracted (lexicon changed)."""
+        base = self.baseline.detector().dimension_fingerprints()
+        cand = self.candidate.detector().dimension_fingerprints()
+        return [d for d in AIDetector.DIMENSIONS if base[d] != cand[d]]
+
+    def run(self, pages: Iterable[Dict]) -> Dict:
+        """Replay pages and return the flip report."""
+        started = time.perf_counter()
+        report = FlipReport(self.baseline, self.candidate, self.changed_dimensions())
+
+        base_fps = self.baseline.detector().dimension_fingerprints()
+        cand_fps = self.candidate.detector().dimension_fingerprints()
+
+        def prepared_batches():
+            seen = set()
+            batch = []
+            for page in pages:
+                digest = _page_digest(page)
+                if digest in seen:
+                    report.duplicates_skipped += 1
+                    continue
+                seen.add(digest)
+                batch.append(page)
+                if len(batch) >= self.batch_size:
+                    yield self._prepare(batch, base_fps, cand_fps)
+                    batch = []
+            if batch:
+                yield self._prepare(batch, base_fps, cand_fps)
+
+        if self.workers <= 1:
+            _init_worker(self.baseline, self.candidate)
+            for args in prepared_batches():
+                self._collect(report, args, _replay_batch(*args))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.baseline, self.candidate),
+            ) as pool:
+                # Keep a bounded number of batches in flight
+                in_flight = []
+                for args in prepared_batches():
+                    in_flight.append((args, pool.submit(_replay_batch, *args)))
+                    if len(in_flight) >= self.workers * 2:
+                        args0, future = in_flight.pop(0)
+                        self._collect(report, args0, future.result())
+                for args0, future in in_flight:
+                    self._collect(report, args0, future.result())
+
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        return report.to_dict()
+
+    def close(self):
+        self.cache.close()
+
+    # ─── Internal ─────────────────────────────────────────────────────────────
+
+    def _prepare(self, batch, base_fps, cand_fps):
+        """Resolve profiles and prefetch cached feature records for a batch."""
+        profiles = {}
+        keys = []
+        for page in batch:
+            slug = page.get("property_slug") or "no-profile"
+            entry = self._profile_entry(slug)
+            if entry is not None:
+                profiles[slug] = entry
+            for raw_text in (page.get("sections") or {}).values():
+                text = (raw_text or "").strip()
+                if not text:
+                    continue
+                digest = text_hash(text)
+                for dim in AIDetector.DIMENSIONS:
+                    keys.append(pass1_key(dim, base_fps[dim], digest))
+                    keys.append(pass1_key(dim, cand_fps[dim], digest))
+                if entry is not None:
+                    keys.append(pass2_key(entry[0], digest))
+        return batch, profiles, self.cache.get_many(keys)
+
+    def _profile_entry(self, slug):
+        if slug not in self._profiles:
+            profile = resolve_profile(slug, profiles_dir=self.profiles_dir, store=self.profile_store)
+            self._profiles[slug] = (content_hash_of(profile), profile) if profile else None
+        return self._profiles[slug]
+
+    def _collect(self, report, args, outcome):
+        page_results, new_entries, measured = outcome
+        cached = args[2]
+        self.cache.put_many(new_entries)
+        report.dimensions_measured += measured
+        report.cache_hits += len(cached)
+        for page in page_results:
+            report.add_page(page)
+
+
+class FlipReport:
+    """Accumulates replay outcomes per property."""
+
+    def __init__(self, baseline: GateConfig, candidate: GateConfig, changed: List[str]):
+        self.baseline = baseline
+        self.candidate = candidate
+        self.changed = changed
+        self.pages = 0
+        self.sections = 0
+        self.duplicates_skipped = 0
+        self.dimensions_measured = 0
+        self.cache_hits = 0
+        self.pages_to_fail = 0
+        self.pages_to_pass = 0
+        self.elapsed_seconds = 0.0
+        self.properties: Dict[str, Dict] = {}
+
+    def add_page(self, page: Dict):
+        slug = page["property_slug"]
+        prop = self.properties.setdefault(slug, {
+            "pages": 0,
+            "sections": 0,
+            "pages_newly_failing": 0,
+            "pages_newly_passing": 0,
+            "newly_failing": [],
+            "newly_passing": [],
+        })
+        self.pages += 1
+        prop["pages"] += 1
+
+        base_page_pass = True
+        cand_page_pass = True
+        for sec in page["sections"]:
+            self.sections += 1
+            prop["sections"] += 1
+            base_page_pass = base_page_pass and sec["baseline_pass"]
+            cand_page_pass = cand_page_pass and sec["candidate_pass"]
+            if sec["baseline_pass"] == sec["candidate_pass"]:
+                continue
+            entry = {
+                "job_id": page["job_id"],
+                "section": sec["section"],
+                "baseline_pass1": sec["baseline_pass1"],
+                "candidate_pass1": sec["candidate_pass1"],
+                "baseline_pass2": sec["baseline_pass2"],
+                "candidate_pass2": sec["candidate_pass2"],
+            }
+            if sec["baseline_pass"]:
+                entry["candidate_failures"] = sec["candidate_failures"]
+                prop["newly_failing"].append(entry)
+            else:
+                prop["newly_passing"].append(entry)
+
+        if base_page_pass and not cand_page_pass:
+            self.pages_to_fail += 1
+            prop["pages_newly_failing"] += 1
+        elif cand_page_pass and not base_page_pass:
+            self.pages_to_pass += 1
+            prop["pages_newly_passing"] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "baseline": self.baseline.describe(),
+            "candidate": self.candidate.describe(),
+            "dimensions_recomputed": self.changed,
+            "pages_replayed": self.pages,
+            "sections_replayed": self.sections,
+            "duplicates_skipped": self.duplicates_skipped,
+            "pages_newly_failing": self.pages_to_fail,
+            "pages_newly_passing": self.pages_to_pass,
+            "sections_newly_failing": sum(len(p["newly_failing"]) for p in self.properties.values()),
+            "sections_newly_passing": sum(len(p["newly_passing"]) for p in self.properties.values()),
+            "dimensions_measured": self.dimensions_measured,
+            "cache_hits": self.cache_hits,
+            "elapsed_seconds": self.elapsed_seconds,
+            "properties": self.properties,
+        }
+
+
+def _page_digest(page: Dict) -> str:
+    h = hashlib.sha1((page.get("property_slug") or "").encode("utf-8"))
+    sections = page.get("sections") or {}
+    for name in sorted(sections):
+        h.update(b"\x00" + name.encode("utf-8") + b"\x00" + (sections[name] or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Replay historical content under a candidate gate configuration.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--audit-dir", help="Audit log directory (written with retain_content=True)")
+    source.add_argument("--corpus", help="JSONL corpus of {property_slug, job_id, sections}")
+    parser.add_argument("--property", dest="property_slug", help="Only replay this property (audit source)")
+    parser.add_argument("--since", help="Only replay records at/after this timestamp (audit source)")
+    parser.add_argument("--until", help="Only replay records before this timestamp (audit source)")
+    parser.add_argument("--profiles-dir", default=str(Path(__file__).parent.parent / "profiles"))
+    parser.add_argument("--profile-store", help="ProfileStore SQLite file (instead of --profiles-dir)")
+    parser.add_argument("--add-ai-ism", action="append", default=[], help="AI-ism phrase to add (repeatable)")
+    parser.add_argument("--lexicons", help="JSON file of replacement lexicons, e.g. {\"AI_ISMS\": [...]}")
+    parser.add_argument("--pass1-threshold", type=float, help="Candidate Pass 1 threshold")
+    parser.add_argument("--pass2-threshold", type=float, help="Candidate Pass 2 threshold")
+    parser.add_argument("--pass1-policy", help="JSON file of candidate Pass 1 policy overrides")
+    parser.add_argument("--pass2-policy", help="JSON file of candidate Pass 2 policy overrides")
+    parser.add_argument("--baseline-lexicons", help="JSON file of the lexicons production runs today")
+    parser.add_argument("--baseline-pass1-policy", help="JSON file of the Pass 1 policy production runs today")
+    parser.add_argument("--baseline-pass2-policy", help="JSON file of the Pass 2 policy production runs today")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=ReplayEngine.BATCH_SIZE)
+    parser.add_argument("--cache", help="SQLite feature cache file (reused across runs)")
+    parser.add_argument("--out", help="Write the full JSON report here")
+    args = parser.parse_args()
+
+    def load_json(path):
+        if not path:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # The candidate is the baseline plus whatever the candidate flags change
+    baseline_lexicons = load_json(args.baseline_lexicons) or {}
+    baseline_policies = [load_json(args.baseline_pass1_policy), load_json(args.baseline_pass2_policy)]
+    lexicons = load_json(args.lexicons) or dict(baseline_lexicons)
+    if args.add_ai_ism:
+        lexicons["AI_ISMS"] = list(lexicons.get("AI_ISMS", AIDetector.AI_ISMS)) + args.add_ai_ism
+
+    store = None
+    if args.profile_store:
+        from profile_store import ProfileStore
+        store = ProfileStore(args.profile_store)
+
+    engine = ReplayEngine(
+        GateConfig(
+            lexicons=baseline_lexicons,
+            label="baseline",
+            pass1_policy=baseline_policies[0],
+            pass2_policy=baseline_policies[1],
+        ),
+        GateConfig(
+            pass1_threshold=args.pass1_threshold,
+            pass2_threshold=args.pass2_threshold,
+            lexicons=lexicons,
+            label="candidate",
+            pass1_policy=load_json(args.pass1_policy) or baseline_policies[0],
+            pass2_policy=load_json(args.pass2_policy) or baseline_policies[1],
+        ),
+        profiles_dir=args.profiles_dir,
+        profile_store=store,
+        cache_path=args.cache,
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+
+    if args.audit_dir:
+        pages = iter_audit_pages(args.audit_dir, property_slug=args.property_slug,
+                                 since=args.since, until=args.until)
+    else:
+        pages = iter_jsonl_pages(args.corpus)
+
+    report = engine.run(pages)
+    engine.close()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"\n SCRVNR REPLAY — {report['pages_replayed']} pages, {report['sections_replayed']} sections "
+          f"in {report['elapsed_seconds']}s")
+    print("=" * 60)
+    print(f"Dimensions recomputed: {', '.join(report['dimensions_recomputed']) or 'none (policy/threshold-only change)'}")
+    print(f"Pages newly failing:   {report['pages_newly_failing']}")
+    print(f"Pages newly passing:   {report['pages_newly_passing']}")
+    for slug, prop in sorted(report["properties"].items()):
+        if prop["newly_failing"] or prop["newly_passing"]:
+            print(f"\n  {slug}: {len(prop['newly_failing'])} section(s) newly failing, "
+                  f"{len(prop['newly_passing'])} newly passing (of {prop['sections']})")
+    if args.out:
+        print(f"\nFull report: {args.out}")
+    sys.exit(0)
@@ -0,0 +1,841 @@
+"""
+GHM SCRVNR — Scoring Policies
+===============================
+Stage two of scoring: maps raw feature records to dimension scores.
+
+Stage one (AIDetector.extract_features / VoiceAligner.extract_features)
+reads the text once and produces a compact, JSON-serializable record of raw
+measurements per dimension: sentence counts, burstiness, phrase hits,
+densities. A policy holds everything that turns those measurements into a
+decision — score curves, dimension weights, thresholds — as plain data.
+
+Because policies never see text, re-weighting, re-banding or re-thresholding
+stored sections is arithmetic over their feature records.
+
+Policy config is a nested dict. Overrides are deep-merged over DEFAULTS, so a
+tenant policy only lists what it changes:
+
+    policy = Pass1Policy({"weights": {"burstiness": 0.35, "ai_isms": 0.15}})
+    policy = Pass2Policy({"pass_threshold": 0.55,
+                          "curves": {"sentence_rhythm": {"tolerance": 0.20}}})
+
+Pass 2 curves (Pass2Policy.*_curve) take plain numbers or NumPy arrays of
+profile targets, so CompiledProfileSet scores every profile at once with
+the same arithmetic VoiceAligner uses for one.
+
+Usage:
+    detector = AIDetector()
+    features = detector.extract_features(text)            # once, store it
+    result = detector.score_features(features, "hero")    # default policy
+    result = detector.score_features(features, "hero", policy=tenant_policy)
+
+    aligner = VoiceAligner(profile)
+    features = aligner.extract_features(text)
+    result = aligner.score_features(features, "hero", policy=Pass2Policy.load("policy.json"))
+"""
+
+import copy
+import hashlib
+import json
+import math
+import statistics
+from typing import Dict, List, Optional, Tuple
+
+
+class ScoringPolicy:
+    """
+    Curves, weights and thresholds for one pass.
+    Immutable by convention; picklable; round-trips through to_dict().
+    """
+
+    DEFAULTS: Dict = {}
+
+    def __init__(self, overrides: Dict = None):
+        self.config = _deep_merge(copy.deepcopy(self.DEFAULTS), overrides or {})
+        unknown = set(self.config["weights"]) - set(self.DEFAULTS["weights"])
+        if unknown:
+            raise ValueError(f"Unknown dimension weight(s): {', '.join(sorted(unknown))}")
+
+    @property
+    def pass_threshold(self) -> float:
+        return self.config["pass_threshold"]
+
+    @property
+    def dimension_fail_threshold(self) -> float:
+        return self.config["dimension_fail_threshold"]
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        return self.config["weights"]
+
+    def curve(self, dimension: str) -> Dict:
+        return self.config["curves"][dimension]
+
+    def score_dimension(self, dimension: str, features: Dict, *args) -> Dict:
+        """Score one dimension's raw feature record."""
+        return getattr(self, "score_" + dimension)(features, *args)
+
+    def fingerprint(self) -> str:
+        """Stable short hash of the full config (for caches and audit records)."""
+        canonical = json.dumps(self.config, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def to_dict(self) -> Dict:
+        return copy.deepcopy(self.config)
+
+    @classmethod
+    def load(cls, path: str) -> "ScoringPolicy":
+        """Load overrides from a JSON file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+# ─── Pass 1 ───────────────────────────────────────────────────────────────────
+
+class Pass1Policy(ScoringPolicy):
+    """Scores AIDetector feature records."""
+
+    DEFAULTS = {
+        "pass_threshold": 0.65,
+        # A dimension below this score is reported as a failure
+        "dimension_fail_threshold": 0.60,
+        # Burstiness and ai_isms carry the most signal
+        "weights": {
+            "burstiness": 0.25,
+            "ai_isms": 0.25,
+            "parallel_structure": 0.15,
+            "hedge_density": 0.15,
+            "specificity": 0.10,
+            "transition_tells": 0.10,
+        },
+        "curves": {
+            # Piecewise linear: first [x0, y0, slope] with burstiness >= x0 wins,
+            # score = y0 + (burstiness - x0) * slope, capped at 1.0
+            "burstiness": {
+                "segments": [[0.80, 1.0, 0.0], [0.60, 0.75, 1.25], [0.40, 0.40, 1.75], [0.0, 0.0, 1.0]],
+                "target": 0.60,
+                "few_sentences_score": 0.70,
+            },
+            # steps[n] for n violations; past the table, drop per_extra each
+            "ai_isms": {
+                "steps": [1.0, 0.75, 0.55, 0.40],
+                "per_extra": 0.10,
+            },
+            "parallel_structure": {
+                "min_bullets": 3,
+                "severe_cv": 0.15,
+                "severe_min_bullets": 4,
+                "severe_score": 0.40,
+                "mild_cv": 0.25,
+                "mild_score": 0.65,
+                "min_openers": 3,
+                "opener_min_count": 4,
+                "opener_ratio": 0.40,
+                "opener_score": 0.50,
+            },
+            # [max density per 100 words, score]; above every band = floor
+            "hedge_density": {
+                "bands": [[1.0, 1.0], [2.0, 0.80], [3.0, 0.55], [4.0, 0.35]],
+                "floor": 0.20,
+            },
+            # [min specificity density, max vague density (null = any), score]
+            # then penalties [vague density above, penalty, floor]
+            "specificity": {
+                "tiers": [[5, 1, 1.0], [3, 2, 0.80], [2, None, 0.65], [1, 1, 0.65], [1, None, 0.50]],
+                "floor": 0.30,
+                "vague_penalties": [[3, 0.30, 0.20], [2, 0.15, 0.30]],
+            },
+            "transition_tells": {
+                "bands": [[0.5, 1.0], [1.0, 0.80], [2.0, 0.60], [3.0, 0.40]],
+                "floor": 0.20,
+            },
+            # Page-level, not weighted into section scores. An opener is flagged
+            # once it starts sentences in opener_sections sections; every
+            # shared n-gram and every extra identically shaped section costs.
+            "page_repetition": {
+                "opener_sections": 3,
+                "opener_penalty": 0.15,
+                "ngram_penalty": 0.05,
+                "ngram_max_penalty": 0.40,
+                "structure_penalty": 0.20,
+            },
+        },
+    }
+
+    def score(self, features: Dict) -> Dict[str, Dict]:
+        """Score every dimension present in a feature record."""
+        return {
+            dim: self.score_dimension(dim, features[dim])
+            for dim in self.weights
+            if dim in features
+        }
+
+    def score_burstiness(self, f: Dict) -> Dict:
+        c = self.curve("burstiness")
+        burstiness = f.get("burstiness")
+        if burstiness is None:
+            return {
+                "score": c["few_sentences_score"],
+                "burstiness": None,
+                "note": "Too few sentences to score meaningfully",
+                "sentence_count": f["sentence_count"],
+            }
+
+        score = 0.0
+        for x0, y0, slope in c["segments"]:
+            if burstiness >= x0:
+                score = y0 + (burstiness - x0) * slope
+                break
+
+        result = {
+            "score": round(min(1.0, score), 3),
+            "burstiness": round(burstiness, 3),
+            "mean_sentence_length": round(f["mean_length"], 1),
+            "std_dev": round(f["std_dev"], 1),
+            "sentence_count": f["sentence_count"],
+        }
+
+        if burstiness < c["target"]:
+            result["failure_reason"] = (
+                f"Sentence rhythm too uniform (burstiness: {burstiness:.2f}, target: >{c['target']:.2f})"
+            )
+            result["suggestion"] = (
+                "Vary sentence length more aggressively. Mix very short declaratives "
+                "(4-8 words) with longer explanatory sentences (20-30 words). "
+                "Flat, medium-length sentences signal AI generation."
+            )
+        return result
+
+    def score_ai_isms(self, f: Dict) -> Dict:
+        c = self.curve("ai_isms")
+        found = f["found"]
+        steps = c["steps"]
+        n = len(found)
+        if n < len(steps):
+            score = steps[n]
+        else:
+            score = max(0.0, steps[-1] - (n - (len(steps) - 1)) * c["per_extra"])
+
+        density = (n / max(1, f["word_count"])) * 100
+        result = {
+            "score": round(score, 3),
+            "violations_found": n,
+            "flagged_phrases": list(found),
+            "density_per_100_words": round(density, 2),
+        }
+
+        if found:
+            result["failure_reason"] = f"AI-ism phrases detected: {', '.join(found[:3])}"
+            result["suggestion"] = (
+                f"Remove or rewrite sections containing: {', '.join(found[:5])}. "
+                "These phrases appear at statistically elevated rates in LLM-generated text."
+            )
+        return result
+
+    def score_parallel_structure(self, f: Dict) -> Dict:
+        c = self.curve("parallel_structure")
+        bullet_count = f["bullet_count"]
+        cv = f.get("bullet_cv")
+
+        bullet_score = 1.0
+        uniformity_note = None
+        if bullet_count >= c["min_bullets"] and cv is not None:
+            if cv < c["severe_cv"] and bullet_count >= c["severe_min_bullets"]:
+                bullet_score = c["severe_score"]
+                uniformity_note = (
+                    f"{bullet_count} bullet items with very uniform length "
+                    f"(CV: {cv:.2f}). LLMs produce highly uniform lists."
+                )
+            elif cv < c["mild_cv"]:
+                bullet_score = c["mild_score"]
+
+        opener_score = 1.0
+        opener_note = None
+        opener_count = f["opener_count"]
+        top_count = f.get("top_opener_count", 0)
+        if opener_count >= c["min_openers"]:
+            if top_count >= c["opener_min_count"] and top_count / opener_count > c["opener_ratio"]:
+                opener_score = c["opener_score"]
+                opener_note = (
+                    f"'{f['top_opener']}' starts {top_count} of {opener_count} "
+                    "sentences. Repetitive sentence structure signals AI generation."
+                )
+
+        overall_score = min(bullet_score, opener_score)
+        result = {
+            "score": round(overall_score, 3),
+            "bullet_uniformity_score": round(bullet_score, 3),
+            "opener_repetition_score": round(opener_score, 3),
+            "bullet_count": bullet_count,
+        }
+
+        if uniformity_note:
+            result["failure_reason"] = uniformity_note
+        if opener_note:
+            result["failure_reason"] = (result.get("failure_reason", "") + " " + opener_note).strip()
+        if overall_score < self.dimension_fail_threshold:
+            result["suggestion"] = (
+                "Break parallel structure. Vary bullet item length substantially. "
+                "Mix sentence openers. Add structural variety: short declarative, "
+                "then longer explanatory, then specific example."
+            )
+        return result
+
+    def score_hedge_density(self, f: Dict) -> Dict:
+        c = self.curve("hedge_density")
+        density = (f["hedge_count"] / max(1, f["word_count"])) * 100
+        score = _band(density, c["bands"], c["floor"])
+        examples = f["examples"]
+
+        result = {
+            "score": round(score, 3),
+            "hedge_count": f["hedge_count"],
+            "density_per_100_words": round(density, 2),
+            "examples": examples[:5],
+        }
+
+        if score < self.dimension_fail_threshold:
+            result["failure_reason"] = (
+                f"High hedge density: {density:.1f} qualifiers per 100 words "
+                f"(examples: {', '.join(examples[:3])})"
+            )
+            result["suggestion"] = (
+                "Remove qualifying language. State claims directly. Replace "
+                "'it may be worth considering X' with 'consider X'. "
+                "Hedges soften copy into AI-flavored mush."
+            )
+        return result
+
+    def score_specificity(self, f: Dict) -> Dict:
+        c = self.curve("specificity")
+        word_count = max(1, f["word_count"])
+        specificity_density = (f["numbers"] + f["proper_nouns"]) / (word_count / 100)
+        vague_density = f["vague"] / (word_count / 100)
+
+        score = c["floor"]
+        for min_specific, max_vague, tier_score in c["tiers"]:
+            if specificity_density >= min_specific and (max_vague is None or vague_density <= max_vague):
+                score = tier_score
+                break
+
+        # Penalize for vague density regardless
+        for vague_above, penalty, floor in c["vague_penalties"]:
+            if vague_density > vague_above:
+                score = max(floor, score - penalty)
+                break
+
+        result = {
+            "score": round(score, 3),
+            "numbers_found": f["numbers"],
+            "proper_nouns_found": f["proper_nouns"],
+            "vague_quantity_words": f["vague"],
+            "specificity_density": round(specificity_density, 2),
+        }
+
+        if score < self.dimension_fail_threshold:
+            result["failure_reason"] = (
+                f"Copy lacks specificity (specificity density: {specificity_density:.1f}/100 words, "
+                f"vague terms: {f['vague']})"
+            )
+            result["suggestion"] = (
+                "Add concrete details: specific numbers, model names, years, measurements. "
+                "Replace 'many years of experience' with '18 years'. "
+                "Replace 'a wide range of services' with the actual service names."
+            )
+        return result
+
+    def score_transition_tells(self, f: Dict) -> Dict:
+        c = self.curve("transition_tells")
+        found = f["found"]
+        total = sum(count for _, count in found)
+        density = (total / max(1, f["word_count"])) * 100
+        score = _band(density, c["bands"], c["floor"])
+
+        result = {
+            "score": round(score, 3),
+            "transition_count": total,
+            "density_per_100_words": round(density, 2),
+            "examples": [phrase for phrase, _ in found[:4]],
+        }
+
+        if score < self.dimension_fail_threshold:
+            result["failure_reason"] = (
+                f"Overuse of formal transitions: {', '.join([p for p, _ in found[:3]])} "
+                f"({density:.1f} per 100 words)"
+            )
+            result["suggestion"] = (
+                "Remove formal transitions. Let ideas connect naturally without 'Furthermore,' "
+                "'Moreover,' 'In conclusion.' These words are AI tells. "
+                "Use em-free direct connection or start a new sentence."
+            )
+        return result
+
+    def score_page_repetition(self, f: Dict) -> Dict:
+        c = self.curve("page_repetition")
+        openers = [item for item in f["openers"] if len(item[1]) >= c["opener_sections"]]
+        ngrams = f["ngrams"]
+        structures = f["structures"]
+
+        penalty = (
+            len(openers) * c["opener_penalty"]
+            + min(c["ngram_max_penalty"], f.get("shared_ngrams", len(ngrams)) * c["ngram_penalty"])
+            + sum(len(group) - 1 for group in structures) * c["structure_penalty"]
+        )
+        score = max(0.0, 1.0 - penalty)
+
+        result = {
+            "score": round(score, 3),
+            "pass": score >= self.dimension_fail_threshold,
+            "sections": f["sections"],
+            "repeated_openers": [[opener, len(names)] for opener, names in openers[:5]],
+            "repeated_ngrams": [[ngram, names] for ngram, names in ngrams[:10]],
+            "shared_ngrams": f.get("shared_ngrams", len(ngrams)),
+            "identical_structures": structures,
+        }
+
+        if score < self.dimension_fail_threshold:
+            findings = []
+            if openers:
+                findings.append(f"'{openers[0][0]}' opens sentences in {len(openers[0][1])} sections")
+            if ngrams:
+                findings.append(f"{f.get('shared_ngrams', len(ngrams))} phrase(s) repeated across sections, "
+                                f"e.g. '{ngrams[0][0]}'")
+            if structures:
+                findings.append(f"identically structured sections: {', '.join(structures[0])}")
+            result["failure_reason"] = "Page repeats itself: " + "; ".join(findings)
+            result["suggestion"] = (
+                "Vary how sections open and are laid out, and say repeated lines once. "
+                "Templated sections with the same openers and phrasing read as generated."
+            )
+        return result
+
+
+# ─── Pass 2 ───────────────────────────────────────────────────────────────────
+
+class Pass2Policy(ScoringPolicy):
+    """
+    Scores VoiceAligner feature records against profile targets.
+    Targets (grade range, burstiness, contraction rate, ...) come from the
+    profile; the policy supplies tolerances, curves and weights. Per-profile
+    tolerances, where the schema has them, take precedence.
+    """
+
+    DEFAULTS = {
+        "pass_threshold": 0.60,
+        "dimension_fail_threshold": 0.60,
+        # Native constructions and contraction rate are highest signal.
+        # Normalized over the dimensions the profile actually defines.
+        "weights": {
+            "reading_level": 0.15,
+            "sentence_rhythm": 0.15,
+            "contraction_rate": 0.20,
+            "specificity": 0.10,
+            "register": 0.10,
+            "native_constructions": 0.20,
+            "negative_space": 0.10,
+        },
+        # Returned when the profile has the section but no usable target
+        "neutral_score": 0.80,
+        "curves": {
+            "reading_level": {"tolerance": 1.5},
+            "sentence_rhythm": {"tolerance": 0.15, "few_sentences_score": 0.75},
+            "contraction_rate": {"tolerance": 0.10},
+            # [min density, level] highest first; score drops per level of distance
+            "specificity": {
+                "levels": [[8, "very-high"], [5, "high"], [2, "moderate"], [0, "low"]],
+                "per_level": 0.33,
+            },
+            "register": {"midpoint": 5, "divisor": 5.0},
+            # [min hit rate, score]; not every section uses every pattern,
+            # 15-30% is baseline good performance
+            "native_constructions": {
+                "bands": [[0.30, 1.0], [0.20, 0.85], [0.10, 0.70], [0.05, 0.55]],
+                "floor": 0.40,
+            },
+            "negative_space": {"steps": [1.0, 0.50], "floor": 0.20},
+        },
+    }
+
+    LEVELS = {"low": 1, "moderate": 2, "high": 3, "very-high": 4}
+
+    def score(self, features: Dict, profile: Dict) -> Dict[str, Dict]:
+        """Score every dimension present in a feature record."""
+        return {
+            dim: self.score_dimension(dim, features[dim], profile.get(_PROFILE_SECTIONS[dim], {}))
+            for dim in self.weights
+            if dim in features
+        }
+
+    def composite(self, dimensions: Dict[str, Dict]) -> float:
+        """Weighted mean normalized to the dimensions actually scored."""
+        active = {k: v for k, v in self.weights.items() if k in dimensions}
+        total_weight = sum(active.values())
+        if total_weight == 0:
+            total_weight = 1.0
+        return sum(
+            dimensions[dim]["score"] * (active[dim] / total_weight)
+            for dim in dimensions
+        )
+
+    # ─── Targets and curves ──────────────────────────────────────────────────
+    # Shared by the score_* methods below and CompiledProfileSet's vectorized
+    # path: targets are plain numbers or NumPy arrays (one entry per profile),
+    # and the same expressions score both.
+
+    def reading_level_range(self, profile_rl: Dict) -> Optional[Tuple[float, float, float]]:
+        """(low, high, tolerance) of the target grade range; None without a target."""
+        target_min = profile_rl.get("target_min")
+        target_max = profile_rl.get("target_max")
+        tolerance = profile_rl.get("tolerance", self.curve("reading_level")["tolerance"])
+
+        # If only measured (no explicit target range), derive range from measured
+        if target_min is None and target_max is None:
+            measured_profile = profile_rl.get("flesch_kincaid_grade")
+            if not measured_profile:
+                return None
+            return measured_profile - tolerance, measured_profile + tolerance, tolerance
+        return (
+            -math.inf if target_min is None else target_min,
+            math.inf if target_max is None else target_max,
+            tolerance,
+        )
+
+    def contraction_target(self, profile_cr: Dict) -> Tuple[Optional[float], float, float]:
+        """(target, upper bound or NaN, tolerance); target is None when unset."""
+        target_max = profile_cr.get("target_max")
+        return (
+            profile_cr.get("target_min") or profile_cr.get("measured"),
+            target_max if target_max else math.nan,
+            profile_cr.get("tolerance", self.curve("contraction_rate")["tolerance"]),
+        )
+
+    def specificity_target(self, profile_ts: Dict) -> int:
+        return self.LEVELS.get(profile_ts.get("target", "moderate"), 2)
+
+    def reading_level_curve(self, grade, low, high, tolerance):
+        """1.0 inside [low, high], then down by 1/tolerance per grade outside."""
+        return _clip0(1.0 - _clip0(_maximum(low - grade, grade - high)) / tolerance)
+
+    def rhythm_curve(self, burstiness, target):
+        return _clip0(1.0 - abs(burstiness - target) / (self.curve("sentence_rhythm")["tolerance"] * 2))
+
+    def contraction_curve(self, measured, target, target_max, tolerance):
+        """1.0 inside [target, target_max], else by distance to target."""
+        in_range = (measured <= target_max) & (measured >= target)
+        return _where(in_range, 1.0, _clip0(1.0 - abs(measured - target) / (tolerance * 2)))
+
+    def specificity_curve(self, level, target_level):
+        return _clip0(1.0 - abs(level - target_level) * self.curve("specificity")["per_level"])
+
+    def register_curve(self, estimate, target):
+        return _clip0(1.0 - abs(estimate - target) / self.curve("register")["divisor"])
+
+    def native_curve(self, hit_rate):
+        """Score of the first band whose minimum hit rate is met, else the floor."""
+        c = self.curve("native_constructions")
+        np = _numpy_of(hit_rate)
+        if np is not None:
+            return np.select([hit_rate >= min_rate for min_rate, _ in c["bands"]],
+                             [score for _, score in c["bands"]], c["floor"])
+        for min_rate, band_score in c["bands"]:
+            if hit_rate >= min_rate:
+                return band_score
+        return c["floor"]
+
+    def negative_space_curve(self, violations):
+        """Score by violation count: steps[count], then the floor."""
+        c = self.curve("negative_space")
+        steps = c["steps"]
+        np = _numpy_of(violations)
+        if np is not None:
+            return np.where(violations < len(steps),
+                            np.array(steps)[np.minimum(violations, len(steps) - 1)], c["floor"])
+        return steps[violations] if violations < len(steps) else c["floor"]
+
+    def score_reading_level(self, f: Dict, profile_rl: Dict) -> Dict:
+        fk = f["fk_grade"]
+        target_range = self.reading_level_range(profile_rl)
+        if target_range is None:
+            return {"score": self.config["neutral_score"], "note": "No reading level target in profile"}
+        target_min, target_max, tolerance = target_range
+
+        # Score by distance from acceptable range
+        score = self.reading_level_curve(fk, target_min, target_max, tolerance)
+
+        result = {
+            "score": round(score, 3),
+            "measured_grade": round(fk, 1),
+            "target_min": None if math.isinf(target_min) else target_min,
+            "target_max": None if math.isinf(target_max) else target_max,
+        }
+
+        if score < self.dimension_fail_threshold:
+            direction = "too complex" if fk > target_max else "too simple"
+            result["failure_reason"] = (
+                f"Reading level {direction} (grade {fk:.1f}, target: {target_min}-{target_max})"
+            )
+            result["suggestion"] = (
+                f"{'Simplify sentence structure and vocabulary' if fk > target_max else 'Add more technical detail and complexity'} "
+                f"to reach target reading level {target_min:.0f}-{target_max:.0f}."
+            )
+        return result
+
+    def score_sentence_rhythm(self, f: Dict, profile_sr: Dict) -> Dict:
+        c = self.curve("sentence_rhythm")
+        target_burstiness = profile_sr.get("burstiness_score")
+        measured = f.get("burstiness")
+        if measured is None:
+            return {"score": c["few_sentences_score"], "note": "Too few sentences to score rhythm"}
+
+        distance = abs(measured - target_burstiness)
+        score = self.rhythm_curve(measured, target_burstiness)
+
+        result = {
+            "score": round(score, 3),
+            "measured_burstiness": round(measured, 3),
+            "target_burstiness": target_burstiness,
+            "distance": round(distance, 3),
+        }
+
+        if score < self.dimension_fail_threshold:
+            direction = "too varied" if measured > target_burstiness else "too uniform"
+            result["failure_reason"] = (
+                f"Sentence rhythm {direction} (measured: {measured:.2f}, "
+                f"profile target: {target_burstiness:.2f})"
+            )
+            result["suggestion"] = (
+                f"This brand voice has burstiness {target_burstiness:.2f}. "
+                f"{'Reduce extreme sentence length variation' if measured > target_burstiness else 'Add more variety in sentence length'}."
+            )
+        return result
+
+    def score_contraction_rate(self, f: Dict, profile_cr: Dict) -> Dict:
+        target, target_max, tolerance = self.contraction_target(profile_cr)
+        if target is None:
+            return {"score": self.config["neutral_score"], "note": "No contraction target in profile"}
+
+        measured = f["measured"]
+        score = self.contraction_curve(measured, target, target_max, tolerance)
+
+        result = {
+            "score": round(score, 3),
+            "measured": round(measured, 3),
+            "target": target,
+            "tolerance": tolerance,
+        }
+
+        if score < self.dimension_fail_threshold:
+            direction = "too formal" if measured < target else "too casual"
+            result["failure_reason"] = (
+                f"Contraction rate {direction} ({measured:.0%} vs. profile target {target:.0%})"
+            )
+            result["suggestion"] = (
+                f"{'Add contractions' if measured < target else 'Reduce contractions'} "
+                f"to match brand voice (target: {target:.0%})."
+            )
+        return result
+
+    def score_specificity(self, f: Dict, profile_ts: Dict) -> Dict:
+        target_level = profile_ts.get("target", "moderate")
+        target_numeric = self.specificity_target(profile_ts)
+
+        specificity_density, measured_level = self.specificity_level(f)
+        measured_numeric = self.LEVELS[measured_level]
+        score = self.specificity_curve(measured_numeric, target_numeric)
+
+        result = {
+            "score": round(score, 3),
+            "measured_level": measured_level,
+            "target_level": target_level,
+            "specificity_density": round(specificity_density, 2),
+        }
+
+        if score < self.dimension_fail_threshold:
+            direction = "too vague" if measured_numeric < target_numeric else "too technical"
+            result["failure_reason"] = (
+                f"Specificity {direction} (measured: {measured_level}, profile target: {target_level})"
+            )
+            result["suggestion"] = (
+                f"This brand voice commits to {target_level} specificity. "
+                f"{'Add specific numbers, model names, and technical details' if measured_numeric < target_numeric else 'Reduce technical jargon for broader accessibility'}."
+            )
+        return result
+
+    def specificity_level(self, f: Dict):
+        """Return (density per 100 words, level name) for specificity features."""
+        word_count = max(1, f["word_count"])
+        density = (f["numbers"] + f["proper_nouns"] + f["model_names"] * 2) / (word_count / 100)
+        levels = self.curve("specificity")["levels"]
+        for min_density, level in levels:
+            if density >= min_density:
+                return density, level
+        return density, levels[-1][1]
+
+    def register_estimates(self, f: Dict):
+        """Return (formality, warmth) estimates on the 1-10 scale from marker counts."""
+        midpoint = self.curve("register")["midpoint"]
+        formal, casual = f["formal"], f["casual"]
+        if casual > formal:
+            formality = max(1, midpoint - (casual - formal))
+        else:
+            formality = min(10, midpoint + (formal - casual))
+        # Warmth: second-person usage, direct address, inclusive language
+        warm, cold = f["warm"], f["cold"]
+        if warm > cold:
+            warmth = min(10, midpoint + (warm - cold))
+        else:
+            warmth = max(1, midpoint - (cold - warm))
+        return formality, warmth
+
+    def score_register(self, f: Dict, profile_reg: Dict) -> Dict:
+        target_formality = profile_reg.get("formality_score")
+        target_warmth = profile_reg.get("warmth_score")
+
+        if target_formality is None and target_warmth is None:
+            return {"score": self.config["neutral_score"], "note": "No register targets in profile"}
+
+        estimated_formality, estimated_warmth = self.register_estimates(f)
+        scores = []
+        result = {}
+        if target_formality is not None:
+            scores.append(self.register_curve(estimated_formality, target_formality))
+        if target_warmth is not None:
+            scores.append(self.register_curve(estimated_warmth, target_warmth))
+
+        overall_score = statistics.mean(scores) if scores else self.config["neutral_score"]
+
+        result["score"] = round(overall_score, 3)
+        if target_formality is not None:
+            result["formality_estimated"] = estimated_formality
+            result["formality_target"] = target_formality
+        if target_warmth is not None:
+            result["warmth_estimated"] = estimated_warmth
+            result["warmth_target"] = target_warmth
+
+        if overall_score < self.dimension_fail_threshold:
+            result["failure_reason"] = "Register (formality/warmth) doesn't match brand voice"
+            result["suggestion"] = (
+                f"Adjust tone toward profile targets: "
+                f"formality {target_formality}/10, warmth {target_warmth}/10."
+            )
+        return result
+
+    def score_native_constructions(self, f: Dict, profile_nc: Dict) -> Dict:
+        found, missed = f["found"], f["missed"]
+        total = len(found) + len(missed)
+        if total == 0:
+            return {"score": self.config["neutral_score"], "note": "No high-confidence constructions to match"}
+
+        hit_rate = len(found) / total
+        score = self.native_curve(hit_rate)
+
+        result = {
+            "score": round(score, 3),
+            "patterns_found": len(found),
+            "patterns_checked": total,
+            "hit_rate": round(hit_rate, 3),
+            "found_examples": found[:3],
+            "missed_examples": missed[:3],
+        }
+
+        if score < self.dimension_fail_threshold and len(found) == 0:
+            result["failure_reason"] = (
+                f"No native brand constructions detected (0/{total} patterns matched)"
+            )
+            result["suggestion"] = (
+                f"This brand voice uses characteristic patterns. Consider: "
+                f"{', '.join(missed[:3])}"
+            )
+        return result
+
+    def score_negative_space(self, f: Dict, profile_ns: Dict) -> Dict:
+        violations = f["violations"]
+        score = self.negative_space_curve(len(violations))
+
+        result = {
+            "score": round(score, 3),
+            "violations": list(violations),
+            "violation_count": len(violations),
+        }
+
+        if violations:
+            result["failure_reason"] = (
+                f"Negative space violations — brand would never say: {', '.join(violations[:3])}"
+            )
+            result["suggestion"] = (
+                f"Remove or rewrite sections containing: {', '.join(violations)}. "
+                "These patterns are explicitly out of character for this brand voice."
+            )
+        return result
+
+
+# Profile section each Pass 2 dimension reads its targets from
+_PROFILE_SECTIONS = {
+    "reading_level": "reading_level",
+    "sentence_rhythm": "sentence_rhythm",
+    "contraction_rate": "contraction_rate",
+    "specificity": "technical_specificity",
+    "register": "register",
+    "native_constructions": "native_constructions",
+    "negative_space": "negative_space",
+}
+
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+def _band(value: float, bands: List, floor: float) -> float:
+    """First [limit, score] with value <= limit, else floor."""
+    for limit, score in bands:
+        if value <= limit:
+            return score
+    return floor
+
+
+def _numpy_of(value):
+    """The numpy module when value is a NumPy array or scalar, else None.
+    Checked by type so scoring never imports NumPy for plain numbers."""
+    if type(value).__module__ == "numpy":
+        import numpy
+        return numpy
+    return None
+
+
+def _clip0(value):
+    np = _numpy_of(value)
+    return np.maximum(0.0, value) if np is not None else max(0.0, value)
+
+
+def _maximum(a, b):
+    np = _numpy_of(a) or _numpy_of(b)
+    return np.maximum(a, b) if np is not None else max(a, b)
+
+
+def _where(condition, a, b):
+    np = _numpy_of(condition)
+    if np is not None:
+        return np.where(condition, a, b)
+    return a if condition else b
+
+
+def _deep_merge(base: Dict, overrides: Dict) -> Dict:
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _deep_merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("pass1", "pass2"):
+        print("Usage: python scoring_policy.py pass1|pass2 [overrides.json]")
+        print("Prints the effective policy (defaults merged with overrides).")
+        sys.exit(1)
+
+    cls = Pass1Policy if sys.argv[1] == "pass1" else Pass2Policy
+    policy = cls.load(sys.argv[2]) if len(sys.argv) > 2 else cls()
+    print(json.dumps({"fingerprint": policy.fingerprint(), "policy": policy.to_dict()}, indent=2))
@@ -19,6 +19,13 @@ Usage:
     # Single section
     result = gate.run_section(text="...", section_name="hero")
 
+    # Per-stage timings (adds a "timings" block; off by default)
+    result = gate.run(sections, timings=True)
+
+    # Streamed: each section as soon as it is scored, then the result
+    for event in gate.iter_run(sections):
+        ...
+
 Result shape:
     {
         "gate_open": bool,           # True only if BOTH passes pass
@@ -27,17 +34,22 @@ Result shape:
         "override_eligible": bool,  # True if human override is allowed
         "summary": str,             # Human-readable one-liner
         "action_required": str,     # What to do next
-        "sections": {...}           # Per-section breakdown
+        "sections": {...},          # Per-section breakdown
+        "versions": {...}           # Lexicon and profile versions that scored it
     }
 """
 
 import json
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from pass1_ai_detection import AIDetector
 from pass2_voice_alignment import VoiceAligner
+from profile_validator import validate_profile
+from scoring_policy import Pass1Policy, Pass2Policy
+from timing import StageTimer
 
 
 class SCRVNRGate:
@@ -60,6 +72,11 @@ class SCRVNRGate:
         profile_dict: Optional[Dict] = None,
         pass1_threshold: float = None,
         pass2_threshold: float = None,
+        pass1_policy: Pass1Policy = None,
+        pass2_policy: Pass2Policy = None,
+        metrics=None,
+        lexicons=None,
+        profile_version: str = None,
     ):
         """
         Args:
@@ -67,12 +84,35 @@ class SCRVNRGate:
             profile_dict: Directly injected profile dict (alternative to path)
             pass1_threshold: Override default Pass 1 threshold
             pass2_threshold: Override default Pass 2 threshold
+            pass1_policy: Tenant scoring policy for Pass 1 (see scoring_policy.py)
+            pass2_policy: Tenant scoring policy for Pass 2
+            metrics: Optional MetricsRegistry — run latency, section counts
+                     and pass/fail counts are recorded to it
+            lexicons: Optional LexiconSet for Pass 1 (see lexicons.py)
+            profile_version: Label of the profile revision, recorded with
+                     the lexicon version in result["versions"]
+
+        Raises:
+            FileNotFoundError:      profile_path does not exist
+            ProfileValidationError: profile does not match the schema
         """
-        self.pass1_threshold = pass1_threshold or self.PASS1_THRESHOLD
-        self.pass2_threshold = pass2_threshold or self.PASS2_THRESHOLD
+        self.pass1_threshold = pass1_threshold or (
+            pass1_policy.pass_threshold if pass1_policy else self.PASS1_THRESHOLD
+        )
+        self.pass2_threshold = pass2_threshold or (
+            pass2_policy.pass_threshold if pass2_policy else self.PASS2_THRESHOLD
+        )
+
+        self.attach_metrics(metrics)
 
         # Pass 1 is always active
-        self.detector = AIDetector(pass_threshold=self.pass1_threshold)
+        self.detector = AIDetector(
+            pass_threshold=self.pass1_threshold,
+            policy=pass1_policy,
+            lexicons=lexicons.tables if lexicons is not None else None,
+            lexicon_version=lexicons.version if lexicons is not None else None,
+        )
+        self.profile_version = profile_version
 
         # Pass 2 requires a profile
         self.aligner = None
@@ -80,16 +120,44 @@ class SCRVNRGate:
 
         if profile_dict:
             self.profile = profile_dict
-            self.aligner = VoiceAligner(profile_dict, pass_threshold=self.pass2_threshold)
+            self.aligner = VoiceAligner(profile_dict, pass_threshold=self.pass2_threshold,
+                                        policy=pass2_policy)
         elif profile_path:
             profile_path = Path(profile_path)
             if not profile_path.exists():
                 raise FileNotFoundError(f"Voice profile not found: {profile_path}")
             with open(profile_path, "r", encoding="utf-8") as f:
                 self.profile = json.load(f)
-            self.aligner = VoiceAligner(self.profile, pass_threshold=self.pass2_threshold)
-
-    def run(self, sections: Dict[str, str], override: bool = False, override_note: str = "") -> Dict:
+            self.aligner = VoiceAligner(self.profile, pass_threshold=self.pass2_threshold,
+                                        policy=pass2_policy)
+
+    def attach_metrics(self, metrics):
+        """Record to this MetricsRegistry from now on (None stops recording)."""
+        self.metrics = metrics
+        if metrics is not None:
+            self._run_seconds = metrics.histogram(
+                "scrvnr_gate_run_seconds", "SCRVNRGate.run latency", ("profile",))
+            self._sections_total = metrics.counter(
+                "scrvnr_gate_sections_total", "Sections scored by the gate")
+            self._pass_results = metrics.counter(
+                "scrvnr_pass_results_total", "Page-level pass/fail per pass", ("pass", "result"))
+
+    def __getstate__(self) -> Dict:
+        # Metric families hold locks and belong to the process; warm snapshots
+        # pickle the compiled gate without them (re-bound via attach_metrics).
+        state = dict(self.__dict__)
+        for key in ("_run_seconds", "_sections_total", "_pass_results"):
+            state.pop(key, None)
+        state["metrics"] = None
+        return state
+
+    def run(
+        self,
+        sections: Dict[str, str],
+        override: bool = False,
+        override_note: str = "",
+        timings: bool = False,
+    ) -> Dict:
         """
         Run the full SCRVNR gate on a set of named sections.
 
@@ -97,20 +165,76 @@ class SCRVNRGate:
             sections:      dict of {section_name: text}
             override:      If True, gate reports override rather than hard fail
             override_note: Required if override=True
+            timings:       If True, add a "timings" block — total and per-stage
+                           milliseconds (pass1, pass2, every dimension scorer,
+                           summary)
 
         Returns:
             Full gate result with per-section breakdown
         """
         if not sections:
             return self._empty_result()
+        for event in self.iter_run(sections, override, override_note, timings):
+            pass
+        return event["result"]
+
+    def iter_run(
+        self,
+        sections: Dict[str, str],
+        override: bool = False,
+        override_note: str = "",
+        timings: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        run() as a stream. Sections are scored one at a time, in input order,
+        and each is yielded as soon as both passes have scored it:
 
-        # ── Pass 1: AI Detection ──────────────────────────────────────────────
-        p1_doc = self.detector.analyze_document(sections)
+            {"event": "section", "name": str, "index": int, "total": int,
+             **per-section summary}                 # same fields as result["sections"][name]
 
-        # ── Pass 2: Voice Alignment ───────────────────────────────────────────
-        p2_doc = None
-        if self.aligner:
-            p2_doc = self.aligner.analyze_document(sections)
+        followed by exactly one
+
+            {"event": "result", "result": <the dict run() returns>}
+
+        The page-level work (aggregates, page repetition, gate decision) only
+        needs the per-section records, so streaming adds no scoring work.
+        """
+        if not sections:
+            yield {"event": "result", "result": self._empty_result()}
+            return
+        started = time.perf_counter() if self.metrics is not None else None
+        timer = StageTimer() if timings else None
+
+        # ── Per section: Pass 1 (AI detection), then Pass 2 (voice alignment) ─
+        p1_results, p1_features, p2_results = {}, {}, {}
+        section_summaries = {}
+        for index, (name, text) in enumerate(sections.items()):
+            if timer is None:
+                p1_features[name] = self.detector.extract_features(text)
+                p1_results[name] = self.detector.score_features(p1_features[name], name)
+                if self.aligner:
+                    p2_results[name] = self.aligner.score_features(self.aligner.extract_features(text), name)
+            else:
+                with timer.stage("pass1"):
+                    p1_features[name] = self.detector.extract_features(text, timer)
+                    with timer.stage("pass1.score"):
+                        p1_results[name] = self.detector.score_features(p1_features[name], name)
+                if self.aligner:
+                    with timer.stage("pass2"):
+                        features = self.aligner.extract_features(text, timer)
+                        with timer.stage("pass2.score"):
+                            p2_results[name] = self.aligner.score_features(features, name)
+
+            section_summaries[name] = self._section_summary(p1_results[name], p2_results.get(name))
+            yield dict(event="section", name=name, index=index, total=len(sections), **section_summaries[name])
+
+        if timer is None:
+            p1_doc = self.detector.summarize_document(p1_results, p1_features)
+            p2_doc = self.aligner.summarize_document(p2_results) if self.aligner else None
+        else:
+            with timer.stage("pass1"):
+                p1_doc = self.detector.summarize_document(p1_results, p1_features, timer)
+            p2_doc = self.aligner.summarize_document(p2_results) if self.aligner else None
 
         # ── Gate Decision ─────────────────────────────────────────────────────
         p1_pass = p1_doc["pass"]
@@ -128,31 +252,18 @@ class SCRVNRGate:
             # Override doesn't change the scores — it just unlocks the gate.
             # The audit trail records everything.
 
-        # ── Build Per-Section Summary ─────────────────────────────────────────
-        section_summaries = {}
-        for name in sections:
-            p1_sec = p1_doc["section_results"].get(name, {})
-            p2_sec = p2_doc["section_results"].get(name, {}) if p2_doc else None
-
-            sec_p1_pass = p1_sec.get("pass", True)
-            sec_p2_pass = p2_sec.get("pass", True) if p2_sec else True
-            sec_pass = sec_p1_pass and sec_p2_pass
-
-            section_summaries[name] = {
-                "pass": sec_pass,
-                "pass1_score": p1_sec.get("overall_score"),
-                "pass1_pass": sec_p1_pass,
-                "pass1_failures": p1_sec.get("failures", []),
-                "pass2_score": p2_sec.get("overall_score") if p2_sec else None,
-                "pass2_pass": sec_p2_pass,
-                "pass2_failures": p2_sec.get("failures", []) if p2_sec else [],
-            }
-
         # ── Human-readable summary ────────────────────────────────────────────
-        summary, action = self._build_summary(
-            gate_open, p1_pass, p2_pass, p2_active,
-            p1_doc, p2_doc, override_applied
-        )
+        if timer is None:
+            summary, action = self._build_summary(
+                gate_open, p1_pass, p2_pass, p2_active,
+                p1_doc, p2_doc, override_applied
+            )
+        else:
+            with timer.stage("summary"):
+                summary, action = self._build_summary(
+                    gate_open, p1_pass, p2_pass, p2_active,
+                    p1_doc, p2_doc, override_applied
+                )
 
         result = {
             "gate_open": gate_open or override_applied,
@@ -179,12 +290,19 @@ class SCRVNRGate:
                 "detail": p2_doc,
             },
             "sections": section_summaries,
+            # Page-level dimension across sections. Informational — not gated.
+            "page_repetition": p1_doc["page_repetition"],
+            "versions": {"lexicons": self.detector.lexicon_version, "profile": self.profile_version},
             "summary": summary,
             "action_required": action,
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
+        if timer is not None:
+            result["timings"] = timer.to_dict()
+        if started is not None:
+            self._record_metrics(result, len(sections), started)
 
-        return result
+        yield {"event": "result", "result": result}
 
     def run_section(
         self,
@@ -192,6 +310,7 @@ class SCRVNRGate:
         section_name: str = "section",
         override: bool = False,
         override_note: str = "",
+        timings: bool = False,
     ) -> Dict:
         """
         Convenience wrapper for single-section analysis.
@@ -200,10 +319,33 @@ class SCRVNRGate:
             sections={section_name: text},
             override=override,
             override_note=override_note,
+            timings=timings,
         )
 
     # ─── Internal ─────────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _section_summary(p1_sec: Dict, p2_sec: Optional[Dict]) -> Dict:
+        sec_p1_pass = p1_sec.get("pass", True)
+        sec_p2_pass = p2_sec.get("pass", True) if p2_sec else True
+        return {
+            "pass": sec_p1_pass and sec_p2_pass,
+            "pass1_score": p1_sec.get("overall_score"),
+            "pass1_pass": sec_p1_pass,
+            "pass1_failures": p1_sec.get("failures", []),
+            "pass2_score": p2_sec.get("overall_score") if p2_sec else None,
+            "pass2_pass": sec_p2_pass,
+            "pass2_failures": p2_sec.get("failures", []) if p2_sec else [],
+        }
+
+    def _record_metrics(self, result: Dict, section_count: int, started: float):
+        profile_id = result["pass2"]["profile_used"] or "none"
+        self._run_seconds.observe(time.perf_counter() - started, profile_id)
+        self._sections_total.inc(amount=section_count)
+        self._pass_results.inc("pass1", "pass" if result["pass1"]["pass"] else "fail")
+        if result["pass2"]["active"]:
+            self._pass_results.inc("pass2", "pass" if result["pass2"]["pass"] else "fail")
+
     def _gate_status(self, gate_open: bool, override_applied: bool) -> str:
         if gate_open:
             return "PASS"
@@ -282,25 +424,84 @@ class SCRVNRGate:
 
 # ─── Convenience: Load profile by client/brand slug ───────────────────────────
 
-def load_profile(profiles_dir: str, client_slug: str, brand_slug: str) -> Optional[Dict]:
-    """
-    Load a voice profile by client/brand slug from the profiles directory.
-    Returns None if not found.
-    """
-    profiles_dir = Path(profiles_dir)
-    # Try canonical naming: {client_slug}-{brand_slug}.json
-    candidates = [
+def _profile_candidates(profiles_dir: Path, client_slug: str, brand_slug: str) -> List[Path]:
+    # Canonical naming first: {client_slug}-{brand_slug}.json
+    return [
         profiles_dir / f"{client_slug}-{brand_slug}.json",
         profiles_dir / client_slug / f"{brand_slug}.json",
         profiles_dir / f"{brand_slug}.json",
     ]
-    for path in candidates:
+
+
+def load_profile(
+    profiles_dir: Optional[str],
+    client_slug: str,
+    brand_slug: str,
+    store=None,
+) -> Optional[Dict]:
+    """
+    Load a voice profile by client/brand slug from the profiles directory.
+    Returns None if not found. Raises ProfileValidationError if the file
+    exists but does not match the schema.
+
+    If a ProfileStore is passed as store, it is used in place of the
+    directory (profiles_dir may be None).
+    """
+    if store is not None:
+        return store.get(client_slug, brand_slug)
+
+    for path in _profile_candidates(Path(profiles_dir), client_slug, brand_slug):
         if path.exists():
             with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                return validate_profile(json.load(f))
     return None
 
 
+def resolve_profile_path(property_slug: str, profiles_dir: str) -> Optional[Path]:
+    """The profile file resolve_profile would read for a slug (directory only), or None."""
+    if "-" in property_slug:
+        client_slug, brand_slug = property_slug.rsplit("-", 1)
+    else:
+        client_slug, brand_slug = property_slug, "main"
+    profiles_dir = Path(profiles_dir)
+    for path in _profile_candidates(profiles_dir, client_slug, brand_slug) + [profiles_dir / f"{property_slug}.json"]:
+        if path.exists():
+            return path
+    return None
+
+
+def resolve_profile(
+    property_slug: str,
+    profiles_dir: Optional[str] = None,
+    store=None,
+) -> Optional[Dict]:
+    """
+    Resolve a Website Studio property slug (e.g. "gad-main") to a profile.
+
+    Store: exact profile_id first, then the client/brand split on the last "-".
+    Directory: the client/brand split via load_profile, then {slug}.json.
+    Returns None if nothing matches.
+    """
+    if "-" in property_slug:
+        client_slug, brand_slug = property_slug.rsplit("-", 1)
+    else:
+        client_slug, brand_slug = property_slug, "main"
+
+    if store is not None:
+        profile = store.get_by_id(property_slug)
+        if profile is None and "-" in property_slug:
+            profile = store.get(client_slug, brand_slug)
+        return profile
+
+    profile = load_profile(profiles_dir, client_slug, brand_slug)
+    if not profile:
+        direct = Path(profiles_dir) / f"{property_slug}.json"
+        if direct.exists():
+            with open(direct, "r", encoding="utf-8") as f:
+                profile = validate_profile(json.load(f))
+    return profile
+
+
 # ─── CLI ─────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -308,7 +509,7 @@ if __name__ == "__main__":
     import json as _json
 
     def _usage():
-        print("Usage: python scrvnr_gate.py <file.txt> [<profile.json>] [--json] [--override 'note']")
+        print("Usage: python scrvnr_gate.py <file.txt | dir | 'glob'> [<profile.json>] [--json] [--override 'note']")
         sys.exit(1)
 
     if len(sys.argv) < 2:
@@ -328,11 +529,22 @@ if __name__ == "__main__":
             override = True
             override_note = sys.argv[i + 1]
 
+    # Directory or glob: JSONL batch across cores (see batch_gate.py)
+    from batch_gate import is_batch_target, run_batch, split_sections
+    if is_batch_target(content_path):
+        batch_profile = None
+        if profile_path:
+            with open(profile_path, "r", encoding="utf-8") as f:
+                batch_profile = validate_profile(_json.load(f))
+        run_batch([content_path], sys.stdout, profile=batch_profile)
+        sys.exit(0)
+
     with open(content_path, "r", encoding="utf-8") as f:
         text = f.read()
 
     gate = SCRVNRGate(profile_path=profile_path)
-    result = gate.run_section(text, section_name="document", override=override, override_note=override_note)
+    # Split like a batch run (headings, <h1>-<h3>) so a file scores the same either way
+    result = gate.run(split_sections(content_path, text) or {"document": text}, override=override, override_note=override_note)
 
     if output_json:
         print(_json.dumps(result, indent=2))
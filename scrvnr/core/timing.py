@@ -0,0 +1,65 @@
+"""
+GHM SCRVNR — Stage Timing
+===========================
+Opt-in per-stage timing for gate runs.
+
+Callers that want timings create a StageTimer and pass it down; callers
+that don't pass None, and instrumented code takes its original untimed
+path. Disabled instrumentation costs one `is None` check per stage.
+
+Durations come from time.perf_counter() (monotonic) and accumulate per
+stage name, so a dimension measured once per section reports its total
+across the page.
+
+Timings block (in gate, adapter and runner results):
+    {
+        "total_ms": 41.2,
+        "stages": {"pass1": 20.1, "pass1.burstiness": 2.3, ..., "summary": 0.02}
+    }
+
+Usage:
+    timer = StageTimer()
+    with timer.stage("pass1"):
+        ...
+    timer.add("pass1.burstiness", seconds)
+    result["timings"] = timer.to_dict()
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class StageTimer:
+    """Accumulates monotonic durations per named stage."""
+
+    def __init__(self, started: float = None):
+        """
+        Args:
+            started: perf_counter() value total_ms counts from (default: now)
+        """
+        self.stages: Dict[str, float] = {}   # name -> seconds
+        self._started = time.perf_counter() if started is None else started
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block under name."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, timings: Dict, prefix: str = ""):
+        """Fold another timings block (to_dict() output) in under a name prefix."""
+        for name, ms in timings.get("stages", {}).items():
+            self.add(prefix + name, ms / 1000)
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "stages": {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+        }
@@ -27,6 +27,13 @@ Usage:
     # Save to file
     extractor.save(profile, "profiles/gad-main.json")
 
+    # Or to a versioned SQLite store
+    extractor = VoiceProfileExtractor(profile_store=ProfileStore("profiles.db"))
+    extractor.save(profile)
+
+    # Keep a nearest-profile index current on every save
+    extractor = VoiceProfileExtractor(profile_index=ProfileIndex.from_directory("profiles"))
+
 Confidence levels:
     high   — metric extracted from sufficient sample (>500 words)
     medium — metric estimated from limited sample (200-500 words)
@@ -42,6 +49,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from file_utils import atomic_write
+
 
 class VoiceProfileExtractor:
     """
@@ -102,6 +111,17 @@ class VoiceProfileExtractor:
     WARM_MARKERS = ["you", "your", "we", "our", "together", "help", "care", "family", "trust"]
     COLD_MARKERS = ["the client", "the customer", "users", "end users", "personnel", "individuals"]
 
+    def __init__(self, profile_store=None, profile_index=None):
+        """
+        Args:
+            profile_store: Optional ProfileStore. When set, save() also records
+                           a new profile version in the store.
+            profile_index: Optional ProfileIndex. When set, save() adds or
+                           replaces the profile in the index.
+        """
+        self.profile_store = profile_store
+        self.profile_index = profile_index
+
     def extract(
         self,
         text: str,
@@ -290,14 +310,43 @@ class VoiceProfileExtractor:
 
         return profile
 
-    def save(self, profile: Dict, output_path: str) -> str:
-        """Save profile to JSON file. Returns absolute path."""
+    def save(
+        self,
+        profile: Dict,
+        output_path: Optional[str] = None,
+        expected_version: int = None,
+        note: str = None,
+    ) -> str:
+        """
+        Save profile to a JSON file and/or the configured ProfileStore.
+
+        File writes go to a temp file in the same directory and are renamed
+        into place, so concurrent saves never leave a torn or interleaved file.
+        Store writes are versioned; pass expected_version to fail with
+        ProfileConflictError instead of overwriting a concurrent update.
+
+        Returns the absolute file path, or the profile_id for store-only saves.
+        """
+        if output_path is None and self.profile_store is None:
+            raise ValueError("save() needs an output_path or a profile_store")
+
+        if self.profile_store is not None:
+            self.profile_store.put(profile, expected_version=expected_version, note=note)
+
+        if output_path is None:
+            self._index(profile)
+            return profile["profile_id"]
+
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
+        with atomic_write(output_path, "w", encoding="utf-8", fsync=True) as f:
             json.dump(profile, f, indent=2, ensure_ascii=False)
+        self._index(profile)
         return str(output_path.resolve())
 
+    def _index(self, profile: Dict):
+        if self.profile_index is not None:
+            self.profile_index.add(profile)
+
     def update(self, existing_profile_path: str, new_text: str) -> Dict:
         """
         Update an existing profile with fresh source text.
@@ -0,0 +1,218 @@
+"""
+GHM SCRVNR — Warm-Start Snapshot
+==================================
+Saves an adapter's compiled per-property gates to one file so a restarted
+or newly scaled-out worker starts warm.
+
+A cold adapter pays for every property on its first request: resolve the
+profile file, parse the JSON, validate it against the schema, then build
+the detector and aligner (pattern tables, active dimensions, policies).
+A snapshot stores each compiled SCRVNRGate pickled, one blob per
+property, behind a small index:
+
+    SCRVSNAP | u16 format | u64 index length | index (pickle) | blob | blob ...
+
+Opening a snapshot memory-maps the file read-only and decodes only the
+index, so it costs about the same for 5 properties as for 5,000. A blob is
+unpickled when its property is requested. The mapping is read-only and
+backed by the page cache, so every worker process that opens the same
+snapshot shares one physical copy of it; with SCRVNRAdapter(max_gates=N)
+each worker keeps only its N hot gates as private objects and re-decodes
+the rest from the shared pages on demand.
+
+Validation:
+  - The whole snapshot is ignored if it was written in another format, by
+    different engine source (hash of ENGINE_MODULES) or with different
+    gate thresholds.
+  - Each entry records the source it was compiled from: ("file", path,
+    blake2b of the bytes) or ("store", profile_id, content_hash). The
+    adapter uses an entry only while the property still resolves to that
+    source with that hash; edited, moved or re-versioned profiles are
+    loaded the normal way.
+
+Usage:
+    adapter.save_snapshot("scrvnr/warm.snap")              # after warm-up
+    adapter = SCRVNRAdapter(snapshot="scrvnr/warm.snap")   # on restart
+
+CLI:
+    python warm_snapshot.py build <snapshot> [--profiles-dir DIR]   # compile every profile
+    python warm_snapshot.py info <snapshot>
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from file_utils import atomic_write
+
+MAGIC = b"SCRVSNAP"
+FORMAT_VERSION = 1
+ENGINE_MODULES = (
+    "scrvnr_gate",
+    "pass1_ai_detection",
+    "pass2_voice_alignment",
+    "scoring_policy",
+    "lexicons",
+    "profile_validator",
+    "warm_snapshot",
+)
+
+_HEADER = struct.Struct(">8sHQ")
+
+
+def file_hash(path) -> str:
+    """blake2b of a file's bytes (the "file" source hash)."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def engine_fingerprint() -> str:
+    """Hash of the engine source. Pickled gates are only reused by the code that wrote them."""
+    core_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.blake2b(digest_size=16)
+    for name in ENGINE_MODULES:
+        with open(os.path.join(core_dir, name + ".py"), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, entries: Dict[str, Tuple[object, tuple]], config: Dict) -> int:
+    """
+    Write {property_slug: (gate, source)} atomically. Returns the entry count.
+
+    Args:
+        config: Settings the gates were compiled under (thresholds); a reader
+                with different settings ignores the snapshot.
+    """
+    index, blobs, offset = {}, [], 0
+    for slug, (gate, source) in entries.items():
+        blob = pickle.dumps(gate, protocol=pickle.HIGHEST_PROTOCOL)
+        index[slug] = (offset, len(blob), tuple(source))
+        blobs.append(blob)
+        offset += len(blob)
+    meta = pickle.dumps({
+        "engine": engine_fingerprint(),
+        "config": config,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "entries": index,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    with atomic_write(Path(path), "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)))
+        f.write(meta)
+        for blob in blobs:
+            f.write(blob)
+    return len(index)
+
+
+class WarmSnapshot:
+    """Read side of a snapshot file: mapped once, entries decoded on demand."""
+
+    def __init__(self, path: str, config: Dict = None):
+        """
+        Args:
+            path:   Snapshot file
+            config: Expected compile settings (None accepts any)
+
+        A missing, corrupt or mismatched snapshot is not an error: it opens
+        empty and .rejected says why.
+        """
+        self.path = str(path)
+        self.rejected: Optional[str] = None
+        self.created_at: Optional[str] = None
+        self.entries: Dict[str, tuple] = {}
+        self._mm = None
+        self._base = 0
+        try:
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, meta_len = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError("not a snapshot, or another format version")
+            meta = pickle.loads(self._mm[_HEADER.size:_HEADER.size + meta_len])
+        except (OSError, ValueError, struct.error, pickle.UnpicklingError, EOFError) as e:
+            self._reject(f"unreadable: {e}")
+            return
+        if meta["engine"] != engine_fingerprint():
+            self._reject("engine source changed")
+        elif config is not None and meta["config"] != config:
+            self._reject("gate settings differ")
+        else:
+            self.entries = meta["entries"]
+            self.created_at = meta["created_at"]
+            self._base = _HEADER.size + meta_len
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, property_slug: str) -> bool:
+        return property_slug in self.entries
+
+    def source(self, property_slug: str) -> tuple:
+        """The source an entry was compiled from (see module docstring)."""
+        return self.entries[property_slug][2]
+
+    def load(self, property_slug: str):
+        """Unpickle a private copy of one entry's gate from the mapped file."""
+        offset, length, _ = self.entries[property_slug]
+        start = self._base + offset
+        return pickle.loads(self._mm[start:start + length])
+
+    def discard(self, property_slug: str):
+        """Forget an entry (e.g. its source changed)."""
+        self.entries.pop(property_slug, None)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _reject(self, reason: str):
+        self.rejected = reason
+        self.entries = {}
+        self.close()
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    _scrvnr_root = Path(__file__).parent.parent
+    sys.path.insert(0, str(_scrvnr_root))
+
+    parser = argparse.ArgumentParser(description="Build or inspect a warm-start snapshot.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="Compile every profile in a directory into a snapshot")
+    p.add_argument("snapshot")
+    p.add_argument("--profiles-dir", default=str(_scrvnr_root / "profiles"))
+    p = sub.add_parser("info", help="Show a snapshot's header and entries")
+    p.add_argument("snapshot")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from website_studio_adapter import SCRVNRAdapter
+        started = time.perf_counter()
+        adapter = SCRVNRAdapter(profiles_dir=args.profiles_dir)
+        adapter.warm()
+        count = adapter.save_snapshot(args.snapshot)
+        print(f" Snapshot: {count} properties -> {args.snapshot} "
+              f"({os.path.getsize(args.snapshot) / 1024:.0f} KB, {time.perf_counter() - started:.2f}s)")
+    else:
+        snapshot = WarmSnapshot(args.snapshot)
+        if snapshot.rejected:
+            print(f" Rejected: {snapshot.rejected}")
+            sys.exit(1)
+        print(f" {len(snapshot)} properties, written {snapshot.created_at}")
+        for slug in sorted(snapshot.entries):
+            print(f"  {slug:<40} {snapshot.source(slug)[0]:<6} {snapshot.entries[slug][1]:>8} bytes")
+        snapshot.close()
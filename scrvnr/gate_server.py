@@ -0,0 +1,192 @@
+"""
+GHM SCRVNR — Gate HTTP Service
+================================
+Long-running alternative to spawning ws_gate_runner.py per request.
+
+One process holds one SCRVNRAdapter, so profiles, compiled gates and
+lexicons are loaded once instead of on every call. Payloads and results
+are the same JSON shapes ws_gate_runner.py reads and writes.
+
+Endpoints:
+    POST /check      runner payload -> adapter result
+                     ("section_only" selects check_section, "timings" is honoured;
+                     "stream": true answers a page check with NDJSON, a line
+                     per section as it is scored, then the result line —
+                     the same records as ws_gate_runner.py streams)
+    POST /reload     adapter.reload() — re-read lexicons and cached profiles,
+                     swap them in without dropping requests
+                     (optional body {"lexicons": path})
+    GET  /healthz    {"ok": true, "requests": n, "lexicons": version, "generation": n}
+    GET  /metrics    Prometheus text (also on --metrics-port if given)
+
+SIGHUP triggers the same reload as POST /reload.
+
+With --snapshot, compiled gates are taken from a warm-start snapshot at
+start-up and the snapshot is rewritten on shutdown (warm_snapshot.py), so
+a restarted service skips rebuilding every profile.
+
+Binds to 127.0.0.1 by default. It is meant to sit behind the app server
+on the same host and has no authentication of its own.
+
+Usage:
+    python -m scrvnr serve --port 8765 --metrics-port 9464
+    curl -s localhost:8765/check -d '{"property_slug": "gad-main", "sections": {"hero": "..."}}'
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+
+_scrvnr_root = Path(__file__).parent
+sys.path.insert(0, str(_scrvnr_root / "core"))
+
+from lexicons import LexiconError
+from metrics import MetricsRegistry
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+def handle_payload(adapter, payload: Dict) -> Dict:
+    """Dispatch one runner-shaped payload to the adapter (see SCRVNRAdapter.payload_call)."""
+    check, kwargs = adapter.payload_call(payload)
+    return check(**kwargs)
+
+
+def make_server(adapter, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP server bound to host:port around an adapter (not yet serving)."""
+    state = {"requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/healthz":
+                self._send(200, {"ok": True, "requests": state["requests"],
+                                 "lexicons": adapter.lexicons.version, "generation": adapter.generation})
+            elif path == "/metrics" and adapter.metrics is not None:
+                body = adapter.metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self._send(404, {"error": "Not found"})
+
+        def do_POST(self):
+            path = self.path.split("?")[0]
+            if path not in ("/check", "/reload"):
+                self._send(404, {"error": "Not found"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                self._send(413, {"error": "Payload too large"})
+                return
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError as e:
+                self._send(400, {"error": f"Invalid JSON input: {e}"})
+                return
+            if path == "/reload":
+                try:
+                    self._send(200, adapter.reload(payload.get("lexicons")))
+                except LexiconError as e:
+                    self._send(400, {"error": str(e)})
+                return
+            with lock:
+                state["requests"] += 1
+            if payload.get("stream") and not payload.get("section_only"):
+                self._stream(payload)
+                return
+            try:
+                self._send(200, handle_payload(adapter, payload))
+            except Exception as e:
+                self._send(500, {"gate_open": False, "gate_status": "ERROR", "error": str(e)})
+
+        def _send(self, status: int, data: Dict):
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, payload: Dict):
+            """NDJSON response, one flushed line per adapter.iter_check_payload() record."""
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            try:
+                events = adapter.iter_check_payload(payload)
+                for event in events:
+                    self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                events.close()   # client went away: stop scoring the rest of the page
+            except Exception as e:
+                result = {"gate_open": False, "gate_status": "ERROR", "error": str(e)}
+                self.wfile.write(json.dumps({"event": "result", "result": result}).encode("utf-8") + b"\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def _reload_logged(adapter):
+    try:
+        result = adapter.reload()
+        print(f" Reloaded: lexicons {result['lexicons']}, {result['gates']} gates "
+              f"(generation {result['generation']})", flush=True)
+    except LexiconError as e:
+        print(f" Reload failed, still serving the previous version: {e}", flush=True)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, profiles_dir: str = None, metrics_port: int = None,
+          audit_dir: str = None, duplicate_index: str = None, snapshot: str = None, max_gates: int = None,
+          lexicons_path: str = None):
+    """Build the adapter, serve until interrupted, then flush the audit log, index and snapshot."""
+    from website_studio_adapter import SCRVNRAdapter
+
+    audit_log = None
+    if audit_dir:
+        from audit_log import AuditLog
+        audit_log = AuditLog(audit_dir)
+    index = None
+    if duplicate_index:
+        from near_duplicate import open_duplicate_index
+        index = open_duplicate_index(duplicate_index)
+    metrics = MetricsRegistry()
+    adapter = SCRVNRAdapter(profiles_dir=profiles_dir, audit_log=audit_log, duplicate_index=index,
+                            metrics=metrics, snapshot=snapshot, max_gates=max_gates,
+                            lexicons_path=lexicons_path)
+
+    server = make_server(adapter, host, port)
+    if hasattr(signal, "SIGHUP"):
+        def _reload(*_):
+            threading.Thread(target=_reload_logged, args=(adapter,), daemon=True).start()
+        signal.signal(signal.SIGHUP, _reload)
+    if metrics_port:
+        metrics.serve(metrics_port, host)
+    print(f" SCRVNR gate service on http://{host}:{server.server_address[1]} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if audit_log is not None:
+            audit_log.close()
+        if index is not None:
+            index.save()
+        if snapshot:
+            adapter.save_snapshot(snapshot)
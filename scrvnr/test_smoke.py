@@ -192,6 +192,10 @@ try:
     with open(saved, "r") as f:
         loaded = json.load(f)
     check("Profile save/load roundtrip", loaded["profile_id"] == "test-client-main")
+    saved_umask = os.umask(0o022)
+    os.umask(saved_umask)
+    check("Saved profile gets the umask-derived mode, not mkstemp's 0600",
+          os.stat(saved).st_mode & 0o777 == 0o666 & ~saved_umask)
 finally:
     pathlib.Path(tmp_path).unlink(missing_ok=True)
 
@@ -308,6 +312,1569 @@ check("Action always populated", bool(result_good["action_required"].strip()))
 check("Timestamp in result", "Z" in result_good["timestamp"])
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# PROFILE VALIDATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("PROFILE VALIDATION")
+print("=" * 60)
+
+from profile_validator import ProfileValidationError, get_validator
+from scrvnr_gate import load_profile
+
+validator = get_validator()
+profiles_dir = os.path.join(os.path.dirname(__file__), "profiles")
+
+check("Extracted profile validates", validator.errors(profile) == [],
+      "; ".join(validator.errors(profile)))
+check("Sparse profile validates", validator.errors(sparse_profile) == [])
+gad = load_profile(profiles_dir, "gad", "main")
+check("Bundled gad-main profile loads and validates", gad is not None and gad["profile_id"] == "gad-main")
+
+broken = json.loads(json.dumps(profile))
+broken["reading_level"]["tolerance"] = "1.5"
+broken["technical_specificity"]["target"] = "extreme"
+broken["native_constructions"]["items"].append({"pattern": 42})
+broken_errors = validator.errors(broken)
+check("Validator reports field-level paths",
+      any(e.startswith("reading_level.tolerance") for e in broken_errors) and
+      any(e.startswith("technical_specificity.target") for e in broken_errors) and
+      any(e.startswith("native_constructions.items[2].pattern") for e in broken_errors),
+      "; ".join(broken_errors))
+
+try:
+    SCRVNRGate(profile_dict=broken)
+    check("Gate rejects malformed profile at construction", False, "no error raised")
+except ProfileValidationError as e:
+    check("Gate rejects malformed profile at construction", len(e.errors) == 3, str(e))
+
+zero_tolerance = json.loads(json.dumps(profile))
+zero_tolerance["contraction_rate"]["tolerance"] = 0
+check("Zero tolerance (scorer divisor) rejected",
+      any("contraction_rate.tolerance" in e for e in validator.errors(zero_tolerance)))
+check("Non-dict profile rejected", validator.errors(["not", "a", "profile"]) != [])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PROFILE STORE
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("PROFILE STORE")
+print("=" * 60)
+
+from profile_store import ProfileStore, ProfileConflictError
+from website_studio_adapter import SCRVNRAdapter
+
+store_dir = tempfile.mkdtemp()
+store = ProfileStore(os.path.join(store_dir, "profiles.db"))
+imported = store.import_directory(profiles_dir)
+check("Store imports profiles directory", imported == ["gad-main"], f"imported={imported}")
+check("Store lookup by client/brand",
+      (store.get("german-auto-doctor", "main") or {}).get("profile_id") == "gad-main")
+
+v1 = store.put(profile)
+v1_again = store.put(profile)
+check("Identical content does not add a version", v1 == v1_again == 1)
+
+store_extractor = VoiceProfileExtractor(profile_store=store)
+updated = json.loads(json.dumps(profile))
+updated["locked_fields"] = ["negative_space"]
+saved_id = store_extractor.save(updated, expected_version=1, note="lock negative space")
+check("Extractor saves new version to store",
+      saved_id == "test-client-main" and store.head("test-client-main")["version"] == 2)
+check("History keeps versions and locked-field metadata",
+      [h["version"] for h in store.history("test-client-main")] == [2, 1] and
+      store.history("test-client-main")[0]["locked_fields"] == ["negative_space"])
+check("Old version still readable",
+      store.get_by_id("test-client-main", version=1)["locked_fields"] == [])
+
+try:
+    store_extractor.save(updated, expected_version=1)
+    check("Stale expected_version rejected", False, "no conflict raised")
+except ProfileConflictError:
+    check("Stale expected_version rejected", True)
+
+try:
+    store.put(broken)
+    check("Store rejects invalid profile", False, "no error raised")
+except ProfileValidationError:
+    check("Store rejects invalid profile", True)
+
+store_loaded = load_profile(None, "test-client", "main", store=store)
+check("load_profile reads from store", store_loaded["locked_fields"] == ["negative_space"])
+
+store_adapter = SCRVNRAdapter(profile_store=store)
+store_page = store_adapter.check_page("gad-main", {"hero": GOOD_TEXT})
+check("Adapter gates against store-backed profile",
+      store_page["profile_loaded"] and store_page["profile_id"] == "gad-main")
+check("Adapter lists store profiles",
+      store_adapter.list_profiles() == ["gad-main", "test-client-main"])
+store.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AUDIT LOG
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("AUDIT LOG")
+print("=" * 60)
+
+from audit_log import AuditLog, list_segments
+
+audit_dir = tempfile.mkdtemp()
+audit = AuditLog(audit_dir, segment_max_bytes=4096, retain_content=True)
+audit_adapter = SCRVNRAdapter(profiles_dir=profiles_dir, audit_log=audit)
+audit_adapter.check_page("gad-main", {"hero": GOOD_TEXT, "cta": BAD_TEXT}, job_id="job-1")
+audit_adapter.check_page("gad-main", {"cta": BAD_TEXT}, override=True,
+                         override_note="Client approved", job_id="job-2")
+audit_adapter.check_section("gad-main", "hero", GOOD_TEXT)  # live checks are not logged
+check("Audit flush completes", audit.flush())
+
+audit_records = [
+    json.loads(line)
+    for seg in list_segments(audit_dir)
+    for line in open(seg, encoding="utf-8")
+]
+check("Audit log records page decisions only", len(audit_records) == 2,
+      f"records={len(audit_records)}")
+check("Audit record carries job, status and scores",
+      audit_records[0]["job_id"] == "job-1" and audit_records[0]["gate_status"] == "FAIL" and
+      "cta" in audit_records[0]["failures"] and audit_records[0]["pass1_score"] is not None)
+check("Audit record keeps override note",
+      audit_records[1]["gate_status"] == "OVERRIDE" and audit_records[1]["override_note"] == "Client approved")
+check("Audit record has content hash (and content when retained)",
+      len(audit_records[0]["content_hash"]) == 64 and audit_records[0]["content"]["hero"] == GOOD_TEXT)
+
+for i in range(10):
+    audit.append({"job_id": f"bulk-{i}", "gate_status": "PASS"})
+audit.close()
+check("Audit segments rotate at size limit", len(list_segments(audit_dir)) > 1,
+      f"segments={len(list_segments(audit_dir))}")
+
+# Simulate a crash mid-write: torn tail line is dropped on reopen
+with open(list_segments(audit_dir)[-1], "ab") as f:
+    f.write(b'{"job_id": "torn-wri')
+reopened = AuditLog(audit_dir)
+reopened.append({"job_id": "after-crash", "gate_status": "PASS"})
+reopened.close()
+tail_lines = open(list_segments(audit_dir)[-1], encoding="utf-8").read().splitlines()
+check("Torn tail truncated on reopen",
+      all(json.loads(l) for l in tail_lines) and json.loads(tail_lines[-1])["job_id"] == "after-crash")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AUDIT QUERIES
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("AUDIT QUERIES")
+print("=" * 60)
+
+from audit_query import AuditQuery
+
+query_dir = tempfile.mkdtemp()
+query_log = AuditLog(query_dir, segment_max_bytes=2048)
+for i in range(60):
+    query_log.append({
+        "ts": f"2026-0{1 + i // 20}-{10 + i % 20:02d}T12:00:00Z",
+        "job_id": f"job-{i % 7}",
+        "property_slug": "gad-main" if i % 2 else "thiccles-main",
+        "gate_status": "OVERRIDE" if i % 5 == 0 else "PASS",
+    })
+query_log.close()
+
+q = AuditQuery(query_dir)
+segment_files = list_segments(query_dir)
+check("Sealed segments have sidecar indexes",
+      all(seg.with_name(seg.name.replace(".jsonl", ".idx.json")).exists() for seg in segment_files))
+
+overrides = q.find(property_slug="thiccles-main", gate_status="OVERRIDE",
+                   since="2026-02-01", until="2026-03-01")
+expected = [i for i in range(20, 40) if i % 2 == 0 and i % 5 == 0]
+check("Property + status + time range query",
+      [r["ts"] for r in overrides] ==
+      [f"2026-02-{10 + i % 20:02d}T12:00:00Z" for i in expected],
+      f"got {len(overrides)}")
+check("Job history query", len(q.find(job_id="job-3")) == len([i for i in range(60) if i % 7 == 3]))
+check("Count answered from indexes", q.count(gate_status="OVERRIDE") == 12)
+
+# Records written after the sidecar was saved are still found (tail catch-up)
+late = AuditLog(query_dir)
+late.append({"ts": "2026-04-01T00:00:00Z", "job_id": "job-late", "gate_status": "FAIL"})
+late.flush()
+check("Unsealed tail records are queryable", len(q.find(job_id="job-late")) == 1)
+late.close()
+
+import io
+buf = io.StringIO()
+exported = q.export_jsonl(buf, gate_status="FAIL")
+check("JSONL export", exported == 1 and json.loads(buf.getvalue())["job_id"] == "job-late")
+check("Reindex rebuilds all sidecars", AuditQuery(query_dir).reindex() == len(list_segments(query_dir)))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# REPLAY ENGINE
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("REPLAY ENGINE")
+print("=" * 60)
+
+from replay import ReplayEngine, GateConfig, iter_audit_pages
+
+replay_pages = [
+    {"property_slug": "gad-main", "job_id": "r1",
+     "sections": {"hero": GOOD_TEXT, "cta": "Book your service. Elevate your drive with us today."}},
+    {"property_slug": "no-profile", "job_id": "r2", "sections": {"hero": GOOD_TEXT}},
+    {"property_slug": "no-profile", "job_id": "r2-dup", "sections": {"hero": GOOD_TEXT}},
+]
+lexicon_engine = ReplayEngine(
+    GateConfig(),
+    GateConfig(lexicons={"AI_ISMS": AIDetector.AI_ISMS + ["elevate your", "book your service"]}),
+    profiles_dir=profiles_dir, workers=1,
+)
+check("Only the changed dimension is recomputed",
+      lexicon_engine.changed_dimensions() == ["ai_isms"])
+lexicon_report = lexicon_engine.run(replay_pages)
+check("Identical content replayed once",
+      lexicon_report["pages_replayed"] == 2 and lexicon_report["duplicates_skipped"] == 1)
+# 2 distinct texts: full baseline measurement + one candidate ai_isms re-measure each
+check("Scoring reuses unchanged dimensions",
+      lexicon_report["dimensions_measured"] == 2 * len(AIDetector.DIMENSIONS) + 2,
+      f"measured={lexicon_report['dimensions_measured']}")
+
+threshold_engine = ReplayEngine(GateConfig(), GateConfig(pass1_threshold=0.99),
+                                profiles_dir=profiles_dir, workers=1)
+threshold_report = threshold_engine.run(replay_pages)
+check("Threshold change flips passing sections to failing",
+      threshold_report["sections_newly_failing"] >= 1 and
+      threshold_report["properties"]["no-profile"]["pages_newly_failing"] == 1)
+check("Threshold-only change recomputes no dimensions",
+      threshold_report["dimensions_recomputed"] == [])
+
+audit_pages = list(iter_audit_pages(audit_dir))
+check("Replay reads retained content from audit log",
+      len(audit_pages) == 2 and audit_pages[0]["sections"]["hero"] == GOOD_TEXT)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCORING POLICIES (feature extraction / scoring split)
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("SCORING POLICIES")
+print("=" * 60)
+
+from scoring_policy import Pass1Policy, Pass2Policy
+
+# Stored feature records round-trip through JSON and rescore identically
+bad_features = json.loads(json.dumps(detector.extract_features(BAD_TEXT)))
+check("Pass 1 features rescore to the same result",
+      detector.score_features(bad_features, "body") == detector.analyze_section(BAD_TEXT, "body"))
+check("Pass 1 feature record holds no text",
+      BAD_TEXT.strip()[:40] not in json.dumps(bad_features))
+
+reweighted = Pass1Policy({"weights": {"burstiness": 0.0, "ai_isms": 0.50}})
+check("Re-weighting changes the score without re-reading text",
+      detector.score_features(bad_features, "body", policy=reweighted)["overall_score"]
+      != detector.score_features(bad_features, "body")["overall_score"])
+check("Policy overrides merge over defaults",
+      reweighted.weights["hedge_density"] == 0.15 and reweighted.pass_threshold == 0.65)
+check("Policy fingerprint tracks config",
+      Pass1Policy().fingerprint() == Pass1Policy().fingerprint()
+      and reweighted.fingerprint() != Pass1Policy().fingerprint())
+
+try:
+    Pass1Policy({"weights": {"vibes": 1.0}})
+    check("Unknown dimension weight rejected", False)
+except ValueError:
+    check("Unknown dimension weight rejected", True)
+
+good_features = aligner.extract_features(GOOD_TEXT)
+check("Pass 2 features rescore to the same result",
+      aligner.score_features(good_features, "hero") == aligner.analyze_section(GOOD_TEXT, "hero"))
+strict_p2 = Pass2Policy({"pass_threshold": 0.99, "curves": {"sentence_rhythm": {"tolerance": 0.01}}})
+strict_result = aligner.score_features(good_features, "hero", policy=strict_p2)
+check("Pass 2 policy brings its own threshold and curves",
+      strict_result["threshold"] == 0.99 and not strict_result["pass"])
+
+policy_gate = SCRVNRGate(profile_dict=profile, pass1_policy=Pass1Policy({"pass_threshold": 0.99}))
+check("Gate takes its threshold from a tenant policy",
+      policy_gate.pass1_threshold == 0.99 and not policy_gate.run_section(GOOD_TEXT)["pass1"]["pass"])
+
+policy_engine = ReplayEngine(GateConfig(), GateConfig(pass2_policy={"pass_threshold": 0.99}),
+                             profiles_dir=profiles_dir, workers=1)
+policy_report = policy_engine.run(replay_pages)
+check("Replay: policy-only change re-extracts no Pass 1 dimensions",
+      policy_report["dimensions_recomputed"] == []
+      and policy_report["dimensions_measured"] == 2 * len(AIDetector.DIMENSIONS),
+      f"measured={policy_report['dimensions_measured']}")
+check("Replay: Pass 2 policy change flips the profiled property",
+      len(policy_report["properties"]["gad-main"]["newly_failing"]) >= 1
+      and policy_report["properties"]["no-profile"]["newly_failing"] == [])
+
+import subprocess
+from replay import pass2_key
+from unittest import mock
+with mock.patch.object(VoiceAligner, "FEATURE_VERSION", VoiceAligner.FEATURE_VERSION + 1):
+    bumped_key = pass2_key("p", "d")
+check("Replay Pass 2 cache key carries the Pass 2 feature version", bumped_key != pass2_key("p", "d"))
+
+replay_cli_dir = tempfile.mkdtemp()
+corpus_path = os.path.join(replay_cli_dir, "corpus.jsonl")
+strict_path = os.path.join(replay_cli_dir, "strict.json")
+with open(corpus_path, "w", encoding="utf-8") as f:
+    f.write("".join(json.dumps(page) + "\n" for page in replay_pages))
+with open(strict_path, "w", encoding="utf-8") as f:
+    json.dump({"pass_threshold": 0.99}, f)
+
+
+def replay_cli(*extra):
+    out = os.path.join(replay_cli_dir, "report.json")
+    subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "core", "replay.py"),
+                    "--corpus", corpus_path,
+                    "--profiles-dir", profiles_dir, "--workers", "1", "--out", out, *extra],
+                   capture_output=True, check=True)
+    with open(out, encoding="utf-8") as f:
+        return json.load(f)
+
+
+check("Replay CLI: a candidate policy flips pages against the default baseline",
+      replay_cli("--pass2-policy", strict_path)["sections_newly_failing"] >= 1)
+check("Replay CLI: the baseline takes its own policy, and the candidate builds on it",
+      replay_cli("--baseline-pass2-policy", strict_path)["sections_newly_failing"] == 0
+      and replay_cli("--baseline-pass2-policy", strict_path, "--pass1-threshold", "0.99")["sections_newly_failing"] >= 1)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CALIBRATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("CALIBRATION")
+print("=" * 60)
+
+from calibration import Calibrator, load_labeled_corpus, np as calibration_np
+
+cal_dir = tempfile.mkdtemp()
+labeled_path = os.path.join(cal_dir, "labeled.jsonl")
+human_lines = [l.strip() for l in GOOD_TEXT.strip().split("\n") if l.strip()]
+ai_lines = [l.strip() for l in BAD_TEXT.strip().split("\n") if l.strip()]
+with open(labeled_path, "w", encoding="utf-8") as f:
+    f.write(json.dumps({"text": GOOD_TEXT, "label": "human"}) + "\n")
+    f.write(json.dumps({"sections": {"a": BAD_TEXT, "b": ""}, "label": "ai"}) + "\n")
+    for i in range(len(human_lines)):
+        f.write(json.dumps({"text": " ".join(human_lines[i:] + human_lines[:i]), "label": 0}) + "\n")
+    for i in range(len(ai_lines)):
+        f.write(json.dumps({"text": " ".join(ai_lines[i:] + ai_lines[:i]), "label": True}) + "\n")
+
+samples = load_labeled_corpus(labeled_path)
+check("Labeled corpus parses text/sections and label forms",
+      len(samples) == 2 + len(human_lines) + len(ai_lines)
+      and samples[0][1] is False and samples[1][1] is True)
+
+cal = Calibrator(use_numpy=False).extract(samples)
+cal_report = cal.report(configs=50)
+check("Calibration reports every Pass 1 dimension",
+      list(cal_report["dimensions"]) == list(AIDetector.DIMENSIONS))
+check("AI-ism dimension separates the labeled classes",
+      cal_report["dimensions"]["ai_isms"]["auc"] > 0.5)
+check("Current policy metrics reported at its threshold",
+      cal_report["current"]["at_threshold"]["threshold"] == 0.65
+      and 0.0 <= cal_report["current"]["auc"] <= 1.0)
+check("Suggested policy is a valid Pass 1 policy",
+      Pass1Policy(cal_report["suggested_policy"]).pass_threshold == cal_report["suggested_policy"]["pass_threshold"])
+
+features_path = os.path.join(cal_dir, "features.jsonl")
+cal.save_features(features_path)
+cached_cal = Calibrator(use_numpy=False)
+check("Feature cache reloads without re-extracting",
+      cached_cal.load_features(features_path) and cached_cal.matrix == cal.matrix)
+check("Feature cache rejected after a lexicon change",
+      not Calibrator(lexicons={"AI_ISMS": ["elevate your"]}).load_features(features_path))
+
+if calibration_np is not None:
+    rows = cal.sample_weights(20) + [cal.current_weights()]
+    fast = Calibrator(use_numpy=True)
+    fast.load_features(features_path)
+    check("NumPy and pure-Python sweeps agree",
+          fast.evaluate(rows) == cal.evaluate(rows))
+    out_of_range = [[2.0] * len(cal.dimensions), [0.5] * len(cal.dimensions), [-1.0] * len(cal.dimensions)]
+    check("NumPy and pure-Python sweeps agree when composites leave [0, 1]",
+          fast.evaluate(out_of_range) == cal.evaluate(out_of_range)
+          and all(0.0 <= r["auc"] <= 1.0 and 0.0 <= r["best"]["recall"] <= 1.0 for r in fast.evaluate(out_of_range)))
+else:
+    print("  (NumPy not installed — vectorized path not checked)")
+
+p2_cal = Calibrator(profile=profile, use_numpy=False).extract(samples)
+check("Pass 2 calibration covers the profile's dimensions only",
+      set(p2_cal.report(configs=10)["dimensions"]) == set(aligner._dimensions))
+p2_features_path = os.path.join(cal_dir, "p2_features.jsonl")
+p2_cal.save_features(p2_features_path)
+with mock.patch.object(VoiceAligner, "FEATURE_VERSION", VoiceAligner.FEATURE_VERSION + 1):
+    stale_p2 = Calibrator(profile=profile, use_numpy=False).load_features(p2_features_path)
+check("Pass 2 feature cache is invalidated by a feature version bump",
+      Calibrator(profile=profile, use_numpy=False).load_features(p2_features_path) and not stale_p2)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MULTI-PROFILE SCORING
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("MULTI-PROFILE SCORING")
+print("=" * 60)
+
+import copy
+import itertools
+from profile_set import CompiledProfileSet, np as profile_set_np
+
+formal_profile = copy.deepcopy(profile)
+formal_profile["profile_id"] = "formal-variant"
+formal_profile["register"]["formality_score"] = 10
+formal_profile["contraction_rate"] = {"measured": 0.0, "target_max": 0.02}
+set_profiles = [profile, formal_profile, {"profile_id": "sparse-brand"}]
+set_aligners = [VoiceAligner(p) for p in set_profiles]
+
+py_set = CompiledProfileSet(set_profiles, use_numpy=False)
+for label, text in (("good", GOOD_TEXT), ("bad", BAD_TEXT)):
+    entries = py_set.score_all(text)
+    expected = [a.analyze_section(text) for a in set_aligners]
+    check(f"Profile set matches per-profile analyze_section ({label} text)",
+          [e["score"] for e in entries] == [r["overall_score"] for r in expected]
+          and [e["pass"] for e in entries] == [r["pass"] for r in expected]
+          and all(e["dimensions"] == {d: v["score"] for d, v in r["dimensions"].items()}
+                  for e, r in zip(entries, expected)))
+
+ranked = py_set.rank(GOOD_TEXT)
+check("Rank orders profiles by score",
+      [r["score"] for r in ranked] == sorted((r["score"] for r in ranked), reverse=True))
+check("Sparse profile flagged and scored leniently",
+      any(r["profile_id"] == "sparse-brand" and r["sparse"] and r["score"] == 0.80 for r in ranked))
+check("Rank honors top", len(py_set.rank(GOOD_TEXT, top=1)) == 1)
+
+if profile_set_np is not None:
+    np_set = CompiledProfileSet(set_profiles, use_numpy=True)
+    check("NumPy and pure-Python profile sets agree",
+          np_set.score_all(GOOD_TEXT) == py_set.score_all(GOOD_TEXT)
+          and np_set.score_all(BAD_TEXT) == py_set.score_all(BAD_TEXT))
+else:
+    print("  (NumPy not installed — vectorized path not checked)")
+
+# Every curve branch, under the default and a non-default policy
+grid_profiles = []
+negative_hits = ["world-class", "furthermore", "moreover", "in conclusion", "cutting-edge"]
+for i, (rl, burst, cr, level, reg) in enumerate(itertools.product(
+        [{"target_min": 7.0, "target_max": 10.0}, {"target_max": 5.0, "tolerance": 3.0}, {"target_min": 14.0}],
+        [0.66, 0.05],
+        [{"target_min": 0.18, "target_max": 0.4}, {"measured": 0.0, "target_max": 0.02}, {"measured": 0.9}],
+        ["low", "very-high"],
+        [{"formality_score": 2}, {"formality_score": 9, "warmth_score": 3}])):
+    variant = copy.deepcopy(profile)
+    variant["profile_id"] = f"grid-{i}"
+    variant["reading_level"] = rl
+    variant["sentence_rhythm"]["burstiness_score"] = burst
+    variant["contraction_rate"] = cr
+    variant["technical_specificity"]["target"] = level
+    variant["register"] = reg
+    variant["native_constructions"]["items"] = profile["native_constructions"]["items"][:i % 7 + 1] \
+        + [{"pattern": "since 2004", "confidence": 0.9}] * (i % 2)
+    variant["negative_space"]["items"] = negative_hits[:i % 4]
+    grid_profiles.append(variant)
+grid_texts = [GOOD_TEXT, BAD_TEXT, "We're open. Call now.", GOOD_TEXT + BAD_TEXT]
+grid_policies = [Pass2Policy(), Pass2Policy({"curves": {
+    "reading_level": {"tolerance": 0.5}, "sentence_rhythm": {"tolerance": 0.05},
+    "specificity": {"per_level": 0.2}, "register": {"divisor": 3.0},
+    "native_constructions": {"bands": [[0.5, 1.0], [0.1, 0.6]], "floor": 0.1},
+    "negative_space": {"steps": [1.0, 0.7, 0.3], "floor": 0.0}}})]
+grid_paths = {"python": False} if profile_set_np is None else {"python": False, "numpy": True}
+mismatched = set()
+for policy in grid_policies:
+    grid_aligners = [VoiceAligner(p, policy=policy) for p in grid_profiles]
+    grid_sets = {name: CompiledProfileSet(grid_profiles, policy=policy, use_numpy=flag)
+                 for name, flag in grid_paths.items()}
+    for text in grid_texts:
+        expected = [{d: v["score"] for d, v in a.analyze_section(text)["dimensions"].items()} for a in grid_aligners]
+        for grid_set in grid_sets.values():
+            for entry, want in zip(grid_set.score_all(text), expected):
+                mismatched.update(d for d in set(want) | set(entry["dimensions"])
+                                  if entry["dimensions"].get(d) != want.get(d))
+for dim in Pass2Policy.DEFAULTS["weights"]:
+    check(f"{dim}: {' and '.join(grid_paths)} profile sets match analyze_section", dim not in mismatched)
+
+check("VoiceAligner.compile_profiles builds a profile set",
+      len(VoiceAligner.compile_profiles(set_profiles)) == 3)
+
+dir_set = CompiledProfileSet.from_directory(profiles_dir)
+check("Profile set loads from a profiles directory",
+      len(dir_set) >= 1 and "gad-main" in dir_set.profile_ids)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# NEAREST-PROFILE INDEX
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("NEAREST-PROFILE INDEX")
+print("=" * 60)
+
+from profile_index import ProfileIndex, profile_vector, np as profile_index_np
+
+casual_profile = copy.deepcopy(profile)
+casual_profile["profile_id"] = "casual-variant"
+casual_profile["register"]["formality_score"] = 2
+casual_profile["contraction_rate"]["measured"] = 0.7
+index = ProfileIndex(use_numpy=False)
+for p in (profile, formal_profile, casual_profile):
+    index.add(p)
+
+near_formal = copy.deepcopy(formal_profile)
+near_formal["profile_id"] = "new-client"
+check("Nearest neighbour is the closest DNA",
+      index.nearest(near_formal, k=1)[0]["profile_id"] == "formal-variant"
+      and index.nearest(near_formal, k=1)[0]["distance"] == 0.0)
+check("Query excludes its own indexed entry",
+      all(n["profile_id"] != "formal-variant" for n in index.nearest(formal_profile, k=3)))
+check("Vector is fixed-length and normalized",
+      len(profile_vector(profile)) == index.dim
+      and len(profile_vector({"profile_id": "sparse"})) == index.dim
+      and all(0.0 <= v <= 1.0 for v in profile_vector(profile)))
+
+broken_profile = copy.deepcopy(profile)
+broken_profile["profile_id"] = "broken"
+broken_profile["register"] = None
+try:
+    index.add(broken_profile)
+    check("Malformed profile is rejected by the index", False)
+except ProfileValidationError:
+    check("Malformed profile is rejected by the index", "broken" not in index and len(index) == 3)
+
+index.remove("formal-variant")
+check("Removed profiles drop out of results",
+      "formal-variant" not in index and len(index) == 2
+      and index.nearest(near_formal, k=5)[0]["profile_id"] != "formal-variant")
+
+index_dir = tempfile.mkdtemp()
+VoiceProfileExtractor(profile_index=index).save(near_formal, os.path.join(index_dir, "new-client.json"))
+check("Extractor save() updates the index",
+      "new-client" in index and len(index) == 3)
+
+if profile_index_np is not None:
+    dir_index = ProfileIndex.from_directory(profiles_dir, use_numpy=True)
+    py_index = ProfileIndex.from_directory(profiles_dir, use_numpy=False)
+    for p in (formal_profile, casual_profile):
+        dir_index.add(p)
+        py_index.add(p)
+    check("NumPy and pure-Python indexes agree",
+          dir_index.nearest(near_formal, k=3) == py_index.nearest(near_formal, k=3))
+else:
+    print("  (NumPy not installed — vectorized path not checked)")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# NEAR-DUPLICATE INDEX
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("NEAR-DUPLICATE INDEX")
+print("=" * 60)
+
+from near_duplicate import NearDuplicateIndex, np as near_duplicate_np
+
+dup_dir = tempfile.mkdtemp()
+dup_path = os.path.join(dup_dir, "dupes.json")
+dupes = NearDuplicateIndex(dup_path, use_numpy=False)
+dupes.add(("gad-main", "page-1", "services"), GOOD_TEXT)
+good_words = GOOD_TEXT.split()
+edited = " ".join(good_words[:len(good_words) // 2] + ["Simi"] + good_words[len(good_words) // 2 + 1:])
+check("Lightly edited copy matches", [m["key"] for m in dupes.query(edited)] == [["gad-main", "page-1", "services"]])
+check("Unrelated copy does not match", dupes.query(BAD_TEXT) == [])
+check("Own key is excluded", dupes.query(GOOD_TEXT, exclude=("gad-main", "page-1", "services")) == [])
+check("Short sections are not indexed", not dupes.add(("gad-main", "page-1", "cta"), "Call us today."))
+
+dupes.save()
+reloaded = NearDuplicateIndex(dup_path, use_numpy=False)
+check("Index persists and reloads", len(reloaded) == 1 and reloaded.query(edited) == dupes.query(edited))
+try:
+    NearDuplicateIndex(dup_path, num_perm=32, bands=8)
+    check("Parameter mismatch on load rejected", False)
+except ValueError:
+    check("Parameter mismatch on load rejected", True)
+
+bounded = NearDuplicateIndex(max_entries=2, use_numpy=False)
+for i in range(3):
+    bounded.add(("p", str(i), "s"), GOOD_TEXT)
+check("Size bound evicts the oldest entries",
+      len(bounded) == 2 and ("p", "0", "s") not in bounded and bounded.evicted == 1)
+
+if near_duplicate_np is not None:
+    check("NumPy and pure-Python MinHash agree",
+          NearDuplicateIndex(use_numpy=True).signature(GOOD_TEXT) == dupes.signature(GOOD_TEXT))
+else:
+    print("  (NumPy not installed — vectorized path not checked)")
+
+dup_adapter = SCRVNRAdapter(profiles_dir=profiles_dir, duplicate_index=NearDuplicateIndex())
+first = dup_adapter.check_page("gad-main", {"services": GOOD_TEXT}, job_id="job-1")
+again = dup_adapter.check_page("gad-main", {"services": GOOD_TEXT}, job_id="job-1")
+other = dup_adapter.check_page("gad-other", {"intro": edited}, job_id="job-2")
+check("check_page flags near-duplicates across properties",
+      first["near_duplicates"] == {} and again["near_duplicates"] == {}
+      and other["near_duplicates"]["intro"][0]["key"] == ["gad-main", "job-1", "services"])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PAGE-LEVEL REPETITION
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("PAGE-LEVEL REPETITION")
+print("=" * 60)
+
+templated_page = {
+    "hero": "We understand that your vehicle deserves the best care. Our team of certified experts delivers exceptional service. Schedule your appointment today and experience the difference.",
+    "services": "We understand that every repair matters. Our team of certified experts handles oil changes and engine rebuilds. Schedule your appointment today and experience the difference.",
+    "about": "We understand that trust is earned. Our team of certified experts has served Simi Valley for years. Schedule your appointment today and experience the difference.",
+}
+templated = SCRVNRGate().run(templated_page)["page_repetition"]
+check("Cross-section openers detected",
+      ["we understand", 3] in templated["repeated_openers"])
+check("Repeated n-grams list their sections",
+      ["schedule your appointment today", ["hero", "services", "about"]] in templated["repeated_ngrams"])
+check("Templated page fails the page-level dimension",
+      not templated["pass"] and "failure_reason" in templated)
+
+varied = SCRVNRGate().run({"hero": GOOD_TEXT, "cta": BAD_TEXT})["page_repetition"]
+check("Distinct sections pass the page-level dimension", varied["pass"] and varied["sections"] == 2)
+
+shaped = "- Brakes done right today\n- Oil changes in an hour\n- Tires mounted and balanced\n- Alignment while you wait"
+structures = detector.measure_page_repetition({
+    "a": detector.extract_features(shaped),
+    "b": detector.extract_features(shaped.replace("Brakes", "Rotors").replace("Oil", "Coolant")),
+})["structures"]
+check("Identically structured sections grouped", structures == [["a", "b"]])
+
+templated_features = {name: detector.extract_features(text) for name, text in templated_page.items()}
+check("Repeated phrases come from the sketches, without the texts",
+      detector.measure_page_repetition(templated_features)["ngrams"][:len(templated["repeated_ngrams"])]
+      == templated["repeated_ngrams"])
+
+words = [f"w{i}" for i in range(3000)]
+long_a = " ".join(words[:1500]) + " " + " ".join(f"a{i}" for i in range(1500))
+long_b = " ".join(words[:1500]) + " " + " ".join(f"b{i}" for i in range(1500))
+long_features = {"a": detector.extract_features(long_a), "b": detector.extract_features(long_b)}
+long_page = long_features["a"]["parallel_structure"]["page"]
+long_shared = detector.measure_page_repetition(long_features)["shared_ngrams"]
+check("Page sketch stays bounded however long the section",
+      len(long_page["ngrams"]) == detector.PAGE_SKETCH and long_page["ngram_count"] > 2900
+      and len(json.dumps(long_page)) < len(long_a) / 5, str(len(json.dumps(long_page))))
+check("Shared n-grams of long sections are estimated from the sketch",
+      700 <= long_shared <= 2200, str(long_shared))
+
+legacy = detector.extract_features(GOOD_TEXT)
+del legacy["parallel_structure"]["page"]
+check("Feature records without page tokens are skipped",
+      detector.measure_page_repetition({"old": legacy})["sections"] == 0)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BENCHMARK HARNESS
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("BENCHMARK HARNESS")
+print("=" * 60)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+from corpus import make_section, make_page, PRESETS
+from run_bench import compare, time_call
+
+check("Corpus is deterministic",
+      make_section(500, **PRESETS["ai"], seed=4) == make_section(500, **PRESETS["ai"], seed=4)
+      and make_page(seed=2) == make_page(seed=2))
+check("Corpus hits the requested length",
+      all(abs(len(make_section(n, seed=1).split()) - n) <= n * 0.05 for n in (50, 500, 5000)))
+flat = detector.extract_features(make_section(3000, burstiness=0.25, seed=1))["burstiness"]["burstiness"]
+bursty = detector.extract_features(make_section(3000, burstiness=0.9, seed=1))["burstiness"]["burstiness"]
+check("Corpus burstiness control", flat < 0.35 < 0.6 < bursty, f"{flat:.2f} / {bursty:.2f}")
+check("Corpus AI-ism and hedge controls",
+      detector.analyze_section(make_section(500, **PRESETS["ai"], seed=1))["overall_score"]
+      < detector.analyze_section(make_section(500, **PRESETS["human"], seed=1))["overall_score"])
+
+timing = time_call(lambda: None, min_time=0.0, max_runs=5)
+check("Timer reports median/min/runs", set(timing) == {"median_ms", "min_ms", "runs"} and timing["runs"] >= 1)
+bench_report = compare(
+    {"a": {"min_ms": 2.0}, "b": {"min_ms": 0.5}, "c": {"min_ms": 1.1}, "new": {"min_ms": 1.0}},
+    {"a": {"min_ms": 1.0}, "b": {"min_ms": 1.0}, "c": {"min_ms": 1.0}, "gone": {"min_ms": 1.0}},
+    tolerance=0.25,
+)
+check("Regressions and improvements flagged beyond tolerance",
+      [r["name"] for r in bench_report["regressions"]] == ["a"]
+      and [r["name"] for r in bench_report["improvements"]] == ["b"]
+      and bench_report["new"] == ["new"] and bench_report["missing"] == ["gone"])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STAGE TIMINGS
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("STAGE TIMINGS")
+print("=" * 60)
+
+timed_gate = SCRVNRGate(profile_dict=profile)
+page_sections = {"hero": GOOD_TEXT, "body": BAD_TEXT}
+plain = timed_gate.run(page_sections)
+timed = timed_gate.run(page_sections, timings=True)
+check("No timings block unless requested", "timings" not in plain)
+stages = timed.get("timings", {}).get("stages", {})
+check("Gate timings cover passes, dimensions and summary",
+      {"pass1", "pass2", "summary", "pass1.score", "pass2.score", "pass1.page_repetition"} <= set(stages)
+      and all("pass1." + d in stages for d in AIDetector.DIMENSIONS))
+check("Timings are non-negative and bounded by the total",
+      all(v >= 0 for v in stages.values()) and stages["pass1"] <= timed["timings"]["total_ms"])
+strip = lambda r: {k: v for k, v in r.items() if k not in ("timings", "timestamp")}
+check("Timed result otherwise identical", strip(plain) == strip(timed))
+
+timed_page = SCRVNRAdapter(profiles_dir=profiles_dir).check_page("gad-main", page_sections, timings=True)
+adapter_stages = timed_page.get("timings", {}).get("stages", {})
+check("Adapter timings include load, gate stages and result build",
+      {"profile_load", "gate", "gate.pass1", "result_build"} <= set(adapter_stages)
+      and "timings" not in timed_page["audit"])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# METRICS
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("METRICS")
+print("=" * 60)
+
+from metrics import MetricsRegistry
+
+registry = MetricsRegistry()
+hist = registry.histogram("t_seconds", "test", ("kind",), buckets=(0.1, 0.2, 0.4))
+for v in (0.05, 0.15, 0.15, 0.3, 1.0):
+    hist.observe(v, "a")
+check("Histogram counts and quantiles",
+      hist.count("a") == 5 and 0.1 <= hist.quantile(0.5, "a") <= 0.2 and hist.quantile(0.99, "a") == 0.4)
+check("Registry returns the existing metric by name",
+      registry.histogram("t_seconds", "test", ("kind",)) is hist)
+text = registry.render()
+check("Prometheus histogram exposition",
+      't_seconds_bucket{kind="a",le="0.2"} 3' in text and 't_seconds_bucket{kind="a",le="+Inf"} 5' in text
+      and 't_seconds_count{kind="a"} 5' in text)
+
+metered = SCRVNRAdapter(profiles_dir=profiles_dir, metrics=MetricsRegistry())
+metered.check_page("gad-main", {"hero": GOOD_TEXT})
+metered.check_page("gad-main", {"hero": BAD_TEXT})
+section_status = metered.check_section("gad-main", "hero", GOOD_TEXT)["gate_status"]
+m = metered.metrics
+check("Adapter records requests, decisions and cache hits",
+      m.get("scrvnr_request_seconds").count("check_page") == 2
+      and sum(m.get("scrvnr_gate_decisions_total")._values.values()) == 2
+      and m.get("scrvnr_gate_cache_total").value("hit") == 2
+      and m.get("scrvnr_profile_loads_total").value("found") == 1
+      and m.get("scrvnr_gate_run_seconds").count("gad-main") == 3)
+
+metrics_dir = tempfile.mkdtemp()
+metrics_path = os.path.join(metrics_dir, "scrvnr.prom")
+m.accumulate(metrics_path)
+m.accumulate(metrics_path)
+with open(metrics_path, encoding="utf-8") as f:
+    accumulated = f.read()
+check("accumulate() sums counters across writes",
+      f'scrvnr_requests_total{{entry="check_section",status="{section_status}"}} 2' in accumulated)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ON-DEMAND PROFILING
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("ON-DEMAND PROFILING")
+print("=" * 60)
+
+import subprocess
+from profiling import run_profiled
+
+prof_adapter = SCRVNRAdapter(profiles_dir=profiles_dir)
+prof_dir = tempfile.mkdtemp()
+cpu_result, cpu_report = run_profiled("cpu", prof_adapter.check_page, "gad-main", {"hero": GOOD_TEXT},
+                                      top=5, out_dir=prof_dir, label="job/1")
+check("CPU profile reports top functions and writes .prof",
+      "gate_status" in cpu_result and len(cpu_report["top"]) == 5
+      and cpu_report["file"].endswith(".prof") and os.path.exists(cpu_report["file"]))
+_, alloc_report = run_profiled("alloc", prof_adapter.check_page, "gad-main", {"hero": BAD_TEXT}, top=3)
+check("Allocation profile reports peak and top sites",
+      alloc_report["peak_kb"] > 0 and 0 < len(alloc_report["top"]) <= 3 and alloc_report["file"] is None)
+
+runner_env = {k: v for k, v in os.environ.items() if not k.startswith("SCRVNR_")}
+runner_out = subprocess.run(
+    [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py")],
+    input=json.dumps({"property_slug": "gad-main", "sections": {"hero": GOOD_TEXT}, "profile": "cpu"}).encode(),
+    capture_output=True, env=runner_env,
+)
+runner_result = json.loads(runner_out.stdout)
+check("Runner ignores profile requests unless SCRVNR_PROFILING is set",
+      "error" in runner_result.get("profiling", {}) and "top" not in runner_result["profiling"]
+      and runner_result["gate_status"] in ("PASS", "FAIL"))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LOAD TEST HARNESS
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("LOAD TEST HARNESS")
+print("=" * 60)
+
+import itertools
+import shutil
+from load_test import AdapterTransport, composer_traffic, make_properties, run_load
+
+load_dir, load_slugs = make_properties(3, bare=2)
+first = list(itertools.islice(composer_traffic(load_slugs, seed=5, words=60), 200))
+check("Composer traffic is deterministic and mixes section bursts with page submits",
+      first == list(itertools.islice(composer_traffic(load_slugs, seed=5, words=60), 200))
+      and sum(e[0] == "check_section" for e in first) > sum(e[0] == "check_page" for e in first) > 0)
+load_report = run_load(AdapterTransport(load_dir), composer_traffic(load_slugs, seed=5, words=60),
+                       concurrency=2, max_requests=40, sample_interval=0.05)
+check("Load run reports throughput, percentiles and memory",
+      load_report["requests"] == 40 and load_report["errors"] == 0 and load_report["throughput_rps"] > 0
+      and load_report["latency_ms"]["check_section"]["p50"] <= load_report["latency_ms"]["check_section"]["p99"]
+      and load_report["memory"]["samples"] and 1 <= load_report["caches"]["gates"] <= len(load_slugs))
+shutil.rmtree(load_dir, ignore_errors=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# UNIFIED CLI
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("UNIFIED CLI")
+print("=" * 60)
+
+import contextlib
+import io
+import threading
+import urllib.request
+
+_here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _here)
+import cli
+from gate_server import make_server
+
+cli_dir = tempfile.mkdtemp()
+good_path, bad_path = os.path.join(cli_dir, "good.txt"), os.path.join(cli_dir, "bad.txt")
+with open(good_path, "w", encoding="utf-8") as f:
+    f.write(GOOD_TEXT)
+with open(bad_path, "w", encoding="utf-8") as f:
+    f.write(BAD_TEXT)
+
+with contextlib.redirect_stdout(io.StringIO()) as cli_out:
+    detect_code = cli.main(["detect", good_path, bad_path, "--json"])
+cli_results = json.loads(cli_out.getvalue())
+check("detect scores every file and exits 1 on a failure",
+      len(cli_results) == 2 and cli_results[0]["pass"] and not cli_results[1]["pass"] and detect_code == 1)
+with contextlib.redirect_stdout(io.StringIO()) as cli_out:
+    gate_code = cli.main(["--profiles-dir", profiles_dir, "gate", good_path, "--profile", "gad-main", "--json"])
+gate_cli = json.loads(cli_out.getvalue())
+check("gate resolves a profile slug", gate_cli["pass2"]["active"] and gate_code == (0 if gate_cli["gate_open"] else 1))
+
+cold = subprocess.run(
+    [sys.executable, "-c", "import sys; sys.path.insert(0, sys.argv[1]); import cli; "
+     "print(sorted(m for m in ('pass1_ai_detection', 'pass2_voice_alignment', 'website_studio_adapter') "
+     "if m in sys.modules))", _here],
+    capture_output=True, text=True,
+)
+check("Importing the CLI loads no engine", cold.stdout.strip() == "[]", cold.stdout + cold.stderr)
+
+server = make_server(SCRVNRAdapter(profiles_dir=profiles_dir), port=0)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+request = urllib.request.Request(
+    f"http://127.0.0.1:{server.server_address[1]}/check",
+    data=json.dumps({"property_slug": "gad-main", "sections": {"hero": GOOD_TEXT}}).encode(),
+)
+served = json.loads(urllib.request.urlopen(request, timeout=10).read())
+server.shutdown()
+server.server_close()
+check("serve answers runner payloads over HTTP",
+      served["profile_id"] == "gad-main" and served["gate_status"] in ("PASS", "FAIL"))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BATCH GATE
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("BATCH GATE")
+print("=" * 60)
+
+from batch_gate import run_batch, split_sections
+
+md_sections = split_sections("page.md", "Lead in.\n\n# Our Services\n\nBrakes.\n\n## FAQ\n\nAsk.\n\n## FAQ\n\nMore.")
+check("Markdown splits on headings",
+      list(md_sections) == ["intro", "our-services", "faq", "faq-2"] and md_sections["our-services"] == "Brakes.")
+html_sections = split_sections("page.html", "<script>var x;</script><h1>Hero</h1><p>Fast &amp; fair.</p><h2>About</h2><div>Us</div>")
+check("HTML splits on h1-h3 and strips markup",
+      html_sections == {"hero": "Fast & fair.", "about": "Us"}, str(html_sections))
+
+batch_dir = tempfile.mkdtemp()
+os.makedirs(os.path.join(batch_dir, "nested"))
+for i in range(6):
+    name = os.path.join(batch_dir, "nested" if i % 2 else "", f"page{i}.md")
+    with open(name, "w", encoding="utf-8") as f:
+        f.write(f"# Hero\n\n{GOOD_TEXT if i % 3 else BAD_TEXT}\n\n# About\n\n{GOOD_TEXT}")
+with open(os.path.join(batch_dir, "notes.bin"), "w") as f:
+    f.write("skipped")
+batch_out = io.StringIO()
+batch_summary = run_batch([batch_dir], batch_out, profile=profile, workers=2)
+batch_lines = [json.loads(line) for line in batch_out.getvalue().splitlines()]
+check("Batch streams one record per file, then the summary",
+      len(batch_lines) == 7 and batch_lines[-1] == {"summary": batch_summary}
+      and batch_summary["files"] == 6 and sum(batch_summary["gate_status"].values()) == 6)
+serial_out = io.StringIO()
+serial_summary = run_batch([os.path.join(batch_dir, "**", "*.md")], serial_out, profile=profile, workers=1)
+check("Glob + in-process run agrees with the process pool",
+      serial_summary["gate_status"] == batch_summary["gate_status"]
+      and serial_summary["mean_pass2"] == batch_summary["mean_pass2"])
+page0 = os.path.join(batch_dir, "page0.md")
+page0_record = next(r for r in batch_lines if r.get("file") == page0)
+profile_path = os.path.join(cli_dir, "profile.json")
+with open(profile_path, "w", encoding="utf-8") as f:
+    json.dump(profile, f)
+with contextlib.redirect_stdout(io.StringIO()) as cli_out:
+    cli.main(["gate", page0, "--profile", profile_path, "--json"])
+single = json.loads(cli_out.getvalue())
+single = single[0] if isinstance(single, list) else single
+check("Single-file gate splits on headings and scores like the batch record",
+      sorted(single["sections"]) == ["about", "hero"]
+      and single["pass1"]["score"] == page0_record["pass1_score"]
+      and single["pass2"]["score"] == page0_record["pass2_score"], str(sorted(single["sections"])))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# WATCH MODE
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("WATCH MODE")
+print("=" * 60)
+
+from watch import GateWatcher, format_change
+
+watch_dir = tempfile.mkdtemp()
+watch_page = os.path.join(watch_dir, "services.md")
+with open(watch_page, "w", encoding="utf-8") as f:
+    f.write(f"# Hero\n\n{GOOD_TEXT}\n\n# Services\n\n{BAD_TEXT}")
+watcher = GateWatcher([watch_dir], profile=profile)
+watch_baseline = watcher.scan()
+check("Baseline scan scores every file", watch_baseline["files"] == 1 and watcher.sections_scored == 2)
+check("Unchanged tree polls clean", watcher.poll() == [])
+
+with open(watch_page, "w", encoding="utf-8") as f:
+    f.write(f"# Hero\n\n{GOOD_TEXT}\n\n# Services\n\n{GOOD_TEXT}")
+os.utime(watch_page, ns=(0, 10 ** 18))   # force an mtime change on coarse clocks
+watch_changes = watcher.poll()
+check("Edit re-scores only the changed section",
+      len(watch_changes) == 1 and [s["name"] for s in watch_changes[0]["sections"]] == ["services"]
+      and watcher.sections_scored == 3 and watcher.sections_reused == 1)
+watch_lines = format_change(watch_changes[0])
+check("Delta line shows before → after and status",
+      watch_lines[1].strip().startswith("services:") and "→" in watch_lines[1]
+      and watch_lines[1].endswith(("PASS", "FAIL")), str(watch_lines))
+os.utime(watch_page, ns=(0, 2 * 10 ** 18))
+check("Touch without edit is not re-scored", watcher.poll() == [] and watcher.sections_scored == 3)
+os.remove(watch_page)
+check("Deleted file is reported", [c["event"] for c in watcher.poll()] == ["removed"] and len(watcher) == 0)
+# A dangling link stats like a file deleted between scandir and stat (editor atomic save)
+os.symlink(os.path.join(watch_dir, "gone.md"), os.path.join(watch_dir, "ghost.md"))
+check("File vanishing mid-walk is skipped", watcher.poll() == [] and len(watcher) == 0)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LAZY IMPORTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("LAZY IMPORTS")
+print("=" * 60)
+
+lazy_probe = (
+    "import sys, scrvnr\n"
+    "loaded = lambda: sorted(m for m in ('pass1_ai_detection', 'scrvnr_gate', 'calibration') if m in sys.modules)\n"
+    "before = loaded()\n"
+    "detector = scrvnr.AIDetector\n"
+    "print(before, loaded(), 'AIDetector' in vars(scrvnr))\n"
+    "import scrvnr.website_studio_adapter as wsa\n"
+    "print('default_adapter' in vars(wsa), wsa.default_adapter is wsa.default_adapter)\n"
+)
+lazy_out = subprocess.run([sys.executable, "-c", lazy_probe], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.splitlines()
+check("import scrvnr loads no engine; first access loads only its module",
+      lazy_out[:1] == ["[] ['pass1_ai_detection'] True"], str(lazy_out))
+check("default_adapter is built on first access and cached",
+      lazy_out[1:] == ["False True"], str(lazy_out))
+core_probe = (
+    "import scrvnr, scrvnr.core\n"
+    "print(scrvnr.core.SCRVNRGate is scrvnr.SCRVNRGate, scrvnr.core._LAZY is scrvnr._LAZY)\n"
+    "from scrvnr.core.scoring_policy import Pass1Policy\n"
+    "print(Pass1Policy.__name__)\n"
+)
+core_out = subprocess.run([sys.executable, "-c", core_probe], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+check("scrvnr.core resolves attributes and submodules through the one root map",
+      core_out.stdout.splitlines() == ["True True", "Pass1Policy"], core_out.stderr[-300:])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# WARM-START SNAPSHOT
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("WARM-START SNAPSHOT")
+print("=" * 60)
+
+from warm_snapshot import WarmSnapshot
+
+snap_profiles = tempfile.mkdtemp()
+shutil.copy(os.path.join(profiles_dir, "gad-main.json"), snap_profiles)
+snap_path = os.path.join(tempfile.mkdtemp(), "warm.snap")
+cold_adapter = SCRVNRAdapter(profiles_dir=snap_profiles)
+check("warm() builds every listed profile", cold_adapter.warm() == 1)
+check("save_snapshot writes compiled gates", cold_adapter.save_snapshot(snap_path) == 1)
+
+snap_page = {"hero": GOOD_TEXT, "services": BAD_TEXT}
+warm_adapter = SCRVNRAdapter(profiles_dir=snap_profiles, snapshot=snap_path)
+check("Snapshot opens lazily (index only)", len(warm_adapter.snapshot) == 1 and not warm_adapter._gate_cache)
+warm_result = warm_adapter.check_page("gad-main", snap_page)
+cold_result = cold_adapter.check_page("gad-main", snap_page)
+check("Snapshot gate scores identically",
+      warm_result["sections"] == cold_result["sections"] and warm_result["gate_status"] == cold_result["gate_status"])
+
+with open(os.path.join(snap_profiles, "gad-main.json"), "a", encoding="utf-8") as f:
+    f.write("\n")
+stale_adapter = SCRVNRAdapter(profiles_dir=snap_profiles, snapshot=snap_path)
+stale_adapter.check_page("gad-main", snap_page)
+check("Edited profile source bypasses its snapshot entry",
+      "gad-main" not in stale_adapter.snapshot and stale_adapter._gate_cache["gad-main"] is not None)
+check("Different thresholds reject the whole snapshot",
+      WarmSnapshot(snap_path, {"pass1_threshold": 0.9, "pass2_threshold": 0.6}).rejected == "gate settings differ")
+from warm_snapshot import ENGINE_MODULES
+check("Snapshot engine hash covers the pickled LexiconSet", "lexicons" in ENGINE_MODULES)
+concurrent_snap = os.path.join(tempfile.mkdtemp(), "warm.snap")
+concurrent_errors = []
+
+
+def save_concurrent_snapshot():
+    try:
+        cold_adapter.save_snapshot(concurrent_snap)
+    except Exception as e:
+        concurrent_errors.append(e)
+
+
+concurrent_threads = [threading.Thread(target=save_concurrent_snapshot) for _ in range(8)]
+for t in concurrent_threads:
+    t.start()
+for t in concurrent_threads:
+    t.join()
+check("Concurrent save_snapshot calls do not clobber each other",
+      not concurrent_errors and len(WarmSnapshot(concurrent_snap)) == 1
+      and os.listdir(os.path.dirname(concurrent_snap)) == ["warm.snap"])
+
+with open(snap_path, "r+b") as f:
+    f.write(b"NOTASNAP")
+check("Corrupt snapshot opens empty", SCRVNRAdapter(profiles_dir=snap_profiles, snapshot=snap_path).snapshot.rejected
+      is not None)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BOUNDED GATE CACHE OVER A SHARED SNAPSHOT
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("BOUNDED GATE CACHE OVER A SHARED SNAPSHOT")
+print("=" * 60)
+
+lru_profiles = tempfile.mkdtemp()
+with open(os.path.join(profiles_dir, "gad-main.json"), "r", encoding="utf-8") as f:
+    lru_source = json.load(f)
+for i in range(4):
+    lru_profile = dict(lru_source, profile_id=f"t{i}-main", client_slug=f"t{i}")
+    with open(os.path.join(lru_profiles, f"t{i}-main.json"), "w", encoding="utf-8") as f:
+        json.dump(lru_profile, f)
+lru_snap = os.path.join(tempfile.mkdtemp(), "shared.snap")
+builder = SCRVNRAdapter(profiles_dir=lru_profiles)
+builder.warm()
+builder.save_snapshot(lru_snap)
+
+from metrics import MetricsRegistry as _LruMetrics
+lru_metrics = _LruMetrics()
+workers = [SCRVNRAdapter(profiles_dir=lru_profiles, snapshot=lru_snap, max_gates=2, metrics=lru_metrics)
+           for _ in range(2)]
+for worker in workers:
+    for slug in ("t0-main", "t1-main", "t2-main", "t3-main", "t0-main"):
+        worker.check_section(slug, "hero", GOOD_TEXT)
+check("max_gates bounds each worker's compiled gates",
+      all(list(w._gate_cache) == ["t3-main", "t0-main"] for w in workers))
+check("Evicted gates are re-decoded from the shared snapshot",
+      lru_metrics.get("scrvnr_profile_loads_total").value("snapshot") == 10
+      and lru_metrics.get("scrvnr_gate_cache_total").value("evict") == 6)
+check("save_snapshot keeps uncached snapshot entries", workers[0].save_snapshot(lru_snap) == 4)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LEXICON HOT RELOAD
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("LEXICON HOT RELOAD")
+print("=" * 60)
+
+from lexicons import LexiconError, load_lexicons
+
+lex_dir = tempfile.mkdtemp()
+lex_v1 = os.path.join(lex_dir, "v1.json")
+lex_v2 = os.path.join(lex_dir, "v2.json")
+with open(lex_v1, "w", encoding="utf-8") as f:
+    json.dump({"version": "v1", "AI_ISMS": ["zebra crossing"]}, f)
+with open(lex_v2, "w", encoding="utf-8") as f:
+    json.dump({"version": "v2", "AI_ISMS": AIDetector.AI_ISMS + ["brakes"]}, f)
+lex_bad = os.path.join(lex_dir, "bad.json")
+with open(lex_bad, "w", encoding="utf-8") as f:
+    json.dump({"version": "v3", "AI_ISM": ["typo"]}, f)
+
+check("Lexicon file loads with its version", load_lexicons(lex_v1).version == "v1"
+      and load_lexicons(lex_v1).tables["AI_ISMS"] == ("zebra crossing",))
+try:
+    load_lexicons(lex_bad)
+    check("Unknown lexicon name is rejected", False)
+except LexiconError:
+    check("Unknown lexicon name is rejected", True)
+
+reload_adapter = SCRVNRAdapter(profiles_dir=profiles_dir, lexicons_path=lex_v1)
+reload_text = "Bring the brakes in. We check pads, rotors and fluid while you wait, then call you with a price."
+before = reload_adapter.check_section("gad-main", "hero", reload_text)
+held_gate = reload_adapter._get_gate("gad-main")
+check("Results record lexicon and profile versions",
+      before["versions"]["lexicons"] == "v1" and len(before["versions"]["profile"] or "") == 12)
+
+reload_errors = []
+def _hammer():
+    for _ in range(30):
+        try:
+            reload_adapter.check_section("gad-main", "hero", reload_text)
+        except Exception as e:
+            reload_errors.append(e)
+hammer = threading.Thread(target=_hammer)
+hammer.start()
+reload_summary = reload_adapter.reload(lex_v2)
+hammer.join()
+after = reload_adapter.check_section("gad-main", "hero", reload_text)
+check("reload swaps lexicons without failing concurrent requests",
+      not reload_errors and reload_summary["lexicons"] == "v2" and reload_summary["gates"] == 1
+      and after["versions"]["lexicons"] == "v2" and reload_adapter.generation == 1)
+check("New lexicon changes scores; gates held by in-flight requests keep the old version",
+      after["pass1_score"] < before["pass1_score"] and held_gate.detector.lexicon_version == "v1"
+      and held_gate.run_section(reload_text)["versions"]["lexicons"] == "v1")
+try:
+    reload_adapter.reload(lex_bad)
+    check("Bad lexicon file leaves the live version in place", False)
+except LexiconError:
+    check("Bad lexicon file leaves the live version in place",
+          reload_adapter.lexicons.version == "v2" and reload_adapter.generation == 1)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FRAMED RUNNER PROTOCOL
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("FRAMED RUNNER PROTOCOL")
+print("=" * 60)
+
+from framing import FramedClient, FrameError, KIND_SECTION, KIND_RESULT
+
+stream_page = {"hero": GOOD_TEXT, "body": BAD_TEXT, "cta": "Call us today. We answer the phone."}
+stream_adapter = SCRVNRAdapter(profiles_dir=profiles_dir)
+stream_events = list(stream_adapter.iter_check_page("gad-main", stream_page, job_id="stream-1"))
+stream_plain = stream_adapter.check_page("gad-main", stream_page, job_id="stream-1")
+check("iter_check_page yields each section, then the check_page result",
+      [e.get("section") for e in stream_events[:-1]] == list(stream_page)
+      and stream_events[-1]["event"] == "result"
+      and stream_events[-1]["result"]["sections"] == stream_plain["sections"]
+      and stream_events[-1]["result"]["gate_status"] == stream_plain["gate_status"])
+check("Streamed section records match the final per-section results",
+      all(e["pass"] == stream_plain["sections"][e["section"]]["pass"]
+          and e["pass1_score"] == stream_plain["sections"][e["section"]]["pass1_score"]
+          for e in stream_events[:-1]))
+
+framed_client = FramedClient(
+    [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py"),
+     "--framed", "--max-bytes", "20000"],
+    env=dict(runner_env, SCRVNR_PROFILES_DIR=profiles_dir),
+)
+try:
+    framed_results = {}
+    def _framed(i):
+        framed_results[i] = framed_client.request({"property_slug": "gad-main", "sections": stream_page,
+                                                   "job_id": f"job-{i}"})
+    framed_threads = [threading.Thread(target=_framed, args=(i,)) for i in range(6)]
+    for t in framed_threads:
+        t.start()
+    for t in framed_threads:
+        t.join()
+    check("Framed runner serves concurrent requests, each matched to its id",
+          sorted(framed_results) == list(range(6))
+          and all(r["job_id"] == f"job-{i}" and r["gate_status"] == stream_plain["gate_status"]
+                  for i, r in framed_results.items()))
+    framed_stream = list(framed_client.stream({"property_slug": "gad-main", "sections": stream_page, "stream": True}))
+    check("Streaming request gets a SECTION frame per section, then RESULT",
+          [k for k, _ in framed_stream] == [KIND_SECTION] * 3 + [KIND_RESULT]
+          and [b["section"] for _, b in framed_stream[:-1]] == list(stream_page))
+    oversized = framed_client.request({"property_slug": "gad-main", "sections": {"hero": "word " * 5000}})
+    check("Oversized frame is refused before parsing; the runner keeps serving",
+          oversized["gate_status"] == "ERROR" and "limit" in oversized["error"]
+          and framed_client.request({"property_slug": "gad-main", "sections": {"hero": GOOD_TEXT}})["gate_status"]
+          in ("PASS", "FAIL"))
+finally:
+    framed_client.close()
+check("Framed runner exits cleanly when stdin closes", framed_client.process.returncode == 0)
+
+# A runner that answers its first request with an undecodable body
+bad_body_runner = (
+    "import sys; sys.path.insert(0, sys.argv[1])\n"
+    "from framing import HEADER, KIND_RESULT, pack_frame, read_frame\n"
+    "out = sys.stdout.buffer\n"
+    "first = True\n"
+    "while True:\n"
+    "    frame = read_frame(sys.stdin.buffer)\n"
+    "    if frame is None:\n"
+    "        break\n"
+    "    request_id, codec, kind, body = frame\n"
+    "    if first:\n"
+    "        out.write(HEADER.pack(9, request_id, codec, KIND_RESULT) + b'{not json')\n"
+    "        first = False\n"
+    "    else:\n"
+    "        out.write(pack_frame(request_id, KIND_RESULT, {'ok': request_id}))\n"
+    "    out.flush()\n"
+)
+bad_body_client = FramedClient([sys.executable, "-c", bad_body_runner,
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "core")])
+bad_body_first = bad_body_client.request({})
+bad_body_second = bad_body_client.request({})
+bad_body_client.close()
+check("Undecodable response fails only its own request; the reader keeps going",
+      bad_body_first["gate_status"] == "ERROR" and "Invalid frame body" in bad_body_first["error"]
+      and bad_body_second == {"ok": 2})
+try:
+    next(bad_body_client.stream({}))
+    check("Request after the runner exited is refused, not left waiting", False)
+except FrameError:
+    check("Request after the runner exited is refused, not left waiting", True)
+
+oneshot = subprocess.run(
+    [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py")],
+    input=json.dumps({"property_slug": "gad-main", "sections": {"hero": "word " * 100}}).encode(),
+    capture_output=True, env=dict(runner_env, SCRVNR_MAX_REQUEST_BYTES="200"),
+)
+check("One-shot runner enforces the size limit before parsing",
+      json.loads(oneshot.stdout)["gate_status"] == "ERROR" and "limit" in json.loads(oneshot.stdout)["error"])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STREAMED SECTION RESULTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("STREAMED SECTION RESULTS")
+print("=" * 60)
+
+stream_gate = SCRVNRGate(profile_dict=profile)
+gate_events = list(stream_gate.iter_run(stream_page))
+gate_plain = stream_gate.run(stream_page)
+gate_plain.pop("timestamp")
+gate_final = gate_events[-1]["result"]
+gate_final.pop("timestamp")
+check("iter_run yields sections in order, then the same result as run()",
+      [(e["event"], e.get("name"), e.get("index")) for e in gate_events]
+      == [("section", name, i) for i, name in enumerate(stream_page)] + [("result", None, None)]
+      and gate_final == gate_plain)
+
+streamed_lines = []
+streamed_proc = subprocess.Popen(
+    [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py")],
+    stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=dict(runner_env, SCRVNR_PROFILES_DIR=profiles_dir),
+)
+streamed_proc.stdin.write(json.dumps({"property_slug": "gad-main", "sections": stream_page, "stream": True}).encode())
+streamed_proc.stdin.close()
+for line in streamed_proc.stdout:
+    streamed_lines.append(json.loads(line))
+streamed_proc.wait()
+check("Runner streams NDJSON: a line per section, then the result line",
+      [r["event"] for r in streamed_lines] == ["section"] * 3 + ["result"]
+      and [r["section"] for r in streamed_lines[:-1]] == list(stream_page)
+      and streamed_lines[-1]["result"]["gate_status"] == stream_plain["gate_status"])
+empty_stream = subprocess.run(
+    [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py")],
+    input=json.dumps({"property_slug": "gad-main", "sections": {"hero": "  "}, "stream": True}).encode(),
+    capture_output=True, env=runner_env,
+)
+empty_lines = [json.loads(line) for line in empty_stream.stdout.splitlines()]
+check("Streamed request that cannot be gated gets only the result line",
+      len(empty_lines) == 1 and empty_lines[0]["result"]["gate_status"] == "ERROR")
+
+stream_server = make_server(SCRVNRAdapter(profiles_dir=profiles_dir), port=0)
+threading.Thread(target=stream_server.serve_forever, daemon=True).start()
+stream_request = urllib.request.Request(
+    f"http://127.0.0.1:{stream_server.server_address[1]}/check",
+    data=json.dumps({"property_slug": "gad-main", "sections": stream_page, "stream": True}).encode(),
+)
+with urllib.request.urlopen(stream_request, timeout=10) as stream_response:
+    served_lines = [json.loads(line) for line in stream_response]
+    served_type = stream_response.headers["Content-Type"]
+stream_server.shutdown()
+stream_server.server_close()
+check("Gate server streams NDJSON for \"stream\": true",
+      served_type == "application/x-ndjson"
+      and [r["event"] for r in served_lines] == ["section"] * 3 + ["result"]
+      and served_lines[-1]["result"]["sections"] == stream_plain["sections"])
+
+from gate_server import handle_payload
+
+payload_adapter = SCRVNRAdapter(profiles_dir=profiles_dir)
+payload_events = list(payload_adapter.iter_check_payload({"property_slug": "gad-main", "sections": stream_page,
+                                                          "stream": True}))
+section_events = list(payload_adapter.iter_check_payload({"property_slug": "gad-main", "sections": stream_page,
+                                                          "section_only": "hero", "stream": True}))
+check("Payload dispatch: streamed page, plain page and section share one path",
+      [e["event"] for e in payload_events] == ["section"] * 3 + ["result"]
+      and payload_events[-1]["result"]["sections"] == stream_plain["sections"]
+      and [e["event"] for e in section_events] == ["result"]
+      and dict(section_events[0]["result"], timestamp=None)
+      == dict(payload_adapter.check_section("gad-main", "hero", stream_page["hero"]), timestamp=None)
+      and handle_payload(payload_adapter, {"property_slug": "gad-main", "sections": stream_page})["sections"]
+      == stream_plain["sections"])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED AUDIT DIRECTORY
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("SHARED AUDIT DIRECTORY")
+print("=" * 60)
+
+shared_audit_dir = tempfile.mkdtemp()
+shared_writer = (
+    "import sys; sys.path.insert(0, sys.argv[3])\n"
+    "from audit_log import AuditLog\n"
+    "log = AuditLog(sys.argv[1], segment_max_bytes=600, flush_interval=0.01)\n"
+    "for i in range(4):\n"
+    "    log.append({'job_id': f'{sys.argv[2]}-{i}', 'property_slug': sys.argv[2], 'gate_status': 'PASS'})\n"
+    "    log.flush()\n"
+    "log.close()\n"
+)
+shared_core = os.path.join(os.path.dirname(os.path.abspath(__file__)), "core")
+shared_procs = [subprocess.Popen([sys.executable, "-c", shared_writer, shared_audit_dir, f"p{i}", shared_core])
+                for i in range(8)]
+for proc in shared_procs:
+    proc.wait()
+shared_lines = [json.loads(line) for seg in list_segments(shared_audit_dir) for line in open(seg, encoding="utf-8")]
+check("Processes sharing an audit directory lose no records",
+      len(shared_lines) == 32 and len({r["job_id"] for r in shared_lines}) == 32)
+shared_query = AuditQuery(shared_audit_dir)
+check("Sidecar offsets from several writers point at the right records",
+      shared_query.count() == 32
+      and all([r["property_slug"] for r in shared_query.find(property_slug=f"p{i}")] == [f"p{i}"] * 4
+              for i in range(8)))
+
+
+# A sidecar whose offsets do not describe its segment is ignored and rebuilt by scanning
+bad_sidecar_dir = tempfile.mkdtemp()
+bad_sidecar_log = AuditLog(bad_sidecar_dir)
+for slug in ("pa", "pa", "pb", "pb", "pb"):
+    bad_sidecar_log.append({"job_id": slug, "property_slug": slug, "gate_status": "PASS"})
+bad_sidecar_log.close()
+bad_segment = list_segments(bad_sidecar_dir)[0]
+bad_sidecar = bad_segment.with_name(bad_segment.name.replace(".jsonl", ".idx.json"))
+bad_data = json.load(open(bad_sidecar, encoding="utf-8"))
+bad_data["offsets"] = bad_data["offsets"][:2]
+bad_data["postings"] = {"property_slug": {"pb": [0, 1]}}
+json.dump(bad_data, open(bad_sidecar, "w", encoding="utf-8"))
+bad_query = AuditQuery(bad_sidecar_dir)
+check("Query scans a segment whose sidecar offsets do not match it",
+      bad_query.count() == 5 and [r["property_slug"] for r in bad_query.find(property_slug="pb")] == ["pb"] * 3)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED DUPLICATE INDEX
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("SHARED DUPLICATE INDEX")
+print("=" * 60)
+
+from near_duplicate import SqliteDuplicateIndex, open_duplicate_index
+
+sql_dupes = open_duplicate_index(os.path.join(dup_dir, "dupes.db"), use_numpy=False)
+check("open_duplicate_index picks SQLite for .db and JSON otherwise",
+      isinstance(sql_dupes, SqliteDuplicateIndex)
+      and type(open_duplicate_index(os.path.join(dup_dir, "other.json"))) is NearDuplicateIndex)
+sql_dupes.add(("gad-main", "page-1", "services"), GOOD_TEXT)
+check("SQLite index answers like the in-memory one",
+      sql_dupes.query(edited) == dupes.query(edited) and sql_dupes.query(BAD_TEXT) == []
+      and sql_dupes.query(GOOD_TEXT, exclude=("gad-main", "page-1", "services")) == [])
+sql_bounded = SqliteDuplicateIndex(os.path.join(dup_dir, "bounded.db"), max_entries=2, use_numpy=False)
+for i in range(3):
+    sql_bounded.add(("p", str(i), "s"), GOOD_TEXT)
+check("SQLite size bound evicts the oldest entries",
+      len(sql_bounded) == 2 and ("p", "0", "s") not in sql_bounded and sql_bounded.evicted == 1)
+
+shared_dup_path = os.path.join(dup_dir, "shared.db")
+shared_dup_procs = [
+    subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py")],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        env=dict(runner_env, SCRVNR_PROFILES_DIR=profiles_dir, SCRVNR_DUPLICATE_INDEX=shared_dup_path),
+    )
+    for _ in range(8)
+]
+for i, proc in enumerate(shared_dup_procs):
+    proc.stdin.write(json.dumps({"property_slug": "gad-main", "sections": {"services": GOOD_TEXT},
+                                 "job_id": f"spawn-{i}"}).encode())
+    proc.stdin.close()
+shared_dup_results = [json.loads(proc.stdout.read()) for proc in shared_dup_procs]
+for proc in shared_dup_procs:
+    proc.wait()
+    proc.stdout.close()
+check("Concurrent one-shot runners share a SQLite duplicate index without losing adds",
+      len(open_duplicate_index(shared_dup_path, use_numpy=False)) == 8
+      and all("near_duplicates" in r for r in shared_dup_results))
+
+json_dup_path = os.path.join(dup_dir, "runner.json")
+json_dup_run = subprocess.run(
+    [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py")],
+    input=json.dumps({"property_slug": "gad-main", "sections": {"services": GOOD_TEXT}}).encode(),
+    capture_output=True, env=dict(runner_env, SCRVNR_PROFILES_DIR=profiles_dir, SCRVNR_DUPLICATE_INDEX=json_dup_path),
+)
+check("One-shot runner ignores a JSON duplicate index with a warning",
+      "near_duplicates" not in json.loads(json_dup_run.stdout) and not os.path.exists(json_dup_path)
+      and b"framed mode" in json_dup_run.stderr)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RUNNER SHUTDOWN
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("RUNNER SHUTDOWN")
+print("=" * 60)
+
+# A metrics path under a regular file cannot be written: flushing fails after the result is out
+unwritable_metrics = os.path.join(tempfile.mkstemp()[1], "scrvnr.prom")
+for finish_payload in ({"property_slug": "gad-main", "sections": {"services": GOOD_TEXT}},
+                       {"property_slug": "gad-main", "sections": {"services": GOOD_TEXT}, "stream": True}):
+    finish_run = subprocess.run(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_gate_runner.py")],
+        input=json.dumps(finish_payload).encode(), capture_output=True,
+        env=dict(runner_env, SCRVNR_PROFILES_DIR=profiles_dir, SCRVNR_METRICS_FILE=unwritable_metrics),
+    )
+    finish_lines = finish_run.stdout.decode().splitlines()
+    finish_result = json.loads(finish_lines[-1])
+    finish_result = finish_result.get("result", finish_result)
+    check(f"Flush failure after {'a streamed' if finish_payload.get('stream') else 'a'} result goes to stderr only",
+          len(finish_lines) == (2 if finish_payload.get("stream") else 1)
+          and finish_result["gate_status"] != "ERROR"
+          and b"could not flush the metrics file" in finish_run.stderr)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AUDIT WRITE FAILURES
+# ─────────────────────────────────────────────────────────────────────────────
+
+print("\n" + "=" * 60)
+print("AUDIT WRITE FAILURES")
+print("=" * 60)
+
+import contextlib
+import threading
+from audit_log import LOCK_NAME
+
+
+def audit_lines(log_dir):
+    return [json.loads(line) for seg in list_segments(log_dir) for line in open(seg, encoding="utf-8")]
+
+
+# Another process holds the directory lock for a while: the batch is retried, not lost
+retry_dir = tempfile.mkdtemp()
+retry_log = AuditLog(retry_dir)
+retry_log._lock.timeout = 0.05
+retry_log.RETRY_BACKOFF = 0.05
+open(os.path.join(retry_dir, LOCK_NAME), "w").close()
+threading.Timer(0.2, os.remove, [os.path.join(retry_dir, LOCK_NAME)]).start()
+retry_err = io.StringIO()
+with contextlib.redirect_stderr(retry_err):
+    retry_log.append({"job_id": "r1", "property_slug": "p", "gate_status": "PASS"})
+    retry_log.flush()
+retry_log.close()
+check("Batch blocked by a lock timeout is retried and written once",
+      [r["job_id"] for r in audit_lines(retry_dir)] == ["r1"]
+      and retry_log.write_errors >= 1 and retry_log.records_dropped == 0
+      and "retrying 1 record" in retry_err.getvalue())
+
+# The lock never frees: the records are dropped only after WRITE_ATTEMPTS, and reported
+stuck_dir = tempfile.mkdtemp()
+stuck_log = AuditLog(stuck_dir)
+stuck_log._lock.timeout = 0.01
+stuck_log._lock.stale = 3600
+stuck_log.RETRY_BACKOFF = 0.01
+stuck_log.WRITE_ATTEMPTS = 2
+open(os.path.join(stuck_dir, LOCK_NAME), "w").close()
+stuck_err = io.StringIO()
+with contextlib.redirect_stderr(stuck_err):
+    stuck_log.append({"job_id": "s1", "property_slug": "p", "gate_status": "PASS"})
+    stuck_log.flush()
+os.remove(os.path.join(stuck_dir, LOCK_NAME))
+stuck_log.close()
+check("Records lost after the last attempt are counted and reported on stderr",
+      stuck_log.records_dropped == 1 and stuck_log.write_errors == 2
+      and "dropped 1 record(s)" in stuck_err.getvalue() and "'s1'" in stuck_err.getvalue())
+stuck_metrics = MetricsRegistry()
+SCRVNRAdapter(profiles_dir=profiles_dir, audit_log=stuck_log, metrics=stuck_metrics)
+check("Dropped audit records are exported as a metric",
+      "scrvnr_audit_records_dropped 1" in stuck_metrics.render())
+
+# A write fails after part of the batch reached the segment: the retry resumes after it
+partial_dir = tempfile.mkdtemp()
+partial_log = AuditLog(partial_dir)
+partial_log.RETRY_BACKOFF = 0.01
+real_write_line = partial_log._write_line
+partial_calls = []
+
+
+def failing_write_line(record, data):
+    partial_calls.append(record["job_id"])
+    if len(partial_calls) == 3:
+        raise OSError("disk full")
+    real_write_line(record, data)
+
+
+partial_log._write_line = failing_write_line
+with contextlib.redirect_stderr(io.StringIO()):
+    for i in range(4):
+        partial_log.append({"job_id": f"w{i}", "property_slug": "p", "gate_status": "PASS"})
+    partial_log.flush()
+partial_log.close()
+check("Retry after a partial write neither loses nor duplicates records",
+      [r["job_id"] for r in audit_lines(partial_dir)] == ["w0", "w1", "w2", "w3"]
+      and partial_log.records_written == 4 and AuditQuery(partial_dir).count() == 4)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # FINAL REPORT
 # ─────────────────────────────────────────────────────────────────────────────
@@ -11,8 +11,13 @@ Adapter responsibilities:
   - Normalize Website Studio section data into SCRVNR input format
   - Return a Website Studio-ready result structure
   - Handle missing profiles gracefully (Pass 1 only, with warning)
-  - Provide section-level results for inline composer feedback
+  - Provide section-level results for inline composer feedback, streamed
+    as each section is scored (iter_check_page)
   - Log all gate decisions for audit trail
+  - Flag sections that near-duplicate previously gated content
+  - Record request, cache and decision metrics (optional MetricsRegistry)
+  - Start warm from a snapshot of compiled gates (optional, see warm_snapshot.py)
+  - Hot-reload lexicons and profiles without dropping requests (reload())
 
 Usage in Website Studio pipeline:
 
@@ -44,19 +49,47 @@ Usage in Website Studio pipeline:
         override=True,
         override_note="Client approved via email 2026-02-18"
     )
+
+    # Streamed: one record per section as it is scored, then the result
+    for event in adapter.iter_check_page("gad-main", sections):
+        ...
+
+    # A ws_gate_runner-shaped payload (section or page, streamed or not)
+    for event in adapter.iter_check_payload({"property_slug": "gad-main", "sections": sections}):
+        ...
+
+    # Per-stage timings for profiling (adds result["timings"]):
+    result = adapter.check_page("gad-main", sections, timings=True)
+
+    # Swap in a new lexicon file / edited profiles while serving
+    # (result["versions"] records which ones scored each result):
+    adapter.reload("scrvnr/lexicons/2026-10.json")
+
+    # Warm restarts: save compiled gates, reuse them in the next process
+    adapter.save_snapshot("scrvnr/warm.snap")
+    adapter = SCRVNRAdapter(profiles_dir="scrvnr/profiles", snapshot="scrvnr/warm.snap")
 """
 
 import json
 import sys
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # Add scrvnr core to path
 _scrvnr_root = Path(__file__).parent
-sys.path.insert(0, str(_scrvnr_root / "core"))
+if str(_scrvnr_root / "core") not in sys.path:
+    sys.path.insert(0, str(_scrvnr_root / "core"))
 
-from scrvnr_gate import SCRVNRGate, load_profile
+from scrvnr_gate import SCRVNRGate, resolve_profile, resolve_profile_path
+from lexicons import load_lexicons
+from profile_validator import ProfileValidationError
+from audit_log import content_hash
+from timing import StageTimer
+from warm_snapshot import WarmSnapshot, file_hash, write_snapshot
 
 
 # ── Profile registry cache ────────────────────────────────────────────────────
@@ -74,12 +107,84 @@ class SCRVNRAdapter:
         profiles_dir: str = None,
         pass1_threshold: float = 0.65,
         pass2_threshold: float = 0.60,
+        profile_store=None,
+        audit_log=None,
+        duplicate_index=None,
+        metrics=None,
+        snapshot: str = None,
+        max_gates: int = None,
+        lexicons_path: str = None,
     ):
+        """
+        Args:
+            profiles_dir:    Directory of {profile-slug}.json files
+            pass1_threshold: Pass 1 threshold for every gate
+            pass2_threshold: Pass 2 threshold for every gate
+            profile_store:   Optional ProfileStore used in place of profiles_dir
+            audit_log:       Optional AuditLog. Every check_page decision is
+                             appended to it (write-behind, off the gate path).
+            duplicate_index: Optional NearDuplicateIndex. check_page reports
+                             near-duplicates of earlier sections, then
+                             indexes the page's sections.
+            metrics:         Optional MetricsRegistry. Request rate and latency
+                             per entry point, decisions per property, profile
+                             loads, gate cache hits and audit queue depth are
+                             recorded to it (gates share it too).
+            snapshot:        Optional warm-start snapshot path (save_snapshot).
+                             Gates whose profile source is unchanged are
+                             taken from it instead of being rebuilt.
+            max_gates:       Keep at most this many compiled gates (least
+                             recently used are evicted). Default: no limit.
+                             With a snapshot, an evicted gate is decoded
+                             again from the shared read-only mapping, so a
+                             pool of workers opening one snapshot keeps
+                             only its hot tenants in private memory.
+            lexicons_path:   Optional versioned Pass 1 lexicon file (see
+                             lexicons.py). Default: the built-in lists.
+
+        Raises:
+            LexiconError: lexicons_path is unreadable or malformed
+        """
         self.profiles_dir = Path(profiles_dir or (_scrvnr_root / "profiles"))
+        self.profile_store = profile_store
+        self.audit_log = audit_log
+        self.duplicate_index = duplicate_index
         self.pass1_threshold = pass1_threshold
         self.pass2_threshold = pass2_threshold
         self._profile_cache: Dict[str, Optional[Dict]] = {}
-        self._gate_cache: Dict[str, SCRVNRGate] = {}
+        self._gate_cache: "OrderedDict[str, SCRVNRGate]" = OrderedDict()
+        self._gate_lock = threading.Lock()
+        self.max_gates = max_gates
+        self._profile_sources: Dict[str, tuple] = {}
+        self._snapshot_checked = set()
+        self.lexicons_path = lexicons_path
+        self.lexicons = load_lexicons(lexicons_path)
+        self._generation = 0
+        self._reload_lock = threading.Lock()
+        self.snapshot = WarmSnapshot(snapshot, self._snapshot_config()) if snapshot else None
+        self.metrics = metrics
+        if metrics is not None:
+            self._requests = metrics.counter(
+                "scrvnr_requests_total", "Adapter requests", ("entry", "status"))
+            self._request_seconds = metrics.histogram(
+                "scrvnr_request_seconds", "Adapter request latency", ("entry",))
+            self._in_flight = metrics.gauge(
+                "scrvnr_requests_in_flight", "Adapter requests currently running")
+            self._decisions = metrics.counter(
+                "scrvnr_gate_decisions_total", "check_page decisions", ("property", "status"))
+            self._profile_loads = metrics.counter(
+                "scrvnr_profile_loads_total", "Profile resolutions", ("result",))
+            self._gate_cache_lookups = metrics.counter(
+                "scrvnr_gate_cache_total", "Per-property gate cache lookups and evictions", ("result",))
+            metrics.gauge("scrvnr_gate_cache_size", "Compiled gates held by this adapter",
+                          fn=lambda: len(self._gate_cache))
+            self._near_duplicates = metrics.counter(
+                "scrvnr_near_duplicates_total", "Sections flagged as near-duplicates")
+            if audit_log is not None:
+                metrics.gauge("scrvnr_audit_queue_depth", "Audit records not yet fsynced",
+                              fn=lambda: audit_log.queue_depth)
+                metrics.gauge("scrvnr_audit_records_dropped", "Audit records lost after repeated write failures",
+                              fn=lambda: audit_log.records_dropped)
 
     def check_page(
         self,
@@ -88,6 +193,7 @@ class SCRVNRAdapter:
         override: bool = False,
         override_note: str = "",
         job_id: str = None,
+        timings: bool = False,
     ) -> Dict:
         """
         Run the SCRVNR gate on a full page of sections.
@@ -100,26 +206,119 @@ class SCRVNRAdapter:
             override:      Human override flag. Requires override_note.
             override_note: Reason for override. Required if override=True.
             job_id:        Optional job/page ID for audit logging.
+            timings:       If True, add result["timings"] — milliseconds for
+                           profile_load, gate (plus every gate.* stage),
+                           result_build, near_duplicates and audit. The audit
+                           record itself is unchanged.
 
         Returns:
             Website Studio-ready result dict (see _build_ws_result)
         """
-        if override and not override_note.strip():
-            return self._error_result("Override requires a note. Provide override_note.")
+        if self.metrics is not None:
+            return self._observe("check_page", self._check_page,
+                                 property_slug, sections, override, override_note, job_id, timings)
+        return self._check_page(property_slug, sections, override, override_note, job_id, timings)
+
+    def _check_page(self, property_slug, sections, override, override_note, job_id, timings) -> Dict:
+        if timings:
+            active_sections, error = self._page_sections(sections, override, override_note)
+            if error is not None:
+                return error
+            return self._check_page_timed(property_slug, active_sections, override, override_note, job_id)
+        for event in self._iter_check_page(property_slug, sections, override, override_note, job_id):
+            pass
+        return event["result"]
+
+    def iter_check_page(
+        self,
+        property_slug: str,
+        sections: Dict[str, str],
+        override: bool = False,
+        override_note: str = "",
+        job_id: str = None,
+    ) -> Iterator[Dict]:
+        """
+        check_page() as a stream, for UIs that light up section indicators
+        as results arrive. Yields one record per section as soon as both
+        passes have scored it (input order):
 
-        # Filter empty sections
-        active_sections = {k: v for k, v in sections.items() if v and v.strip()}
-        if not active_sections:
-            return self._error_result("No content provided in sections.")
+            {"event": "section", "section", "index", "total", "pass",
+             "pass1_score", "pass1_pass", "pass2_score", "pass2_pass", "failures"}
 
-        gate = self._get_gate(property_slug)
-        raw = gate.run(
-            sections=active_sections,
-            override=override,
-            override_note=override_note,
-        )
+        then exactly one {"event": "result", "result": <check_page() result>}.
+        Near-duplicate matching, audit logging and metrics happen once, with
+        the final record. Errors (bad override, empty page) yield only the
+        final record.
+        """
+        stream = self._iter_check_page(property_slug, sections, override, override_note, job_id)
+        if self.metrics is not None:
+            return self._observe_stream("check_page", property_slug, stream)
+        return stream
 
-        return self._build_ws_result(raw, property_slug, job_id)
+    def _iter_check_page(self, property_slug, sections, override, override_note, job_id) -> Iterator[Dict]:
+        active_sections, error = self._page_sections(sections, override, override_note)
+        if error is not None:
+            yield {"event": "result", "result": error}
+            return
+
+        gate = self._get_gate(property_slug)
+        for event in gate.iter_run(sections=active_sections, override=override, override_note=override_note):
+            if event["event"] == "section":
+                yield {
+                    "event": "section",
+                    "section": event["name"],
+                    "index": event["index"],
+                    "total": event["total"],
+                    "pass": event["pass"],
+                    "pass1_score": event["pass1_score"],
+                    "pass1_pass": event["pass1_pass"],
+                    "pass2_score": event["pass2_score"],
+                    "pass2_pass": event["pass2_pass"],
+                    "failures": event["pass1_failures"] + event["pass2_failures"],
+                }
+            else:
+                raw = event["result"]
+
+        result = self._build_ws_result(raw, property_slug, job_id)
+        if self.duplicate_index is not None:
+            result["near_duplicates"] = self._check_duplicates(property_slug, active_sections, job_id)
+        if self.audit_log is not None:
+            self.audit_log.append_decision(result, active_sections, property_slug, job_id)
+        yield {"event": "result", "result": result}
+
+    def _page_sections(self, sections, override, override_note):
+        """(non-empty sections, None), or (None, error result) for a page that cannot be gated."""
+        if override and not override_note.strip():
+            return None, self._error_result("Override requires a note. Provide override_note.")
+        active_sections = {k: v for k, v in sections.items() if v and v.strip()}
+        if not active_sections:
+            return None, self._error_result("No content provided in sections.")
+        return active_sections, None
+
+    def _check_page_timed(self, property_slug, active_sections, override, override_note, job_id) -> Dict:
+        """check_page with every stage timed. Kept apart so the default path carries no timing code."""
+        timer = StageTimer()
+        with timer.stage("profile_load"):
+            gate = self._get_gate(property_slug)
+        with timer.stage("gate"):
+            raw = gate.run(
+                sections=active_sections,
+                override=override,
+                override_note=override_note,
+                timings=True,
+            )
+        timer.merge(raw.pop("timings"), prefix="gate.")
+
+        with timer.stage("result_build"):
+            result = self._build_ws_result(raw, property_slug, job_id)
+        if self.duplicate_index is not None:
+            with timer.stage("near_duplicates"):
+                result["near_duplicates"] = self._check_duplicates(property_slug, active_sections, job_id)
+        if self.audit_log is not None:
+            with timer.stage("audit"):
+                self.audit_log.append_decision(result, active_sections, property_slug, job_id)
+        result["timings"] = timer.to_dict()
+        return result
 
     def check_section(
         self,
@@ -134,6 +333,12 @@ class SCRVNRAdapter:
         Used for live inline feedback in the Page Composer.
         Lightweight — returns only what the composer UI needs.
         """
+        if self.metrics is not None:
+            return self._observe("check_section", self._check_section,
+                                 property_slug, section_name, text, override, override_note)
+        return self._check_section(property_slug, section_name, text, override, override_note)
+
+    def _check_section(self, property_slug, section_name, text, override, override_note) -> Dict:
         if not text or not text.strip():
             return {"gate_open": True, "skipped": True, "reason": "Empty section"}
 
@@ -147,6 +352,46 @@ class SCRVNRAdapter:
 
         return self._build_ws_section_result(raw, section_name)
 
+    def payload_call(self, payload: Dict) -> Tuple[Callable, Dict]:
+        """
+        (method, kwargs) for a runner-shaped request payload (the input
+        schema in ws_gate_runner.py, also what gate_server.py accepts):
+        check_section when "section_only" is set, check_page otherwise.
+        """
+        property_slug = payload.get("property_slug", "no-profile")
+        sections = payload.get("sections", {})
+        section_only = payload.get("section_only")
+        if section_only:
+            return self.check_section, dict(
+                property_slug=property_slug,
+                section_name=section_only,
+                text=sections.get(section_only, ""),
+                override=payload.get("override", False),
+                override_note=payload.get("override_note", ""),
+            )
+        return self.check_page, dict(
+            property_slug=property_slug,
+            sections=sections,
+            override=payload.get("override", False),
+            override_note=payload.get("override_note", ""),
+            job_id=payload.get("job_id"),
+            timings=bool(payload.get("timings", False)),
+        )
+
+    def iter_check_payload(self, payload: Dict) -> Iterator[Dict]:
+        """
+        A payload's response as iter_check_page() records: the section
+        records when "stream" is set on a page check ("timings" is then
+        ignored), and always a final {"event": "result", "result": ...}.
+        Every transport (runner stdout, framed runner, gate server) answers
+        through this.
+        """
+        check, kwargs = self.payload_call(payload)
+        if payload.get("stream") and check == self.check_page:
+            kwargs.pop("timings")
+            return self.iter_check_page(**kwargs)
+        return iter([{"event": "result", "result": check(**kwargs)}])
+
     def get_profile_summary(self, property_slug: str) -> Dict:
         """
         Return a human-readable summary of the loaded voice profile.
@@ -193,41 +438,259 @@ class SCRVNRAdapter:
 
     def list_profiles(self) -> List[str]:
         """Return list of available profile slugs."""
+        if self.profile_store is not None:
+            return self.profile_store.list_profiles()
         return [
             p.stem for p in self.profiles_dir.glob("*.json")
             if p.is_file()
         ]
 
+    def warm(self, property_slugs: List[str] = None) -> int:
+        """Build gates ahead of traffic (every listed profile by default). Returns the count."""
+        slugs = self.list_profiles() if property_slugs is None else property_slugs
+        for slug in slugs:
+            self._get_gate(slug)
+        return len(slugs)
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Write every compiled gate that has a profile to a warm-start snapshot
+        (see warm_snapshot.py). Valid entries of the snapshot this adapter
+        started from are carried over, cached or not. Returns the entry count.
+        """
+        entries = {}
+        if self.snapshot is not None:
+            for slug in list(self.snapshot.entries):
+                if self._snapshot_entry_valid(slug, self.snapshot):
+                    entries[slug] = (self.snapshot.load(slug), self.snapshot.source(slug))
+        with self._gate_lock:
+            cached = list(self._gate_cache.items())
+        for slug, gate in cached:
+            if gate.profile is not None and slug in self._profile_sources:
+                entries[slug] = (gate, self._profile_sources[slug])
+        return write_snapshot(path, entries, self._snapshot_config())
+
+    @property
+    def generation(self) -> int:
+        """Number of reloads swapped in so far."""
+        return self._generation
+
+    def reload(self, lexicons_path: str = None) -> Dict:
+        """
+        Re-read the lexicon file and every cached profile, build new gates
+        beside the live ones, then swap them in at once (copy-on-write).
+        Requests already running finish on the gates they hold; requests
+        after the swap see only the new versions. Serving continues while
+        the new gates are built. A bad lexicon file raises LexiconError and
+        changes nothing.
+
+        Args:
+            lexicons_path: Switch to this lexicon file (default: re-read the current one)
+
+        Returns:
+            {"lexicons": version, "generation": n, "gates": rebuilt, "failed": [slugs]}
+        """
+        with self._reload_lock:
+            path = lexicons_path or self.lexicons_path
+            lexicons = load_lexicons(path)
+            with self._gate_lock:
+                slugs = list(self._gate_cache)
+            gates, profiles, sources, failed = OrderedDict(), {}, {}, []
+            for slug in slugs:
+                try:
+                    profile, source = self._resolve(slug)
+                except ProfileValidationError:
+                    failed.append(slug)     # next request raises, as on a cold start
+                    continue
+                profiles[slug] = profile
+                sources[slug] = source
+                gates[slug] = self._build_gate(profile, lexicons, source)
+            snapshot = None
+            if self.snapshot is not None:
+                snapshot = WarmSnapshot(self.snapshot.path, self._snapshot_config(lexicons))
+
+            with self._gate_lock:
+                self.lexicons_path, self.lexicons = path, lexicons
+                self._gate_cache, self._profile_cache = gates, profiles
+                for slug, source in sources.items():
+                    if source is None:
+                        self._profile_sources.pop(slug, None)
+                    else:
+                        self._profile_sources[slug] = source
+                self.snapshot, self._snapshot_checked = snapshot, set()
+                self._generation += 1
+                generation = self._generation
+        return {"lexicons": lexicons.version, "generation": generation, "gates": len(gates), "failed": failed}
+
     # ── Internal ──────────────────────────────────────────────────────────────
 
     def _get_gate(self, property_slug: str) -> SCRVNRGate:
         """Load (or return cached) gate for this property slug."""
-        if property_slug not in self._gate_cache:
+        with self._gate_lock:
+            gate = self._gate_cache.get(property_slug)
+            if gate is not None:
+                self._gate_cache.move_to_end(property_slug)
+            generation, lexicons, snapshot = self._generation, self.lexicons, self.snapshot
+        if gate is not None:
+            if self.metrics is not None:
+                self._gate_cache_lookups.inc("hit")
+            return gate
+
+        if self.metrics is not None:
+            self._gate_cache_lookups.inc("miss")
+        gate = self._gate_from_snapshot(property_slug, snapshot) if snapshot is not None else None
+        if gate is None:
             profile = self._load_profile(property_slug)
-            self._gate_cache[property_slug] = SCRVNRGate(
-                profile_dict=profile,
-                pass1_threshold=self.pass1_threshold,
-                pass2_threshold=self.pass2_threshold,
-            )
-        return self._gate_cache[property_slug]
+            gate = self._build_gate(profile, lexicons, self._profile_sources.get(property_slug) if profile else None)
+        with self._gate_lock:
+            # A reload swapped state while this gate was built: serve it, don't cache it
+            if generation != self._generation:
+                return gate
+            self._gate_cache[property_slug] = gate
+            evicted = []
+            while self.max_gates and len(self._gate_cache) > self.max_gates:
+                evicted.append(self._gate_cache.popitem(last=False)[0])
+            for slug in evicted:
+                self._profile_cache.pop(slug, None)
+        if evicted and self.metrics is not None:
+            self._gate_cache_lookups.inc("evict", amount=len(evicted))
+        return gate
+
+    def _build_gate(self, profile: Optional[Dict], lexicons, source: Optional[tuple]) -> SCRVNRGate:
+        return SCRVNRGate(
+            profile_dict=profile,
+            pass1_threshold=self.pass1_threshold,
+            pass2_threshold=self.pass2_threshold,
+            metrics=self.metrics,
+            lexicons=lexicons,
+            profile_version=source[2][:12] if source else None,
+        )
+
+    def _gate_from_snapshot(self, property_slug: str, snapshot: WarmSnapshot) -> Optional[SCRVNRGate]:
+        """A private copy of the snapshot's gate for this slug if its source is unchanged, else None."""
+        if not self._snapshot_entry_valid(property_slug, snapshot):
+            return None
+        gate = snapshot.load(property_slug)
+        gate.attach_metrics(self.metrics)
+        self._profile_sources[property_slug] = snapshot.source(property_slug)
+        if self.metrics is not None:
+            self._profile_loads.inc("snapshot")
+        return gate
+
+    def _snapshot_entry_valid(self, property_slug: str, snapshot: WarmSnapshot) -> bool:
+        """Check an entry's source hash once per process; stale entries are dropped."""
+        if property_slug not in snapshot:
+            return False
+        if property_slug in self._snapshot_checked:
+            return True
+        source = snapshot.source(property_slug)
+        profile_id = source[1] if source[0] == "store" else None
+        if self._profile_source(property_slug, profile_id) != source:
+            snapshot.discard(property_slug)
+            return False
+        self._snapshot_checked.add(property_slug)
+        return True
+
+    def _profile_source(self, property_slug: str, profile_id: str = None) -> Optional[tuple]:
+        """Where this slug's profile comes from now, with a content hash (None if nowhere)."""
+        if self.profile_store is not None:
+            profile_id = profile_id or property_slug
+            head = self.profile_store.head(profile_id)
+            return ("store", profile_id, head["content_hash"]) if head else None
+        path = resolve_profile_path(property_slug, str(self.profiles_dir))
+        return ("file", str(path), file_hash(path)) if path else None
+
+    def _snapshot_config(self, lexicons=None) -> Dict:
+        return {
+            "pass1_threshold": self.pass1_threshold,
+            "pass2_threshold": self.pass2_threshold,
+            "lexicons": (lexicons or self.lexicons).digest,
+        }
+
+    def _observe(self, entry: str, fn, property_slug: str, *args) -> Dict:
+        """Run an entry point, recording latency, status and (for pages) the decision."""
+        self._in_flight.inc()
+        started = time.perf_counter()
+        status = "EXCEPTION"
+        try:
+            result = fn(property_slug, *args)
+            status = result.get("gate_status") or ("SKIPPED" if result.get("skipped") else "UNKNOWN")
+            if entry == "check_page":
+                self._decisions.inc(property_slug, status)
+            return result
+        finally:
+            self._in_flight.dec()
+            self._request_seconds.observe(time.perf_counter() - started, entry)
+            self._requests.inc(entry, status)
+
+    def _observe_stream(self, entry: str, property_slug: str, stream: Iterator[Dict]) -> Iterator[Dict]:
+        """_observe for iter_check_page: the request ends with its final record (or when abandoned)."""
+        self._in_flight.inc()
+        started = time.perf_counter()
+        status = "EXCEPTION"
+        try:
+            for event in stream:
+                if event["event"] == "result":
+                    status = event["result"].get("gate_status") or "UNKNOWN"
+                    self._decisions.inc(property_slug, status)
+                yield event
+        except GeneratorExit:
+            if status == "EXCEPTION":
+                status = "CANCELLED"
+            raise
+        finally:
+            self._in_flight.dec()
+            self._request_seconds.observe(time.perf_counter() - started, entry)
+            self._requests.inc(entry, status)
+
+    def _check_duplicates(self, property_slug: str, sections: Dict[str, str], job_id: str) -> Dict:
+        """
+        Match each section against everything gated before, then index it.
+        Informational — duplicates never close the gate.
+
+        Returns {section: [{"key": [property_slug, page_id, section], "similarity": 0.93}]}
+        for sections with matches. A page is identified by job_id, or by its
+        content hash when there is none, so resubmitting a page never matches
+        its own earlier version.
+        """
+        page_id = job_id or content_hash(sections)[:16]
+        flagged = {}
+        for name, text in sections.items():
+            key = (property_slug, page_id, name)
+            sig = self.duplicate_index.signature(text)
+            if sig is None:
+                continue
+            matches = self.duplicate_index.query_signature(sig, exclude=key)
+            if matches:
+                flagged[name] = matches
+            self.duplicate_index.add_signature(key, sig)
+        if self.metrics is not None and flagged:
+            self._near_duplicates.inc(amount=len(flagged))
+        return flagged
 
     def _load_profile(self, property_slug: str) -> Optional[Dict]:
         """Load (or return cached) profile. Returns None if not found."""
         if property_slug not in self._profile_cache:
-            profile = load_profile(
-                profiles_dir=str(self.profiles_dir),
-                client_slug=property_slug.rsplit("-", 1)[0] if "-" in property_slug else property_slug,
-                brand_slug=property_slug.rsplit("-", 1)[1] if "-" in property_slug else "main",
-            )
-            # Also try direct filename match
-            if not profile:
-                direct = self.profiles_dir / f"{property_slug}.json"
-                if direct.exists():
-                    with open(direct) as f:
-                        profile = json.load(f)
+            profile, source = self._resolve(property_slug)
             self._profile_cache[property_slug] = profile
+            if source is not None:
+                self._profile_sources[property_slug] = source
+            if self.metrics is not None:
+                self._profile_loads.inc("found" if profile else "missing")
         return self._profile_cache[property_slug]
 
+    def _resolve(self, property_slug: str):
+        """(profile, source) read fresh from the directory or store; (None, None) if not found."""
+        profile = resolve_profile(
+            property_slug,
+            profiles_dir=str(self.profiles_dir),
+            store=self.profile_store,
+        )
+        if profile is None:
+            return None, None
+        profile_id = profile.get("profile_id") if self.profile_store is not None else None
+        return profile, self._profile_source(property_slug, profile_id)
+
     def _build_ws_result(self, raw: Dict, property_slug: str, job_id: str) -> Dict:
         """
         Transform raw gate result into Website Studio pipeline format.
@@ -243,6 +706,8 @@ class SCRVNRAdapter:
           action_required    — guidance copy for composer prompt
           sections           — per-section results for inline feedback
           composer_feedback  — structured feedback list for UI rendering
+          page_repetition    — cross-section repetition (page-level, informational)
+          near_duplicates    — {section: matches}, only with a duplicate_index
           audit              — full raw result for audit trail storage
         """
         profile_loaded = raw["pass2"]["active"]
@@ -277,6 +742,8 @@ class SCRVNRAdapter:
             "action_required": raw["action_required"],
             "sections": section_results,
             "composer_feedback": feedback,
+            "page_repetition": raw.get("page_repetition"),
+            "versions": raw.get("versions"),
             "job_id": job_id,
             "timestamp": raw["timestamp"],
             "audit": raw,  # Full raw result for audit trail
@@ -306,6 +773,7 @@ class SCRVNRAdapter:
             "profile_loaded": p2.get("active"),
             "failures": all_failures,
             "action": raw.get("action_required"),
+            "versions": raw.get("versions"),
             "timestamp": raw.get("timestamp"),
         }
 
@@ -323,6 +791,14 @@ class SCRVNRAdapter:
 # Import and use this directly for simple cases:
 #   from scrvnr.website_studio_adapter import default_adapter
 #   result = default_adapter.check_page("gad-main", sections)
+# Built on first access (PEP 562), so importing this module costs nothing extra.
 
 _default_profiles_dir = Path(__file__).parent / "profiles"
-default_adapter = SCRVNRAdapter(profiles_dir=str(_default_profiles_dir))
+
+
+def __getattr__(name):
+    if name == "default_adapter":
+        adapter = SCRVNRAdapter(profiles_dir=str(_default_profiles_dir))
+        globals()["default_adapter"] = adapter
+        return adapter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
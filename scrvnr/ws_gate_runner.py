@@ -4,6 +4,16 @@ ws_gate_runner.py — Website Studio SCRVNR subprocess entry point
 Accepts JSON on stdin, writes result JSON to stdout.
 Called by the Next.js SCRVNR API route via child_process.spawn.
 
+Framed mode (--framed) keeps one process up for many requests: payloads
+arrive as length-prefixed frames on stdin and results leave as frames on
+stdout, tagged with the request id, in completion order (protocol:
+core/framing.py). Requests run concurrently (--workers) against one
+adapter, so profiles, gates and lexicons are loaded once. A page payload
+with "stream": true gets a SECTION frame per section (the section record
+described under "stream" below), then its RESULT frame. "profile" is ignored in framed mode.
+
+    python ws_gate_runner.py --framed [--workers 4] [--max-bytes N]
+
 Input JSON schema:
   {
     "property_slug": str,
@@ -11,62 +21,306 @@ Input JSON schema:
     "section_only": str | null,   # If set, run check_section instead of check_page
     "override": bool,
     "override_note": str,
-    "job_id": str | null
+    "job_id": str | null,
+    "timings": bool,              # Optional: add a "timings" block to the output
+    "profile": "cpu" | "alloc",   # Optional: profile this request (needs SCRVNR_PROFILING)
+    "profile_top": int,           # Optional: entries in the profiling report
+    "stream": bool                # Optional: stream per-section results (below)
   }
 
 Output: JSON matching ScrvnrAdapterResult TypeScript type.
+
+With "stream": true (page checks) the output is NDJSON instead, one line
+flushed as each section has been scored by both passes, so the composer
+can light up section indicators while the rest of the page is scored:
+  {"event": "section", "section", "index", "total", "pass", "pass1_score",
+   "pass1_pass", "pass2_score", "pass2_pass", "failures"}
+  ...
+  {"event": "result", "result": <the usual output>}      # always last
+"timings" and "profile" are ignored when streaming. A payload that is not
+valid JSON, or is over the size limit, still gets the plain error output.
+
+With "timings": true the output gains
+  "timings": {"total_ms": ..., "stages": {"parse", "import", "adapter_init",
+              "check", "check.<adapter stage>", ..., "serialize"}}
+measured from runner start (after interpreter startup) to the end of
+serializing the result.
+
+With "profile" set and profiling enabled, the check runs under cProfile
+("cpu") or tracemalloc ("alloc") and the output gains a "profiling" block
+with the top-N functions or allocation sites (see core/profiling.py).
+When profiling is not enabled the check runs normally and "profiling"
+reports the error instead.
+
+Environment:
+  SCRVNR_PROFILES_DIR   Directory of profile JSON files (default: profiles/
+                        next to this script).
+  SCRVNR_PROFILE_STORE  Path to a ProfileStore SQLite file. When set, profiles
+                        are read from the store instead of profiles/.
+  SCRVNR_AUDIT_DIR      Directory for the gate decision audit log. When set,
+                        every full-page check is appended to it.
+  SCRVNR_DUPLICATE_INDEX
+                        Path to a near-duplicate index. When set, full-page
+                        checks report near-duplicates of earlier sections.
+                        A .db/.sqlite path is a SQLite index that each check
+                        updates in place; concurrent runners can share it.
+                        A .json index is loaded whole and rewritten on exit,
+                        so it is only used in framed mode; a one-shot runner
+                        ignores it with a warning on stderr.
+  SCRVNR_METRICS_FILE   Path to a Prometheus text file. When set, each
+                        request's metrics are added to running totals
+                        (kept in <path>.state.json) and the file is rewritten
+                        for the node_exporter textfile collector.
+  SCRVNR_LEXICONS       Path to a versioned Pass 1 lexicon file (see
+                        core/lexicons.py). Each request reads it, so a new
+                        file takes effect on the next spawn (framed mode:
+                        on restart).
+  SCRVNR_MAX_REQUEST_BYTES
+                        Request size limit (default 16 MiB). Checked before
+                        parsing: one-shot mode reads at most this much stdin,
+                        framed mode checks each frame's length prefix.
+  SCRVNR_PROFILING      Set to 1 to honour the payload "profile" field.
+                        Without it no payload can start a profiler.
+  SCRVNR_PROFILING_DIR  With profiling enabled, also write each capture
+                        (.prof / .tracemalloc) to this directory.
+  SCRVNR_PROFILING_TOP  Default entries in the profiling report (25).
 """
 
 import sys
 import json
+import os
+import time
+
+_STARTED = time.perf_counter()
+
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+WINDOW_PER_WORKER = 4
+
 
 def main():
-    raw = sys.stdin.read()
+    limit = _max_request_bytes()
+    raw = sys.stdin.buffer.read(limit + 1)
+    if len(raw) > limit:
+        error_out(f"Request exceeds the {limit}-byte limit")
+        return
+    t0 = time.perf_counter()
     try:
         payload = json.loads(raw)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         error_out(f"Invalid JSON input: {e}")
         return
+    parse_seconds = time.perf_counter() - t0
 
     property_slug = payload.get("property_slug", "no-profile")
-    sections      = payload.get("sections", {})
-    section_only  = payload.get("section_only")
-    override      = payload.get("override", False)
-    override_note = payload.get("override_note", "")
     job_id        = payload.get("job_id")
+    timings       = bool(payload.get("timings", False))
+    profile_mode  = payload.get("profile")
+    stream        = bool(payload.get("stream")) and not payload.get("section_only")
+
+    if stream:
+        stream_out(payload)
+        return
 
+    adapter = None
     try:
-        from website_studio_adapter import SCRVNRAdapter
-        import os
-
-        profiles_dir = os.path.join(os.path.dirname(__file__), "profiles")
-        adapter = SCRVNRAdapter(profiles_dir=profiles_dir)
-
-        if section_only:
-            result = adapter.check_section(
-                property_slug=property_slug,
-                section_name=section_only,
-                text=sections.get(section_only, ""),
-                override=override,
-                override_note=override_note,
-            )
+        t0 = time.perf_counter()
+        import website_studio_adapter  # noqa: F401  (puts core/ on sys.path)
+        from timing import StageTimer
+
+        timer = None
+        if timings:
+            timer = StageTimer(started=_STARTED)
+            timer.add("parse", parse_seconds)
+            timer.add("import", time.perf_counter() - t0)
+        adapter = build_adapter(timer)
+        t0 = time.perf_counter()
+
+        check, kwargs = adapter.payload_call(payload)
+
+        if not profile_mode:
+            result = check(**kwargs)
         else:
-            result = adapter.check_page(
-                property_slug=property_slug,
-                sections=sections,
-                override=override,
-                override_note=override_note,
-                job_id=job_id,
-            )
+            from profiling import MODES, profiling_enabled, profile_dir, run_profiled
+            if not profiling_enabled():
+                result = check(**kwargs)
+                result["profiling"] = {"mode": profile_mode, "error": "Profiling is disabled (set SCRVNR_PROFILING=1)"}
+            elif profile_mode not in MODES:
+                result = check(**kwargs)
+                result["profiling"] = {"mode": profile_mode, "error": f"Unknown profiling mode; use one of {MODES}"}
+            else:
+                result, report = run_profiled(
+                    profile_mode, check, top=payload.get("profile_top"),
+                    out_dir=profile_dir(), label=job_id or property_slug, **kwargs,
+                )
+                result["profiling"] = report
 
-        print(json.dumps(result))
+        if timer is None:
+            print(json.dumps(result))
+        else:
+            timer.add("check", time.perf_counter() - t0)
+            if "timings" in result:
+                timer.merge(result.pop("timings"), prefix="check.")
+            # Serialize first, then splice the timings block in so that
+            # serialization itself is counted.
+            t0 = time.perf_counter()
+            body = json.dumps(result)
+            timer.add("serialize", time.perf_counter() - t0)
+            print(body[:-1] + ', "timings": ' + json.dumps(timer.to_dict()) + "}")
 
     except Exception as e:
         error_out(str(e))
+    if adapter is not None:
+        finish(adapter, save_duplicates=not payload.get("section_only"))
 
 
-def error_out(message: str):
-    result = {
+def stream_out(payload):
+    """Page check as NDJSON: a line per section as it is scored, then the result line."""
+    adapter = None
+    try:
+        adapter = build_adapter()
+        for event in adapter.iter_check_payload(payload):
+            sys.stdout.write(json.dumps(event) + "\n")
+            sys.stdout.flush()
+    except Exception as e:
+        print(json.dumps({"event": "result", "result": error_result(str(e))}))
+    if adapter is not None:
+        finish(adapter)
+
+
+def build_adapter(timer=None, long_lived: bool = False):
+    """
+    The adapter with the collaborators the environment asks for (see module
+    docstring). long_lived: the adapter serves many requests (framed mode).
+    """
+    from website_studio_adapter import SCRVNRAdapter
+    t0 = time.perf_counter()
+
+    profiles_dir = os.environ.get("SCRVNR_PROFILES_DIR") or os.path.join(os.path.dirname(__file__), "profiles")
+    store_path = os.environ.get("SCRVNR_PROFILE_STORE")
+    profile_store = None
+    if store_path:
+        from profile_store import ProfileStore
+        profile_store = ProfileStore(store_path)
+    audit_dir = os.environ.get("SCRVNR_AUDIT_DIR")
+    audit_log = None
+    if audit_dir:
+        from audit_log import AuditLog
+        audit_log = AuditLog(audit_dir)
+    duplicate_path = os.environ.get("SCRVNR_DUPLICATE_INDEX")
+    duplicate_index = None
+    if duplicate_path:
+        from near_duplicate import SqliteDuplicateIndex, open_duplicate_index
+        duplicate_index = open_duplicate_index(duplicate_path)
+        if not long_lived and not isinstance(duplicate_index, SqliteDuplicateIndex):
+            # A whole-file index per spawn is O(n) I/O and concurrent spawns lose each other's adds
+            print(f"SCRVNR_DUPLICATE_INDEX={duplicate_path}: a JSON index is only used in framed mode; "
+                  f"use a .db path to share one across runners", file=sys.stderr)
+            duplicate_index = None
+    metrics = None
+    if os.environ.get("SCRVNR_METRICS_FILE"):
+        from metrics import MetricsRegistry
+        metrics = MetricsRegistry()
+    adapter = SCRVNRAdapter(
+        profiles_dir=profiles_dir,
+        profile_store=profile_store,
+        audit_log=audit_log,
+        duplicate_index=duplicate_index,
+        metrics=metrics,
+        lexicons_path=os.environ.get("SCRVNR_LEXICONS"),
+    )
+    if timer is not None:
+        timer.add("adapter_init", time.perf_counter() - t0)
+    return adapter
+
+
+def finish(adapter, save_duplicates: bool = True):
+    """
+    Flush the audit log, duplicate index and metrics file after the last
+    request. Runs after the result has been written, so a failure here is
+    logged to stderr rather than answered with a second result.
+    """
+    steps = []
+    if adapter.audit_log is not None:
+        steps.append(("audit log", adapter.audit_log.close))
+    if adapter.duplicate_index is not None and save_duplicates:
+        steps.append(("duplicate index", adapter.duplicate_index.save))
+    if adapter.metrics is not None:
+        steps.append(("metrics file", lambda: adapter.metrics.accumulate(os.environ["SCRVNR_METRICS_FILE"])))
+    for what, step in steps:
+        try:
+            step()
+        except Exception as e:
+            print(f"SCRVNR runner: could not flush the {what}: {e}", file=sys.stderr)
+
+
+def _max_request_bytes() -> int:
+    return int(os.environ.get("SCRVNR_MAX_REQUEST_BYTES") or MAX_REQUEST_BYTES)
+
+
+# ─── Framed mode ─────────────────────────────────────────────────────────────
+
+def serve_framed(workers: int = 4, max_bytes: int = None):
+    """
+    Serve length-prefixed frames on stdin/stdout until stdin closes
+    (protocol: core/framing.py). Requests run on a thread pool against one
+    adapter; at most workers x WINDOW_PER_WORKER are read ahead, so a fast
+    caller is held back by the pipe rather than buffered here.
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    import website_studio_adapter  # noqa: F401  (puts core/ on sys.path)
+    from framing import KIND_ERROR, KIND_REQUEST, FrameError, FrameWriter, read_frame
+
+    max_bytes = max_bytes or _max_request_bytes()
+    stdin = sys.stdin.buffer
+    writer = FrameWriter(sys.stdout.buffer)
+    sys.stdout = sys.stderr      # a stray print() must not corrupt the frame stream
+    adapter = build_adapter(long_lived=True)
+    window = threading.BoundedSemaphore(workers * WINDOW_PER_WORKER)
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="scrvnr-framed") as pool:
+        while True:
+            try:
+                frame = read_frame(stdin, max_bytes)
+            except FrameError as e:
+                if e.request_id is None:
+                    break        # truncated stream: the caller has gone
+                writer.write(e.request_id, KIND_ERROR, error_result(str(e)))
+                continue
+            if frame is None:
+                break
+            request_id, codec, kind, body = frame
+            if kind != KIND_REQUEST:
+                writer.write(request_id, KIND_ERROR, error_result(f"Unexpected frame kind {kind}"))
+                continue
+            window.acquire()
+            future = pool.submit(handle_frame, adapter, writer, request_id, codec, body)
+            future.add_done_callback(lambda _: window.release())
+    finish(adapter)
+
+
+def handle_frame(adapter, writer, request_id: int, codec: int, body: bytes):
+    """Answer one REQUEST frame with SECTION frames (when streaming) and a RESULT or ERROR frame."""
+    from framing import CODEC_JSON, KIND_ERROR, KIND_RESULT, KIND_SECTION, FrameError, codecs, decode
+
+    if codec not in codecs():
+        writer.write(request_id, KIND_ERROR, error_result(f"Unsupported codec {codec!r}"), CODEC_JSON)
+        return
+    try:
+        payload = decode(body, codec)
+        if not isinstance(payload, dict):
+            raise FrameError("Request must be an object")
+        for event in adapter.iter_check_payload(payload):
+            if event["event"] == "section":
+                writer.write(request_id, KIND_SECTION, event, codec)
+            else:
+                writer.write(request_id, KIND_RESULT, event["result"], codec)
+    except Exception as e:
+        writer.write(request_id, KIND_ERROR, error_result(str(e)), codec)
+
+
+def error_result(message: str) -> dict:
+    return {
         "gate_open": False,
         "gate_status": "ERROR",
         "override_applied": False,
@@ -86,8 +340,25 @@ def error_out(message: str):
         "timestamp": "",
         "error": message,
     }
-    print(json.dumps(result))
+
+
+def error_out(message: str):
+    print(json.dumps(error_result(message)))
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        import argparse
+        parser = argparse.ArgumentParser(description="SCRVNR runner: one JSON request on stdin, or framed mode.")
+        parser.add_argument("--framed", action="store_true", help="Serve length-prefixed frames until stdin closes")
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent requests in framed mode")
+        parser.add_argument("--max-bytes", type=int, help="Request size limit (default: SCRVNR_MAX_REQUEST_BYTES or 16 MiB)")
+        args = parser.parse_args()
+        if args.max_bytes:
+            os.environ["SCRVNR_MAX_REQUEST_BYTES"] = str(args.max_bytes)
+        if args.framed:
+            serve_framed(workers=args.workers)
+        else:
+            main()
+    else:
+        main()
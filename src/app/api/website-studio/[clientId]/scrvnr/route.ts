@@ -1,17 +1,13 @@
 import { NextRequest, NextResponse } from "next/server";
 import { withPermission } from "@/lib/auth/api-permissions";
-import { spawn } from "child_process";
-import path from "path";
 import {
   getComposerPage,
   recordScrvnrResult,
   updateBuildJobPageCounts,
 } from "@/lib/db/website-studio";
+import { runScrvnr } from "@/lib/scrvnr/gate-runner";
 import type { ScrvnrAdapterResult } from "@/types/website-studio";
 
-const SCRVNR_ROOT = path.resolve(process.cwd(), "scrvnr");
-const PYTHON_SCRIPT = path.join(SCRVNR_ROOT, "ws_gate_runner.py");
-
 // POST /api/website-studio/[clientId]/scrvnr
 // Runs the SCRVNR gate on a composer page (full page or single section).
 //
@@ -21,6 +17,10 @@ const PYTHON_SCRIPT = path.join(SCRVNR_ROOT, "ws_gate_runner.py");
 //   section?:      string   — if provided, single-section live check only
 //   override?:     boolean
 //   overrideNote?: string
+//   stream?:       boolean  — full page check only: respond with NDJSON, one
+//                             {event: "section", ...} line per section as it
+//                             is scored, then {event: "result", data} (or
+//                             {event: "error", error}) as the last line
 export async function POST(
   request: NextRequest,
   { params }: { params: Promise<{ clientId: string }> }
@@ -30,7 +30,7 @@ export async function POST(
 
   try {
     const body = await request.json();
-    const { pageId, sections, section, override, overrideNote } = body;
+    const { pageId, sections, section, override, overrideNote, stream } = body;
 
     if (!pageId || !sections) {
       return NextResponse.json(
@@ -59,27 +59,34 @@ export async function POST(
       job_id: String(pageId),
     };
 
-    const adapterResult = await runPythonAdapter(adapterInput);
+    const recordPageCheck = async (adapterResult: ScrvnrAdapterResult) => {
+      // Full page check — record in DB and sync page status
+      const gateRecord = await recordScrvnrResult(
+        pageId,
+        voiceProfileSlug ?? "no-profile",
+        voiceProfileSlug,
+        adapterResult
+      );
 
-    // Single-section live checks don't persist to the audit trail
-    if (section) {
-      return NextResponse.json({ success: true, data: adapterResult });
+      // Re-tally build job page counts
+      if (pageWithContext?.job?.id) {
+        await updateBuildJobPageCounts(pageWithContext.job.id);
+      }
+      return { adapterResult, gateRecord };
+    };
+
+    if (stream && !section) {
+      return streamPageCheck(adapterInput, recordPageCheck);
     }
 
-    // Full page check — record in DB and sync page status
-    const gateRecord = await recordScrvnrResult(
-      pageId,
-      voiceProfileSlug ?? "no-profile",
-      voiceProfileSlug,
-      adapterResult
-    );
+    const adapterResult = await runScrvnr(adapterInput);
 
-    // Re-tally build job page counts
-    if (pageWithContext?.job?.id) {
-      await updateBuildJobPageCounts(pageWithContext.job.id);
+    // Single-section live checks don't persist to the audit trail
+    if (section) {
+      return NextResponse.json({ success: true, data: adapterResult });
     }
 
-    return NextResponse.json({ success: true, data: { adapterResult, gateRecord } });
+    return NextResponse.json({ success: true, data: await recordPageCheck(adapterResult) });
   } catch (err) {
     console.error("[website-studio/scrvnr] POST failed", err);
     return NextResponse.json(
@@ -89,35 +96,39 @@ export async function POST(
   }
 }
 
-// ── Python adapter runner ─────────────────────────────────────────────────────
-// Calls ws_gate_runner.py which accepts JSON on stdin, returns JSON on stdout.
-// This is a clean subprocess contract — no HTTP server needed for SCRVNR.
-
-function runPythonAdapter(input: object): Promise<ScrvnrAdapterResult> {
-  return new Promise((resolve, reject) => {
-    const python = spawn("python", [PYTHON_SCRIPT], {
-      cwd: SCRVNR_ROOT,
-    });
-
-    let stdout = "";
-    let stderr = "";
-
-    python.stdout.on("data", (chunk) => { stdout += chunk.toString(); });
-    python.stderr.on("data", (chunk) => { stderr += chunk.toString(); });
-
-    python.on("close", (code) => {
-      if (code !== 0) {
-        reject(new Error(`SCRVNR runner exited ${code}: ${stderr}`));
-        return;
-      }
+// ── Streamed page check ───────────────────────────────────────────────────────
+// Forwards the runner's section lines as they arrive, so the composer lights
+// up section indicators while the rest of the page is scored. The page is
+// recorded once the final result is in, before the last line is sent.
+
+function streamPageCheck(
+  adapterInput: Parameters<typeof runScrvnr>[0],
+  recordPageCheck: (adapterResult: ScrvnrAdapterResult) => Promise<object>
+): Response {
+  const encoder = new TextEncoder();
+  const body = new ReadableStream({
+    async start(controller) {
+      const send = (line: object) => {
+        try { controller.enqueue(encoder.encode(JSON.stringify(line) + "\n")); }
+        catch { /* client went away */ }
+      };
       try {
-        resolve(JSON.parse(stdout) as ScrvnrAdapterResult);
-      } catch {
-        reject(new Error(`SCRVNR runner returned invalid JSON: ${stdout}`));
+        const adapterResult = await runScrvnr(adapterInput, send);
+        send({ event: "result", data: await recordPageCheck(adapterResult) });
+      } catch (err) {
+        console.error("[website-studio/scrvnr] streamed POST failed", err);
+        send({ event: "error", error: "SCRVNR evaluation failed" });
+      } finally {
+        try { controller.close(); } catch { /* already closed */ }
       }
-    });
+    },
+  });
 
-    python.stdin.write(JSON.stringify(input));
-    python.stdin.end();
+  return new Response(body, {
+    headers: {
+      "Content-Type": "application/x-ndjson",
+      "Cache-Control": "no-cache, no-transform",
+      "X-Accel-Buffering": "no",
+    },
   });
 }
@@ -7,7 +7,13 @@ import { Button } from "@/components/ui/button";
 import { Textarea } from "@/components/ui/textarea";
 import { Badge } from "@/components/ui/badge";
 import { Card, CardContent, CardHeader } from "@/components/ui/card";
-import type { ComposerPage, ScrvnrGateStatus, ScrvnrComposerFeedback } from "@/types/website-studio";
+import type {
+  ComposerPage,
+  ScrvnrAdapterResult,
+  ScrvnrGateStatus,
+  ScrvnrComposerFeedback,
+  ScrvnrSectionEvent,
+} from "@/types/website-studio";
 
 // Default section stacks per tier (shown as empty slots until filled)
 const DEFAULT_SECTIONS = ["hero", "services", "why-us", "cta"];
@@ -111,12 +117,17 @@ export function PageComposer({ clientId, job, initialPageId, onBack, onRefresh }
       const res = await fetch(`/api/website-studio/${clientId}/scrvnr`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ pageId: selectedPageId, sections, override, overrideNote }),
+        body: JSON.stringify({ pageId: selectedPageId, sections, override, overrideNote, stream: true }),
       });
-      const json = await res.json();
-      if (!json.success) throw new Error(json.error);
 
-      const result = json.data.adapterResult ?? json.data;
+      // Section indicators light up as each section is scored
+      const result = await readScrvnrStream(res, (event) => {
+        const { section, pass, pass1_score, pass2_score, failures } = event;
+        setSectionFeedback((prev) => [
+          ...prev.filter((f) => f.section !== section),
+          { section, pass, pass1_score, pass2_score, failures },
+        ]);
+      });
       setScrvnrStatus(result.gate_open ? "cleared" : "failed");
       setSectionFeedback(result.composer_feedback ?? []);
 
@@ -339,3 +350,34 @@ function PageStatusIcon({ status, reviewStatus }: { status: ScrvnrGateStatus; re
   if (status === "override") return <AlertCircle className="h-3 w-3 text-status-warning shrink-0" />;
   return null;
 }
+
+// Reads the SCRVNR route's NDJSON page check: section lines as they arrive,
+// then the result line. Validation errors come back as plain JSON.
+async function readScrvnrStream(
+  res: Response,
+  onSection: (event: ScrvnrSectionEvent) => void
+): Promise<ScrvnrAdapterResult> {
+  if (!res.headers.get("Content-Type")?.includes("application/x-ndjson") || !res.body) {
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error);
+    return json.data.adapterResult ?? json.data;
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let pending = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    pending += decoder.decode(value, { stream: !done });
+    const lines = pending.split("\n");
+    pending = done ? "" : lines.pop() ?? "";
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const message = JSON.parse(line);
+      if (message.event === "section") onSection(message);
+      else if (message.event === "result") return message.data.adapterResult;
+      else if (message.event === "error") throw new Error(message.error);
+    }
+    if (done) throw new Error("SCRVNR stream ended without a result");
+  }
+}
@@ -0,0 +1,221 @@
+import { spawn, type ChildProcessWithoutNullStreams } from "child_process";
+import path from "path";
+import type { ScrvnrAdapterResult, ScrvnrSectionEvent } from "@/types/website-studio";
+
+// ── SCRVNR gate runner client ─────────────────────────────────────────────────
+// Talks to scrvnr/ws_gate_runner.py in one of two modes:
+//
+//   one-shot (default)   a process per request: JSON payload on stdin,
+//                        NDJSON on stdout (one line without "stream", a line
+//                        per section then a result line with it)
+//   framed               SCRVNR_RUNNER_MODE=framed — one long-lived
+//                        `ws_gate_runner.py --framed` process shared by every
+//                        request, speaking length-prefixed frames
+//                        (scrvnr/core/framing.py). Profiles and lexicons are
+//                        loaded once instead of per request.
+//
+// Passing onSection asks the runner to stream: it is called with each
+// section's result as soon as both passes have scored it.
+
+const SCRVNR_ROOT = path.resolve(process.cwd(), "scrvnr");
+const PYTHON_SCRIPT = path.join(SCRVNR_ROOT, "ws_gate_runner.py");
+
+export type ScrvnrRunnerInput = {
+  property_slug: string;
+  sections: Record<string, string>;
+  section_only: string | null;
+  override: boolean;
+  override_note: string;
+  job_id: string | null;
+};
+
+type SectionHandler = (event: ScrvnrSectionEvent) => void;
+
+export function runScrvnr(
+  input: ScrvnrRunnerInput,
+  onSection?: SectionHandler
+): Promise<ScrvnrAdapterResult> {
+  const payload = { ...input, stream: Boolean(onSection) && !input.section_only };
+  if (process.env.SCRVNR_RUNNER_MODE === "framed") {
+    return framedRunner().request(payload, onSection);
+  }
+  return runOnce(payload, onSection);
+}
+
+// ── One-shot: NDJSON on stdout ────────────────────────────────────────────────
+
+function runOnce(payload: object, onSection?: SectionHandler): Promise<ScrvnrAdapterResult> {
+  return new Promise((resolve, reject) => {
+    const python = spawn("python", [PYTHON_SCRIPT], { cwd: SCRVNR_ROOT });
+
+    let pending = "";
+    let stderr = "";
+    let result: ScrvnrAdapterResult | null = null;
+    let badLine: string | null = null;
+
+    // Lines are handled as they arrive so section events reach the caller
+    // while later sections are still being scored.
+    const handleLine = (line: string) => {
+      if (!line.trim()) return;
+      let message: any;
+      try {
+        message = JSON.parse(line);
+      } catch {
+        badLine = badLine ?? line;
+        return;
+      }
+      if (message.event === "section") {
+        onSection?.(message as ScrvnrSectionEvent);
+      } else if (message.event === "result") {
+        result = message.result as ScrvnrAdapterResult;
+      } else {
+        result = message as ScrvnrAdapterResult; // unstreamed output or a runner error
+      }
+    };
+
+    python.stdout.setEncoding("utf8");
+    python.stdout.on("data", (chunk: string) => {
+      const lines = (pending + chunk).split("\n");
+      pending = lines.pop() ?? "";
+      lines.forEach(handleLine);
+    });
+    python.stderr.on("data", (chunk) => { stderr += chunk.toString(); });
+
+    python.on("error", reject);
+    python.on("close", (code) => {
+      handleLine(pending);
+      if (code !== 0) {
+        reject(new Error(`SCRVNR runner exited ${code}: ${stderr}`));
+      } else if (result === null) {
+        reject(new Error(`SCRVNR runner returned invalid NDJSON: ${badLine ?? "(no result line)"}`));
+      } else {
+        resolve(result);
+      }
+    });
+
+    python.stdin.write(JSON.stringify(payload));
+    python.stdin.end();
+  });
+}
+
+// ── Framed: one long-lived runner ─────────────────────────────────────────────
+// Frame: u32 body length | u32 request id | u8 codec | u8 kind | body
+// (big-endian). Always the JSON codec here. Responses arrive in completion
+// order and are matched to requests by id.
+
+const HEADER_BYTES = 10;
+const CODEC_JSON = "j".charCodeAt(0);
+const KIND_REQUEST = 1;
+const KIND_SECTION = 2;
+const KIND_RESULT = 3;
+const KIND_ERROR = 4;
+const MAX_REQUEST_ID = 0xffffffff;
+
+type PendingRequest = {
+  onSection?: SectionHandler;
+  resolve: (result: ScrvnrAdapterResult) => void;
+  reject: (err: Error) => void;
+};
+
+class FramedRunner {
+  private readonly child: ChildProcessWithoutNullStreams;
+  private readonly pending = new Map<number, PendingRequest>();
+  private buffer = Buffer.alloc(0);
+  private nextId = 1;
+  private exited = false;
+
+  constructor() {
+    this.child = spawn("python", [PYTHON_SCRIPT, "--framed"], { cwd: SCRVNR_ROOT });
+    this.child.stdout.on("data", (chunk: Buffer) => this.onData(chunk));
+    this.child.stderr.on("data", (chunk) => {
+      console.error("[scrvnr/framed-runner]", chunk.toString().trimEnd());
+    });
+    // EPIPE on a write after the runner died would otherwise be unhandled
+    this.child.stdin.on("error", (err) => this.onExit(err));
+    this.child.on("error", (err) => this.onExit(err));
+    this.child.on("close", (code, signal) => {
+      this.onExit(new Error(`SCRVNR framed runner exited ${code ?? signal}`));
+    });
+  }
+
+  request(payload: object, onSection?: SectionHandler): Promise<ScrvnrAdapterResult> {
+    return new Promise((resolve, reject) => {
+      // Registered before the liveness check and the write, so an exit at
+      // any point after this rejects the request instead of leaving it hanging.
+      const id = this.allocateId();
+      this.pending.set(id, { onSection, resolve, reject });
+      if (this.exited) {
+        this.settle(id)?.reject(new Error("SCRVNR framed runner has exited"));
+        return;
+      }
+      const body = Buffer.from(JSON.stringify(payload), "utf8");
+      const header = Buffer.alloc(HEADER_BYTES);
+      header.writeUInt32BE(body.length, 0);
+      header.writeUInt32BE(id, 4);
+      header.writeUInt8(CODEC_JSON, 8);
+      header.writeUInt8(KIND_REQUEST, 9);
+      this.child.stdin.write(Buffer.concat([header, body]));
+    });
+  }
+
+  private allocateId(): number {
+    const id = this.nextId;
+    this.nextId = id >= MAX_REQUEST_ID ? 1 : id + 1;
+    return id;
+  }
+
+  private settle(id: number): PendingRequest | undefined {
+    const request = this.pending.get(id);
+    this.pending.delete(id);
+    return request;
+  }
+
+  private onData(chunk: Buffer) {
+    this.buffer = this.buffer.length ? Buffer.concat([this.buffer, chunk]) : chunk;
+    while (this.buffer.length >= HEADER_BYTES) {
+      const length = this.buffer.readUInt32BE(0);
+      if (this.buffer.length < HEADER_BYTES + length) return;
+      const id = this.buffer.readUInt32BE(4);
+      const codec = this.buffer.readUInt8(8);
+      const kind = this.buffer.readUInt8(9);
+      const body = this.buffer.subarray(HEADER_BYTES, HEADER_BYTES + length);
+      this.buffer = this.buffer.subarray(HEADER_BYTES + length);
+      this.onFrame(id, codec, kind, body);
+    }
+  }
+
+  private onFrame(id: number, codec: number, kind: number, body: Buffer) {
+    const request = this.pending.get(id);
+    if (!request) return;
+    // A frame that cannot be decoded fails its own request only
+    let message: any;
+    try {
+      if (codec !== CODEC_JSON) throw new Error(`unexpected codec ${codec}`);
+      message = JSON.parse(body.toString("utf8"));
+    } catch (err) {
+      this.settle(id)?.reject(new Error(`SCRVNR framed runner sent an undecodable frame: ${err}`));
+      return;
+    }
+    if (kind === KIND_SECTION) {
+      request.onSection?.(message as ScrvnrSectionEvent);
+    } else if (kind === KIND_RESULT || kind === KIND_ERROR) {
+      this.settle(id)?.resolve(message as ScrvnrAdapterResult); // ERROR bodies are error results
+    }
+  }
+
+  private onExit(err: Error) {
+    if (this.exited) return;
+    this.exited = true;
+    if (sharedRunner === this) sharedRunner = null; // the next request starts a new runner
+    for (const id of Array.from(this.pending.keys())) {
+      this.settle(id)?.reject(err);
+    }
+  }
+}
+
+let sharedRunner: FramedRunner | null = null;
+
+function framedRunner(): FramedRunner {
+  sharedRunner = sharedRunner ?? new FramedRunner();
+  return sharedRunner;
+}
@@ -284,6 +284,16 @@ export type ScrvnrComposerFeedback = {
   failures: string[];
 };
 
+// One NDJSON line (or SECTION frame) per section when the runner streams
+// ("stream": true), sent as soon as both passes have scored that section.
+export type ScrvnrSectionEvent = ScrvnrComposerFeedback & {
+  event: "section";
+  index: number;
+  total: number;
+  pass1_pass: boolean;
+  pass2_pass: boolean;
+};
+
 // ── New Property Init ──────────────────────────────────────────────────────
 
 export type NewPropertyConfig = {